@@ -0,0 +1,110 @@
+import argparse
+import time
+
+import ibis
+import pandas as pd
+
+import codegen.trace as trc
+import codegen.utils as utl
+from codegen.generator import generate_noir_code, post_order, post_order_dfs
+from codegen.operators import Operator
+from codegen.workspace import use_workspace
+
+INTS_STRINGS = utl.ROOT_DIR + "/data/nullable_op/ints_strings.csv"
+MANY_INTS = utl.ROOT_DIR + "/data/nullable_op/many_ints.csv"
+
+
+# synthetic plans, each growing with size to stress one kind of operator: they are only generated, never built
+
+
+def filters(size: int):
+    # a single selection with size predicates
+    t = ibis.read_csv(INTS_STRINGS)
+    return [(INTS_STRINGS, t)], t.filter([t.int1 != i for i in range(size)])
+
+
+def maps(size: int):
+    t = ibis.read_csv(INTS_STRINGS)
+    return [(INTS_STRINGS, t)], t.mutate(**{f"c{i}": t.int4 + i for i in range(size)})
+
+
+def windows(size: int):
+    t = ibis.read_csv(INTS_STRINGS)
+    return [(INTS_STRINGS, t)], t.mutate(**{f"w{i}": t.int4.sum().over(ibis.window(preceding=i + 1, following=0))
+                                            for i in range(size)})
+
+
+def joins(size: int):
+    # a chain of joins of size tables, each read separately: ibis takes much longer to build it than to generate it
+    files_tables = [(MANY_INTS, ibis.read_csv(MANY_INTS)) for _ in range(size)]
+    query = files_tables[0][1].select("int1", "int2")
+    for i, (_, t) in enumerate(files_tables[1:]):
+        query = query.join(t.select("int1", **{f"v{i}": t.int2}), "int1").select("int1", "int2")
+    return files_tables, query
+
+
+SHAPES = {"filters": filters, "maps": maps, "windows": windows, "joins": joins}
+# sizes giving plans of at least 1000 nodes
+DEFAULT_SIZES = {"filters": 1000, "maps": 1000, "windows": 300, "joins": 100}
+
+
+def main():
+    parser = argparse.ArgumentParser("ibis-renoir-codegen-benchmark",
+                                     description="Time the code generation of synthetic plans with thousands of nodes, "
+                                                 "split into recognizing operators, building and optimizing their "
+                                                 "logical plan and generating their code.")
+    parser.add_argument("--shapes", type=str, nargs="+", choices=list(SHAPES), default=list(SHAPES),
+                        help="Plans to generate, all by default")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        help=f"Sizes of each plan, by default those giving 1000+ nodes: {DEFAULT_SIZES}")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Generations of each plan: the first, with the caches of ibis still cold, and the "
+                             "fastest are reported")
+    args = parser.parse_args()
+
+    # the generated code goes to a workspace of its own, leaving noir_template's untouched
+    use_workspace("codegen-benchmark")
+    rows = []
+    for shape in args.shapes:
+        for size in args.sizes or [DEFAULT_SIZES[shape]]:
+            rows.append(measure(shape, size, args.runs))
+            print(f"generated {shape} of size {size} in {rows[-1]['total_s']:.4f}s", flush=True)
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+
+def measure(shape: str, size: int, runs: int) -> dict:
+    start_time = time.perf_counter()
+    files_tables, query = SHAPES[shape](size)
+    build_s = time.perf_counter() - start_time
+
+    first_s = None
+    best: dict[str, float] = {}
+    for _ in range(runs):
+        trc.start()
+        start_time = time.perf_counter()
+        generate_noir_code(files_tables, query, render_query_graph=False)
+        total_s = time.perf_counter() - start_time
+        trc.stop()
+        spans = {e["name"]: e["dur"] / 1e6 for e in trc.events}
+        times = {"recognize_s": spans["recognize operators"], "plan_s": spans["logical plan"],
+                 "generate_s": spans["generate"] - spans["recognize operators"] - spans["logical plan"],
+                 "total_s": total_s}
+        first_s = first_s or total_s
+        best = {k: min(v, best.get(k, v)) for k, v in times.items()}
+    with open(utl.CRATE_DIR + "/src/main.rs") as f:
+        code_bytes = len(f.read())
+    return {"shape": shape, "size": size, "plan_nodes": len(post_order(query.op())),
+            "operators": operators_count(query), "code_bytes": code_bytes, "ibis_build_s": build_s, "first_total_s": first_s, **best}
+
+
+def operators_count(query) -> int:
+    # operators are cleared once their code is generated, so they are recognized again to count them
+    Operator.cleanup()
+    post_order_dfs(query.op())
+    count = len(Operator.operators)
+    Operator.cleanup()
+    return count
+
+
+if __name__ == "__main__":
+    main()
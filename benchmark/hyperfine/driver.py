@@ -0,0 +1,147 @@
+"""
+Persistent driver for hyperfine, so that the measured commands don't pay the startup of python and the imports of
+ibis, the compiler and the backends, which dominate the time of queries on small datasets. The server imports
+everything once, then runs each command in a fork of itself, with the standard streams of the client:
+
+    python -m benchmark.hyperfine.driver serve &
+    hyperfine "python -S benchmark/hyperfine/driver.py <hyperfine_benchmark.py arguments>"
+
+The client only imports the standard library and waits for the command to end, exiting with its status. With
+--time_output it also appends the elapsed time, the peak memory and the cpu times of the fork, measured by the
+server, in the format the benchmark scripts use with /usr/bin/time. Commands run one at a time.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+
+SOCKET_PATH = f"{tempfile.gettempdir()}/ibis-renoir-driver-{os.getuid()}.sock"
+# seconds the client waits for the server to start listening
+CONNECT_TIMEOUT_S = 60
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        parser = argparse.ArgumentParser("ibis-renoir-driver serve")
+        parser.add_argument("--socket", type=str, default=SOCKET_PATH, help="Path of the unix socket to listen on")
+        args = parser.parse_args(sys.argv[2:])
+        serve(args.socket)
+        return
+
+    parser = argparse.ArgumentParser("ibis-renoir-driver",
+                                     description="Run hyperfine_benchmark.py with the arguments that follow, "
+                                                 "in the driver process started with `serve`")
+    parser.add_argument("--socket", type=str, default=SOCKET_PATH, help="Path of the unix socket of the driver")
+    parser.add_argument("--time_output", type=str,
+                        help="File to append the measurements of the run to, as /usr/bin/time -a -o "
+                             "-f '<label>,%%e,%%M,%%U,%%S,%%x'")
+    parser.add_argument("--time_label", type=str, default="", help="First columns of the line appended")
+    args, command = parser.parse_known_args()
+    sys.exit(run(args.socket, command, args.time_output, args.time_label))
+
+
+def run(socket_path: str, command: list[str], time_output: str = None, time_label: str = "") -> int:
+    start_time = time.perf_counter()
+    conn = connect(socket_path)
+    request = json.dumps({"argv": command, "cwd": os.getcwd()}).encode() + b"\n"
+    # the fork writes to the streams of the client, sent along with the request
+    socket.send_fds(conn, [request], [0, 1, 2])
+    response = json.loads(conn.makefile("rb").readline())
+    conn.close()
+    elapsed = time.perf_counter() - start_time
+
+    if time_output:
+        with open(time_output, "a") as f:
+            f.write(f"{time_label},{elapsed:.2f},{response['max_rss_k']},{response['user_s']:.2f},"
+                    f"{response['system_s']:.2f},{response['status']}\n")
+    return response["status"]
+
+
+def connect(socket_path: str) -> socket.socket:
+    deadline = time.monotonic() + CONNECT_TIMEOUT_S
+    while True:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            conn.connect(socket_path)
+            return conn
+        except (FileNotFoundError, ConnectionRefusedError):
+            conn.close()
+            # the server could still be importing
+            if time.monotonic() > deadline:
+                raise Exception(f"No driver is listening on {socket_path}, start it with "
+                                "`python -m benchmark.hyperfine.driver serve`")
+            time.sleep(0.1)
+
+
+def serve(socket_path: str):
+    sys.path.insert(0, ROOT_DIR)
+    # everything the commands import, so that forks find them already loaded
+    import benchmark.hyperfine.hyperfine_benchmark  # noqa: F401
+    import ibis.backends.duckdb  # noqa: F401
+    import ibis.backends.polars  # noqa: F401
+    import pyflink.table  # noqa: F401
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    print(f"driver listening on {socket_path}", flush=True)
+    # stopped with kill or ctrl-c, also when started in the background by a script, which ignores sigint
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                handle(server, conn)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.remove(socket_path)
+
+
+def handle(server: socket.socket, conn: socket.socket):
+    request, fds, _, _ = socket.recv_fds(conn, 1 << 16, 3)
+    request = json.loads(request)
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        server.close()
+        conn.close()
+        for fd, std in zip(fds, (0, 1, 2)):
+            os.dup2(fd, std)
+        status = 0
+        try:
+            import benchmark.hyperfine.hyperfine_benchmark as hb
+            os.chdir(request["cwd"])
+            hb.main(request["argv"])
+        except SystemExit as e:
+            # sys.exit() and sys.exit(None) are successes, exiting with a message is not
+            status = 0 if e.code is None else (e.code if isinstance(e.code, int) else 1)
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+            status = 1
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # skip the cleanup of the modules and threads inherited from the server
+        os._exit(status)
+
+    for fd in fds:
+        os.close(fd)
+    _, wait_status, usage = os.wait4(pid, 0)
+    response = {"status": os.waitstatus_to_exitcode(wait_status), "max_rss_k": usage.ru_maxrss,
+                "user_s": usage.ru_utime, "system_s": usage.ru_stime}
+    conn.sendall(json.dumps(response).encode() + b"\n")
+
+
+if __name__ == "__main__":
+    main()
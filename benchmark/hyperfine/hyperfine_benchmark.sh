@@ -14,10 +14,17 @@ size_suffix="_10000000"
 # change to skip the first n tests
 skip=0
 
+# set to true to run the commands in forks of a driver process that already imported everything (see driver.py),
+# measuring the queries without the python startup: memory is measured by the driver instead of /usr/bin/time
+driver=false
+
 source .venv3.11/bin/activate
 mkdir -p log/$1
-memo="log/$1/memo_log.csv"
-echo "test_name,backend,elapsed_s,resident_k,user,system,status" > $memo
+if [ "$driver" = true ]; then
+    python3 -m benchmark.hyperfine.driver serve &
+    driver_pid=$!
+    trap "kill $driver_pid" EXIT
+fi
 i=0
 # use grep to filter the tests you want to run, with option -v "test_name" to exclude single test pattern
 # or -v -e "test_name1" -e "test_name2" to exclude multiple patterns
@@ -29,13 +36,21 @@ python3 -m benchmark.discover_tests | grep -v "non_nullable" | while IFS= read -
     fi
     trim=${name##*.}
     for backend in "${backends[@]}"; do
-        hyperfine --warmup 1 \
-        "/usr/bin/time -a -o $memo -f '$trim,$backend,%e,%M,%U,%S,%x' \
-        python3 -m benchmark.hyperfine_benchmark $name --backend $backend --path_suffix $size_suffix" \
-        --export-json log/$1/hyperfine_${trim}${size_suffix}_${backend}.json
+        json="log/$1/hyperfine_${trim}${size_suffix}_${backend}.json"
+        memo="log/$1/memo_${trim}${size_suffix}_${backend}.csv"
+        rm -f $memo
+        if [ "$driver" = true ]; then
+            command="python3 -S benchmark/hyperfine/driver.py --time_output $memo --time_label '$trim,$backend' \
+            $name --backend $backend --path_suffix $size_suffix"
+        else
+            command="/usr/bin/time -a -o $memo -f '$trim,$backend,%e,%M,%U,%S,%x' \
+            python3 -m benchmark.hyperfine.hyperfine_benchmark $name --backend $backend --path_suffix $size_suffix"
+        fi
+        hyperfine --warmup 1 "$command" --export-json $json
         printf "\n"
-        # copy every time we run a test so if we quit before finish all tests we still have both
-        cp log/codegen_log.csv log/$1/codegen_log.csv
-        cp benchmark/hyperfine_benchmark.sh log/$1/hyperfine_benchmark.sh
+        # store the results every time we run a test so if we quit before finish all tests we still have them
+        python3 -m benchmark.hyperfine.store_results hyperfine $json --dir $1 --test $trim --backend $backend --path_suffix "$size_suffix"
+        python3 -m benchmark.hyperfine.store_results time $memo --dir $1 --path_suffix "$size_suffix" --warmup 1
+        cp benchmark/hyperfine/hyperfine_benchmark.sh log/$1/hyperfine_benchmark.sh
     done
 done
\ No newline at end of file
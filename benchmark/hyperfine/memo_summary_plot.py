@@ -1,25 +1,24 @@
 import argparse
-import glob
 import pandas as pd
 import plotly.express as px
 
+from codegen.result_store import ResultStore
+
 parser = argparse.ArgumentParser(description='Process some files.')
 parser.add_argument('directory', type=str,
                     help='The directory to process files from')
 args = parser.parse_args()
 
-dataset_size = glob.glob(f"{args.directory}/*hyperfine_test*.json")[0].split('_')[-2]
-# find the only memo_log.csv file that should be in the given directory
-memo_file = glob.glob(f"{args.directory}/memo_log.csv").pop()
-memo_df = pd.read_csv(memo_file)
+# runs measured by /usr/bin/time in the given directory, skipping the warmup runs
+memo_df = ResultStore().read(args.directory, source='time')
+memo_df = memo_df[memo_df['run_count'] != -1]
+dataset_size = memo_df['path_suffix'].iloc[0].lstrip('_')
 
-# for each test and each backend, compute the mean values skipping the first warmup row
-mean_df = (memo_df
-           .groupby(['test_name', 'backend'])
-           .apply(lambda x: x.iloc[1:].mean()).reset_index())
+# for each test and each backend, compute the mean max memory
+mean_df = memo_df.groupby(['test_name', 'backend_name'])['max_memory_MiB'].mean().reset_index()
 
-# Create a DataFrame with test names, backends, and resident_k values
-df = pd.DataFrame([(row['test_name'], row['backend'], row['resident_k'] / (1024 * 1024)) for _, row in mean_df.iterrows()], columns=['Test name', 'Backend', 'Resident GB'])
+# Create a DataFrame with test names, backends, and resident GB values
+df = pd.DataFrame([(row['test_name'], row['backend_name'], row['max_memory_MiB'] / 1024) for _, row in mean_df.iterrows()], columns=['Test name', 'Backend', 'Resident GB'])
 
 # Create the scatter plot for resident_k
 fig = px.scatter(df, x='Test name', y='Resident GB', color='Backend', title=f'<b>Max memory of each backend & test on dataset size {dataset_size}', labels={'Resident GB': 'Resident GB'})
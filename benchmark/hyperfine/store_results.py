@@ -0,0 +1,60 @@
+import argparse
+import io
+import json
+
+import pandas as pd
+
+from codegen.result_store import ResultStore
+
+# columns written by `/usr/bin/time -f '<test>,<backend>,%e,%M,%U,%S,%x'`
+TIME_COLUMNS = ['test_name', 'backend_name', 'elapsed_s', 'resident_k', 'user', 'system', 'status']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Add the measurements of hyperfine or /usr/bin/time to the result store.')
+    parser.add_argument('source', type=str, choices=['hyperfine', 'time'],
+                        help='hyperfine: a json exported by hyperfine for a single command. '
+                             f'time: the lines written by /usr/bin/time with the columns {",".join(TIME_COLUMNS)}')
+    parser.add_argument('file', type=str, help='The file with the measurements')
+    parser.add_argument('--dir', type=str, required=True, help='The benchmark run the measurements belong to')
+    parser.add_argument('--test', type=str, help='Test measured by hyperfine')
+    parser.add_argument('--backend', type=str, help='Backend measured by hyperfine')
+    parser.add_argument('--path_suffix', type=str, default="", help='Suffix of the input files of the test')
+    parser.add_argument('--warmup', type=int, default=0,
+                        help='Number of warmup runs at the start of each test and backend measured by time')
+    args = parser.parse_args()
+
+    if args.source == 'hyperfine':
+        rows = hyperfine_rows(args.file, args.test, args.backend)
+    else:
+        rows = time_rows(args.file, args.warmup)
+    for row in rows:
+        row['path_suffix'] = args.path_suffix
+    ResultStore().append(args.dir, args.source, rows)
+
+
+def hyperfine_rows(path: str, test_name: str, backend: str) -> list[dict]:
+    # one row per timed run, warmup runs are not exported by hyperfine
+    with open(path) as f:
+        result = json.load(f)["results"][0]
+    memory = result.get("memory_usage_byte") or [None] * len(result["times"])
+    return [{'test_name': test_name, 'backend_name': backend, 'run_count': i, 'total_time_s': time,
+             'exit_status': exit_code, 'max_memory_MiB': mem / 2 ** 20 if mem is not None else -1}
+            for i, (time, exit_code, mem) in enumerate(zip(result["times"], result["exit_codes"], memory))]
+
+
+def time_rows(path: str, warmup: int) -> list[dict]:
+    # time writes an additional line before the measurements of commands that failed
+    with open(path) as f:
+        lines = [line for line in f if not line.startswith("Command")]
+    df = pd.read_csv(io.StringIO("".join(lines)), names=TIME_COLUMNS)
+    # runs are numbered for each test and backend, warmup runs with -1 as in the internal benchmark
+    run = df.groupby(['test_name', 'backend_name']).cumcount() - warmup
+    return [{'test_name': r.test_name, 'backend_name': r.backend_name, 'run_count': max(int(n), -1),
+             'total_time_s': r.elapsed_s, 'max_memory_MiB': r.resident_k / 1024, 'user_time_s': r.user,
+             'system_time_s': r.system, 'exit_status': int(r.status)}
+            for r, n in zip(df.itertuples(), run)]
+
+
+if __name__ == "__main__":
+    main()
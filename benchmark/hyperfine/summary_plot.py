@@ -1,36 +1,20 @@
 import argparse
-import glob
-import json
 import matplotlib.pyplot as plt
 import pandas as pd
 import plotly.express as px
 
+from codegen.result_store import ResultStore
+
 parser = argparse.ArgumentParser(description='Process some files.')
 parser.add_argument('directory', type=str, help='The directory to process files from')
 args = parser.parse_args()
 
-# Find all JSON files in the specified directory that contain "hyperfine_test" in their names
-# Exclude files with "COMPARISON" in their names
-json_files = glob.glob(f"{args.directory}/*hyperfine_test*.json")
-json_files = [file for file in json_files if "COMPARISON" not in file]
+# hyperfine runs of the benchmark stored in the given directory
+runs = ResultStore().read(args.directory, source='hyperfine')
+dataset_size = runs['path_suffix'].iloc[0].lstrip('_')
 
 results = {}
-dataset_size = json_files[0].split('_')[-2]
-
-for json_file in json_files:
-    backend_name = json_file.split('_')[-1].split('.json')[0]
-    test_name = json_file.split('hyperfine_test_')[-1].rsplit('_', 2)[0]
-
-    with open(json_file, 'r') as f:
-        try:
-            data = json.load(f)
-            # Add the mean time to the nested dictionary
-            # There is a single result for each test
-            mean_time = data["results"][0]["mean"]
-        except json.JSONDecodeError:
-            print(f"Storing negative time due to invalid encoding: {json_file}")
-            mean_time = -0.1
-    
+for (test_name, backend_name), mean_time in runs.groupby(['test_name', 'backend_name'])['total_time_s'].mean().items():
     if test_name not in results:
         results[test_name] = {}
     results[test_name][backend_name] = mean_time
@@ -0,0 +1,113 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from codegen.result_store import ResultStore
+
+# besides the test and the backend, the configuration columns that tell runs apart
+CONFIG_COLUMNS = ['table_origin', 'file_format', 'path_suffix', 'num_processes', 'cores_per_process', 'dataset_rows']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare a candidate internal benchmark run against a baseline run, '
+                                                 'exiting with an error when a test got significantly slower or '
+                                                 'uses significantly more memory.')
+    parser.add_argument('baseline', type=str, help='The directory of the baseline benchmark run, e.g. log/internal/<name>')
+    parser.add_argument('candidate', type=str, help='The directory of the candidate benchmark run')
+    parser.add_argument('--metrics', type=str, nargs='+', default=['total_time_s', 'max_memory_MiB'],
+                        help='Columns of the result store to compare, lower is better. Defaults to total time and max memory')
+    parser.add_argument('--threshold', type=float, default=0.05,
+                        help='Relative increase of the mean tolerated before flagging a regression. Defaults to 0.05')
+    parser.add_argument('--confidence', type=float, default=0.95,
+                        help='Confidence level of the bootstrapped intervals. Defaults to 0.95')
+    parser.add_argument('--resamples', type=int, default=10_000,
+                        help='Number of bootstrap resamples. Defaults to 10000')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the bootstrap resampling')
+    args = parser.parse_args()
+
+    baseline = read_runs(args.baseline)
+    candidate = read_runs(args.candidate)
+    result = compare(baseline, candidate, args.metrics, args.threshold, args.confidence, args.resamples,
+                     np.random.default_rng(args.seed))
+
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(result.to_string(index=False, float_format=lambda v: f"{v:.4g}"))
+    regressions = result[result['verdict'] == 'regression']
+    if len(regressions) > 0:
+        print(f"\n{len(regressions)} significant regressions past {args.threshold:.0%}:")
+        for _, r in regressions.iterrows():
+            print(f"  {r['test_name']} on {r['backend_name']}: {r['metric']} x{r['ratio']:.3f} "
+                  f"[{r['ratio_low']:.3f}, {r['ratio_high']:.3f}]")
+        sys.exit(1)
+
+
+def read_runs(dir: str) -> pd.DataFrame:
+    # only measured runs that completed: warmup runs are logged with run_count -1
+    df = ResultStore().read(dir, source='internal')
+    return df[(df['run_count'] != -1) & (df['exception'] == 'None')]
+
+
+def group_columns(df: pd.DataFrame) -> list[str]:
+    return ['test_name', 'backend_name'] + [c for c in CONFIG_COLUMNS if c in df.columns]
+
+
+def bootstrap_ratio(baseline: np.ndarray, candidate: np.ndarray, confidence: float, resamples: int,
+                    rng: np.random.Generator) -> tuple[float, float, float]:
+    """
+    ratio of the candidate mean over the baseline mean, with its percentile bootstrap confidence interval: both
+    samples are resampled with replacement independently, all resamples at once
+    """
+    base_means = baseline[rng.integers(0, len(baseline), (resamples, len(baseline)))].mean(axis=1)
+    cand_means = candidate[rng.integers(0, len(candidate), (resamples, len(candidate)))].mean(axis=1)
+    ratios = cand_means / base_means
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(ratios, [alpha, 1 - alpha])
+    return candidate.mean() / baseline.mean(), low, high
+
+
+def compare(baseline: pd.DataFrame, candidate: pd.DataFrame, metrics: list[str], threshold: float,
+            confidence: float, resamples: int, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    for each configuration in both runs and each metric, a regression when the whole confidence interval of the
+    ratio of the means is above 1 + threshold and an improvement when it is below 1 - threshold: with fewer than
+    two runs on either side, or metrics not measured (-1), the difference can't be told apart from noise
+    """
+    keys = [c for c in group_columns(baseline) if c in candidate.columns]
+    candidate_groups = dict(list(candidate.groupby(keys)))
+    result = []
+    for key, base in baseline.groupby(keys):
+        cand = candidate_groups.pop(key, None)
+        for metric in metrics:
+            row = dict(zip(keys, key))
+            row['metric'] = metric
+            if cand is None:
+                result.append({**row, 'verdict': 'missing from candidate'})
+                continue
+            b = base[metric].to_numpy(dtype=float)
+            c = cand[metric].to_numpy(dtype=float)
+            b, c = b[b >= 0], c[c >= 0]
+            row.update({'baseline_mean': b.mean() if len(b) else np.nan,
+                        'candidate_mean': c.mean() if len(c) else np.nan,
+                        'baseline_runs': len(b), 'candidate_runs': len(c)})
+            if len(b) < 2 or len(c) < 2 or b.mean() == 0:
+                result.append({**row, 'verdict': 'inconclusive'})
+                continue
+            ratio, low, high = bootstrap_ratio(b, c, confidence, resamples, rng)
+            verdict = 'unchanged'
+            if low > 1 + threshold:
+                verdict = 'regression'
+            elif high < 1 - threshold:
+                verdict = 'improvement'
+            result.append({**row, 'ratio': ratio, 'ratio_low': low, 'ratio_high': high, 'verdict': verdict})
+    for key in candidate_groups:
+        for metric in metrics:
+            result.append({**dict(zip(keys, key)), 'metric': metric, 'verdict': 'missing from baseline'})
+    columns = keys + ['metric', 'baseline_mean', 'candidate_mean', 'baseline_runs', 'candidate_runs',
+                      'ratio', 'ratio_low', 'ratio_high', 'verdict']
+    return pd.DataFrame(result, columns=columns)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 import multiprocessing.connection
+import os
+import ibis
 import benchmark.discover.load_tests as bench
 import test
 import argparse
 import test.test_nexmark
 import test.test_operators
 import time
+import itertools
 import codegen.benchmark as bm
+from codegen.cluster import Cluster
+from codegen.workspace import use_workspace
 from datetime import datetime
 import multiprocessing
 import traceback
@@ -36,6 +41,26 @@ def main():
                         help="Instead of running the query starting from the csv load, read it directly from backend table. \
                               No need to perform load as instrumented run can load before running without affecting the measured data",
                         type=str, nargs='+', choices=["csv", "cached"],  default="csv")
+    parser.add_argument("--processes",
+                        help="List of numbers of cooperating renoir processes to compare, each deployed as a cluster on localhost \
+                              communicating over loopback TCP. Ignored by other backends. Defaults to a single process.",
+                        type=int, nargs='+', default=[1])
+    parser.add_argument("--cores_per_process",
+                        help="Number of cores assigned to each renoir process, also limiting the threads of duckdb and polars. \
+                              By default all cores are used by single process and split evenly across processes of a cluster.",
+                        type=int, default=None)
+    parser.add_argument("--file_format",
+                        help="Formats of the input files to compare, converted from the csv files on first use. Flink only reads csv. \
+                              Binary is the memory-mapped table cache only read by renoir, other backends skip it.",
+                        type=str, nargs='+', choices=["csv", "parquet", "arrow", "binary"], default=["csv"])
+    parser.add_argument("--compile_once",
+                        help="Renoir only: compile each query once before the runs, recording its cold and warm compile times, \
+                              so that runs only measure the execution of the built binary.",
+                        action="store_true")
+    parser.add_argument("--precompile_workers",
+                        help="Renoir only: number of processes building all the selected queries in parallel before any measured run, \
+                              each in its own copy of the crate. Runs then reuse the built binaries. Disabled by default.",
+                        type=int, default=0)
     parser.add_argument("--dir",
                         help="Where to store the log file. Defaults to directory from timestamp.",
                         type=str, default=datetime.now().strftime("%Y-%m-%d_%H:%M:%S"))
@@ -45,18 +70,68 @@ def main():
         pat in t for pat in args.test_patterns)]
     tests_split: list[tuple] = [t.rsplit(".", 1) for t in tests_full]
 
+    if args.precompile_workers > 0 and "renoir" in args.backends:
+        precompile(tests_split, args)
+
     for test_class, test_case in tests_split:
         for backend in args.backends:
-            for table_origin in args.table_origin:
+            # process layouts only make sense for renoir: other backends run once in their own process
+            layouts = args.processes if backend == "renoir" else [1]
+            formats = args.file_format if backend != "flink" else ["csv"]
+            if backend != "renoir":
+                formats = [f for f in formats if f != "binary"]
+            for processes, table_origin, file_format in itertools.product(layouts, args.table_origin, formats):
                 main, worker = multiprocessing.Pipe(duplex=True)
                 p = multiprocessing.Process(target=child_workload, args=(
-                    worker, test_class, test_case, backend, table_origin, args.path_suffix, args.runs, args.warmup, args.dir))
+                    worker, test_class, test_case, backend, table_origin, args.path_suffix, args.runs, args.warmup, args.dir,
+                    processes, args.cores_per_process, file_format, args.compile_once, args.precompile_workers > 0))
                 p.start()
                 count = args.warmup + args.runs
-                allow_runs(count, p, main, test_case, backend, table_origin, args.dir)
+                allow_runs(count, p, main, test_case, backend, table_origin, args.dir, processes, file_format)
+
+
+def precompile(tests_split: list[tuple], args: argparse.Namespace):
+    """
+    build every renoir query of the sweep on a pool of workers, storing the binaries in the backend's cache:
+    measured runs still happen one at a time afterwards, finding the binaries instead of building them
+    """
+    jobs = []
+    for test_class, test_case in tests_split:
+        for processes, file_format in itertools.product(args.processes, args.file_format):
+            jobs.append((test_class, test_case, args.path_suffix, processes, args.cores_per_process, file_format))
+
+    workspace_ids = multiprocessing.Queue()
+    for i in range(args.precompile_workers):
+        workspace_ids.put(i)
+    with multiprocessing.Pool(args.precompile_workers, initializer=init_precompile_worker,
+                              initargs=(workspace_ids,)) as pool:
+        for message in pool.imap_unordered(precompile_once, jobs):
+            print(message)
+
 
+def init_precompile_worker(workspace_ids: multiprocessing.Queue):
+    # each worker builds in its own crate, reused across sweeps
+    use_workspace(f"worker-{workspace_ids.get()}")
+    # compile times of workers building in parallel aren't meaningful
+    os.environ["PERFORM_BENCHMARK"] = "false"
 
-def allow_runs(count: int, p: multiprocessing.Process, conn: multiprocessing.connection.Connection, test_case: str, backend: str, table_origin: str, dir: str):
+
+def precompile_once(job: tuple) -> str:
+    test_class, test_case, path_suffix, processes, cores_per_process, file_format = job
+    try:
+        start_time = time.perf_counter()
+        test_instance: test.TestCompiler = eval(f"{test_class}(\"{test_case}\")")
+        setup_test_instance(test_instance, "renoir", path_suffix, None, processes, cores_per_process, file_format,
+                            reuse_binaries=True)
+        getattr(test_instance, test_case)()
+        ibis.get_backend().build_query(test_instance.query)
+        return f"precompiled - processes: {processes}\tformat: {file_format}\ttime: {time.perf_counter() - start_time:.10f}\tquery: {test_case}"
+    except Exception as e:
+        return f"precompile failed - query: {test_case}\t" + " ".join(traceback.format_exception_only(e)).strip()
+
+
+def allow_runs(count: int, p: multiprocessing.Process, conn: multiprocessing.connection.Connection, test_case: str, backend: str, table_origin: str, dir: str, processes: int = 1,
+               file_format: str = "csv"):
     """
     send messages to worker allowing it to perform run_once, and kill it if it takes too long
     """
@@ -69,6 +144,8 @@ def allow_runs(count: int, p: multiprocessing.Process, conn: multiprocessing.con
             logger = bm.Benchmark(test_case, dir)
             logger.backend_name = backend
             logger.table_origin = table_origin
+            logger.num_processes = processes
+            logger.file_format = file_format
             logger.run_count = i
             logger.exception = "timeout"
             logger.log()
@@ -81,30 +158,29 @@ def allow_runs(count: int, p: multiprocessing.Process, conn: multiprocessing.con
         print("success: " + message)
 
 
-def child_workload(pipe: multiprocessing.connection.Connection, test_class: str, test_case: str, backend: str, table_origin: str, path_suffix: str, runs: int, warmup: int, dir: str):
+def child_workload(pipe: multiprocessing.connection.Connection, test_class: str, test_case: str, backend: str, table_origin: str, path_suffix: str, runs: int, warmup: int, dir: str,
+                   processes: int = 1, cores_per_process: int = None, file_format: str = "csv", compile_once=False, precompiled=False,
+                   dataset_rows: int = -1):
     try:
         test_instance: test.TestCompiler = eval(
             f"{test_class}(\"{test_case}\")")
-        test_instance.benchmark = bm.Benchmark(
-            test_case, dir)
-        test_instance.benchmark.table_origin = table_origin
-
-        # in case the backend is renoir, we leave the default duckdb backend to read the tables to create the AST
-        # otherwise, we load the tables with the desired one
-        test_instance.set_backend(
-            backend, cached=(table_origin == "cached"))
-
-        test_instance.init_benchmark_settings(
-            perform_compilation=(backend == "renoir"))
-
-        test_instance.init_files(file_suffix=path_suffix)
-        test_instance.init_tables()
+        compile_once = compile_once and backend == "renoir"
+        setup_test_instance(test_instance, backend, path_suffix, dir, processes, cores_per_process, file_format,
+                            reuse_binaries=compile_once or precompiled, table_origin=table_origin)
+        test_instance.benchmark.dataset_rows = dataset_rows
 
         # if table origin is cached, we need to pre-load the tables in the backends before submitting the queries
         # otherwise, we measure the time of both loading the table and running the query
         if table_origin == "cached":
             test_instance.preload_tables(backend)
 
+        if compile_once:
+            # build the query before the runs, which then find its binary and only execute it
+            getattr(test_instance, test_case)()
+            cold, warm = ibis.get_backend().compile_times(test_instance.query)
+            test_instance.benchmark.renoir_cold_compile_time_s = cold
+            test_instance.benchmark.renoir_warm_compile_time_s = warm
+
         for i in range(warmup + runs):
             count = i - warmup if i >= warmup else -1
             # wait for permission from main thread
@@ -120,18 +196,59 @@ def child_workload(pipe: multiprocessing.connection.Connection, test_class: str,
         pipe.send((False, trace))
 
 
+def setup_test_instance(test_instance: test.TestCompiler, backend: str, path_suffix: str, dir: str | None, processes: int = 1,
+                        cores_per_process: int = None, file_format: str = "csv", reuse_binaries=False,
+                        table_origin: str = "csv"):
+    """
+    load the files and tables of the test with the given backend, logging its runs to dir unless it's None
+    """
+    if dir is not None:
+        test_instance.benchmark = bm.Benchmark(
+            test_instance._testMethodName, dir)
+        test_instance.benchmark.table_origin = table_origin
+        test_instance.benchmark.num_processes = processes
+        test_instance.benchmark.file_format = file_format
+        test_instance.benchmark.cores_per_process = cores_per_process or -1
+        test_instance.benchmark.path_suffix = path_suffix
+    # keep the default local context unless a specific layout was requested
+    if backend == "renoir" and (processes > 1 or cores_per_process):
+        test_instance.cluster = Cluster.local(processes, cores_per_process)
+    if backend == "polars" and cores_per_process:
+        # read when polars is first imported, which happens when setting the backend
+        os.environ["POLARS_MAX_THREADS"] = str(cores_per_process)
+
+    test_instance.init_files(file_suffix=path_suffix)
+    if file_format == "binary":
+        # other backends and the ibis AST still read the csv, renoir converts it when generating the source
+        test_instance.binary_cache = True
+    elif file_format != "csv":
+        test_instance.files = test_instance.convert_files(file_format)
+
+    test_instance.reuse_binaries = reuse_binaries
+
+    # load the tables with the desired backend: renoir's records the files behind the tables
+    # and compiles the query when it's executed
+    test_instance.set_backend(
+        backend, cached=(table_origin == "cached"))
+    if backend == "duckdb" and cores_per_process:
+        ibis.get_backend().raw_sql(f"SET threads TO {cores_per_process}")
+
+    test_instance.init_benchmark_settings(perform_compilation=False)
+
+    test_instance.init_tables()
+
+
 def run_once(test_case: str, test_instance: test.TestCompiler, run_count: int, backend: str) -> str:
     test_instance.benchmark.run_count = run_count
     test_instance.benchmark.backend_name = backend
 
     start_time = time.perf_counter()
 
-    test_method = getattr(test_instance, test_case)
-    memo = memory_usage((test_method,), include_children=True)
-    # If the backend is renoir, we have already performed the compilation to renoir code and ran it after this line
-
-    if backend != "renoir":
-        memo = memory_usage((test_instance.query.execute,), include_children=True)
+    # the test method only builds the query, which every backend (renoir included) runs when executing it
+    getattr(test_instance, test_case)()
+    # sampled memory of the whole process tree, comparable across backends: renoir also records the exact peak
+    # memory of its build and of its processes alone in separate columns
+    memo = memory_usage((test_instance.query.execute,), include_children=True)
 
     end_time = time.perf_counter()
     total_time = end_time - start_time
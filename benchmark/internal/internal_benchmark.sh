@@ -3,8 +3,13 @@
 # if you want to run the benchmark on a different dataset size, change the path_suffix, otherwise leave ""
 # the git repository only contains the base non-suffixed files, so in case you use this variable you
 # need to generate the extended files first.
-# for nexmark, `cd data/nexmark_data_gen && cargo run -- 10000000`
+# for nexmark, `cd data/nexmark_data_gen && cargo run --release -- 10000000` (events are generated on all cores, `--threads N` to change)
 # for operators, `cd data/operators_data_gen && cargo run -- 10000000` 
+# to compare renoir running as 1..N cooperating processes on localhost, add e.g. `--processes 1 2 4 --cores_per_process 2`
+# to compare reading parquet and arrow ipc files against csv, add `--file_format csv parquet arrow`
+# to compare renoir reading the memory-mapped binary table cache, add `binary` to the file formats
+# to check a change for performance regressions against a previous run, with bootstrapped confidence intervals:
+# `python -m benchmark.internal.compare_logs log/internal/<baseline> log/internal/$1` exits with 1 on a regression
 
 source .venv3.11/bin/activate
 
@@ -1,17 +1,22 @@
 import argparse
-import pandas as pd
 import plotly.express as px
 from plotly.subplots import make_subplots
 from statistics import mode
 
+from codegen.result_store import ResultStore
+
 def main():
     parser = argparse.ArgumentParser(description='Plot summary of internal benchmark run.')
     parser.add_argument('dir', type=str, help='The directory containing the internal benchmark results')
     args = parser.parse_args()
 
     dataset_size = args.dir.split('/')[-1].split('_')[0]
-    file = args.dir + "/codegen_log.csv"
-    df = pd.read_csv(file)
+    df = ResultStore().read(args.dir, source='internal')
+    # renoir runs with multiple processes are plotted as separate backends to compare layouts
+    multi = df['num_processes'] > 1
+    df.loc[multi, 'backend_name'] = df.loc[multi, 'backend_name'] + ' x' + df.loc[multi, 'num_processes'].astype(str)
+    columnar = df['file_format'] != 'csv'
+    df.loc[columnar, 'backend_name'] = df.loc[columnar, 'backend_name'] + ' (' + df.loc[columnar, 'file_format'] + ')'
     agg = df[df['run_count'] != -1].groupby(['test_name', 'backend_name', 'table_origin']).agg({
         'total_time_s': ['mean', 'std'],
         'max_memory_MiB': ['mean', 'std'],
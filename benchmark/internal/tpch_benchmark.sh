@@ -0,0 +1,20 @@
+#!/bin/bash
+
+# TPC-H queries on each scale factor, converted from dbgen output with
+# `cd data/tpc_data_gen && cargo run --release -- ../tpch --suffix _sf<scale factor>` (see its README)
+# polars runs only the queries whose joins and predicates its ibis backend supports
+
+source .venv3.11/bin/activate
+
+for sf in 1 3 10; do
+    python -m benchmark.internal.internal_benchmark \
+        --test_patterns TestTPCH \
+        --runs 3 \
+        --warmup 1 \
+        --table_origin csv \
+        --dir tpch/$1/sf$sf \
+        --backends duckdb polars renoir \
+        --path_suffix _sf$sf \
+    || exit 1
+done
+cp benchmark/internal/tpch_benchmark.sh log/tpch/$1/tpch_benchmark.sh
@@ -0,0 +1,102 @@
+import argparse
+import multiprocessing
+import os
+import subprocess
+from datetime import datetime
+
+import benchmark.discover.load_tests as bench
+import test
+import test.test_nexmark
+import test.test_operators
+from benchmark.internal.internal_benchmark import allow_runs, child_workload
+from codegen import ROOT_DIR
+
+# generator writing the files of each data directory with a given number of rows, as name_<size>.csv
+GENERATORS = {
+    "nexmark": ("nexmark_data_gen", "cargo run --release -- {size}"),
+    "nullable_op": ("operator_data_gen", "bash nullable_op_data_gen.sh {size}"),
+    "non_nullable_op": ("operator_data_gen", "bash non_nullable_op_data_gen.sh {size}"),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser("ibis-renoir-scaling")
+    parser.add_argument("--test_patterns",
+                        help="Pattern to select which tests to run among those discoverable by unittest. By default all are included",
+                        default=[""], type=str, nargs='+')
+    parser.add_argument("--sizes",
+                        help="Numbers of rows of the generated datasets, each read through the path suffix _<size>. \
+                              Missing datasets are generated before running the queries over them.",
+                        type=int, nargs='+', default=[10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--cores",
+                        help="Parallelism levels to compare: cores of the renoir process and threads of duckdb and polars. \
+                              Flink always uses its default parallelism.",
+                        type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument("--backends",
+                        help="List of backends to use among duckdb, flink, polars, renoir. Defaults to all.",
+                        type=str, nargs='+', default=["duckdb", "flink", "polars", "renoir"])
+    parser.add_argument("--runs",
+                        help="Number of runs to perform for each test, size and parallelism. Defaults to 5",
+                        type=int, default=5)
+    parser.add_argument("--warmup",
+                        help="Number of warmup runs to perform for each test, size and parallelism. Defaults to 1",
+                        type=int, default=1)
+    parser.add_argument("--dir",
+                        help="Where to store the log file. Defaults to directory from timestamp.",
+                        type=str, default="scaling/" + datetime.now().strftime("%Y-%m-%d_%H:%M:%S"))
+    args = parser.parse_args()
+
+    tests_full = [t for t in bench.main() if any(
+        pat in t for pat in args.test_patterns)]
+    tests_split: list[tuple] = [t.rsplit(".", 1) for t in tests_full]
+
+    for test_class, test_case in tests_split:
+        for size in args.sizes:
+            files = ensure_dataset(test_class, test_case, size)
+            rows = sum(count_rows(f) for f in files)
+            for backend in args.backends:
+                levels = args.cores if backend != "flink" else [None]
+                for cores in levels:
+                    main, worker = multiprocessing.Pipe(duplex=True)
+                    p = multiprocessing.Process(target=child_workload, args=(
+                        worker, test_class, test_case, backend, "csv", f"_{size}", args.runs, args.warmup, args.dir,
+                        1, cores, "csv", False, False, rows))
+                    p.start()
+                    allow_runs(args.warmup + args.runs, p, main, test_case, backend, "csv", args.dir)
+                    p.join()
+
+
+def ensure_dataset(test_class: str, test_case: str, size: int) -> list[str]:
+    """
+    paths of the files read by the test with the given number of rows, generating those that don't exist yet
+    """
+    test_instance: test.TestCompiler = eval(f"{test_class}(\"{test_case}\")")
+    test_instance.init_files(file_suffix=f"_{size}")
+    files = list(test_instance.files.values())
+    for data_dir in {os.path.basename(os.path.dirname(f)) for f in files if not os.path.isfile(f)}:
+        generator, command = GENERATORS[data_dir]
+        print(f"generating {data_dir} with {size} rows")
+        subprocess.run(command.format(size=size), shell=True, check=True, cwd=f"{ROOT_DIR}/data/{generator}",
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return files
+
+
+def count_rows(path: str) -> int:
+    # counted once and stored next to the file, as large files take a while to scan
+    count_path = path + ".rows"
+    if os.path.isfile(count_path) and os.path.getmtime(count_path) >= os.path.getmtime(path):
+        with open(count_path) as f:
+            return int(f.read())
+    rows = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 24), b""):
+            rows += block.count(b"\n")
+    # without the header
+    rows = max(rows - 1, 0)
+    with open(count_path, "w") as f:
+        f.write(str(rows))
+    return rows
+
+
+if __name__ == "__main__":
+    main()
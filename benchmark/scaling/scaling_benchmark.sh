@@ -0,0 +1,17 @@
+#!/bin/bash
+
+# datasets with the given numbers of rows are generated in data/ before the first query reading them,
+# each query is then run for every size and parallelism level: plot with
+# `python -m benchmark.scaling.scaling_plot log/scaling/$1`
+
+source .venv3.11/bin/activate
+
+python -m benchmark.scaling.scaling_benchmark \
+    --test_patterns TestNullable TestNexmark \
+    --sizes 10000 100000 1000000 10000000 \
+    --cores 1 2 4 8 \
+    --runs 3 \
+    --warmup 1 \
+    --dir scaling/$1 \
+    --backends duckdb polars flink renoir \
+&& cp benchmark/scaling/scaling_benchmark.sh log/scaling/$1/scaling_benchmark.sh
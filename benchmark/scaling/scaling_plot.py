@@ -0,0 +1,85 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from codegen.result_store import ResultStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Plot throughput and scaling curves of a scaling benchmark run.')
+    parser.add_argument('dir', type=str, help='The directory containing the scaling benchmark results')
+    args = parser.parse_args()
+
+    df = ResultStore().read(args.dir, source='internal')
+    df = df[(df['run_count'] != -1) & (df['dataset_rows'] > 0) & (df['exception'] == 'None')]
+    agg = df.groupby(['test_name', 'backend_name', 'dataset_rows', 'cores_per_process']).agg({
+        'total_time_s': 'mean',
+        'renoir_compile_time_s': 'mean',
+        'renoir_execute_time_s': 'mean',
+    }).reset_index()
+    agg['rows_s'] = agg['dataset_rows'] / agg['total_time_s']
+    # renoir without the compilation, as when reusing the binary
+    renoir = agg['backend_name'] == 'renoir'
+    agg.loc[renoir, 'execute_rows_s'] = agg.loc[renoir, 'dataset_rows'] / agg.loc[renoir, 'renoir_execute_time_s']
+
+    # speedup and efficiency against the lowest parallelism of each backend on the same query and dataset
+    base = agg.groupby(['test_name', 'backend_name', 'dataset_rows'])['cores_per_process'].transform('min')
+    base_time = agg[agg['cores_per_process'] == base].set_index(
+        ['test_name', 'backend_name', 'dataset_rows'])['total_time_s']
+    agg['speedup'] = base_time.reindex(
+        pd.MultiIndex.from_frame(agg[['test_name', 'backend_name', 'dataset_rows']])).values / agg['total_time_s']
+    agg['efficiency'] = agg['speedup'] * base / agg['cores_per_process']
+
+    throughput = px.line(agg.sort_values('dataset_rows'), x='dataset_rows', y='rows_s', color='backend_name',
+                         line_dash='cores_per_process', facet_col='test_name', facet_col_wrap=3, markers=True,
+                         log_x=True, log_y=True,
+                         labels={'dataset_rows': 'Rows', 'rows_s': 'Rows/s', 'backend_name': 'Backend',
+                                 'cores_per_process': 'Cores'},
+                         title='Throughput by Dataset Size')
+    throughput.show()
+
+    largest = agg[agg['dataset_rows'] == agg.groupby('test_name')['dataset_rows'].transform('max')]
+    speedup = px.line(largest.sort_values('cores_per_process'), x='cores_per_process', y='speedup',
+                      color='backend_name', facet_col='test_name', facet_col_wrap=3, markers=True,
+                      hover_data=['efficiency'],
+                      labels={'cores_per_process': 'Cores', 'speedup': 'Speedup', 'backend_name': 'Backend'},
+                      title='Speedup on the Largest Dataset')
+    speedup.show()
+
+    crossover = find_crossover(agg)
+    print(crossover.to_string(index=False))
+
+
+def find_crossover(agg: pd.DataFrame) -> pd.DataFrame:
+    """
+    dataset size from which renoir's total time, compilation included, is below each other backend at the same
+    parallelism: the smallest measured size where it is, and the break-even extrapolated by fitting time as a
+    linear function of rows, where the compilation is paid back by the lower cost of each row
+    """
+    result = []
+    for (test_name, cores), group in agg.groupby(['test_name', 'cores_per_process']):
+        renoir = group[group['backend_name'] == 'renoir'].set_index('dataset_rows').sort_index()
+        if len(renoir) == 0:
+            continue
+        renoir_fit = np.polyfit(renoir.index, renoir['renoir_execute_time_s'], 1) if len(renoir) > 1 else None
+        compile_s = renoir['renoir_compile_time_s'].mean()
+        for backend, other in group[group['backend_name'] != 'renoir'].groupby('backend_name'):
+            other = other.set_index('dataset_rows').sort_index()
+            sizes = renoir.index.intersection(other.index)
+            faster = [s for s in sizes if renoir.loc[s, 'total_time_s'] < other.loc[s, 'total_time_s']]
+            break_even = np.nan
+            if renoir_fit is not None and len(other) > 1:
+                other_fit = np.polyfit(other.index, other['total_time_s'], 1)
+                per_row_gain = other_fit[0] - renoir_fit[0]
+                if per_row_gain > 0:
+                    break_even = (compile_s + renoir_fit[1] - other_fit[1]) / per_row_gain
+            result.append({'test_name': test_name, 'cores': cores, 'backend': backend,
+                           'observed_crossover_rows': min(faster) if faster else np.nan,
+                           'estimated_break_even_rows': max(break_even, 0)})
+    return pd.DataFrame(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,8 @@
 from .generator import compile_ibis_to_noir, Benchmark
 from .utils import ROOT_DIR
+from .results import read_result, read_result_table
+from .explain import explain, explain_analyze
+from .backend import Backend, register
+
+# makes ibis.renoir available as soon as codegen is imported
+register()
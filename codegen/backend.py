@@ -0,0 +1,230 @@
+import os
+import shutil
+import time
+import types
+from typing import Any, Mapping
+
+import ibis
+import ibis.backends.duckdb
+import ibis.expr.operations as ops
+import ibis.expr.types as ir
+import pyarrow as pa
+import pyarrow.ipc
+from sqlglot.dialects.duckdb import DuckDB
+
+import codegen.utils as utl
+from codegen.benchmark import Benchmark
+from codegen.cluster import Cluster
+from codegen.generator import (binary_path, build_noir_code, generate_noir_code, logical_plan, run_noir_binary,
+                               source_fingerprint)
+from codegen.logical import LogicalPlan
+from codegen.results import cast_widened, read_result_table
+
+
+class Renoir(DuckDB):
+    # duckdb backend uses its name as sql dialect, sqlglot registers dialects by their lowercase class name
+    pass
+
+
+class Backend(ibis.backends.duckdb.Backend):
+    """
+    Ibis backend running queries with renoir: tables are read through an in-memory duckdb connection, used to build
+    the query AST, which remembers the file behind each table so that executing a query generates the renoir code
+    reading the same files, builds it and runs it, returning its arrow output.
+    Binaries are cached by the hash of the generated code, so re-running a query with the same plan skips cargo,
+    and reused for queries with the same logical plan, so running one again skips generating its code too
+    """
+    name = "renoir"
+    cache_dir = utl.ROOT_DIR + "/noir_template/target/renoir-cache"
+
+    def do_connect(self, database: str = ":memory:", cluster: Cluster = None, binary_cache=False,
+                   cache_binaries=True, benchmark: Benchmark = None, **kwargs) -> None:
+        """
+        Create an ibis client that runs queries with renoir.
+
+        Parameters
+        ----------
+        database
+            Path to the duckdb database used to read the tables, in memory by default.
+        cluster
+            Deployment of the generated binary, a single local process using all cores by default.
+        binary_cache
+            Read csv tables through their memory-mapped binary copy.
+        cache_binaries
+            Reuse the binary built for a previous query with the same generated code.
+        benchmark
+            Where to record the compile and execute times of each query.
+        """
+        super().do_connect(database, **kwargs)
+        self.cluster = cluster
+        self.binary_cache = binary_cache
+        self.cache_binaries = cache_binaries
+        self.benchmark = benchmark
+        # file read for each table, by table name
+        self.files: dict[str, str] = {}
+        # binary built for each logical plan, by its fingerprint, when reusing binaries: the settings that also
+        # shape the code (cluster, binary cache, output format) are the same for all queries of a backend
+        self.compiled: dict[str, str] = {}
+
+    def read_csv(self, source_list: str | list[str] | tuple[str], table_name: str | None = None, **kwargs: Any) -> ir.Table:
+        table = super().read_csv(source_list, table_name, **kwargs)
+        self.files[table.get_name()] = self.source_path(source_list)
+        return table
+
+    def read_parquet(self, source_list: str | list[str], table_name: str | None = None, **kwargs: Any) -> ir.Table:
+        table = super().read_parquet(source_list, table_name, **kwargs)
+        self.files[table.get_name()] = self.source_path(source_list)
+        return table
+
+    def read_arrow(self, path: str, table_name: str | None = None) -> ir.Table:
+        # duckdb can't read arrow ipc files, so the table is kept in memory just to build the AST
+        table = ibis.memtable(pyarrow.ipc.open_file(path).read_all(), name=table_name)
+        self.files[table.get_name()] = os.path.abspath(path)
+        return table
+
+    @staticmethod
+    def source_path(source_list: str | list[str] | tuple[str]) -> str:
+        # multiple files are read by renoir through a glob, and generated code needs paths within the repo
+        if not isinstance(source_list, str):
+            if len(source_list) != 1:
+                raise NotImplementedError("Renoir reads multiple files with a glob, not a list of paths!")
+            source_list = source_list[0]
+        return os.path.abspath(source_list)
+
+    def execute(self, expr: ir.Expr, params: Mapping[ir.Scalar, Any] | None = None, limit: str = "default", **kwargs: Any):
+        table = self.to_pyarrow(expr, params=params, limit=limit)
+        df = table.to_pandas()
+        if isinstance(expr, ir.Table):
+            return df
+        if isinstance(expr, ir.Column):
+            return df.iloc[:, 0]
+        return df.iat[0, 0]
+
+    def to_pyarrow(self, expr: ir.Expr, *, params: Mapping[ir.Scalar, Any] | None = None,
+                   limit: int | str | None = None, **_: Any) -> pa.Table:
+        if params:
+            raise NotImplementedError("Renoir backend doesn't support query parameters!")
+        table = self.run(expr.as_table())
+        if isinstance(limit, int):
+            table = table.slice(0, limit)
+        return table
+
+    def to_pyarrow_batches(self, expr: ir.Expr, *, params: Mapping[ir.Scalar, Any] | None = None,
+                           limit: int | str | None = None, chunk_size: int = 1_000_000, **_: Any) -> pa.RecordBatchReader:
+        table = self.to_pyarrow(expr, params=params, limit=limit)
+        return pa.RecordBatchReader.from_batches(table.schema, table.to_batches(max_chunksize=chunk_size))
+
+    def run(self, query: ir.Table) -> pa.Table:
+        plan = self.plan_fingerprint(query) if self.cache_binaries else None
+        if plan in self.compiled:
+            # same plan as a query before, even if built from other tables of the same files: only measure its execution
+            binary = self.compiled[plan]
+            if self.benchmark:
+                self.benchmark.renoir_compile_time_s = 0
+        else:
+            binary = self.build_query(query)
+
+        if self.benchmark:
+            start_time = time.perf_counter()
+        return_code, execute_peak_rss = run_noir_binary(binary, self.cluster)
+        if return_code != 0:
+            raise Exception("Noir code panicked!")
+        if self.benchmark:
+            self.benchmark.renoir_execute_time_s = time.perf_counter() - start_time
+            self.benchmark.renoir_execute_max_memory_MiB = execute_peak_rss
+
+        # renoir can output additional columns, and in a different order
+        table = read_result_table()
+        table = table.select([c for c in query.schema().names if c in table.column_names])
+        return cast_widened(table, query.schema())
+
+    def build_query(self, query: ir.Table) -> str:
+        """
+        generate and build the code of the query, returning the path of its binary
+        """
+        if self.benchmark:
+            start_time = time.perf_counter()
+        self.generate(query)
+        binary, compile_peak_rss = self.build()
+        if self.benchmark:
+            self.benchmark.renoir_compile_time_s = time.perf_counter() - start_time
+            self.benchmark.renoir_compile_max_memory_MiB = compile_peak_rss
+        if self.cache_binaries:
+            self.compiled[LogicalPlan.last.fingerprint()] = binary
+        return binary
+
+    def compile_times(self, query: ir.Table) -> tuple[float, float]:
+        """
+        build the query ignoring cached binaries and return the time of its first build (cold, with only renoir
+        and the other dependencies already built) and of rebuilding the same code (warm, reusing the incremental
+        compilation cache of the first build)
+        """
+        self.generate(query)
+        start_time = time.perf_counter()
+        build_noir_code()
+        cold = time.perf_counter() - start_time
+
+        # cargo would otherwise consider the binary up to date
+        os.utime(utl.CRATE_DIR + "/src/main.rs")
+        start_time = time.perf_counter()
+        build_noir_code()
+        warm = time.perf_counter() - start_time
+
+        if self.cache_binaries:
+            cached = f"{self.cache_dir}/{source_fingerprint()}/noir-template"
+            self.store_binary(cached)
+            self.compiled[LogicalPlan.last.fingerprint()] = cached
+        return cold, warm
+
+    def generate(self, query: ir.Table):
+        generate_noir_code(self.files_tables(query), query, render_query_graph=False, cluster=self.cluster,
+                           binary_cache=self.binary_cache, output_format="arrow")
+
+    def plan_fingerprint(self, query: ir.Table) -> str:
+        return logical_plan(self.files_tables(query), query).fingerprint()
+
+    def files_tables(self, query: ir.Table) -> list[tuple[str, ir.Table]]:
+        files_tables = []
+        for node in query.op().find(ops.PhysicalTable):
+            if node.name not in self.files:
+                raise ValueError(f"Table {node.name} was not read from a file through the renoir backend!")
+            files_tables.append((self.files[node.name], node.to_expr()))
+        return files_tables
+
+    def build(self) -> tuple[str, float]:
+        """
+        returns the path of the binary and the peak memory in MiB of building it, -1 when it was cached
+        """
+        if not self.cache_binaries:
+            return binary_path(), build_noir_code()
+        cached = f"{self.cache_dir}/{source_fingerprint()}/noir-template"
+        peak_rss = -1
+        if not os.path.isfile(cached):
+            peak_rss = build_noir_code()
+            self.store_binary(cached)
+        return cached, peak_rss
+
+    @staticmethod
+    def store_binary(cached: str):
+        # copy and rename, as processes building in parallel could store the same binary
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        tmp_path = f"{cached}.{os.getpid()}.tmp"
+        shutil.copy2(binary_path(), tmp_path)
+        os.replace(tmp_path, cached)
+
+
+def register():
+    """
+    expose the backend as `ibis.renoir`, like ibis does for backends installed through entry points,
+    so that it can also be selected with `ibis.set_backend("renoir")`
+    """
+    backend = Backend()
+
+    def connect(*args, **kwargs):
+        return backend.connect(*args, **kwargs)
+
+    connect.__doc__ = backend.do_connect.__doc__
+    proxy = types.ModuleType(f"ibis.{Backend.name}")
+    proxy.connect = connect
+    proxy.name = Backend.name
+    setattr(ibis, Backend.name, proxy)
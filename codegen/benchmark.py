@@ -1,7 +1,4 @@
-import logging
-import codegen.utils as utl
-import os.path
-from datetime import datetime
+from codegen.result_store import ResultStore
 
 
 class Benchmark:
@@ -12,52 +9,33 @@ class Benchmark:
         self.total_time_s = -1
         self.renoir_compile_time_s = -1
         self.renoir_execute_time_s = -1
+        # when compiling once before the runs: first build of the query and rebuild of the same code
+        self.renoir_cold_compile_time_s = -1
+        self.renoir_warm_compile_time_s = -1
         self.ibis_time_s = -1
         self.max_memory_MiB = -1
+        # exact peak resident memory of the renoir build and of the renoir processes alone
+        self.renoir_compile_max_memory_MiB = -1
+        self.renoir_execute_max_memory_MiB = -1
         self.table_origin = "None"
+        self.num_processes = 1
+        # cores each process of the backend can use, -1 when not limited
+        self.cores_per_process = -1
+        # rows in the input files of the query, when measuring scaling
+        self.dataset_rows = -1
+        # suffix of the input files, e.g. _10000000 for the larger generated datasets
+        self.path_suffix = ""
+        self.file_format = "csv"
+        # rows per second emitted by renoir's continuous sink
+        self.throughput_rows_s = -1
+        # end-to-end latency percentiles of output rows, when measuring latency
+        self.latency_p50_ms = -1
+        self.latency_p99_ms = -1
+        self.latency_p999_ms = -1
         self.exception = "None"
-        self.logger = setup_logger(dir, self)
+        # benchmark run the results are stored under
+        self.dir = dir
 
     def log(self):
-        message = ""
-        for attr, val in self.__dict__.items():
-            if attr == "logger":
-                continue
-            message += f"{val},"
-        message = message[:-1]
-        self.logger.info(message)
-
-
-def setup_logger(dir, bench: Benchmark) -> logging.Logger:
-    name = f"{dir}/codegen_log" if dir else "codegen_log"
-    logger = logging.getLogger(name)
-    file = utl.ROOT_DIR + f"/log/{name}.csv"
-    if not os.path.isfile(file):
-        os.makedirs(os.path.dirname(file), exist_ok=True)
-        header = "level,timestamp,"
-        for attr in bench.__dict__.keys():
-            if attr == "logger":
-                continue
-            header += f"{attr},"
-        header = header[:-1]
-        with open(file, "w") as f:
-            f.write(header + "\n")
-    if not logger.hasHandlers():
-        handler = logging.FileHandler(file, mode='a')
-        handler.setFormatter(CustomFormatter(
-            "%(levelname)s,%(asctime)s,%(message)s"))
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
-    return logger
-
-
-class CustomFormatter(logging.Formatter):
-    converter = datetime.fromtimestamp
-
-    def formatTime(self, record, datefmt=None):
-        ct = self.converter(record.created)
-        if datefmt:
-            s = ct.strftime(datefmt)
-            return s
-        else:
-            return ct.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        row = {attr: val for attr, val in self.__dict__.items() if attr != "dir"}
+        ResultStore().append(self.dir, "internal", [row])
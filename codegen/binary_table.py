@@ -0,0 +1,113 @@
+"""
+Column-oriented binary copy of a csv table, memory-mapped by the generated renoir code (noir_template/binary.rs).
+All integers are little endian u64 and every section starts at a multiple of 8 bytes:
+
+    magic | num_rows | num_cols | num_cols * (name_offset, name_len, type, data_offset) | names
+    column data: validity (one byte per row) followed by
+        - integers, booleans and float64: num_rows fixed-width values, integers and booleans as int64
+        - string: num_rows + 1 offsets into the utf-8 bytes that follow them
+"""
+
+import os
+import struct
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv
+
+MAGIC = b"RNRBIN01"
+EXTENSION = ".rbin"
+# dates are stored as their yyyy-mm-dd string, as they are represented in the generated structs, and narrower
+# integers widened to int64, cast back to the type of their field when read
+TYPE_CODES = {"Int64": 0, "Int32": 0, "Int16": 0, "Int8": 0, "Float64": 1, "String": 2, "Date": 2, "Boolean": 3}
+ARROW_TYPES = {"Int64": pa.int64(), "Int32": pa.int64(), "Int16": pa.int64(), "Int8": pa.int64(),
+               "Float64": pa.float64(), "String": pa.large_string(), "Date": pa.large_string(), "Boolean": pa.bool_()}
+
+
+def cache_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + EXTENSION
+
+
+def is_cache_valid(csv_path: str, cols_types: dict) -> bool:
+    path = cache_path(csv_path)
+    if not os.path.isfile(path) or os.path.getmtime(path) < os.path.getmtime(csv_path):
+        return False
+    try:
+        return read_header(path) == [(c, TYPE_CODES[t.name]) for c, t in cols_types.items()]
+    except (ValueError, struct.error):
+        return False
+
+
+def ensure_cache(csv_path: str, cols_types: dict) -> str:
+    """
+    convert the csv to the binary format on first use, or when the csv or the expected schema changed
+    """
+    if not is_cache_valid(csv_path, cols_types):
+        write_table(csv_path, cache_path(csv_path), cols_types)
+    return cache_path(csv_path)
+
+
+def read_header(path: str) -> list[tuple[str, int]]:
+    with open(path, "rb") as f:
+        if f.read(8) != MAGIC:
+            raise ValueError(f"{path} is not a binary table!")
+        _, num_cols = struct.unpack("<QQ", f.read(16))
+        entries = [struct.unpack("<QQQQ", f.read(32)) for _ in range(num_cols)]
+        columns = []
+        for name_offset, name_len, typ, _ in entries:
+            f.seek(name_offset)
+            columns.append((f.read(name_len).decode(), typ))
+        return columns
+
+
+def write_table(csv_path: str, path: str, cols_types: dict):
+    convert = pyarrow.csv.ConvertOptions(column_types={c: ARROW_TYPES[t.name] for c, t in cols_types.items()},
+                                         include_columns=list(cols_types.keys()))
+    table = pyarrow.csv.read_csv(csv_path, convert_options=convert)
+    num_rows = table.num_rows
+
+    names = [c.encode() for c in cols_types]
+    header_len = 24 + 32 * len(names)
+    names_len = sum(len(n) for n in names)
+    offset = align(header_len + names_len)
+
+    sections = []
+    entries = []
+    name_offset = header_len
+    for (col, typ), name in zip(cols_types.items(), names):
+        data = column_bytes(table.column(col).combine_chunks(), typ.name)
+        entries.append((name_offset, len(name), TYPE_CODES[typ.name], offset))
+        sections.append((offset, data))
+        name_offset += len(name)
+        offset = align(offset + len(data))
+
+    # write to a temporary file and rename, so concurrent runs never map a partially written table
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<QQ", num_rows, len(names)))
+        for entry in entries:
+            f.write(struct.pack("<QQQQ", *entry))
+        for name in names:
+            f.write(name)
+        for start, data in sections:
+            f.write(b"\0" * (start - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
+def column_bytes(column: pa.Array, type_name: str) -> bytes:
+    validity = np.asarray(column.is_valid(), dtype=np.uint8).tobytes()
+    validity += b"\0" * (align(len(validity)) - len(validity))
+    if TYPE_CODES[type_name] == TYPE_CODES["String"]:
+        _, offsets, data = column.buffers()
+        offsets = np.frombuffer(offsets, dtype="<i8", count=len(column) + 1) if offsets else np.zeros(1, dtype="<i8")
+        values = data.to_pybytes()[:offsets[-1]] if data else b""
+        return validity + offsets.astype("<u8").tobytes() + values
+    if type_name == "Boolean":
+        column = column.cast(pa.int64())
+    dtype = "<f8" if type_name == "Float64" else "<i8"
+    return validity + np.asarray(column.fill_null(0).to_numpy(zero_copy_only=False), dtype=dtype).tobytes()
+
+
+def align(n: int) -> int:
+    return (n + 7) // 8 * 8
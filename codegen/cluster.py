@@ -0,0 +1,110 @@
+import os
+import signal
+import subprocess
+import time
+
+import codegen.utils as utl
+
+# renoir reads the id of the current process within the remote config from this variable:
+# when it's set, the binary doesn't try to spawn the other hosts through ssh but just joins the cluster
+HOST_ID_ENV_VAR = "RENOIR_HOST_ID"
+LOCAL_ADDRESSES = ("localhost", "127.0.0.1")
+
+
+class Host:
+    def __init__(self, address: str, num_cores: int, base_port: int):
+        self.address = address
+        self.num_cores = num_cores
+        self.base_port = base_port
+
+    def generate(self) -> str:
+        return (f"[[host]]\n"
+                f"address = \"{self.address}\"\n"
+                f"base_port = {self.base_port}\n"
+                f"num_cores = {self.num_cores}\n")
+
+
+class Cluster:
+    """
+    Describes how the generated renoir binary is deployed: a single process with a fixed number of cores
+    uses renoir's local runtime, while multiple hosts use renoir's remote runtime, with one process per host
+    communicating over TCP
+    """
+    config_file = "renoir-cluster.toml"
+
+    def __init__(self, hosts: list[Host]):
+        if not hosts:
+            raise ValueError("A cluster needs at least one host!")
+        self.hosts = hosts
+
+    @classmethod
+    def local(cls, processes: int = 1, cores_per_process: int = None, base_port: int = 9500, port_stride: int = 500):
+        # all processes share the same machine, so they need non-overlapping port ranges on the loopback interface,
+        # and at least one core each when there are more processes than cores
+        if not cores_per_process:
+            cores_per_process = max((os.cpu_count() or 1) // processes, 1)
+        return cls([Host("127.0.0.1", cores_per_process, base_port + i * port_stride) for i in range(processes)])
+
+    @property
+    def is_remote(self) -> bool:
+        return len(self.hosts) > 1
+
+    @property
+    def num_processes(self) -> int:
+        return len(self.hosts)
+
+    @property
+    def config_path(self) -> str:
+        return utl.OUT_DIR + "/" + self.config_file
+
+    def context_init(self) -> str:
+        # generated binary is run from noir_template, so the config path is relative to it
+        if self.is_remote:
+            return f"StreamContext::new(RuntimeConfig::remote(\"../out/{self.config_file}\").unwrap())"
+        return f"StreamContext::new(RuntimeConfig::local({self.hosts[0].num_cores}).unwrap())"
+
+    def generate(self) -> str:
+        return "\n".join(h.generate() for h in self.hosts)
+
+    def write_config(self):
+        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+        with open(self.config_path, "w") as f:
+            f.write(self.generate())
+
+    def run(self, binary: str, cwd: str) -> tuple[int, float]:
+        """
+        launch one process of the binary for each host and wait for all of them: if any fails the others are
+        killed, as they would otherwise wait forever for the missing peer.
+        Returns the exit code and the highest peak resident memory in MiB among the processes
+        """
+        if not self.is_remote:
+            process = utl.popen_peak_rss([binary], cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            peak_rss = utl.wait_peak_rss(process)
+            return process.returncode, peak_rss
+
+        if any(h.address not in LOCAL_ADDRESSES for h in self.hosts):
+            raise ValueError("Only clusters of processes on localhost can be launched directly!")
+        self.write_config()
+        processes = []
+        for host_id in range(len(self.hosts)):
+            env = dict(os.environ, **{HOST_ID_ENV_VAR: str(host_id)})
+            processes.append(utl.popen_peak_rss([binary], cwd=cwd, env=env,
+                                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+
+        running = list(processes)
+        peak_rss = 0
+        while running:
+            for p in list(running):
+                p_peak_rss = utl.wait_peak_rss(p, block=False)
+                if p_peak_rss is None:
+                    continue
+                running.remove(p)
+                peak_rss = max(peak_rss, p_peak_rss)
+                if p.returncode != 0:
+                    for other in running:
+                        # kill both the launcher and the binary
+                        os.killpg(other.pid, signal.SIGKILL)
+                        utl.wait_peak_rss(other)
+                    return p.returncode, peak_rss
+            time.sleep(0.01)
+        return 0, peak_rss
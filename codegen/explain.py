@@ -0,0 +1,51 @@
+from html import escape
+from typing import TYPE_CHECKING
+
+from ibis.expr.types import Table
+
+import codegen.utils as utl
+from codegen.generator import logical_plan, post_order
+from codegen.results import read_explain
+
+if TYPE_CHECKING:
+    import graphviz as gv
+
+
+def explain(query: Table, files_tables: list[tuple[str, Table]] = ()) -> str:
+    """
+    text of the optimized logical plan the code of the query would be generated from, without generating it:
+    each node with its parameters, the schema of its rows where it changes, and their keys and partitioning.
+    Sources are named after the files of their tables, when given as to compile_ibis_to_noir
+    """
+    return logical_plan(files_tables, query).explain()
+
+
+def explain_analyze(query: Table, render=True) -> "gv.Digraph":
+    """
+    lay the counters of the last run onto the plan rendered by ibis: each node lists the renoir operators
+    generated from it, with the rows entering and leaving them and the time rows spent in them.
+    The query must be the one last compiled with explain=True and run
+    """
+    # graphviz is imported when rendering, not with the compiler
+    from ibis.expr.visualize import get_label, to_graph
+
+    plan = post_order(query.op())
+    counters = read_explain()
+    total_ns = max(counters["time_ns"].sum(), 1)
+
+    graph = to_graph(query)
+    for plan_index, ops in counters.groupby("plan_index"):
+        node = plan[plan_index]
+        lines = ""
+        for _, op in ops.iterrows():
+            rows_in = "-" if op["operator"] == "DatabaseOperator" else op["rows_in"]
+            lines += (f'<BR ALIGN="LEFT" /><FONT COLOR="blue">{escape(op["operator"])}: '
+                      f'{rows_in} &#8594; {op["rows_out"]} rows, {op["time_ns"] / 1e6:.3f} ms</FONT>')
+        # nodes declared again keep their edges and take the new attributes
+        share = ops["time_ns"].sum() / total_ns
+        graph.node(str(hash(node)), label=get_label(node)[:-1] + lines + ">",
+                   style="filled", fillcolor=f"0.0 {share:.3f} 1.0")
+
+    if render:
+        graph.render(utl.OUT_DIR + "/explain")
+    return graph
@@ -1,14 +1,26 @@
+import glob
+import hashlib
 import os
+import shutil
 import subprocess
 import time
 
 from ibis.common.graph import Node
 from ibis.expr.operations import PhysicalTable
-from ibis.expr.visualize import to_graph
 from codegen.benchmark import Benchmark
+from codegen.cluster import Cluster
 
+import codegen.trace as trc
+import codegen.logical as lgc
 import codegen.utils as utl
-from codegen.operators import Operator
+from codegen.operators import DatabaseOperator, Operator
+from codegen.results import EXPLAIN_PREFIX, LATENCY_PREFIX, latency_percentiles, sustained_throughput
+from codegen.sources import Source
+from codegen.struct import Struct
+
+
+def binary_path() -> str:
+    return utl.CRATE_DIR + "/target/release/noir-template"
 
 
 def compile_ibis_to_noir(files_tables: list[tuple[str, PhysicalTable]],
@@ -16,69 +28,226 @@ def compile_ibis_to_noir(files_tables: list[tuple[str, PhysicalTable]],
                          run_after_gen=True,
                          print_output_to_file=True,
                          render_query_graph=True,
-                         benchmark: Benchmark = None):
+                         benchmark: Benchmark = None,
+                         cluster: Cluster = None,
+                         binary_cache=False,
+                         output_format="csv",
+                         measure_latency=False,
+                         explain=False,
+                         trace=False):
+
+    if trace:
+        # spans are written to out/trace.json after running, or can be written with codegen.trace.write()
+        trc.start()
 
     if benchmark:
         start_time = time.perf_counter()
 
-    for file, table in files_tables:
-        utl.TAB_FILES[str(table._arg.name)] = file
-
-    if render_query_graph:
-        to_graph(query).render(utl.ROOT_DIR + "/out/query")
-        subprocess.run(f"open {utl.ROOT_DIR}/out/query.pdf", shell=True)
-
-    post_order_dfs(query.op())
-    Operator.print_output_to_file = print_output_to_file
-    gen_noir_code()
-
-    if subprocess.run(f"cd {utl.ROOT_DIR}/noir_template && cargo-fmt > /dev/null 2>&1 && cargo build --release > /dev/null 2>&1", shell=True).returncode != 0:
-        raise Exception("Failed to compile generated noir code!")
+    generate_noir_code(files_tables, query, print_output_to_file, render_query_graph,
+                       cluster, binary_cache, output_format, measure_latency, explain, trace)
+    with trc.span("cargo build", "cargo"):
+        compile_peak_rss = build_noir_code()
 
     if benchmark:
         end_time = time.perf_counter()
         benchmark.renoir_compile_time_s = end_time - start_time
+        benchmark.renoir_compile_max_memory_MiB = compile_peak_rss
 
     if run_after_gen:
+        # histograms and counters of previous runs could have been written by a different number of processes
+        for prefix in (f"{LATENCY_PREFIX}*.csv", f"{EXPLAIN_PREFIX}*.json", f"{trc.TRACE_PREFIX}*.json"):
+            for file in glob.glob(f"{utl.OUT_DIR}/{prefix}"):
+                os.remove(file)
         if benchmark:
             start_time = time.perf_counter()
-        # add options to print renoir output: capture_output = True, text = True
-        if subprocess.run(f"cd {utl.ROOT_DIR}/noir_template && cargo run --release > /dev/null 2>&1", shell=True).returncode != 0:
+        with trc.span("run", "renoir"):
+            # the built binary is launched directly instead of through cargo run, so that neither its startup
+            # nor its memory add to those of the query
+            return_code, execute_peak_rss = run_noir_binary(binary_path(), cluster)
+        if return_code != 0:
             raise Exception("Noir code panicked!")
         if benchmark:
             end_time = time.perf_counter()
             benchmark.renoir_execute_time_s = end_time - start_time
+            benchmark.renoir_execute_max_memory_MiB = execute_peak_rss
+            if output_format == "stream":
+                benchmark.throughput_rows_s = sustained_throughput()
+            if measure_latency:
+                percentiles = latency_percentiles((50, 99, 99.9))
+                benchmark.latency_p50_ms = percentiles[50]
+                benchmark.latency_p99_ms = percentiles[99]
+                benchmark.latency_p999_ms = percentiles[99.9]
+        if trace:
+            trc.write()
+
+    trc.stop()
+
+
+def generate_noir_code(files_tables: list[tuple[str, PhysicalTable]],
+                       query: PhysicalTable,
+                       print_output_to_file=True,
+                       render_query_graph=True,
+                       cluster: Cluster = None,
+                       binary_cache=False,
+                       output_format="csv",
+                       measure_latency=False,
+                       explain=False,
+                       trace=False):
+    with trc.span("generate"):
+        # operators and structs left by a generation that failed halfway
+        Operator.cleanup()
+        Struct.cleanup()
+        register_files(files_tables)
+
+        if render_query_graph:
+            # graphviz is only imported to render the graph
+            from ibis.expr.visualize import to_graph
+            to_graph(query).render(utl.OUT_DIR + "/query")
+            subprocess.run(f"open {utl.OUT_DIR}/query.pdf", shell=True)
+
+        utl.RUST_MODULES.clear()
+        Source.binary_cache = binary_cache
+        # structs carry the ingestion time of their rows, so it must be set before creating any of them
+        Struct.measure_latency = measure_latency
+        with trc.span("recognize operators"):
+            post_order_dfs(query.op())
+        with trc.span("logical plan"):
+            plan = lgc.optimize(lgc.build(query.op(), Operator.operators))
+            plan.lower()
+            lgc.LogicalPlan.last = plan
+        Operator.print_output_to_file = print_output_to_file
+        Operator.cluster = cluster
+        Operator.output_format = output_format
+        Operator.explain = explain
+        Operator.trace = trace
+        if trace:
+            utl.require_rust_module("trace")
+        gen_noir_code()
+
+
+def register_files(files_tables: list[tuple[str, PhysicalTable]]):
+    for file, table in files_tables:
+        utl.TAB_FILES[str(table._arg.name)] = file
+
+
+def logical_plan(files_tables: list[tuple[str, PhysicalTable]], query: PhysicalTable) -> lgc.LogicalPlan:
+    """
+    optimized logical plan the code of the query would be generated from, without generating it
+    """
+    register_files(files_tables)
+    Operator.cleanup()
+    post_order_dfs(query.op())
+    plan = lgc.optimize(lgc.build(query.op(), Operator.operators))
+    Operator.cleanup()
+    return plan
+
+
+def build_noir_code() -> float:
+    """
+    returns the peak resident memory in MiB of the build, that is of the largest among cargo and rustc processes
+    """
+    process = utl.popen_peak_rss(f"cd {utl.CRATE_DIR} && cargo-fmt > /dev/null 2>&1 && cargo build --release {cargo_features_args()} > /dev/null 2>&1")
+    peak_rss = utl.wait_peak_rss(process)
+    if process.returncode != 0:
+        raise Exception("Failed to compile generated noir code!")
+    return peak_rss
+
+
+def run_noir_binary(binary: str, cluster: Cluster = None) -> tuple[int, float]:
+    """
+    returns the exit code and peak resident memory in MiB of the binary, the highest among processes of a cluster
+    """
+    # the binary reads and writes files relative to noir_template, or to the crate of the sandbox
+    if cluster:
+        return cluster.run(binary, cwd=utl.RUN_DIR)
+    process = utl.popen_peak_rss([binary], cwd=utl.RUN_DIR,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    peak_rss = utl.wait_peak_rss(process)
+    return process.returncode, peak_rss
+
+
+def cargo_features_args() -> str:
+    return " ".join(f"--features {f}" for f in utl.cargo_features())
+
+
+def source_fingerprint() -> str:
+    """
+    hash of everything that determines the binary built from the last generated code
+    """
+    digest = hashlib.sha256()
+    files = ["src/main.rs", "Cargo.toml"] + [f"src/{module}.rs" for module in sorted(utl.RUST_MODULES)]
+    for file in files:
+        with open(f"{utl.CRATE_DIR}/{file}", "rb") as f:
+            digest.update(f.read())
+    digest.update(cargo_features_args().encode())
+    return digest.hexdigest()
 
 
 def post_order_dfs(root: Node):
+    for i, node in enumerate(post_order(root)):
+        Operator.from_node(node, i)
+
+
+def post_order(root: Node) -> list[Node]:
+    """
+    nodes of the plan in the order operators are created from them: their index identifies them across processes
+    """
+    nodes = []
     stack: list[tuple[Node, bool]] = [(root, False)]
     visited: set[Node] = set()
 
     while stack:
         (node, visit) = stack.pop()
         if visit:
-            Operator.from_node(node)
+            nodes.append(node)
         elif node not in visited:
             visited.add(node)
             stack.append((node, True))
             for child in node.__children__:
                 stack.append((child, False))
+    return nodes
 
 
 def gen_noir_code():
-    mid = ""
-    for op in Operator.operators:
+    # code of each operator, joined once they are all generated
+    mid: list[str] = []
+    Operator.probe_tags = []
+    for i, op in enumerate(Operator.operators):
         # operators can also modify structs while generating, so generate mid before top
-        mid += op.generate()
+        with trc.span(f"generate {type(op).__name__}"):
+            code = op.generate()
+        if Operator.explain or Operator.trace:
+            code = operator_probes(op, code, i)
+        mid.append(code)
 
     # bottom can also generate new struct, so generate bot before top
-    bot = Operator.new_bot().generate()
-    top = Operator.new_top().generate()
+    with trc.span("generate BotOperator"):
+        bot = Operator.new_bot().generate()
+    with trc.span("generate TopOperator"):
+        top = Operator.new_top().generate()
 
-    directory = utl.ROOT_DIR + '/noir_template/src'
+    directory = utl.CRATE_DIR + '/src'
     if not os.path.exists(directory):
         os.makedirs(directory)
     with open(directory + '/main.rs', 'w+') as f:
         f.write(top)
-        f.write(mid)
+        f.writelines(mid)
         f.write(bot)
+    for module in utl.RUST_MODULES:
+        shutil.copyfile(f"{utl.ROOT_DIR}/noir_template/{module}.rs", f"{directory}/{module}.rs")
+
+
+def operator_probes(op: Operator, code: str, i: int) -> str:
+    Operator.probe_tags.append((type(op).__name__, type(op.plan_node).__name__, op.plan_index))
+    modules = [m for m, enabled in (("explain", Operator.explain), ("trace", Operator.trace)) if enabled]
+    probes_in = ""
+    probes_out = ""
+    for module in modules:
+        utl.require_rust_module(module)
+        probes_in += f".inspect(|_| {module}::rows_in({i}))"
+        probes_out += f".inspect(|_| {module}::rows_out({i}))"
+    # sources start new statements, so only the rows they produce are counted
+    if isinstance(op, DatabaseOperator):
+        return code + probes_out
+    return probes_in + code + probes_out
+
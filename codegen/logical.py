@@ -0,0 +1,347 @@
+"""
+Logical plan between the operators recognized from the ibis plan and the rust code generated for them. Each
+operator becomes a node with the schema of the rows it produces, the columns they are keyed and partitioned by,
+and its parameters as text, so that the plan can be optimized by rule-based passes, serialized to json,
+fingerprinted and explained before any code is generated. Nodes are kept in the order their code is generated:
+the operators of a node lower it to rust, reading what passes decided from it.
+"""
+
+import hashlib
+import json
+
+import ibis
+import ibis.expr.operations as ops
+from ibis.common.graph import Node
+from ibis.expr.datatypes.core import DataType
+
+import codegen.utils as utl
+from codegen.operators import (DatabaseOperator, ExplicitWindowOperator, FilterOperator, GroupReduceOperator,
+                               ImplicitWindowOperator, JoinOperator, LoneReduceOperator, MapOperator, Operator,
+                               SelectOperator, SortOperator, WindowOperator)
+from codegen.sources import Source
+
+KINDS = {DatabaseOperator: "Source", SelectOperator: "Select", FilterOperator: "Filter", MapOperator: "Map",
+         ExplicitWindowOperator: "Window", ImplicitWindowOperator: "Window", GroupReduceOperator: "GroupReduce",
+         LoneReduceOperator: "LoneReduce", JoinOperator: "Join", SortOperator: "Sort"}
+# rows of a stream are partitioned by its keys when keyed, else across replicas or on a single one
+ANY, SINGLE = "any", "single"
+
+
+class Column:
+
+    def __init__(self, name: str, dtype: DataType):
+        self.name = name
+        self.dtype = dtype
+
+    @property
+    def nullable(self) -> bool:
+        return self.dtype.nullable
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "type": str(self.dtype.copy(nullable=True)), "nullable": self.nullable}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Column":
+        return cls(d["name"], ibis.dtype(d["type"]).copy(nullable=d["nullable"]))
+
+
+class LogicalNode:
+
+    def __init__(self, kind: str, inputs: list["LogicalNode"], schema: list[Column], keys: list[str],
+                 partitioning: str, params: dict, operator: Operator = None):
+        self.id = -1
+        self.kind = kind
+        # operator generating the code of the node, None for plans read from json, which can't be lowered
+        self.operator = operator
+        self.inputs = inputs
+        self.schema = schema
+        self.keys = keys
+        self.partitioning = partitioning
+        # serializable description of what the node computes
+        self.params = params
+        # predicates pushed to a source, as ibis nodes for the source to generate them
+        self.pushed_filters: list[Node] = []
+
+    @property
+    def names(self) -> list[str]:
+        return [c.name for c in self.schema]
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "kind": self.kind, "inputs": [i.id for i in self.inputs],
+                "schema": [c.to_dict() for c in self.schema], "keys": self.keys,
+                "partitioning": self.partitioning, "params": self.params}
+
+    def describe(self) -> str:
+        params = ", ".join(f"{k}={v}" for k, v in self.params.items())
+        text = f"#{self.id} {self.kind}[{params}]"
+        # the schema is only listed where it changes, with nullable columns marked by ?
+        if not self.inputs or [c.to_dict() for c in self.schema] != [c.to_dict() for c in self.inputs[0].schema]:
+            cols = ", ".join(f"{c.name}: {c.dtype.copy(nullable=True)}{'?' if c.nullable else ''}" for c in self.schema)
+            text += f" -> ({cols})"
+        return text + f" keys=({', '.join(self.keys)}) partitioning={self.partitioning}"
+
+
+class LogicalPlan:
+    # plan of the last query generated, to explain it or compare its fingerprint
+    last: "LogicalPlan" = None
+
+    def __init__(self, query: Node, nodes: list[LogicalNode]):
+        self.query = query
+        self.nodes = nodes
+        self.renumber()
+
+    @property
+    def root(self) -> LogicalNode:
+        return self.nodes[-1]
+
+    def renumber(self):
+        # passes can remove or add nodes: ids are positions, so that equal plans serialize the same
+        for i, node in enumerate(self.nodes):
+            node.id = i
+
+    def to_dict(self) -> dict:
+        return {"root": self.root.id, "nodes": [n.to_dict() for n in self.nodes]}
+
+    def to_json(self, indent: int = None) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    @classmethod
+    def from_json(cls, text: str) -> "LogicalPlan":
+        """
+        plan serialized by to_json, to explain or fingerprint: its nodes have no operators nor ibis nodes
+        """
+        nodes = []
+        for d in json.loads(text)["nodes"]:
+            nodes.append(LogicalNode(d["kind"], [nodes[i] for i in d["inputs"]],
+                                     [Column.from_dict(c) for c in d["schema"]], d["keys"], d["partitioning"],
+                                     d["params"]))
+        return cls(None, nodes)
+
+    def fingerprint(self) -> str:
+        # keys sorted, so that only what the plan computes matters
+        return hashlib.sha256(json.dumps(self.to_dict(), sort_keys=True).encode()).hexdigest()
+
+    def explain(self) -> str:
+        lines = [f"logical plan {self.fingerprint()[:16]}"]
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            lines.append("  " * depth + node.describe())
+            # the left input is listed first
+            stack.extend((i, depth + 1) for i in reversed(node.inputs))
+        return "\n".join(lines)
+
+    def lower(self):
+        # the operators of the nodes generate the code, in the order of the nodes
+        Operator.reindex([n.operator for n in self.nodes])
+        for node in self.nodes:
+            node.operator.logical_node = node
+
+
+def build(query: Node, operators: list[Operator]) -> LogicalPlan:
+    """
+    nodes of the operators recognized from the query, in order: as in the generated code, each source starts
+    a new stream and each join joins the current stream with the one completed before it
+    """
+    nodes: list[LogicalNode] = []
+    current: LogicalNode = None
+    completed: list[LogicalNode] = []
+    for op in operators:
+        if isinstance(op, DatabaseOperator):
+            if current:
+                completed.append(current)
+            current = source_node(op)
+        elif isinstance(op, JoinOperator):
+            current = join_node(op, current, completed.pop())
+        else:
+            current = unary_node(op, current)
+        nodes.append(current)
+    return LogicalPlan(query, nodes)
+
+
+def source_node(op: DatabaseOperator) -> LogicalNode:
+    table = op.table
+    path = utl.TAB_FILES.get(table.name, table.name)
+    # tables read by ibis get random names, so they are told apart by their file
+    params = {"file": Source.relative_path(path)}
+    return LogicalNode("Source", [], relation_schema(table), [], ANY, params, op)
+
+
+def join_node(op: JoinOperator, left: LogicalNode, right: LogicalNode) -> LogicalNode:
+    join = op.join
+    how = type(join).__name__
+    params = {"how": how, "on": [expr_text(p) for p in join.predicates]}
+    if how in ("LeftSemiJoin", "LeftAntiJoin"):
+        return LogicalNode("Join", [left, right], list(left.schema), [], ANY, params, op)
+
+    # overlapping columns of the right side are renamed and all columns turn nullable, as ibis does
+    schema = [Column(c.name, c.dtype.copy(nullable=True)) for c in left.schema]
+    schema += [Column(c.name + "_right" if c.name in left.names else c.name, c.dtype.copy(nullable=True))
+               for c in right.schema]
+    if how == "CrossJoin":
+        return LogicalNode("Join", [left, right], schema, [], ANY, params, op)
+    # the joined stream is keyed by the columns of the right side
+    keys = []
+    for equals in join.predicates:
+        a, b = equals.__children__[0], equals.__children__[1]
+        right_col = b if a.name in left.names and b.name in right.names else a
+        keys.append(right_col.name)
+    return LogicalNode("Join", [left, right], schema, keys, hashed(keys), params, op)
+
+
+def unary_node(op: Operator, prev: LogicalNode) -> LogicalNode:
+    schema, keys, partitioning = list(prev.schema), prev.keys, prev.partitioning
+
+    if isinstance(op, FilterOperator):
+        params = {"predicate": expr_text(op.comparator)}
+    elif isinstance(op, SelectOperator):
+        schema = relation_schema(op.node)
+        params = {"columns": [expr_text(s) for s in op.node.selections]}
+    elif isinstance(op, MapOperator):
+        # a window below the same alias already added its column, which the map replaces
+        schema = with_column(schema, Column(op.node.name, op.node.dtype))
+        params = {"expr": expr_text(op.node)}
+    elif isinstance(op, WindowOperator):
+        schema = with_column(schema, Column(op.alias.name, op.alias.dtype))
+        frame = op.window.frame
+        keys = [b.name for b in frame.group_by]
+        if isinstance(op, ImplicitWindowOperator):
+            keys = keys[:1]
+        partitioning = hashed(keys) if keys else SINGLE
+        params = {"window": expr_text(op.window), "by": keys}
+    elif isinstance(op, GroupReduceOperator):
+        schema = relation_schema(op.node)
+        keys = [b.name for b in op.bys]
+        partitioning = hashed(keys)
+        params = {"by": keys, "metrics": [expr_text(m) for m in op.node.metrics]}
+    elif isinstance(op, LoneReduceOperator):
+        schema = [Column(c.name, c.dtype.copy(nullable=True)) for c in relation_schema(op.node)]
+        keys, partitioning = [], SINGLE
+        params = {"metrics": [expr_text(m) for m in op.node.metrics]}
+    elif isinstance(op, SortOperator):
+        keys, partitioning = [], SINGLE
+        params = {"by": [expr_text(k) for k in op.sort_keys], "limit": op.limit, "offset": op.offset}
+    else:
+        raise Exception(f"Operator {type(op).__name__} has no logical node!")
+    return LogicalNode(KINDS[type(op)], [prev], schema, keys, partitioning, params, op)
+
+
+def relation_schema(node: Node) -> list[Column]:
+    return [Column(n, t) for n, t in zip(node.schema.names, node.schema.types)]
+
+
+def with_column(schema: list[Column], column: Column) -> list[Column]:
+    if column.name in (c.name for c in schema):
+        return [column if c.name == column.name else c for c in schema]
+    return schema + [column]
+
+
+def hashed(keys: list[str]) -> str:
+    return f"hash({', '.join(keys)})" if keys else ANY
+
+
+def expr_text(node: Node) -> str:
+    """
+    stable text of an expression, independent of the names ibis gives to tables
+    """
+    if isinstance(node, ops.TableColumn):
+        return node.name
+    if isinstance(node, ops.Literal):
+        return repr(node.value)
+    if isinstance(node, ops.Alias):
+        return f"{expr_text(node.arg)} as {node.name}"
+    if isinstance(node, ops.SortKey):
+        return f"{expr_text(node.expr)} {'asc' if node.ascending else 'desc'}"
+    args = []
+    for name, arg in zip(node.__argnames__, node.__args__):
+        if isinstance(arg, ops.Relation) or arg is None:
+            continue
+        if isinstance(arg, Node):
+            args.append(expr_text(arg))
+        elif isinstance(arg, tuple):
+            args.append(f"{name}=[{', '.join(expr_text(a) if isinstance(a, Node) else str(a) for a in arg)}]")
+        else:
+            # types of casts, bounds of windows and other arguments that aren't expressions
+            args.append(f"{name}={arg}")
+    return f"{type(node).__name__}({', '.join(args)})"
+
+
+# passes
+
+
+def push_down_filters(plan: LogicalPlan) -> LogicalPlan:
+    # predicates of the filters applied directly to a table, before anything (joins, maps, aggregations)
+    # changes the meaning of its columns: sources can use them to skip data without reading it, while the
+    # filters still apply them to the rows read
+    for i, node in enumerate(plan.nodes):
+        if node.kind != "Source":
+            continue
+        prev = node
+        for next_node in plan.nodes[i + 1:]:
+            if next_node.inputs != [prev] or next_node.kind not in ("Filter", "Select"):
+                break
+            # selects that rename or compute columns change what the names of the filters after them mean
+            if next_node.kind == "Select" and not plain_selection(next_node.operator.node):
+                break
+            if next_node.kind == "Filter" and source_predicate(next_node.operator.comparator, node.operator.table):
+                node.pushed_filters.append(next_node.operator.comparator)
+            prev = next_node
+        node.params["pushed_filters"] = [expr_text(f) for f in node.pushed_filters]
+    return plan
+
+
+def plain_selection(node: ops.Selection) -> bool:
+    return all(isinstance(s, ops.TableColumn) and s.table == node.table for s in node.selections)
+
+
+def source_predicate(predicate: Node, table: ops.DatabaseTable) -> bool:
+    # only the columns of the predicate itself, not those in the definitions of the tables they belong to
+    columns = predicate.find(ops.TableColumn, filter=lambda n: not isinstance(n, ops.Relation))
+    return all(source_column(c, table) for c in columns)
+
+
+def source_column(column: ops.TableColumn, table: ops.DatabaseTable) -> bool:
+    # a column of the table itself or of selections of its columns, which keep their names
+    relation = column.table
+    while isinstance(relation, ops.Selection) and plain_selection(relation):
+        relation = relation.table
+    return relation == table and column.name in table.schema
+
+
+def prune_columns(plan: LogicalPlan) -> LogicalPlan:
+    # sources that can read only some of the columns of their table read those the query could need
+    needed = referenced_columns(plan.query)
+    for node in plan.nodes:
+        if node.kind == "Source":
+            node.params["columns"] = [n for n in node.names if n in needed]
+    return plan
+
+
+PASSES = [push_down_filters, prune_columns]
+
+
+def optimize(plan: LogicalPlan) -> LogicalPlan:
+    for rule in PASSES:
+        plan = rule(plan)
+    plan.renumber()
+    return plan
+
+
+def referenced_columns(root: Node) -> set[str]:
+    """
+    names of all columns that the query could need from its tables: those referenced anywhere in the query
+    plus those in its output, where columns renamed by joins are traced back to their original name
+    """
+    names = set(root.schema.names)
+    names.update(n.removesuffix("_right") for n in root.schema.names)
+    stack = [root]
+    visited = set()
+    while stack:
+        node = stack.pop()
+        if node in visited:
+            continue
+        visited.add(node)
+        if isinstance(node, ops.TableColumn):
+            names.add(node.name)
+        stack.extend(node.__children__)
+    return names
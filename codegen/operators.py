@@ -3,6 +3,8 @@ import ibis.expr.operations as ops
 from ibis.common.graph import Node
 
 import codegen.utils as utl
+from codegen.cluster import Cluster
+from codegen.sources import Source
 from codegen.struct import Struct
 from ibis.expr.datatypes.core import DataType
 
@@ -13,12 +15,63 @@ class Operator:
     # value to prioritize one over the other and change ordeding of operators in noir code
     priority = 0
     print_output_to_file = True
+    # when set, the generated binary runs with the given local parallelism or as a multi-process cluster
+    cluster: Cluster = None
+    # format of the output file when printing it: "csv", "arrow" ipc, or "stream" for a csv written continuously
+    output_format = "csv"
+    # when set, each operator is wrapped by probes counting its rows and time, dumped after execution
+    explain = False
+    # when set, the generated code writes the spans of building the graph, executing it and of each operator
+    trace = False
+    # (python operator, ibis node, index of the node in the plan) of each probed operator
+    probe_tags: list[tuple[str, str, int]] = []
+    # index in the plan and node being recognized when operators are created
+    recognizing: tuple[int, Node] = (-1, None)
+    # types of the nodes recognize can create operators from, so that it's only called with those
+    node_types: tuple[type, ...] = (Node,)
+    # node of the logical plan the operator lowers to code, with what optimizations decided for it
+    logical_node = None
+    # leaf operators whose recognize is called for each type of node, in order: filled on the first node of a type
+    dispatch: dict[tuple[type, type], list[type["Operator"]]] = {}
+    # window functions already turned into operators, which can be found below more than one alias
+    windows: set[Node] = set()
 
     def __init__(self):
+        self.plan_index, self.plan_node = Operator.recognizing
+        # position in operators, which is the order their code is generated in
+        self.index = len(Operator.operators)
         Operator.operators.append(self)
 
     @classmethod
-    def from_node(cls, node: Node):
+    def from_node(cls, node: Node, plan_index: int = -1):
+        recognizers = cls.dispatch.get((cls, type(node)))
+        if recognizers is None:
+            recognizers = [Op for Op in cls.leaves() if isinstance(node, Op.node_types)]
+            cls.dispatch[(cls, type(node))] = recognizers
+
+        Operator.recognizing = (plan_index, node)
+        for Op in recognizers:
+            Op.recognize(node)
+        Operator.recognizing = (-1, None)
+
+    @classmethod
+    def reindex(cls, operators: list["Operator"]):
+        """
+        set the operators to generate, in order, with their positions and, for each table, the number of structs
+        the operators applied to its stream up to the next table produce
+        """
+        cls.operators = operators
+        source = None
+        for i, op in enumerate(operators):
+            op.index = i
+            if isinstance(op, DatabaseOperator):
+                source = op
+                source.count_structs = 0
+            elif source and op.does_add_struct():
+                source.count_structs += 1
+
+    @classmethod
+    def leaves(cls) -> list[type["Operator"]]:
         # recursively find subclasses to include only leaves
         operator_classes = []
         stack = [cls]
@@ -30,9 +83,7 @@ class Operator:
                 stack.extend(subclasses)
             else:
                 operator_classes.append(curr)
-
-        for Op in operator_classes:
-            Op.recognize(node)
+        return operator_classes
 
     @classmethod
     def new_top(cls):
@@ -45,6 +96,7 @@ class Operator:
     @classmethod
     def cleanup(cls):
         cls.operators = []
+        cls.windows = set()
 
     def generate(self) -> str:
         raise NotImplementedError
@@ -58,6 +110,7 @@ class Operator:
 
 
 class SelectOperator(Operator):
+    node_types = (ops.Selection,)
 
     def __init__(self, node: ops.Selection):
         self.node = node
@@ -73,9 +126,12 @@ class SelectOperator(Operator):
         else:
             mid += ".map(|x| "
 
+        # columns selected with a new name are read from the original one
+        renames = {s.name: s.arg.name for s in self.node.selections
+                   if isinstance(s, ops.Alias) and isinstance(s.arg, ops.TableColumn)}
         mid += f"{new_struct.name_struct}{{"
-        for col in new_struct.columns:
-            mid += f"{col}: x.{col}, "
+        mid += "".join(f"{col}: x.{renames.get(col, col)}, " for col in new_struct.columns)
+        mid += Struct.latency_field("x.ingest_ns")
         mid += "})"
 
         return mid
@@ -86,13 +142,22 @@ class SelectOperator(Operator):
     @classmethod
     def recognize(cls, node: Node):
         if (isinstance(node, ops.relations.Selection) and
-                (any(isinstance(c, ops.TableColumn) for c in node.__children__) and
-                 not any(isinstance(c, ops.Join) for c in node.__children__))):
+                (any(isinstance(c, ops.TableColumn) or
+                     (isinstance(c, ops.Alias) and isinstance(c.arg, ops.TableColumn)) for c in node.__children__) and
+                 # selecting all the columns of a join is just how ibis represents its output
+                 not any(isinstance(c, ops.Join) and cls.keeps_all_columns(node, c) for c in node.__children__))):
             return cls(node)
 
+    @staticmethod
+    def keeps_all_columns(node: ops.Selection, join: ops.Join) -> bool:
+        # ibis drops the right copy of columns equal by the join predicates
+        names = {n.removesuffix("_right") for n in node.schema.names}
+        return set(join.left.schema.names) | set(join.right.schema.names) <= names
+
 
 class FilterOperator(Operator):
     priority = 1
+    node_types = (ops.Selection, ops.Aggregation)
 
     def __init__(self, node: ops.logical.Comparison):
         self.comparator = node
@@ -125,14 +190,24 @@ class FilterOperator(Operator):
         log_bins = list(filter((lambda c: isinstance(c, ops.logical.LogicalBinary) and any(
             is_equals_col_lit_or_col_col(cc) for cc in c.__children__)), node.__children__))
 
+        # any other predicate, as long as its expression can be generated
+        recognized = set(equalses) | set(log_bins)
+        others = [p for p in node.predicates if p not in recognized]
+
         for eq in equalses:
             cls(eq)
 
         for lb in log_bins:
             cls(lb)
 
+        for other in others:
+            cls(other)
+
 
 class MapOperator(Operator):
+    # expressions other than arithmetic that can compute a new column
+    scalar_ops = (ops.IfElse, ops.SearchedCase, ops.Cast, ops.ExtractYear, ops.Substring)
+    node_types = (ops.Alias,)
 
     def __init__(self, node: ops.core.Alias):
         self.mapper = node.__children__[0]
@@ -162,14 +237,20 @@ class MapOperator(Operator):
         if len(prev_struct.columns) == len(new_struct.columns):
             cols_to_copy.pop()
 
-        for col in cols_to_copy:
-            mid += f"{col}: x.{col}, "
+        if isinstance(self.mapper, self.scalar_ops):
+            # computed before the columns it reads are moved to the new struct
+            mid += f"{self.node.name}: {operator_arg_stringify(self.mapper, 'x')}, "
+            mid += "".join(f"{col}: x.{col}, " for col in cols_to_copy)
+            mid += f"{Struct.latency_field('x.ingest_ns')}}})"
+            return mid
+
+        mid += "".join(f"{col}: x.{col}, " for col in cols_to_copy)
 
         # override WindowFunction node resolution, so in case WindowFunction is below mapper, it will be resolved
         # to prev struct's last col name for reason above
         num_ops = operator_arg_stringify(
             self.mapper, "x", window_resolve=prev_struct.columns[-1])
-        mid += f"{self.node.name}: {num_ops},}})"
+        mid += f"{self.node.name}: {num_ops}, {Struct.latency_field('x.ingest_ns')}}})"
 
         return mid
 
@@ -183,10 +264,15 @@ class MapOperator(Operator):
                     # and not any(isinstance(cc, ops.WindowFunction) for cc in c.__children__)
                     for c in node.__children__)):
             return cls(node)
+        # ibis also casts the columns of joins to nullable, which structs of joins already are
+        if (isinstance(node, ops.core.Alias) and isinstance(node.arg, cls.scalar_ops) and
+                not (isinstance(node.arg, ops.Cast) and node.arg.to.name == node.arg.arg.dtype.name)):
+            return cls(node)
 
 
 class LoneReduceOperator(Operator):
     aggr_ops = {"Sum": "+"}
+    node_types = (ops.Aggregation,)
 
     def __init__(self, node: ops.Aggregation):
         alias = next(filter(lambda c: isinstance(
@@ -196,34 +282,47 @@ class LoneReduceOperator(Operator):
         super().__init__()
 
     def generate(self) -> str:
+        if not self.is_single_reduce():
+            return AggregateFold(self.node).generate()
+
         col = operator_arg_stringify(self.reducer.__children__[0])
         op = self.aggr_ops[type(self.reducer).__name__]
 
         is_reduced_col_nullable = Struct.last().is_col_nullable(col)
+        ingest = Struct.latency_field("a.ingest_ns.max(b.ingest_ns)")
+        # the reduce is over all rows, whatever they are grouped by
+        mid = ".drop_key()" if Struct.last().is_keyed_stream else ""
+        Struct.with_keyed_stream = None
         if is_reduced_col_nullable:
-            mid = (f".reduce(|a, b| {Struct.last().name_struct}{{"
-                   f"{col}: a.{col}.zip(b.{col}).map(|(x, y)| x {op} y), ..a }} )")
+            mid += (f".reduce(|a, b| {Struct.last().name_struct}{{"
+                   f"{col}: a.{col}.zip(b.{col}).map(|(x, y)| x {op} y), {ingest}..a }} )")
         else:
-            mid = f".reduce(|a, b| {Struct.last().name_struct}{{{col}: a.{col} {op} b.{col}, ..a }} )"
+            mid += f".reduce(|a, b| {Struct.last().name_struct}{{{col}: a.{col} {op} b.{col}, {ingest}..a }} )"
 
         # map after the reduce to conform to ibis renaming reduced column!
         new_struct = Struct.from_relation(self.node)
 
+        ingest = Struct.latency_field("x.ingest_ns")
         if is_reduced_col_nullable:
-            mid += f".map(|x| {new_struct.name_struct}{{{new_struct.columns[0]}: x.{col}}})"
+            mid += f".map(|x| {new_struct.name_struct}{{{new_struct.columns[0]}: x.{col}, {ingest}}})"
         else:
-            mid += f".map(|x| {new_struct.name_struct}{{{new_struct.columns[0]}: Some(x.{col})}})"
+            mid += f".map(|x| {new_struct.name_struct}{{{new_struct.columns[0]}: Some(x.{col}), {ingest}}})"
 
         return mid
 
     def does_add_struct(self) -> bool:
         return True
 
+    def is_single_reduce(self) -> bool:
+        # a single sum of a column is reduced, anything else is folded
+        return (len(self.node.metrics) == 1 and type(self.reducer).__name__ in self.aggr_ops and
+                isinstance(self.reducer.arg, ops.TableColumn) and self.reducer.where is None)
+
     @classmethod
     def recognize(cls, node: Node):
         if (isinstance(node, ops.relations.Aggregation) and
                 any(isinstance(x, ops.core.Alias) for x in node.__children__) and
-                not any(isinstance(x, ops.TableColumn) for x in node.__children__)):
+                not node.by):
             return cls(node)
 
 
@@ -233,6 +332,7 @@ class GroupReduceOperator(Operator):
     aggr_ops_form = {"Max": "a.{0} = max(a.{0}, b.{0})", "Min": "a.{0} = min(a.{0}, b.{0})",
                      "Sum": "a.{0} = a.{0} + b.{0}",
                      "First": "a.{0} = a.{0}"}
+    node_types = (ops.Aggregation,)
 
     def __init__(self, node: ops.Aggregation):
         self.alias = next(
@@ -243,6 +343,9 @@ class GroupReduceOperator(Operator):
         super().__init__()
 
     def generate(self) -> str:
+        if not self.is_single_reduce():
+            return AggregateFold(self.node).generate()
+
         mid = ""
         aggr_name = type(self.reducer).__name__
         bys = [operator_arg_stringify(by) for by in self.bys]
@@ -276,9 +379,13 @@ class GroupReduceOperator(Operator):
             mid = mid[:-2]
             mid += "))"
 
+            ingest = Struct.latency_update("a", "a.ingest_ns.max(b.ingest_ns)")
             if is_reduced_col_nullable:
                 op = self.aggr_ops[aggr_name]
-                mid += f".reduce(|a, b| {{a.{col} = a.{col}.zip(b.{col}).map(|(x, y)| {op});}})"
+                mid += f".reduce(|a, b| {{a.{col} = a.{col}.zip(b.{col}).map(|(x, y)| {op});{ingest}}})"
+            elif ingest:
+                op = self.aggr_ops_form[aggr_name].format(col)
+                mid += f".reduce(|a, b| {{{op}; {ingest}}})"
             else:
                 op = self.aggr_ops_form[aggr_name].format(col)
                 mid += f".reduce(|a, b| {op})"
@@ -301,28 +408,36 @@ class GroupReduceOperator(Operator):
                 # skip last
                 if i == len(new_struct.columns) - 1:
                     break
-                mid += f"{column}: k.{i}, "
+                # the key is borrowed, so only numbers can be moved out of it
+                mid += f"{column}: k.{i}{'' if self.bys[i].dtype.is_numeric() else '.clone()'}, "
         # when reducing, ibis turns results of non-nullable types to nullable! So new_struct will always have nullable
         # field while reduced col could have been either nullable or non-nullable
         if aggr_name == "Mean":
             # in this case aggregation produces single result, not struct
-            # and x is always an f64 (not nullable)
-            mid += f"{new_struct.columns[-1]}: Some(x)}})"
+            # and x is always an f64 (not nullable), so the ingestion time is lost
+            mid += f"{new_struct.columns[-1]}: Some(x), {Struct.latency_field('0')}}})"
         elif is_reduced_col_nullable:
-            mid += f"{new_struct.columns[-1]}: x.{col}}})"
+            mid += f"{new_struct.columns[-1]}: x.{col}, {Struct.latency_field('x.ingest_ns')}}})"
         else:
-            mid += f"{new_struct.columns[-1]}: Some(x.{col})}})"
+            mid += f"{new_struct.columns[-1]}: Some(x.{col}), {Struct.latency_field('x.ingest_ns')}}})"
 
         return mid
 
     def does_add_struct(self) -> bool:
         return True
 
+    def is_single_reduce(self) -> bool:
+        # a single metric over a column, grouped by columns, has its specific reduce
+        return (len(self.node.metrics) == 1 and
+                (type(self.reducer).__name__ in self.aggr_ops or isinstance(self.reducer, ops.Mean)) and
+                isinstance(self.reducer.arg, ops.TableColumn) and self.reducer.where is None and
+                all(isinstance(by, ops.TableColumn) and not by.dtype.is_floating() for by in self.bys))
+
     @classmethod
     def recognize(cls, node: Node):
         if (isinstance(node, ops.relations.Aggregation) and
                 any(isinstance(x, ops.core.Alias) for x in node.__children__) and
-                any(isinstance(x, ops.TableColumn) for x in node.__children__)):
+                node.by):
             return cls(node)
 
 
@@ -331,33 +446,45 @@ class JoinOperator(Operator):
                   "OuterJoin": "outer_join", "LeftJoin": "left_join"}
     ibis_types = {"InnerJoin": "join",
                   "OuterJoin": "outer_join", "LeftJoin": "left_join"}
+    node_types = (ops.Join,)
 
     def __init__(self, node: ops.relations.Join):
         self.join = node
         super().__init__()
 
     def generate(self) -> str:
-        right_struct = Struct.last_complete_transform
+        right_struct = Struct.pop_complete_transform()
         left_struct = Struct.last()
 
-        equals = self.join.predicates[0]
-        # ibis has left and right switched
-        left_col = operator_arg_stringify(equals.right)
-        right_col = operator_arg_stringify(equals.left)
-        join_t = self.noir_types[type(self.join).__name__]
+        join_name = type(self.join).__name__
+        if join_name in ("LeftSemiJoin", "LeftAntiJoin"):
+            return self.generate_semi_anti(left_struct, right_struct)
+        if join_name == "CrossJoin":
+            return self.generate_cross(left_struct, right_struct)
+
+        left_cols, right_cols = self.key_columns(left_struct, right_struct)
+        join_t = self.noir_types[join_name]
 
-        Struct.with_keyed_stream = {equals.left.name: equals.left.dtype}
+        Struct.with_keyed_stream = {c.name: c.dtype for c in right_cols}
         join_struct, cols_turned_nullable = Struct.from_join(
             left_struct, right_struct)
 
-        if left_struct.is_keyed_stream and not right_struct.is_keyed_stream:  # make right struct KS
-            result = f".{join_t}({right_struct.name_short}.group_by(|x| x.{right_col}.clone()))"
-        elif not left_struct.is_keyed_stream and right_struct.is_keyed_stream:  # make left struct KS
-            result = f".group_by(|x| x.{left_col}.clone()).{join_t}({right_struct.name_short})"
-        elif left_struct.is_keyed_stream and right_struct.is_keyed_stream:
-            result = f".{join_t}({right_struct.name_short})"
+        # a side keyed by other columns than those of the join drops its key first
+        is_left_keyed = self.is_keyed_by(left_struct, left_cols, right_cols)
+        is_right_keyed = self.is_keyed_by(right_struct, left_cols, right_cols)
+        result = ".drop_key()" if left_struct.is_keyed_stream and not is_left_keyed else ""
+        right = right_struct.name_short
+        if right_struct.is_keyed_stream and not is_right_keyed:
+            right += ".drop_key()"
+
+        if is_left_keyed and not is_right_keyed:  # make right struct KS
+            result += f".{join_t}({right}.group_by({self.keyer(right_cols, 'x')}))"
+        elif not is_left_keyed and is_right_keyed:  # make left struct KS
+            result += f".group_by({self.keyer(left_cols, 'x')}).{join_t}({right})"
+        elif is_left_keyed and is_right_keyed:
+            result += f".{join_t}({right})"
         else:  # neither is keyed stream
-            result = f".{join_t}({right_struct.name_short}, |x| x.{left_col}.clone(), |y| y.{right_col}.clone())"
+            result += f".{join_t}({right}, {self.keyer(left_cols, 'x')}, {self.keyer(right_cols, 'y')})"
 
         if join_t == "left_join":
             result += f".map(|(_, x)| {{\nlet mut v = {join_struct.name_struct} {{"
@@ -365,7 +492,9 @@ class JoinOperator(Operator):
                                                                     cols_turned_nullable)
             result += self.fill_join_struct_fields_with_none(
                 join_struct.columns[len(left_struct.columns):])
+            result += Struct.latency_field("x.0.ingest_ns")
             result += "};\nif let Some(i) = x.1 {\n"
+            result += Struct.latency_update("v", "v.ingest_ns.max(i.ingest_ns)")
             result += self.fill_join_struct_fields_with_join_struct(join_struct.columns[len(left_struct.columns):],
                                                                     right_struct.columns, cols_turned_nullable,
                                                                     is_left=False,
@@ -376,10 +505,13 @@ class JoinOperator(Operator):
             result += f".map(|(_, x)| {{\nlet mut v = {join_struct.name_struct} {{"
             result += self.fill_join_struct_fields_with_none(
                 join_struct.columns)
+            result += Struct.latency_field("0")
             result += "};\nif let Some(i) = x.0 {\n"
+            result += Struct.latency_update("v", "v.ingest_ns.max(i.ingest_ns)")
             result += self.fill_join_struct_fields_with_join_struct(join_struct.columns, left_struct.columns,
                                                                     cols_turned_nullable, is_if_let=True)
             result += "};\nif let Some(i) = x.1 {\n"
+            result += Struct.latency_update("v", "v.ingest_ns.max(i.ingest_ns)")
             result += self.fill_join_struct_fields_with_join_struct(join_struct.columns[len(left_struct.columns):],
                                                                     right_struct.columns, cols_turned_nullable,
                                                                     is_left=False,
@@ -393,9 +525,92 @@ class JoinOperator(Operator):
             result += self.fill_join_struct_fields_with_join_struct(join_struct.columns[len(left_struct.columns):],
                                                                     right_struct.columns, cols_turned_nullable,
                                                                     is_left=False)
+            result += Struct.latency_field("x.0.ingest_ns.max(x.1.ingest_ns)")
             result += "})"
         return result
 
+    def key_columns(self, left_struct: Struct, right_struct: Struct) -> tuple[list[Node], list[Node]]:
+        """
+        columns of the left and right stream compared by each predicate of the join: ibis doesn't keep the sides
+        of the predicates in the order of the join, so they're told apart by the columns of each stream
+        """
+        left_cols, right_cols = [], []
+        for equals in self.join.predicates:
+            if not (isinstance(equals, ops.Equals) and isinstance(equals.left, ops.TableColumn) and
+                    isinstance(equals.right, ops.TableColumn)):
+                raise Exception(f"Join predicate {equals} not supported, only equality between columns!")
+            a, b = equals.left, equals.right
+            if (a.name in left_struct.columns and b.name in right_struct.columns and
+                    not (b.name in left_struct.columns and a.name in right_struct.columns)):
+                left_cols.append(a)
+                right_cols.append(b)
+            else:
+                # ibis has left and right switched
+                left_cols.append(b)
+                right_cols.append(a)
+        return left_cols, right_cols
+
+    @staticmethod
+    def is_keyed_by(struct: Struct, left_cols: list[Node], right_cols: list[Node]) -> bool:
+        # both sides of the predicates have the same value, so the key can be named after either
+        if not struct.is_keyed_stream:
+            return False
+        keys = list(struct.is_keyed_stream.keys())
+        return keys == [c.name for c in left_cols] or keys == [c.name for c in right_cols]
+
+    @staticmethod
+    def keyer(cols: list[Node], var: str) -> str:
+        keys = []
+        for col in cols:
+            if col.dtype.is_floating():
+                # floats are neither Eq nor Hash, their bits are
+                to_bits = ".map(f64::to_bits)" if col.dtype.nullable else ".to_bits()"
+                keys.append(f"{var}.{col.name}{to_bits}")
+            else:
+                keys.append(f"{var}.{col.name}.clone()")
+        if len(keys) == 1:
+            return f"|{var}| {keys[0]}"
+        return f"|{var}| ({', '.join(keys)})"
+
+    def generate_semi_anti(self, left_struct: Struct, right_struct: Struct) -> str:
+        # rows of the left stream with (semi) or without (anti) a match, each only once: the right stream
+        # is reduced to its distinct keys before joining
+        left_cols, right_cols = self.key_columns(left_struct, right_struct)
+        result = ".drop_key()" if left_struct.is_keyed_stream else ""
+        right = right_struct.name_short + (".drop_key()" if right_struct.is_keyed_stream else "")
+        right += f".group_by_fold({self.keyer(right_cols, 'y')}, (), |_, _| {{}}, |_, _| {{}})"
+        result += f".group_by({self.keyer(left_cols, 'x')})"
+        if isinstance(self.join, ops.LeftSemiJoin):
+            result += f".join({right})"
+        else:
+            result += f".left_join({right}).filter(|(_, x)| x.1.is_none())"
+
+        Struct.with_keyed_stream = None
+        new_struct = Struct.from_args_dict(str(id(self.join)), dict(left_struct.cols_types))
+        result += f".drop_key().map(|x| {new_struct.name_struct} {{"
+        result += "".join(f"{col}: x.0.{col}, " for col in new_struct.columns)
+        result += Struct.latency_field("x.0.ingest_ns")
+        result += "})"
+        return result
+
+    def generate_cross(self, left_struct: Struct, right_struct: Struct) -> str:
+        # every pair of rows shares the same empty key
+        result = ".drop_key()" if left_struct.is_keyed_stream else ""
+        right = right_struct.name_short + (".drop_key()" if right_struct.is_keyed_stream else "")
+        result += f".join({right}, |_| (), |_| ())"
+
+        Struct.with_keyed_stream = None
+        join_struct, cols_turned_nullable = Struct.from_join(left_struct, right_struct)
+        result += f".map(|(_, x)| {join_struct.name_struct} {{"
+        result += self.fill_join_struct_fields_with_join_struct(left_struct.columns, left_struct.columns,
+                                                                cols_turned_nullable)
+        result += self.fill_join_struct_fields_with_join_struct(join_struct.columns[len(left_struct.columns):],
+                                                                right_struct.columns, cols_turned_nullable,
+                                                                is_left=False)
+        result += Struct.latency_field("x.0.ingest_ns.max(x.1.ingest_ns)")
+        result += "}).drop_key()"
+        return result
+
     @staticmethod
     def fill_join_struct_fields_with_join_struct(struct_cols, joined_cols, cols_turned_nullable, is_left=True, is_if_let=False) -> str:
         result = ""
@@ -426,8 +641,69 @@ class JoinOperator(Operator):
             return cls(node)
 
 
+class SortOperator(Operator):
+    # after the other operators of the same selection, which can create the columns it sorts by
+    priority = -1
+    node_types = (ops.Selection, ops.Aggregation, ops.Limit)
+
+    def __init__(self, node: ops.Selection | ops.Limit, sort_keys: list[ops.SortKey]):
+        self.node = node
+        self.sort_keys = sort_keys
+        self.limit: int = None
+        self.offset = 0
+        super().__init__()
+
+    def generate(self) -> str:
+        # all rows are collected by a single replica, which sorts them and keeps those within the limit
+        prev_struct = Struct.last()
+        text = ".drop_key()" if prev_struct.is_keyed_stream else ""
+        text += ".fold(Vec::new(), |v, x| v.push(x)).flat_map(|mut v| {"
+        if self.sort_keys:
+            cmps = []
+            for key in self.sort_keys:
+                col = operator_arg_stringify(key.expr)
+                a, b = ("a", "b") if key.ascending else ("b", "a")
+                cmps.append(f"{a}.{col}.partial_cmp(&{b}.{col}).unwrap_or(std::cmp::Ordering::Equal)")
+            text += f"v.sort_by(|a, b| {cmps[0]}"
+            for cmp in cmps[1:]:
+                text += f".then_with(|| {cmp})"
+            text += ");"
+        if self.offset:
+            text += f"v.drain(..v.len().min({self.offset}));"
+        if self.limit is not None:
+            text += f"v.truncate({self.limit});"
+        text += "v})"
+
+        Struct.with_keyed_stream = None
+        new_struct = Struct.from_args_dict(str(id(self.node)), dict(prev_struct.cols_types))
+        text += f".map(|x| {new_struct.name_struct}{{"
+        text += "".join(f"{col}: x.{col}, " for col in new_struct.columns)
+        text += Struct.latency_field("x.ingest_ns")
+        text += "})"
+        return text
+
+    def does_add_struct(self) -> bool:
+        return True
+
+    @classmethod
+    def recognize(cls, node: Node):
+        if isinstance(node, (ops.Selection, ops.Aggregation)) and node.sort_keys:
+            return cls(node, list(node.sort_keys))
+        if isinstance(node, ops.Limit):
+            # the limit of a sorted table is applied by its sort
+            prev = Operator.operators[-1] if Operator.operators else None
+            if not (isinstance(prev, SortOperator) and prev.node == node.table and prev.limit is None):
+                prev = cls(node, [])
+            if not isinstance(node.n, int) or not isinstance(node.offset, int):
+                raise Exception("Only limits and offsets of literal integers are supported!")
+            prev.limit = node.n
+            prev.offset = node.offset
+            return prev
+
+
 class WindowOperator(Operator):
     priority = 1
+    node_types = (ops.Alias,)
 
     def generate(self) -> str:
         # abstract class so should not actually be used
@@ -436,6 +712,7 @@ class WindowOperator(Operator):
     def __init__(self, node: ops.WindowFunction):
         self.alias = node
         self.window = self.find_window_func_from_alias(node)
+        Operator.windows.add(self.window)
         super().__init__()
 
     def does_add_struct(self) -> bool:
@@ -524,14 +801,14 @@ class ExplicitWindowOperator(WindowOperator):
         # generate .fold to apply the reduction function while maintaining other row fields
         text += f".fold({new_struct.name_struct}{{"
         # fold accumulator initialization
-        for col in prev_struct.columns:
-            text += f"{col}: None, "
+        text += "".join(f"{col}: None, " for col in prev_struct.columns)
         for col, typ in op.fields():
             text += f"{col}: {op.type_init(typ)}, "
+        text += Struct.latency_field("0")
         # fold update step
         text += "}, |acc, x| {"
-        for col in prev_struct.columns:
-            text += f"acc.{col} = x.{col}; "
+        text += "".join(f"acc.{col} = x.{col}; " for col in prev_struct.columns)
+        text += Struct.latency_update("acc", "acc.ingest_ns.max(x.ingest_ns)")
         arg = window.func.args[0].name
         for col, action in op.fold_actions():
             text += action.format(col, arg)
@@ -572,7 +849,7 @@ class ExplicitWindowOperator(WindowOperator):
 
         # check if window function has already been used by other WindowOperator to avoid duplicates
         # when WindowFunction has >1 aliases above
-        if window_func in [op.window for op in Operator.operators if isinstance(op, WindowOperator)]:
+        if window_func in Operator.windows:
             return
 
         if (hasattr(window_func, "frame") and
@@ -652,12 +929,12 @@ class ImplicitWindowOperator(WindowOperator):
         if Struct.with_keyed_stream:
             text += ", x"
         text += f" | {new_struct.name_struct}{{"
-        for col in prev_struct.columns:
-            text += f"{col}: x.{col}, "
+        text += "".join(f"{col}: x.{col}, " for col in prev_struct.columns)
         for col, _ in fold_tup_fields:
             text += f"{col}: *{col}, "
         for col, act in op.map_actions():
             text += act.format(col)
+        text += Struct.latency_field("x.ingest_ns")
         text += "})"
 
         return text
@@ -677,7 +954,7 @@ class ImplicitWindowOperator(WindowOperator):
 
         # check if window function has already been used by other WindowOperator to avoid duplicates
         # when WindowFunction has >1 aliases above
-        if window_func in [op.window for op in Operator.operators if isinstance(op, WindowOperator)]:
+        if window_func in Operator.windows:
             return
 
         if (hasattr(window_func, "frame") and
@@ -687,6 +964,10 @@ class ImplicitWindowOperator(WindowOperator):
 
 
 class DatabaseOperator(Operator):
+    node_types = (ops.PhysicalTable,)
+    # structs produced by the operators applied to this table's stream, counted by Operator.reindex
+    count_structs = 0
+
     def __init__(self, node: ops.DatabaseTable):
         self.table = node
         super().__init__()
@@ -698,23 +979,16 @@ class DatabaseOperator(Operator):
         Struct.with_keyed_stream = None
         struct = Struct.from_relation(self.table)
 
-        # need to have count_id of last struct produced by this table's transformations:
-        # increment this struct's id counter by the number of operations in this table that produce structs
-        this_idx = self.operators.index(self)
-        end_idx = this_idx + 1
-        while end_idx < len(self.operators):
-            op = self.operators[end_idx]
-            if isinstance(op, DatabaseOperator):
-                break
-            end_idx += 1
-        count_structs = len(list(
-            filter(lambda o: o.does_add_struct(), self.operators[this_idx + 1:end_idx])))
-
-        # turning full path to relative path so that rust code contains relative path and expected code can work across machines
-        full_path = utl.TAB_FILES[self.table.name]
-        rel_path = ".." + full_path.split(utl.ROOT_DIR)[1]
-        return (f";\nlet {struct.name_short} = ctx.stream_csv::<{struct.name_struct}>(\"{rel_path}\").batch_mode(BatchMode::fixed(16000));\n" +
-                f"let var_{struct.id_counter + count_structs} = {struct.name_short}")
+        source = Source.from_path(utl.TAB_FILES[self.table.name], self.table.name)
+        source.referenced_columns = set(self.logical_node.params["columns"])
+        stream = source.generate(struct, self.logical_node.pushed_filters)
+        if Struct.measure_latency:
+            # rows are stamped as soon as the source produces them
+            utl.require_rust_module("latency")
+            stream += ".map(|mut x| { x.ingest_ns = latency::now_ns(); x })"
+        # the stream is named after the last struct produced by this table's transformations
+        return (f";\nlet {struct.name_short} = {stream};\n" +
+                f"let var_{struct.id_counter + self.count_structs} = {struct.name_short}")
 
     def does_add_struct(self) -> bool:
         return True
@@ -726,6 +1000,9 @@ class DatabaseOperator(Operator):
 
 
 class TopOperator(Operator):
+    # created by the generator, not from nodes
+    node_types = ()
+
     def __init__(self):
         super().__init__()
 
@@ -735,47 +1012,275 @@ class TopOperator(Operator):
 
         with open(utl.ROOT_DIR + "/noir_template/main_top.rs") as f:
             top = f.read()
-        for st in Struct.structs:
-            top += st.generate()
+        for module in utl.RUST_MODULES:
+            top += f"mod {module};\n"
+        top += "".join(st.generate() for st in Struct.structs)
 
         # cleanup structs: same reason
         Struct.cleanup()
 
         top += "\nfn logic(ctx: StreamContext) {\n"
+        if self.explain:
+            top += f"explain::init({len(self.probe_tags)});\n"
+        if self.trace:
+            top += "trace::begin(\"building graph\");\n"
         return top
 
 
 class BotOperator(Operator):
+    # rows buffered by the continuous sink before blocking the stream
+    stream_buffer_rows = 1024
+    # created by the generator, not from nodes
+    node_types = ()
+
     def __init__(self):
         super().__init__()
 
     def generate(self) -> str:
         last_struct = Struct.last()
-        
+        stream = last_struct.name_short + self.latency_probe(last_struct)
+
         if not self.print_output_to_file:
-            bot = f"; {last_struct.name_short}.for_each(|x| {{std::hint::black_box(x);}});"
-            with open(utl.ROOT_DIR + "/noir_template/main_bot_no_print.rs") as f:
-                bot += f.read()
+            bot = f"; {stream}.for_each(|x| {{std::hint::black_box(x);}});"
+            bot += self.read_template("main_bot_no_print.rs")
             return bot
 
+        if self.output_format == "arrow":
+            return self.generate_arrow(last_struct, stream)
+        if self.output_format == "stream":
+            return self.generate_stream(last_struct, stream)
+
         if not last_struct.is_keyed_stream:
-            bot = f";\n{last_struct.name_short}.write_csv_one(\"../out/noir-result.csv\", true);"
+            bot = f";\n{stream}.write_csv_one(\"../out/noir-result.csv\", true);"
         else:
             names_types = Struct.last().with_keyed_stream
             new_struct = Struct.from_args(str(id(self)), list(names_types.keys()), list(
                 names_types.values()), with_name_short="collect")
-            bot = f";\n{last_struct.name_short}.map(|(k, v)| ({new_struct.name_struct}{{"
+            bot = f";\n{stream}.map(|(k, v)| ({new_struct.name_struct}{{"
             if len(names_types) == 1:
                 bot += f"{list(names_types.keys())[0]}: k.clone(),"
             else:
                 for i, name in enumerate(names_types):
                     bot += f"{name}: k.{i}.clone(),"
+            bot += Struct.latency_field("0")
             bot += "}, v)).drop_key().write_csv_one(\"../out/noir-result.csv\", true);"
 
-        with open(utl.ROOT_DIR + "/noir_template/main_bot.rs") as f:
-            bot += f.read()
+        bot += self.read_template("main_bot.rs")
+        return bot
+
+    def generate_arrow(self, last_struct: Struct, stream: str) -> str:
+        utl.require_rust_module("arrow_sink", feature="arrow_sink")
+        # narrow integers are widened to i64 and dates written as their strings, cast back when read
+        builders = {"Int64": "i64_column", "Int32": "i64_column", "Int16": "i64_column", "Int8": "i64_column",
+                    "Float64": "f64_column", "String": "str_column", "Date": "str_column", "Boolean": "bool_column"}
+
+        bot = f";\nlet result = {stream}.collect_vec();"
+        # (name, type, field of the collected item) for each output column
+        if not last_struct.is_keyed_stream:
+            columns = [(c, t, f"x.{c}") for c, t in last_struct.cols_types.items()]
+        else:
+            # same as csv, key columns come first but are dropped when the value has a column with the same
+            # name, as it can have nulls that the key doesn't have (outer joins)
+            names_types = last_struct.with_keyed_stream
+            if len(names_types) == 1:
+                key_fields = {list(names_types.keys())[0]: "x.0"}
+            else:
+                key_fields = {name: f"x.0.{i}" for i, name in enumerate(names_types)}
+            columns = [(c, t, key_fields[c]) for c, t in names_types.items() if c not in last_struct.cols_types]
+            columns += [(c, t, f"x.1.{c}") for c, t in last_struct.cols_types.items()]
+
+        write = "ctx.execute_blocking();\n"
+        # with a cluster, only the process collecting the output has the rows
+        write += "if let Some(rows) = result.get() {\narrow_sink::write_ipc(\"../out/noir-result.arrow\", vec!["
+        for name, typ, field in columns:
+            value = f"{field}.clone()" if typ.nullable else f"Some({field}.clone())"
+            if typ.is_integer() and typ.name != "Int64":
+                value += ".map(i64::from)"
+            write += f"(\"{name}\", arrow_sink::{builders[typ.name]}(rows.iter().map(|x| {value}))), "
+        write += "]);\n}"
+
+        bot += self.read_template("main_bot_no_print.rs").replace("ctx.execute_blocking();", write)
+        return bot
+
+    def generate_stream(self, last_struct: Struct, stream: str) -> str:
+        utl.require_rust_module("streaming", feature="streaming")
+
+        if not last_struct.is_keyed_stream:
+            header = last_struct.columns
+        else:
+            # same tuples of key and value as the csv output
+            names_types = Struct.last().with_keyed_stream
+            new_struct = Struct.from_args(str(id(self)), list(names_types.keys()), list(
+                names_types.values()), with_name_short="collect")
+            stream += f".map(|(k, v)| ({new_struct.name_struct}{{"
+            if len(names_types) == 1:
+                stream += f"{list(names_types.keys())[0]}: k.clone(),"
+            else:
+                for i, name in enumerate(names_types):
+                    stream += f"{name}: k.{i}.clone(),"
+            stream += Struct.latency_field("0")
+            stream += "}, v)).drop_key()"
+            header = list(names_types.keys()) + last_struct.columns
+
+        header = ", ".join(f"\"{c}\"" for c in header)
+        bot = (f";\nlet (sink, writer) = streaming::continuous_sink(\"../out/noir-result.csv\", "
+               f"\"../out/noir-throughput.csv\", &[{header}], {self.stream_buffer_rows});\n"
+               f"{stream}.for_each(move |x| sink.send(x));")
+        bot += self.read_template("main_bot_no_print.rs").replace("ctx.execute_blocking();",
+                                                                  "ctx.execute_blocking();\nwriter.finish();")
         return bot
 
+    @staticmethod
+    def latency_probe(last_struct: Struct) -> str:
+        # latency of each output row is recorded right before the sink
+        if not Struct.measure_latency:
+            return ""
+        if last_struct.is_keyed_stream:
+            return ".inspect(|(_, x)| latency::record(x.ingest_ns))"
+        return ".inspect(|x| latency::record(x.ingest_ns))"
+
+    def read_template(self, name: str) -> str:
+        with open(utl.ROOT_DIR + "/noir_template/" + name) as f:
+            bot = self.with_context_init(f.read())
+        if Struct.measure_latency:
+            bot = bot.replace("ctx.execute_blocking();",
+                              "ctx.execute_blocking();\nlatency::write_histogram(\"../out/noir-latency\");")
+        tags = ", ".join(f"(\"{op}\", \"{node}\", {i})" for op, node, i in self.probe_tags)
+        if self.explain:
+            bot = bot.replace("ctx.execute_blocking();",
+                              f"ctx.execute_blocking();\nexplain::write_json(\"../out/noir-explain\", &[{tags}]);")
+        if self.trace:
+            bot = bot.replace("ctx.execute_blocking();",
+                              "trace::end();\ntrace::begin(\"execution\");\nctx.execute_blocking();\ntrace::end();\n"
+                              f"trace::write_json(\"../out/noir-trace\", &[{tags}]);")
+        return bot
+
+    def with_context_init(self, bot: str) -> str:
+        # templates create a local context using all cores: replace it when deploying on a specific cluster
+        # each host of a cluster runs main and truncates the output file before executing, which is safe
+        # as no host can start writing results before all hosts have joined the execution
+        if not self.cluster:
+            return bot
+        if self.cluster.is_remote:
+            # written along with the code reading it, then again before launching the processes
+            self.cluster.write_config()
+        return bot.replace("StreamContext::new_local()", self.cluster.context_init())
+
+
+class AggregateFold:
+    """
+    aggregation of any number of metrics, possibly grouped by expressions, as a single fold whose accumulator
+    is the tuple of the accumulators of the metrics: each replica folds its rows, then accumulators are merged
+    """
+
+    def __init__(self, node: ops.Aggregation):
+        self.node = node
+
+    def generate(self) -> str:
+        text = ".drop_key()" if Struct.last().is_keyed_stream else ""
+
+        inits, local, merge, outputs = [], "", "", []
+        for i, metric in enumerate(self.node.metrics):
+            init, fold, merge_fold, output = self.accumulator(metric.arg, f"acc.{i}", f"y.{i}")
+            inits.append(init)
+            local += fold
+            merge += merge_fold
+            outputs.append(output_of_type(output[0], output[1], metric.dtype))
+        init = f"({', '.join(inits)},)"
+
+        if self.node.by:
+            keys = []
+            for by in self.node.by:
+                key = operator_arg_stringify(by.arg if isinstance(by, ops.Alias) else by, "x")
+                # floats are neither Eq nor Hash, their bits are
+                if by.dtype.is_floating():
+                    key += ".map(f64::to_bits)" if by.dtype.nullable else ".to_bits()"
+                elif isinstance(by, ops.TableColumn) or isinstance(by.arg, ops.TableColumn):
+                    key += ".clone()"
+                keys.append(key)
+            keyer = f"|x| {keys[0]}" if len(keys) == 1 else f"|x| ({', '.join(keys)})"
+            text += f".group_by_fold({keyer}, {init}, |acc, x| {{{local}}}, |acc, y| {{{merge}}})"
+            Struct.with_keyed_stream = {by.name: by.dtype for by in self.node.by}
+        else:
+            text += f".fold_assoc({init}, |acc, x| {{{local}}}, |acc, y| {{{merge}}})"
+            Struct.with_keyed_stream = None
+
+        # the "by" fields are also kept in the struct, as in the other aggregations
+        new_struct = Struct.from_relation(self.node)
+        if self.node.by:
+            text += f".map(|(k, acc)| {new_struct.name_struct}{{"
+            for i, by in enumerate(self.node.by):
+                key = "k" if len(self.node.by) == 1 else f"k.{i}"
+                if by.dtype.is_floating() and by.dtype.nullable:
+                    key += ".map(f64::from_bits)"
+                elif by.dtype.is_floating():
+                    key = f"f64::from_bits({'*' if key == 'k' else ''}{key})"
+                else:
+                    key += ".clone()"
+                text += f"{by.name}: {key}, "
+        else:
+            text += f".map(|acc| {new_struct.name_struct}{{"
+        for metric, output in zip(self.node.metrics, outputs):
+            text += f"{metric.name}: {output}, "
+        text += Struct.latency_field("0")
+        text += "})"
+        return text
+
+    @staticmethod
+    def accumulator(reducer: Node, acc: str, other: str) -> tuple[str, str, str, tuple[str, bool]]:
+        """
+        initial value of the accumulator of the reducer, how a row is folded and another accumulator is merged
+        into it, and the output computed from it, with whether it's an Option
+        """
+        name = type(reducer).__name__
+        if getattr(reducer, "where", None) is not None:
+            raise Exception(f"Aggregation {name} with a condition not supported!")
+        if name == "CountStar":
+            return "0i64", f"{acc} += 1; ", f"{acc} += {other}; ", (acc, False)
+
+        arg = reducer.arg
+        value = operator_arg_stringify(arg, "x")
+        is_nullable = arg.dtype.nullable and not isinstance(arg, ops.Literal)
+        if name == "Count":
+            fold = f"if {value}.is_some() {{ {acc} += 1; }} " if is_nullable else f"{acc} += 1; "
+            return "0i64", fold, f"{acc} += {other}; ", (acc, False)
+
+        if isinstance(arg, ops.TableColumn):
+            value += ".clone()"
+
+        def on_value(stmt: str) -> str:
+            if is_nullable:
+                return f"if let Some(v) = {value} {{ {stmt} }} "
+            return f"{{ let v = {value}; {stmt} }} "
+
+        typ = Struct.ibis_to_noir_type[reducer.dtype.name]
+        if name == "Sum":
+            cast = f" as {typ}" if arg.dtype.name != reducer.dtype.name else ""
+            add = f"*{acc}.get_or_insert_with(Default::default) += v"
+            return (f"None::<{typ}>", on_value(f"{add}{cast};"),
+                    f"if let Some(v) = {other} {{ {add}; }} ", (acc, True))
+        if name in ("Min", "Max"):
+            func = name.lower()
+            keep = f"{acc} = Some(match {acc}.take() {{ Some(a) => a.{func}(v), None => v }});"
+            return f"None::<{typ}>", on_value(keep), f"if let Some(v) = {other} {{ {keep} }} ", (acc, True)
+        if name == "Mean":
+            return ("(0f64, 0i64)", on_value(f"{acc}.0 += v as f64; {acc}.1 += 1;"),
+                    f"{acc}.0 += {other}.0; {acc}.1 += {other}.1; ",
+                    (f"({acc}.1 > 0).then(|| {acc}.0 / {acc}.1 as f64)", True))
+        if name == "CountDistinct":
+            arg_typ = Struct.ibis_to_noir_type[arg.dtype.name]
+            return (f"std::collections::HashSet::<{arg_typ}>::new()", on_value(f"{acc}.insert(v);"),
+                    f"{acc}.extend({other}); ", (f"{acc}.len() as i64", False))
+        raise Exception(f"Aggregation {name} not supported!")
+
+
+def output_of_type(text: str, is_option: bool, dtype: DataType) -> str:
+    if dtype.nullable and not is_option:
+        return f"Some({text})"
+    if not dtype.nullable and is_option:
+        return f"{text}.unwrap_or_default()"
+    return text
+
 
 class WindowFuncGen:
     func_type_init = {ibis.dtype("int64"): "Some(0)",
@@ -814,14 +1319,17 @@ class WindowFuncGen:
 def operator_arg_stringify(operand: Node, struct_name=None, window_resolve=None) -> str:
     math_ops = {"Multiply": "*", "Add": "+", "Subtract": "-", "Divide": "/"}
     comp_ops = {"Equals": "==", "Greater": ">",
-                "GreaterEqual": ">=", "Less": "<", "LessEqual": "<="}
+                "GreaterEqual": ">=", "Less": "<", "LessEqual": "<=", "NotEquals": "!="}
     log_ops = {"And": "&", "Or": "|"}
     if isinstance(operand, ibis.expr.operations.generic.TableColumn):
         if struct_name:
             return f"{struct_name}.{operand.name}"
         return operand.name
     elif isinstance(operand, ibis.expr.operations.generic.Literal):
-        if operand.dtype.name == "String":
+        if operand.value is None:
+            return "None"
+        # dates are compared as their iso string
+        if operand.dtype.name in ("String", "Date"):
             return f"\"{operand.value}\""
         return operand.name
     elif isinstance(operand, ops.logical.Comparison):
@@ -835,6 +1343,31 @@ def operator_arg_stringify(operand: Node, struct_name=None, window_resolve=None)
         is_right_nullable = operand.right.dtype.nullable and not isinstance(
             operand.right, ops.Literal)
         op = comp_ops[type(operand).__name__]
+        is_string = operand.left.dtype.name in ("String", "Date")
+        if is_string and op not in ("==", "!=") and isinstance(operand.right, ops.Literal):
+            # strings are ordered against literals as &str
+            if is_left_nullable:
+                return f"{left}.as_deref().is_some_and(|v| v {op} {right})"
+            return f"{left}.as_str() {op} {right}"
+        if is_string and op not in ("==", "!=") and isinstance(operand.left, ops.Literal):
+            if is_right_nullable:
+                return f"{right}.as_deref().is_some_and(|v| {left} {op} v)"
+            return f"{left} {op} {right}.as_str()"
+        if (operand.left.dtype.is_numeric() and operand.right.dtype.is_numeric() and
+                operand.left.dtype.is_floating() != operand.right.dtype.is_floating()):
+            # an integer compared with a float, as a float
+            if isinstance(operand.left, ops.Literal):
+                left = f"{float(operand.left.value)}f64"
+            elif isinstance(operand.right, ops.Literal):
+                right = f"{float(operand.right.value)}f64"
+            elif is_left_nullable and is_right_nullable:
+                return f"{left}.clone().zip({right}.clone()).map_or(false, |(a, b)| (a as f64) {op} (b as f64))"
+            elif is_left_nullable:
+                return f"{left}.clone().is_some_and(|v| (v as f64) {op} ({right} as f64))"
+            elif is_right_nullable:
+                return f"{right}.clone().is_some_and(|v| ({left} as f64) {op} (v as f64))"
+            else:
+                return f"({left} as f64) {op} ({right} as f64)"
         if is_left_nullable and not is_right_nullable:
             return f"{left}.clone().is_some_and(|v| v {op} {right})"
         if not is_left_nullable and is_right_nullable:
@@ -843,11 +1376,80 @@ def operator_arg_stringify(operand: Node, struct_name=None, window_resolve=None)
             return f"{left}.clone().zip({right}.clone()).map_or(false, |(a, b)| a {op} b)"
         return f"{left} {op} {right}"
     elif isinstance(operand, ops.LogicalBinary):
-        left = operator_arg_stringify(
-            operand.left, struct_name, window_resolve)
-        right = operator_arg_stringify(
-            operand.right, struct_name, window_resolve)
-        return f"{left} {log_ops[type(operand).__name__]} {right}"
+        sides = []
+        for side in (operand.left, operand.right):
+            text = operator_arg_stringify(side, struct_name, window_resolve)
+            # & binds tighter than |, so only an Or within an And needs parentheses
+            if isinstance(side, ops.LogicalBinary) and type(side) is not type(operand):
+                text = f"({text})"
+            sides.append(text)
+        return f"{sides[0]} {log_ops[type(operand).__name__]} {sides[1]}"
+    elif isinstance(operand, ops.Not):
+        return f"!({operator_arg_stringify(operand.arg, struct_name, window_resolve)})"
+    elif isinstance(operand, ops.Between):
+        # same as the two comparisons with the bounds, both included
+        lower = ops.GreaterEqual(operand.arg, operand.lower_bound)
+        upper = ops.LessEqual(operand.arg, operand.upper_bound)
+        return (f"({operator_arg_stringify(lower, struct_name, window_resolve)}) & "
+                f"({operator_arg_stringify(upper, struct_name, window_resolve)})")
+    elif isinstance(operand, ops.InValues):
+        value = operator_arg_stringify(operand.value, struct_name, window_resolve)
+        options = ", ".join(operator_arg_stringify(o) for o in operand.options)
+        is_string = operand.value.dtype.name in ("String", "Date")
+        if operand.value.dtype.nullable:
+            if is_string:
+                return f"{value}.as_deref().is_some_and(|v| [{options}].contains(&v))"
+            return f"{value}.is_some_and(|v| [{options}].contains(&v))"
+        if is_string:
+            return f"[{options}].contains(&{value}.as_str())"
+        return f"[{options}].contains(&{value})"
+    elif isinstance(operand, (ops.StartsWith, ops.EndsWith, ops.StringContains, ops.StringSQLLike)):
+        if isinstance(operand, ops.StartsWith):
+            arg, test = operand.arg, f"v.starts_with({operator_arg_stringify(operand.start)})"
+        elif isinstance(operand, ops.EndsWith):
+            arg, test = operand.arg, f"v.ends_with({operator_arg_stringify(operand.end)})"
+        elif isinstance(operand, ops.StringContains):
+            arg, test = operand.haystack, f"v.contains({operator_arg_stringify(operand.needle)})"
+        else:
+            utl.require_rust_module("like")
+            arg, test = operand.arg, f"like::like(v, {operator_arg_stringify(operand.pattern)})"
+        text = operator_arg_stringify(arg, struct_name, window_resolve)
+        if arg.dtype.nullable:
+            return f"{text}.as_deref().is_some_and(|v| {test})"
+        return f"{{ let v = {text}.as_str(); {test} }}"
+    elif isinstance(operand, (ops.IfElse, ops.SearchedCase)):
+        # branches are converted to the type of the whole expression
+        if isinstance(operand, ops.IfElse):
+            cases, results, default = [operand.bool_expr], [operand.true_expr], operand.false_null_expr
+        else:
+            cases, results, default = operand.cases, operand.results, operand.default
+        text = ""
+        for case, result in zip(cases, results):
+            text += (f"if {operator_arg_stringify(case, struct_name, window_resolve)} "
+                     f"{{ {value_of_type(result, operand.dtype, struct_name)} }} else ")
+        return text + f"{{ {value_of_type(default, operand.dtype, struct_name)} }}"
+    elif isinstance(operand, ops.Cast):
+        arg = operator_arg_stringify(operand.arg, struct_name, window_resolve)
+        if operand.to.name == "String" and operand.arg.dtype.name in ("String", "Date"):
+            return f"{arg}.clone()"
+        if operand.to.is_numeric() and operand.arg.dtype.is_numeric():
+            typ = Struct.ibis_to_noir_type[operand.to.name]
+            return f"{arg}.map(|v| v as {typ})" if operand.arg.dtype.nullable else f"{arg} as {typ}"
+        raise Exception(f"Unsupported cast from {operand.arg.dtype} to {operand.to}")
+    elif isinstance(operand, ops.ExtractYear):
+        # the year is the first part of the iso string of the date
+        arg = operator_arg_stringify(operand.arg, struct_name, window_resolve)
+        year = "v[..4].parse::<i32>().unwrap()"
+        return f"{arg}.as_ref().map(|v| {year})" if operand.arg.dtype.nullable else f"{{ let v = &{arg}; {year} }}"
+    elif isinstance(operand, ops.Substring):
+        # ibis substrings start from 0
+        arg = operator_arg_stringify(operand.arg, struct_name, window_resolve)
+        chars = f"v.chars().skip({operand.start.value})"
+        if operand.length is not None:
+            chars += f".take({operand.length.value})"
+        if operand.arg.dtype.nullable:
+            return f"{arg}.as_ref().map(|v| {chars}.collect::<String>())"
+        return f"{{ let v = &{arg}; {chars}.collect::<String>() }}"
     elif isinstance(operand, ops.numeric.NumericBinary):
         # resolve recursively
 
@@ -890,3 +1492,28 @@ def operator_arg_stringify(operand: Node, struct_name=None, window_resolve=None)
         # since python 3.7, dict maintains insertion order
         return f"{struct_name}.{Struct.last().columns[-2]}"
     raise Exception(f"Unsupported operand type: {operand}")
+
+
+def value_of_type(operand: Node, dtype: DataType, struct_name=None) -> str:
+    """
+    rust expression of the operand converted to the given type: to an Option if nullable, to a float if
+    the operand is an integer, as the branches of a conditional must all produce the same type
+    """
+    text = operator_arg_stringify(operand, struct_name)
+    if isinstance(operand, ops.Literal) and operand.value is None:
+        return text
+    is_nullable = operand.dtype.nullable and not isinstance(operand, ops.Literal)
+    if dtype.is_floating() and operand.dtype.is_integer():
+        if isinstance(operand, ops.Literal):
+            text = f"{float(operand.value)}f64"
+        elif is_nullable:
+            text = f"{text}.map(|v| v as f64)"
+        else:
+            text = f"{text} as f64"
+    elif isinstance(operand, ops.TableColumn):
+        text = f"{text}.clone()"
+    if dtype.nullable and not is_nullable:
+        return f"Some({text})"
+    if not dtype.nullable and is_nullable:
+        return f"{text}.unwrap_or_default()"
+    return text
@@ -0,0 +1,169 @@
+"""
+Store of the results of all benchmarks, a sqlite database in log/results.sqlite with one row per measured run:
+runs of the internal and scaling benchmarks logged by Benchmark, hyperfine runs and /usr/bin/time measurements
+are told apart by the source column and grouped by the directory of the benchmark run, given with --dir.
+Each row also records the machine and the git revision it was measured on. Processes append concurrently,
+as sqlite serializes the writes and in wal mode readers don't block them.
+"""
+
+import os
+import platform
+import sqlite3
+import subprocess
+from datetime import datetime
+
+import pandas as pd
+
+import codegen.utils as utl
+
+DB_PATH = utl.ROOT_DIR + "/log/results.sqlite"
+# seconds a process waits for the others to finish writing
+TIMEOUT_S = 60
+
+# columns of the results table: -1 for the measurements that a run didn't take, as in Benchmark
+SCHEMA = {
+    # where the run comes from
+    "run_dir": "TEXT",
+    "source": "TEXT",
+    "timestamp": "TEXT",
+    "git_revision": "TEXT",
+    "git_dirty": "INTEGER",
+    "hostname": "TEXT",
+    "platform": "TEXT",
+    "cpu_model": "TEXT",
+    "cpu_count": "INTEGER",
+    "memory_MiB": "REAL",
+    "python_version": "TEXT",
+    # what was run
+    "test_name": "TEXT",
+    "backend_name": "TEXT",
+    "table_origin": "TEXT",
+    "file_format": "TEXT",
+    "path_suffix": "TEXT",
+    "dataset_rows": "INTEGER",
+    "num_processes": "INTEGER",
+    "cores_per_process": "INTEGER",
+    "run_count": "INTEGER",
+    # stage timings
+    "total_time_s": "REAL",
+    "renoir_compile_time_s": "REAL",
+    "renoir_execute_time_s": "REAL",
+    "renoir_cold_compile_time_s": "REAL",
+    "renoir_warm_compile_time_s": "REAL",
+    "ibis_time_s": "REAL",
+    "user_time_s": "REAL",
+    "system_time_s": "REAL",
+    # memory
+    "max_memory_MiB": "REAL",
+    "renoir_compile_max_memory_MiB": "REAL",
+    "renoir_execute_max_memory_MiB": "REAL",
+    # streaming
+    "throughput_rows_s": "REAL",
+    "latency_p50_ms": "REAL",
+    "latency_p99_ms": "REAL",
+    "latency_p999_ms": "REAL",
+    "exit_status": "INTEGER",
+    "exception": "TEXT",
+}
+
+
+class ResultStore:
+    # machine and git revision, the same for all the rows appended by a process
+    environment: dict = None
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+
+    def connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=TIMEOUT_S)
+        conn.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(f"{c} {t}" for c, t in SCHEMA.items())
+        conn.execute(f"CREATE TABLE IF NOT EXISTS results ({columns})")
+        # columns added to the schema after the database was created
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+        for c, t in SCHEMA.items():
+            if c not in existing:
+                conn.execute(f"ALTER TABLE results ADD COLUMN {c} {t}")
+        return conn
+
+    def append(self, run_dir: str, source: str, rows: list[dict]):
+        """
+        append the rows measured by a benchmark, each a dict with a subset of the columns of the schema
+        """
+        for row in rows:
+            unknown = set(row) - set(SCHEMA)
+            if unknown:
+                raise Exception(f"Columns {unknown} are not in the result store schema!")
+        env = {"run_dir": run_dir or "", "source": source,
+               "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3], **self.get_environment()}
+        # numpy scalars, as measured through pandas, are stored as the python value
+        rows = [{**env, **{c: v.item() if hasattr(v, "item") else v for c, v in row.items()}} for row in rows]
+        conn = self.connect()
+        try:
+            with conn:
+                for row in rows:
+                    conn.execute(f"INSERT INTO results ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                                 list(row.values()))
+        finally:
+            conn.close()
+
+    def read(self, run_dir: str = None, source: str = None) -> pd.DataFrame:
+        """
+        rows of a benchmark run, of all runs when run_dir is None, optionally only those of a source
+        """
+        query, params = "SELECT * FROM results WHERE 1", []
+        if run_dir is not None:
+            query += " AND run_dir = ?"
+            params.append(run_dir_of(run_dir))
+        if source is not None:
+            query += " AND source = ?"
+            params.append(source)
+        conn = self.connect()
+        try:
+            return pd.read_sql_query(query, conn, params=params)
+        finally:
+            conn.close()
+
+    @classmethod
+    def get_environment(cls) -> dict:
+        if cls.environment is None:
+            cls.environment = {
+                "git_revision": git(["rev-parse", "HEAD"]),
+                "git_dirty": int(git(["status", "--porcelain", "--untracked-files=no"]) != ""),
+                "hostname": platform.node(),
+                "platform": platform.platform(),
+                "cpu_model": cpu_model(),
+                "cpu_count": os.cpu_count(),
+                "memory_MiB": os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 2 ** 20,
+                "python_version": platform.python_version(),
+            }
+        return cls.environment
+
+
+def run_dir_of(path: str) -> str:
+    # benchmark runs are named after their directory in log/, which scripts also get as a path
+    path = os.path.normpath(path)
+    log_dir = utl.ROOT_DIR + "/log"
+    if os.path.isabs(path) and path.startswith(log_dir + "/"):
+        return os.path.relpath(path, log_dir)
+    return path[len("log/"):] if path.startswith("log/") else path
+
+
+def git(args: list[str]) -> str:
+    try:
+        return subprocess.run(["git"] + args, cwd=utl.ROOT_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
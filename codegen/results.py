@@ -0,0 +1,133 @@
+import glob
+import json
+import os
+from typing import Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc
+from ibis.expr.schema import Schema
+
+import codegen.utils as utl
+
+# where the generated code writes its output for each format
+RESULT_FILES = {"csv": "noir-result.csv", "arrow": "noir-result.arrow", "stream": "noir-result.csv"}
+# narrow integers written widened to int64 by the arrow output
+NARROW_INTEGERS = {"Int8": pa.int8(), "Int16": pa.int16(), "Int32": pa.int32()}
+# rows written so far by the continuous sink, logged every second
+THROUGHPUT_FILE = "noir-throughput.csv"
+# latency histogram written by each process, suffixed with its host id when running on a cluster
+LATENCY_PREFIX = "noir-latency"
+# per-operator counters written by each process when explaining the query
+EXPLAIN_PREFIX = "noir-explain"
+
+
+def result_path(output_format: str = "csv") -> str:
+    return utl.OUT_DIR + "/" + RESULT_FILES[output_format]
+
+
+def read_result_table() -> pa.Table:
+    """
+    read the arrow ipc output of the last run: the file is memory-mapped, so the columns of the returned
+    table point directly into the mapping instead of being copied
+    """
+    with pa.memory_map(result_path("arrow")) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def cast_widened(table: pa.Table, schema: Schema) -> pa.Table:
+    """
+    cast back the columns of the arrow output written with a wider type than the one of the query: narrow
+    integers written as int64 and dates written as their iso strings
+    """
+    for i, name in enumerate(table.column_names):
+        typ = schema[name].name
+        if typ in NARROW_INTEGERS:
+            table = table.set_column(i, name, table[name].cast(NARROW_INTEGERS[typ]))
+        elif typ == "Date":
+            # arrow parses strings as timestamps, but not as dates
+            table = table.set_column(i, name, table[name].cast(pa.timestamp("s")).cast(pa.date32()))
+    return table
+
+
+def read_result(output_format: str = "csv") -> pd.DataFrame | None:
+    """
+    read the output of the last run as a dataframe, None if the csv output is empty: renoir doesn't write
+    the header of empty outputs, so their columns are unknown
+    """
+    if output_format == "arrow":
+        return read_result_table().to_pandas()
+    if os.path.getsize(result_path(output_format)) == 0:
+        return None
+    return pd.read_csv(result_path(output_format))
+
+
+def read_result_chunks(output_format: str = "csv", chunk_rows: int = 1_000_000) -> Iterator[pd.DataFrame]:
+    """
+    read the output of the last run a chunk of rows at a time, so that outputs larger than memory can be
+    checked: nothing is read from an empty csv output
+    """
+    if output_format == "arrow":
+        with pa.memory_map(result_path("arrow")) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).to_pandas()
+        return
+    if os.path.getsize(result_path(output_format)) == 0:
+        return
+    yield from pd.read_csv(result_path(output_format), chunksize=chunk_rows)
+
+
+def read_throughput() -> pd.DataFrame:
+    return pd.read_csv(utl.OUT_DIR + "/" + THROUGHPUT_FILE)
+
+
+def sustained_throughput() -> float:
+    """
+    rows per second emitted by the continuous sink over the whole run
+    """
+    throughput = read_throughput()
+    if throughput.empty or throughput["elapsed_s"].iloc[-1] == 0:
+        return -1
+    return throughput["rows"].iloc[-1] / throughput["elapsed_s"].iloc[-1]
+
+
+def read_latency_histogram() -> pd.DataFrame:
+    """
+    count of output rows for each latency bucket, summing the histograms of all processes: each bucket is
+    identified by the highest latency in nanoseconds it counts
+    """
+    files = glob.glob(f"{utl.OUT_DIR}/{LATENCY_PREFIX}*.csv")
+    histograms = [pd.read_csv(f) for f in files]
+    if not histograms:
+        return pd.DataFrame({"bucket_ns": [], "count": []})
+    return pd.concat(histograms).groupby("bucket_ns", as_index=False)["count"].sum().sort_values("bucket_ns")
+
+
+def latency_percentiles(percentiles=(50, 99, 99.9)) -> dict[float, float]:
+    """
+    latency in milliseconds of the given percentiles of output rows, -1 if no row was recorded
+    """
+    histogram = read_latency_histogram()
+    total = histogram["count"].sum()
+    if total == 0:
+        return {p: -1 for p in percentiles}
+    cumulative = histogram["count"].cumsum().to_numpy()
+    buckets = histogram["bucket_ns"].to_numpy()
+    return {p: buckets[min(cumulative.searchsorted(total * p / 100), len(buckets) - 1)] / 1e6 for p in percentiles}
+
+
+def read_explain() -> pd.DataFrame:
+    """
+    rows in, rows out and time of each probed operator in the last run, summing the counters of all processes
+    """
+    files = sorted(glob.glob(f"{utl.OUT_DIR}/{EXPLAIN_PREFIX}*.json"))
+    counters = []
+    for file in files:
+        with open(file) as f:
+            counters.append(pd.DataFrame(json.load(f)).reset_index(names="id"))
+    if not counters:
+        raise FileNotFoundError("No operator counters found: compile the query with explain=True and run it!")
+    return (pd.concat(counters)
+            .groupby(["id", "operator", "node", "plan_index"], as_index=False)[["rows_in", "rows_out", "time_ns"]]
+            .sum())
@@ -0,0 +1,383 @@
+import glob
+import os
+from datetime import date
+from urllib.parse import parse_qs, urlsplit
+
+import ibis.expr.operations as ops
+from ibis.common.graph import Node
+
+import codegen.binary_table as binary_table
+import codegen.utils as utl
+from codegen.struct import Struct
+
+
+class Source:
+    """
+    Where a DatabaseOperator reads its table from: generates the rust expression creating the stream
+    of the table's struct, possibly using the filters applied right after the table to skip data
+    """
+    # columns of its table the query could read, None if unknown: set from the logical plan by DatabaseOperator
+    referenced_columns: set[str] = None
+    # read csv tables through their memory-mapped binary copy, converted on first use
+    binary_cache = False
+
+    @classmethod
+    def from_path(cls, path: str, table_name: str = "") -> "Source":
+        if "://" in path:
+            return StreamingSource.from_uri(path)
+        if glob.has_magic(path) or os.path.isdir(path):
+            return PartitionedCsvSource(path)
+        # format is detected from the extension, falling back on the name of the view
+        # ibis creates when reading the table through the duckdb backend
+        ext = os.path.splitext(path)[1]
+        if ext == ".parquet" or table_name.startswith("ibis_read_parquet"):
+            return ParquetSource(path)
+        if ext in (".arrow", ".feather", ".ipc"):
+            return ArrowSource(path)
+        if ext == binary_table.EXTENSION or cls.binary_cache:
+            return BinarySource(path)
+        return CsvSource(path)
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def generate(self, struct: Struct, filters: list[Node]) -> str:
+        raise NotImplementedError
+
+    @staticmethod
+    def relative_path(full_path: str) -> str:
+        # turning full path to relative path so that rust code contains relative path and expected code can work across machines
+        if not full_path.startswith(utl.ROOT_DIR):
+            return full_path
+        return ".." + full_path.split(utl.ROOT_DIR)[1]
+
+
+class CsvSource(Source):
+
+    def generate(self, struct: Struct, filters: list[Node]) -> str:
+        return f"ctx.stream_csv::<{struct.name_struct}>(\"{self.relative_path(self.path)}\").batch_mode(BatchMode::fixed(16000))"
+
+
+class PartitionedCsvSource(Source):
+    """
+    Dataset made of many csv files, selected with a glob or by a directory with hive-style `key=value/` sub-directories:
+    the partition keys are exposed as columns, with values taken from the path of each file, and files whose
+    partition values don't satisfy the filters are pruned at compile time
+    """
+    hive_null = "__HIVE_DEFAULT_PARTITION__"
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        if os.path.isdir(path):
+            self.files = sorted(glob.glob(os.path.join(path, "**", "*.csv"), recursive=True))
+        else:
+            self.files = sorted(glob.glob(path, recursive=True))
+        if not self.files:
+            raise Exception(f"No files found for partitioned source {path}!")
+        self.partitions = [self.parse_partitions(f) for f in self.files]
+
+    @staticmethod
+    def parse_partitions(file: str) -> dict[str, str]:
+        partitions = {}
+        for segment in os.path.dirname(file).split(os.sep):
+            key, sep, value = segment.partition("=")
+            if sep and key:
+                partitions[key] = value
+        return partitions
+
+    def partition_keys(self, struct: Struct) -> list[str]:
+        return [c for c in struct.columns if all(c in p for p in self.partitions)]
+
+    @classmethod
+    def partition_value(cls, raw: str, typ):
+        if raw == cls.hive_null:
+            return None
+        if typ.is_integer():
+            return int(raw)
+        if typ.is_floating():
+            return float(raw)
+        if typ.is_boolean():
+            return raw.lower() == "true"
+        if typ.is_date():
+            # compared with the date literals of filters
+            return date.fromisoformat(raw)
+        return raw
+
+    def generate(self, struct: Struct, filters: list[Node]) -> str:
+        keys = self.partition_keys(struct)
+        files = []
+        for file, partitions in zip(self.files, self.partitions):
+            values = {k: self.partition_value(partitions[k], struct.cols_types[k]) for k in keys}
+            if any(evaluate_partition_filter(f, values) is False for f in filters):
+                continue
+            files.append((file, values))
+
+        # each replica reads a disjoint subset of the files, and csv columns missing from the files (the
+        # partition keys) are deserialized as None, so they're filled in with the values from the file's path
+        text = "ctx.stream_par_iter(move |id, instances| {\nlet files = vec!["
+        for file, values in files:
+            text += f"(\"{self.relative_path(file)}\", ("
+            for k in keys:
+                text += f"{self.rust_value(values[k], struct.cols_types[k])}, "
+            text += ")), "
+        text += "];\n"
+        text += ("files.into_iter().enumerate().filter(move |(i, _)| *i as u64 % instances == id)"
+                 ".flat_map(|(_, (path, part))| csv::Reader::from_path(path).unwrap()"
+                 f".into_deserialize::<{struct.name_struct}>().map(move |r| {{ let mut x = r.unwrap(); ")
+        for i, k in enumerate(keys):
+            text += f"x.{k} = part.{i}.clone(); "
+        text += "x }))\n}).batch_mode(BatchMode::fixed(16000))"
+        return text
+
+    @staticmethod
+    def rust_value(value, typ) -> str:
+        if value is None:
+            return "None"
+        if typ.is_date():
+            # dates are strings in structs
+            value = value.isoformat()
+        if typ.is_string() or typ.is_date():
+            escaped = value.replace("\\", "\\\\").replace("\"", "\\\"")
+            literal = f"String::from(\"{escaped}\")"
+        elif typ.is_boolean():
+            literal = "true" if value else "false"
+        elif typ.is_floating():
+            literal = f"{float(value)}f64"
+        else:
+            # suffixed with the width of the field
+            literal = f"{value}{Struct.ibis_to_noir_type[typ.name]}"
+        return f"Some({literal})" if typ.nullable else literal
+
+
+class ColumnarSource(Source):
+    """
+    Parquet or arrow ipc file, read with the helpers in noir_template/columnar.rs: only the columns referenced by the
+    query are read and directly copied from the record batches into the generated struct, the others are left empty
+    """
+    value_getters = {"Int64": "i64", "Float64": "f64", "String": "str", "Date": "date"}
+
+    def generate(self, struct: Struct, filters: list[Node]) -> str:
+        utl.require_rust_module("columnar", feature="columnar")
+        columns = [c for c in struct.columns
+                   if self.referenced_columns is None or c in self.referenced_columns]
+
+        text = "ctx.stream_par_iter(move |id, instances| {\n"
+        text += self.generate_batches(columns, filters)
+        text += ".flat_map(|batch| {\n"
+        for c in columns:
+            text += f"let c_{c} = columnar::column_{self.value_getters[struct.cols_types[c].name]}(&batch, \"{c}\");\n"
+        text += f"(0..batch.num_rows()).map(move |i| {struct.name_struct} {{"
+        for c, t in struct.cols_types.items():
+            if c in columns:
+                value = f"columnar::value_{self.value_getters[t.name]}(&c_{c}, i)"
+                text += f"{c}: {value}, " if t.nullable else f"{c}: {value}.unwrap_or_default(), "
+            else:
+                text += f"{c}: Default::default(), "
+        text += Struct.latency_field("0")
+        text += "})\n})\n}).batch_mode(BatchMode::fixed(16000))"
+        return text
+
+    def generate_batches(self, columns: list[str], filters: list[Node]) -> str:
+        raise NotImplementedError
+
+    @staticmethod
+    def columns_slice(columns: list[str]) -> str:
+        return "&[" + ", ".join(f"\"{c}\"" for c in columns) + "]"
+
+
+class ParquetSource(ColumnarSource):
+
+    def generate_batches(self, columns: list[str], filters: list[Node]) -> str:
+        # row groups are skipped when their min/max statistics show that no row can satisfy the filters
+        keep = " && ".join(f"({row_group_filter(f)})" for f in filters) if filters else "true"
+        return (f"columnar::parquet_batches(\"{self.relative_path(self.path)}\", {self.columns_slice(columns)}, "
+                f"id, instances, |rg| {keep})")
+
+
+class ArrowSource(ColumnarSource):
+
+    def generate_batches(self, columns: list[str], filters: list[Node]) -> str:
+        return f"columnar::ipc_batches(\"{self.relative_path(self.path)}\", {self.columns_slice(columns)}, id, instances)"
+
+
+class BinarySource(Source):
+    """
+    Table stored in the format of codegen/binary_table.py, read with the helpers in noir_template/binary.rs: csv files
+    are converted when the cache is missing or stale, and each replica maps the file and reads a contiguous range of
+    rows of the columns referenced by the query, with no parsing
+    """
+    value_getters = {"Int64": "i64(i)", "Float64": "f64(i)", "String": "str(i)", "Date": "str(i)",
+                     "Int32": "i64(i).map(|v| v as i32)", "Int16": "i64(i).map(|v| v as i16)",
+                     "Int8": "i64(i).map(|v| v as i8)", "Boolean": "i64(i).map(|v| v != 0)"}
+
+    def generate(self, struct: Struct, filters: list[Node]) -> str:
+        utl.require_rust_module("binary", feature="binary")
+        path = self.path
+        if os.path.splitext(path)[1] != binary_table.EXTENSION:
+            path = binary_table.ensure_cache(path, struct.cols_types)
+        columns = [c for c in struct.columns
+                   if self.referenced_columns is None or c in self.referenced_columns]
+
+        text = "ctx.stream_par_iter(move |id, instances| {\n"
+        text += f"let table = binary::BinaryTable::open(\"{self.relative_path(path)}\");\n"
+        for c in columns:
+            text += f"let c_{c} = table.column(\"{c}\");\n"
+        text += f"table.rows(id, instances).map(move |i| {struct.name_struct} {{"
+        for c, t in struct.cols_types.items():
+            if c in columns:
+                value = f"c_{c}.{self.value_getters[t.name]}"
+                text += f"{c}: {value}, " if t.nullable else f"{c}: {value}.unwrap_or_default(), "
+            else:
+                text += f"{c}: Default::default(), "
+        text += Struct.latency_field("0")
+        text += "})\n}).batch_mode(BatchMode::fixed(16000))"
+        return text
+
+
+class StreamingSource(Source):
+    """
+    Unbounded source given as an uri instead of a file path, read with the helpers in noir_template/streaming.rs
+    by a single replica: rows are batched adaptively, so they don't wait for a full batch when the input is slow
+        tail:///path/to/file.csv?idle_ms=1000   rows appended to a csv, ending after idle_ms without new rows if set
+        tcp://host:port                         csv rows sent by a server, until it closes the connection
+        unix:///path/to/socket                  same, over a unix socket
+        nexmark://bid?events=1000&rate=100      in-process nexmark generator, bid/auction/person rows of the first
+                                                events (unbounded if not set), generated at most at rate events/s
+    """
+    batch_mode = "BatchMode::adaptive(1024, std::time::Duration::from_millis(10))"
+
+    @classmethod
+    def from_uri(cls, uri: str) -> "StreamingSource":
+        sources = {"tail": TailSource, "tcp": TcpSource, "unix": UnixSocketSource, "nexmark": NexmarkSource}
+        scheme = urlsplit(uri).scheme
+        if scheme not in sources:
+            raise Exception(f"Unsupported streaming source {uri}!")
+        return sources[scheme](uri)
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.uri = urlsplit(path)
+        self.params = {k: v[-1] for k, v in parse_qs(self.uri.query).items()}
+
+    def generate(self, struct: Struct, filters: list[Node]) -> str:
+        utl.require_rust_module("streaming", feature="streaming")
+        return f"ctx.stream_iter({self.generate_iter(struct)}).batch_mode({self.batch_mode})"
+
+    def generate_iter(self, struct: Struct) -> str:
+        raise NotImplementedError
+
+    def optional_param(self, name: str) -> str:
+        return f"Some({self.params[name]})" if name in self.params else "None"
+
+
+class TailSource(StreamingSource):
+
+    def generate_iter(self, struct: Struct) -> str:
+        return (f"streaming::tail_csv::<{struct.name_struct}>(\"{self.relative_path(self.uri.path)}\", "
+                f"{self.optional_param('idle_ms')})")
+
+
+class TcpSource(StreamingSource):
+
+    def generate_iter(self, struct: Struct) -> str:
+        return f"streaming::tcp_csv::<{struct.name_struct}>(\"{self.uri.netloc}\")"
+
+
+class UnixSocketSource(StreamingSource):
+
+    def generate_iter(self, struct: Struct) -> str:
+        return f"streaming::unix_csv::<{struct.name_struct}>(\"{self.uri.path}\")"
+
+
+class NexmarkSource(StreamingSource):
+    events = {"bid": "Bid", "auction": "Auction", "person": "Person"}
+
+    def generate_iter(self, struct: Struct) -> str:
+        table = self.uri.netloc
+        if table not in self.events:
+            raise Exception(f"Unknown nexmark table {table}!")
+        # nexmark events have the same fields as the columns of the generated csv files
+        text = (f"streaming::throttle(streaming::nexmark_events({self.optional_param('events')}), "
+                f"{self.optional_param('rate')}).filter_map(|e| match e {{\n"
+                f"nexmark::event::Event::{self.events[table]}(e) => Some({struct.name_struct} {{")
+        for c, t in struct.cols_types.items():
+            if self.referenced_columns is not None and c not in self.referenced_columns:
+                text += f"{c}: Default::default(), "
+                continue
+            value = f"e.{c}.clone()" if t.is_string() else f"e.{c} as {Struct.ibis_to_noir_type[t.name]}"
+            text += f"{c}: Some({value}), " if t.nullable else f"{c}: {value}, "
+        text += Struct.latency_field("0")
+        text += "}),\n_ => None,\n})"
+        return text
+
+
+def row_group_filter(node: Node) -> str:
+    """
+    rust predicate over the row group `rg`, false only if the statistics prove that no row satisfies
+    the filter: anything that is not a comparison between a numeric column and a literal keeps the row group
+    """
+    # condition on (min, max) of the column for `column op value`
+    conditions = {"Equals": "min <= {0} && {0} <= max", "NotEquals": "!(min == {0} && max == {0})",
+                  "Greater": "max > {0}", "GreaterEqual": "max >= {0}",
+                  "Less": "min < {0}", "LessEqual": "min <= {0}"}
+    flipped = {"Greater": "Less", "GreaterEqual": "LessEqual", "Less": "Greater", "LessEqual": "GreaterEqual"}
+
+    if isinstance(node, ops.And):
+        return f"({row_group_filter(node.left)}) && ({row_group_filter(node.right)})"
+    if isinstance(node, ops.Or):
+        return f"({row_group_filter(node.left)}) || ({row_group_filter(node.right)})"
+    if not (isinstance(node, ops.logical.Comparison) and type(node).__name__ in conditions):
+        return "true"
+
+    name = type(node).__name__
+    column, literal = node.left, node.right
+    if isinstance(column, ops.Literal) and isinstance(literal, ops.TableColumn):
+        column, literal = literal, column
+        name = flipped.get(name, name)
+    if not (isinstance(column, ops.TableColumn) and isinstance(literal, ops.Literal)
+            and literal.value is not None and literal.dtype.is_numeric()):
+        return "true"
+    if column.dtype.is_integer() and literal.dtype.is_integer():
+        stats, value = "stats_i64", f"{literal.value}i64"
+    elif column.dtype.is_floating():
+        stats, value = "stats_f64", f"{float(literal.value)}f64"
+    else:
+        return "true"
+    return f"columnar::{stats}(rg, \"{column.name}\").map_or(true, |(min, max)| {conditions[name].format(value)})"
+
+
+def evaluate_partition_filter(node: Node, values: dict):
+    """
+    evaluate a filter predicate over the partition values of a file: returns None when the predicate
+    depends on something other than partition columns and literals, so the file must be read
+    """
+    comp_ops = {"Equals": lambda a, b: a == b, "NotEquals": lambda a, b: a != b,
+                "Greater": lambda a, b: a > b, "GreaterEqual": lambda a, b: a >= b,
+                "Less": lambda a, b: a < b, "LessEqual": lambda a, b: a <= b}
+
+    def operand(n: Node):
+        if isinstance(n, ops.TableColumn) and n.name in values:
+            return True, values[n.name]
+        if isinstance(n, ops.Literal):
+            return True, n.value
+        return False, None
+
+    if isinstance(node, ops.logical.Comparison) and type(node).__name__ in comp_ops:
+        (known_l, left), (known_r, right) = operand(node.left), operand(node.right)
+        if not (known_l and known_r):
+            return None
+        # null partition values never satisfy a comparison
+        if left is None or right is None:
+            return False
+        return comp_ops[type(node).__name__](left, right)
+    if isinstance(node, ops.And):
+        left, right = evaluate_partition_filter(node.left, values), evaluate_partition_filter(node.right, values)
+        if left is False or right is False:
+            return False
+        return True if left and right else None
+    if isinstance(node, ops.Or):
+        left, right = evaluate_partition_filter(node.left, values), evaluate_partition_filter(node.right, values)
+        if left or right:
+            return True
+        return False if left is False and right is False else None
+    return None
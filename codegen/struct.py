@@ -5,11 +5,16 @@ from ibis.expr.datatypes.core import DataType
 
 class Struct(object):
     name_counter = 0
-    ibis_to_noir_type = {"Int64": "i64", "String": "String", "Float64": "f64"}
-    last_complete_transform: "Struct"
+    # dates are kept as their iso string, which sorts and compares like the date
+    ibis_to_noir_type = {"Int64": "i64", "String": "String", "Float64": "f64",
+                         "Int8": "i8", "Int16": "i16", "Int32": "i32", "Date": "String", "Boolean": "bool"}
+    # last structs of the tables whose transforms are over, waiting to be joined: the most recent is on top
+    completed_transforms: list["Struct"] = []
     structs = []
     # copied when generating new structs: toggle if operator turns to keyed/un-keyed
     with_keyed_stream: dict[str, DataType] = None
+    # structs carry the time their row was ingested by the source, not serialized, to measure latency at the sink
+    measure_latency = False
 
     @classmethod
     def id_counter_to_name_short(cls, id_c: int) -> str:
@@ -87,13 +92,17 @@ class Struct(object):
     @classmethod
     def transform_completed(cls):
         if cls.some():
-            cls.last_complete_transform = cls.last()
+            cls.completed_transforms.append(cls.last())
+
+    @classmethod
+    def pop_complete_transform(cls) -> "Struct":
+        return cls.completed_transforms.pop()
 
     @classmethod
     def cleanup(cls):
         cls.name_counter = 0
         cls.structs = []
-        cls.last_complete_transform = None
+        cls.completed_transforms = []
         cls.with_keyed_stream = None
 
     def generate(self) -> str:
@@ -101,11 +110,22 @@ class Struct(object):
         # means that a None struct will be automatically turned, in the next struct with optional fields copying
         # the previous struct's fields into None fields
         body = f"#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]\nstruct {self.name_struct} {{"
-        for col, typ in self.cols_types.items():
-            body += f"{col}: {Struct.type_ibis_to_noir_str(typ.name, typ.nullable)},"
+        # fields are joined at once, as structs of wide tables have thousands of them
+        body += "".join(f"{col}: {Struct.type_ibis_to_noir_str(typ.name, typ.nullable)}," for col, typ in self.cols_types.items())
+        if Struct.measure_latency:
+            body += "#[serde(skip)]\ningest_ns: u64,"
         body += "}\n"
         return body
 
+    @classmethod
+    def latency_field(cls, ingest: str) -> str:
+        # initializer of the ingestion time field in a struct literal, only when measuring latency
+        return f"ingest_ns: {ingest}, " if cls.measure_latency else ""
+
+    @classmethod
+    def latency_update(cls, target: str, ingest: str) -> str:
+        return f"{target}.ingest_ns = {ingest}; " if cls.measure_latency else ""
+
     @property
     def columns(self):
         return list(self.cols_types.keys())
@@ -0,0 +1,77 @@
+"""
+Timeline of the compilation and execution of a query in chrome trace event format, which can be opened with
+chrome://tracing or https://ui.perfetto.dev: spans recorded here for code generation, cargo and the renoir
+processes are merged with those written by the generated code (noir_template/trace.rs)
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import codegen.utils as utl
+
+# spans written by each process of the generated code, suffixed with its host id when running on a cluster
+TRACE_PREFIX = "noir-trace"
+TRACE_FILE = "trace.json"
+
+enabled = False
+events: list[dict] = []
+
+
+def now_us() -> float:
+    # wall clock, as the generated code can't share a monotonic clock with python
+    return time.time_ns() / 1000
+
+
+def start():
+    global enabled
+    enabled = True
+    events.clear()
+
+
+def stop():
+    global enabled
+    enabled = False
+
+
+@contextmanager
+def span(name: str, cat: str = "codegen", **args):
+    if not enabled:
+        yield
+        return
+    begin = now_us()
+    try:
+        yield
+    finally:
+        events.append({"name": name, "cat": cat, "ph": "X", "ts": begin, "dur": now_us() - begin,
+                       "pid": os.getpid(), "tid": threading.get_ident(), "args": args})
+
+
+def write() -> str:
+    """
+    merge the spans recorded in python with those of the last run of the generated code: the time between
+    launching the binary and the first span of each of its processes is added as the process startup
+    """
+    merged = [{"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "python"}}] + events
+    runs = [e for e in events if e["name"] == "run"]
+    for file in sorted(glob.glob(f"{utl.OUT_DIR}/{TRACE_PREFIX}*.json")):
+        with open(file) as f:
+            renoir = json.load(f)
+        spans = [e for e in renoir if e["ph"] == "X"]
+        if not spans:
+            continue
+        pid = spans[0]["pid"]
+        merged.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"renoir {pid}"}})
+        merged += renoir
+        first = min(e["ts"] for e in spans)
+        if runs and runs[-1]["ts"] < first:
+            merged.append({"name": "process startup", "cat": "renoir", "ph": "X", "ts": runs[-1]["ts"],
+                           "dur": first - runs[-1]["ts"], "pid": pid, "tid": 0, "args": {}})
+
+    path = f"{utl.OUT_DIR}/{TRACE_FILE}"
+    with open(path, "w") as f:
+        json.dump({"traceEvents": merged, "displayTimeUnit": "ms"}, f)
+    return path
@@ -1,6 +1,74 @@
 import os
+import subprocess
+import sys
+import tempfile
 
 CODEGEN_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.dirname(CODEGEN_DIR)
 
 TAB_FILES = {}
+
+# crate where the generated code is written and built: processes building in parallel each use a copy of
+# noir_template (see codegen/workspace.py), while templates are always read from noir_template
+CRATE_DIR = ROOT_DIR + "/noir_template"
+# directory the generated binary runs from, reading ../data and writing ../out relative to it, and the output
+# directory it writes to: each test process can run in a sandbox with its own (see codegen/workspace.py)
+RUN_DIR = ROOT_DIR + "/noir_template"
+OUT_DIR = ROOT_DIR + "/out"
+
+# rust modules from noir_template required by the generated code, each optionally enabling a cargo feature
+# with the dependencies it needs: filled while generating and cleared before each compilation
+RUST_MODULES: dict[str, str] = {}
+
+
+def require_rust_module(name: str, feature: str = None):
+    RUST_MODULES[name] = feature
+
+
+def cargo_features() -> list[str]:
+    return sorted(set(f for f in RUST_MODULES.values() if f))
+
+
+# launches a command and writes its peak resident memory to a file: at exec the kernel accounts to a process the
+# peak memory of the one it was spawned from, so commands are spawned from this small interpreter (~8 MiB)
+# instead of the python process running the query, which can hold hundreds of MiB of tables
+PEAK_RSS_LAUNCHER = """import os, sys
+pid = os.posix_spawnp(sys.argv[2], sys.argv[2:], os.environ)
+_, status, rusage = os.wait4(pid, 0)
+with open(sys.argv[1], "w") as f:
+    f.write(str(rusage.ru_maxrss))
+sys.exit(os.waitstatus_to_exitcode(status) % 256)
+"""
+
+
+def popen_peak_rss(cmd: str | list[str], **kwargs) -> subprocess.Popen:
+    """
+    start the command (through the shell if it's a string) in its own process group, to be killed as a whole,
+    recording the peak resident memory of the command and of the descendants it waits for
+    """
+    if isinstance(cmd, str):
+        cmd = ["/bin/sh", "-c", cmd]
+    fd, rss_path = tempfile.mkstemp(suffix=".rss")
+    os.close(fd)
+    process = subprocess.Popen([sys.executable, "-S", "-c", PEAK_RSS_LAUNCHER, rss_path] + cmd,
+                               start_new_session=True, **kwargs)
+    process.rss_path = rss_path
+    return process
+
+
+def wait_peak_rss(process: subprocess.Popen, block=True) -> float | None:
+    """
+    wait for a process started by popen_peak_rss and return its peak resident memory in MiB (the maximum among
+    the command and its descendants, not their sum), or None if it's still running when not blocking
+    """
+    if block:
+        process.wait()
+    elif process.poll() is None:
+        return None
+    try:
+        with open(process.rss_path) as f:
+            # ru_maxrss is in KiB on linux, missing if the launcher was killed
+            content = f.read()
+        return int(content) / 1024 if content else -1
+    finally:
+        os.remove(process.rss_path)
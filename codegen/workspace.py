@@ -0,0 +1,75 @@
+"""
+Copies of the noir_template crate, so that multiple processes can generate and build queries at the same time:
+cargo locks the target directory while building, so each workspace has its own sources and target directory,
+seeded with the dependencies already built in noir_template so that only the generated crate is compiled.
+Sandboxes also run the generated code in isolation: a sandbox mirrors the repository around a workspace and an
+output directory of its own, so processes running tests in parallel don't overwrite each other's results
+"""
+
+import os
+import shutil
+
+import codegen.utils as utl
+
+WORKSPACES_DIR = utl.ROOT_DIR + "/noir_template/target/workspaces"
+SANDBOXES_DIR = utl.ROOT_DIR + "/noir_template/target/sandboxes"
+TEMPLATE_DIR = utl.ROOT_DIR + "/noir_template"
+
+
+def use_workspace(name: str) -> str:
+    """
+    generate and build code of this process in the workspace with the given name, creating it on first use:
+    binaries are still run from noir_template, as the generated code reads and writes files relative to it
+    """
+    crate = f"{WORKSPACES_DIR}/{name}"
+    if not os.path.isdir(crate):
+        create_workspace(crate)
+    utl.CRATE_DIR = crate
+    return crate
+
+
+def use_sandbox(name: str) -> str:
+    """
+    generate, build and run the code of this process in the sandbox with the given name, creating it on first use:
+    the generated code reads ../data and writes ../out relative to the crate, which are the repository's data and
+    the sandbox's own output directory
+    """
+    sandbox = f"{SANDBOXES_DIR}/{name}"
+    crate = sandbox + "/noir_template"
+    if not os.path.isdir(crate):
+        create_sandbox(sandbox)
+    utl.CRATE_DIR = crate
+    utl.RUN_DIR = crate
+    utl.OUT_DIR = sandbox + "/out"
+    return sandbox
+
+
+def use_default():
+    utl.CRATE_DIR = TEMPLATE_DIR
+    utl.RUN_DIR = TEMPLATE_DIR
+    utl.OUT_DIR = utl.ROOT_DIR + "/out"
+
+
+def create_sandbox(sandbox: str):
+    os.makedirs(sandbox + "/out", exist_ok=True)
+    # everything else in the repository, so that paths relative to the crate resolve as from noir_template
+    for entry in os.listdir(utl.ROOT_DIR):
+        link = f"{sandbox}/{entry}"
+        if entry not in ("noir_template", "out", ".git") and not os.path.lexists(link):
+            os.symlink(f"{utl.ROOT_DIR}/{entry}", link)
+    create_workspace(sandbox + "/noir_template")
+
+
+def create_workspace(crate: str):
+    tmp_crate = f"{crate}.{os.getpid()}.tmp"
+    os.makedirs(tmp_crate + "/src")
+    for file in ("Cargo.toml", "Cargo.lock"):
+        if os.path.isfile(f"{TEMPLATE_DIR}/{file}"):
+            # same lock file, so that dependencies resolve to the versions already built
+            shutil.copy2(f"{TEMPLATE_DIR}/{file}", tmp_crate)
+    release = f"{TEMPLATE_DIR}/target/release"
+    if os.path.isdir(release):
+        # the generated crate itself is rebuilt anyway, as its path changed
+        shutil.copytree(release, f"{tmp_crate}/target/release", symlinks=True,
+                        ignore=shutil.ignore_patterns("noir-template*", "noir_template*", "incremental"))
+    os.rename(tmp_crate, crate)
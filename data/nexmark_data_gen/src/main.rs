@@ -1,21 +1,36 @@
 use nexmark::config::NexmarkConfig;
 
-use std::fs::File;
+use std::env;
+use std::fs::{self, File};
+use std::io::BufRead;
+use std::io::BufReader;
 use std::io::BufWriter;
 use std::io::Write;
 use std::path::Path;
-use std::env;
+use std::thread;
 
-use serde::Serialize;
 use nexmark::event::*;
 
+const TABLES: [&str; 3] = ["bid", "person", "auction"];
+
 fn csv_writer(path: impl AsRef<Path>) -> csv::Writer<impl Write> {
     let file = File::create(path).unwrap();
     let writer = BufWriter::new(file);
     csv::WriterBuilder::new().from_writer(writer)
 }
 
-fn main() -> eyre::Result<()> {
+fn part_path(table_dir: &str, shard: usize) -> String {
+    format!("{table_dir}/part-{shard:04}.csv")
+}
+
+// each event only depends on its position in the stream, so each shard generates a contiguous range of
+// events: the shards concatenated in order are the same events generated by a single thread
+fn generate_shard(
+    table_dirs: &[String],
+    shard: usize,
+    start: usize,
+    len: usize,
+) -> eyre::Result<()> {
     let conf = NexmarkConfig {
         num_event_generators: 1,
         first_rate: 10_000_000,
@@ -23,12 +38,14 @@ fn main() -> eyre::Result<()> {
         ..Default::default()
     };
 
-    let size = env::args().collect::<Vec<_>>()[1].parse::<usize>().unwrap();
-    let mut bid = csv_writer(format!("../nexmark/bid_{}.csv", size));
-    let mut person = csv_writer(format!("../nexmark/person_{}.csv", size));
-    let mut auction = csv_writer(format!("../nexmark/auction_{}.csv", size));
+    let mut bid = csv_writer(part_path(&table_dirs[0], shard));
+    let mut person = csv_writer(part_path(&table_dirs[1], shard));
+    let mut auction = csv_writer(part_path(&table_dirs[2], shard));
 
-    for e in nexmark::EventGenerator::new(conf).take(size) {
+    for e in nexmark::EventGenerator::new(conf)
+        .with_offset(start as u64)
+        .take(len)
+    {
         match e {
             Event::Person(p) => {
                 person.serialize(p)?;
@@ -41,7 +58,90 @@ fn main() -> eyre::Result<()> {
             }
         }
     }
+    bid.flush()?;
+    person.flush()?;
+    auction.flush()?;
+    Ok(())
+}
+
+// join the parts of a table in a single file, keeping the header of the first part that has one: a part
+// is empty when its shard generated no event of the table
+fn concatenate(table_dir: &str, path: &str, shards: usize) -> eyre::Result<()> {
+    let mut out = BufWriter::new(File::create(path)?);
+    let mut header = false;
+    for shard in 0..shards {
+        let mut part = BufReader::new(File::open(part_path(table_dir, shard))?);
+        let mut first = String::new();
+        if part.read_line(&mut first)? == 0 {
+            continue;
+        }
+        if !header {
+            out.write_all(first.as_bytes())?;
+            header = true;
+        }
+        std::io::copy(&mut part, &mut out)?;
+    }
+    out.flush()?;
+    Ok(())
+}
+
+// usage: nexmark_data_gen <events> [--threads N] [--partitioned]
+// events are split between the threads (all cores by default), each writing its own part of each table.
+// Parts are then joined in ../nexmark/<table>_<events>.csv, or with --partitioned left as the csv files
+// of the directory ../nexmark/<table>_<events>/, one for each thread
+fn main() -> eyre::Result<()> {
+    let args = env::args().collect::<Vec<_>>();
+    let size = args[1].parse::<usize>().unwrap();
+    let threads = args
+        .iter()
+        .position(|a| a == "--threads")
+        .map(|i| args[i + 1].parse::<usize>().unwrap())
+        .unwrap_or_else(|| thread::available_parallelism().map_or(1, |n| n.get()))
+        .clamp(1, size.max(1));
+    let partitioned = args.iter().any(|a| a == "--partitioned");
+
+    let parts_dir = format!("../nexmark/.parts_{size}");
+    let table_dirs = TABLES
+        .iter()
+        .map(|table| match partitioned {
+            true => format!("../nexmark/{table}_{size}"),
+            false => format!("{parts_dir}/{table}"),
+        })
+        .collect::<Vec<_>>();
+    for dir in table_dirs.iter() {
+        if Path::new(dir).exists() {
+            fs::remove_dir_all(dir)?;
+        }
+        fs::create_dir_all(dir)?;
+    }
+
+    thread::scope(|s| {
+        let handles = (0..threads)
+            .map(|shard| {
+                let start = size * shard / threads;
+                let end = size * (shard + 1) / threads;
+                let table_dirs = &table_dirs;
+                s.spawn(move || generate_shard(table_dirs, shard, start, end - start))
+            })
+            .collect::<Vec<_>>();
+        handles.into_iter().try_for_each(|h| h.join().unwrap())
+    })?;
+
+    if !partitioned {
+        thread::scope(|s| {
+            let handles = TABLES
+                .iter()
+                .zip(table_dirs.iter())
+                .map(|(table, dir)| {
+                    let path = format!("../nexmark/{table}_{size}.csv");
+                    s.spawn(move || concatenate(dir, &path, threads))
+                })
+                .collect::<Vec<_>>();
+            handles.into_iter().try_for_each(|h| h.join().unwrap())
+        })?;
+        fs::remove_dir_all(&parts_dir)?;
+    }
 
     println!("Done generating Nexmark data.");
     Ok(())
-}
\ No newline at end of file
+}
@@ -1,40 +1,719 @@
-use std::path::Path;
-use clap::Parser;
+use clap::{Parser, ValueEnum};
 use std::fs::File;
-use std::io::{BufRead, BufReader, Write};
+use std::io::{BufWriter, Write};
+use std::os::unix::fs::FileExt;
+use std::path::Path;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::{Condvar, Mutex};
+use std::thread;
 
 #[derive(Parser)]
 #[command(about, long_about=None)]
 struct Args {
     dir: String,
-    #[arg(short, long, default_value=".tbl")]
+    #[arg(short, long, default_value = ".tbl")]
     pattern: String,
+    /// appended to the name of each table, e.g. `_sf1` to write lineitem_sf1.csv
+    #[arg(short, long, default_value = "")]
+    suffix: String,
+    /// formats written next to each table, e.g. `--format csv binary`
+    #[arg(short, long, value_enum, num_args=1.., default_values_t=[Format::Csv])]
+    format: Vec<Format>,
+    /// worker threads, all cores by default
+    #[arg(short, long)]
+    threads: Option<usize>,
+    /// size in MB of the byte ranges of a file converted by each worker
+    #[arg(long, default_value_t = 64)]
+    chunk_mb: usize,
+}
+
+#[derive(Clone, Copy, PartialEq, ValueEnum)]
+enum Format {
+    Csv,
+    /// the column-oriented format of codegen/binary_table.py, read by the renoir binary source
+    Binary,
+    /// read by the renoir parquet source, needs the `parquet` feature
+    Parquet,
+}
+
+#[derive(Clone, Copy, PartialEq)]
+enum Type {
+    Int,
+    Float,
+    Str,
+    // yyyy-mm-dd, a string in the csv and binary formats
+    Date,
+}
+
+use Type::*;
+
+// dbgen files have no header, while the tests read tables by column name
+fn columns(table: &str) -> Option<&'static [(&'static str, Type)]> {
+    match table {
+        "customer" => Some(&[
+            ("c_custkey", Int),
+            ("c_name", Str),
+            ("c_address", Str),
+            ("c_nationkey", Int),
+            ("c_phone", Str),
+            ("c_acctbal", Float),
+            ("c_mktsegment", Str),
+            ("c_comment", Str),
+        ]),
+        "lineitem" => Some(&[
+            ("l_orderkey", Int),
+            ("l_partkey", Int),
+            ("l_suppkey", Int),
+            ("l_linenumber", Int),
+            ("l_quantity", Int),
+            ("l_extendedprice", Float),
+            ("l_discount", Float),
+            ("l_tax", Float),
+            ("l_returnflag", Str),
+            ("l_linestatus", Str),
+            ("l_shipdate", Date),
+            ("l_commitdate", Date),
+            ("l_receiptdate", Date),
+            ("l_shipinstruct", Str),
+            ("l_shipmode", Str),
+            ("l_comment", Str),
+        ]),
+        "nation" => Some(&[
+            ("n_nationkey", Int),
+            ("n_name", Str),
+            ("n_regionkey", Int),
+            ("n_comment", Str),
+        ]),
+        "orders" => Some(&[
+            ("o_orderkey", Int),
+            ("o_custkey", Int),
+            ("o_orderstatus", Str),
+            ("o_totalprice", Float),
+            ("o_orderdate", Date),
+            ("o_orderpriority", Str),
+            ("o_clerk", Str),
+            ("o_shippriority", Int),
+            ("o_comment", Str),
+        ]),
+        "part" => Some(&[
+            ("p_partkey", Int),
+            ("p_name", Str),
+            ("p_mfgr", Str),
+            ("p_brand", Str),
+            ("p_type", Str),
+            ("p_size", Int),
+            ("p_container", Str),
+            ("p_retailprice", Float),
+            ("p_comment", Str),
+        ]),
+        "partsupp" => Some(&[
+            ("ps_partkey", Int),
+            ("ps_suppkey", Int),
+            ("ps_availqty", Int),
+            ("ps_supplycost", Float),
+            ("ps_comment", Str),
+        ]),
+        "region" => Some(&[("r_regionkey", Int), ("r_name", Str), ("r_comment", Str)]),
+        "supplier" => Some(&[
+            ("s_suppkey", Int),
+            ("s_name", Str),
+            ("s_address", Str),
+            ("s_nationkey", Int),
+            ("s_phone", Str),
+            ("s_acctbal", Float),
+            ("s_comment", Str),
+        ]),
+        _ => None,
+    }
+}
+
+struct Table {
+    input: File,
+    // path of the output without the extension
+    stem: String,
+    columns: Option<&'static [(&'static str, Type)]>,
+    // byte ranges starting at a line, converted independently
+    chunks: Vec<(u64, u64)>,
+}
+
+impl Table {
+    fn open(path: &str, pattern: &str, suffix: &str, chunk_size: u64) -> eyre::Result<Self> {
+        let input = File::open(path)?;
+        let len = input.metadata()?.len();
+        let mut starts = vec![0];
+        let mut window = [0u8; 4096];
+        let mut pos = chunk_size;
+        // each chunk starts after the first newline following the end of the previous one
+        while pos < len {
+            let read = input.read_at(&mut window, pos)?;
+            if read == 0 {
+                break;
+            }
+            match window[..read].iter().position(|&b| b == b'\n') {
+                Some(i) => {
+                    let start = pos + i as u64 + 1;
+                    if start < len {
+                        starts.push(start);
+                    }
+                    pos = start + chunk_size;
+                }
+                None => pos += read as u64,
+            }
+        }
+        let chunks = starts
+            .iter()
+            .zip(starts.iter().skip(1).chain([&len]))
+            .map(|(&s, &e)| (s, e))
+            .collect();
+        let table = Path::new(path).file_stem().unwrap().to_str().unwrap();
+        Ok(Self {
+            input,
+            stem: path.replace(pattern, suffix),
+            columns: columns(table),
+            chunks,
+        })
+    }
+
+    fn read_chunk(&self, chunk: usize, buf: &mut Vec<u8>) -> eyre::Result<()> {
+        let (start, end) = self.chunks[chunk];
+        buf.resize((end - start) as usize, 0);
+        self.input.read_exact_at(buf, start)?;
+        Ok(())
+    }
+}
+
+// output written by chunks converted in parallel: each waits for the previous chunks of the same file
+struct Ordered<W> {
+    next: Mutex<(usize, W)>,
+    turn: Condvar,
+}
+
+impl<W> Ordered<W> {
+    fn new(writer: W) -> Self {
+        Self {
+            next: Mutex::new((0, writer)),
+            turn: Condvar::new(),
+        }
+    }
+
+    fn write(&self, chunk: usize, f: impl FnOnce(&mut W) -> eyre::Result<()>) -> eyre::Result<()> {
+        let mut next = self
+            .turn
+            .wait_while(self.next.lock().unwrap(), |(n, _)| *n != chunk)
+            .unwrap();
+        let result = f(&mut next.1);
+        next.0 += 1;
+        self.turn.notify_all();
+        result
+    }
+
+    fn into_inner(self) -> W {
+        self.next.into_inner().unwrap().1
+    }
+}
+
+// run the job of each chunk of each table on the worker threads: chunks are taken in order, so the
+// chunks of a file are written with little waiting while small files are converted side by side
+fn for_each_chunk(
+    tables: &[&Table],
+    threads: usize,
+    job: impl Fn(usize, usize, &mut Vec<u8>) -> eyre::Result<()> + Sync,
+) -> eyre::Result<()> {
+    let jobs: Vec<(usize, usize)> = tables
+        .iter()
+        .enumerate()
+        .flat_map(|(t, table)| (0..table.chunks.len()).map(move |c| (t, c)))
+        .collect();
+    let next = AtomicUsize::new(0);
+    thread::scope(|s| {
+        let handles = (0..threads)
+            .map(|_| {
+                s.spawn(|| {
+                    // each worker reuses the same buffer for all of its chunks
+                    let mut buf = Vec::new();
+                    loop {
+                        let i = next.fetch_add(1, Ordering::Relaxed);
+                        let Some(&(t, c)) = jobs.get(i) else {
+                            return Ok(());
+                        };
+                        job(t, c, &mut buf)?;
+                    }
+                })
+            })
+            .collect::<Vec<_>>();
+        handles.into_iter().try_for_each(|h| h.join().unwrap())
+    })
+}
+
+// rewrite the delimiters in place: `,` inside values becomes `;`, the `|` separators become `,` and the
+// one at the end of each line is dropped
+fn convert_delimiters(buf: &mut Vec<u8>) {
+    let mut w = 0;
+    for r in 0..buf.len() {
+        let b = buf[r];
+        match b {
+            b'\n' if w > 0 && buf[w - 1] != b'\n' => buf[w - 1] = b'\n',
+            b',' => {
+                buf[w] = b';';
+                w += 1;
+            }
+            b'|' => {
+                buf[w] = b',';
+                w += 1;
+            }
+            _ => {
+                buf[w] = b;
+                w += 1;
+            }
+        }
+    }
+    // last line of the file without a newline
+    if w > 0 && buf[w - 1] != b'\n' {
+        buf[w - 1] = b'\n';
+    }
+    buf.truncate(w);
+}
+
+fn write_csv(tables: &[&Table], threads: usize) -> eyre::Result<()> {
+    let outputs = tables
+        .iter()
+        .map(|t| {
+            println!("Transforming file: {}.csv", t.stem);
+            let mut out = BufWriter::new(File::create(format!("{}.csv", t.stem))?);
+            if let Some(columns) = t.columns {
+                let names = columns.iter().map(|(c, _)| *c).collect::<Vec<_>>();
+                writeln!(out, "{}", names.join(","))?;
+            }
+            Ok(Ordered::new(out))
+        })
+        .collect::<eyre::Result<Vec<_>>>()?;
+    for_each_chunk(tables, threads, |t, c, buf| {
+        // the chunk takes its turn even when it can't be read, so the next ones don't wait forever
+        let read = tables[t].read_chunk(c, buf);
+        convert_delimiters(buf);
+        outputs[t].write(c, |out| {
+            read?;
+            Ok(out.write_all(buf)?)
+        })
+    })?;
+    for out in outputs {
+        out.into_inner().flush()?;
+    }
+    Ok(())
+}
+
+// fields of each line of a chunk, without the trailing `|`
+fn rows(buf: &[u8]) -> impl Iterator<Item = impl Iterator<Item = &[u8]>> {
+    buf.split(|&b| b == b'\n')
+        .filter(|line| !line.is_empty())
+        .map(|line| line[..line.len() - 1].split(|&b| b == b'|'))
+}
+
+fn parse<T: std::str::FromStr>(field: &[u8]) -> Option<T> {
+    std::str::from_utf8(field).ok()?.parse().ok()
+}
+
+// binary table, laid out as in codegen/binary_table.py
+mod binary {
+    use super::*;
+
+    const MAGIC: &[u8; 8] = b"RNRBIN01";
+
+    fn align(n: u64) -> u64 {
+        (n + 7) / 8 * 8
+    }
+
+    fn is_string(t: Type) -> bool {
+        matches!(t, Str | Date)
+    }
+
+    // rows of a chunk and bytes of each string column, to place every chunk before writing it
+    #[derive(Clone, Default)]
+    struct Sizes {
+        rows: u64,
+        bytes: Vec<u64>,
+    }
+
+    fn sizes(buf: &[u8], columns: &[(&str, Type)]) -> Sizes {
+        let mut sizes = Sizes {
+            rows: 0,
+            bytes: vec![0; columns.len()],
+        };
+        for row in rows(buf) {
+            sizes.rows += 1;
+            for ((field, (_, t)), bytes) in row.zip(columns).zip(sizes.bytes.iter_mut()) {
+                if is_string(*t) {
+                    *bytes += field.len() as u64;
+                }
+            }
+        }
+        sizes
+    }
+
+    // position in the file of the validity and data of each column
+    struct Layout {
+        validity: Vec<u64>,
+        data: Vec<u64>,
+        len: u64,
+    }
+
+    fn layout(columns: &[(&str, Type)], num_rows: u64, bytes: &[u64]) -> Layout {
+        let header = 24 + 32 * columns.len() as u64;
+        let names: u64 = columns.iter().map(|(c, _)| c.len() as u64).sum();
+        let (mut validity, mut data) = (vec![], vec![]);
+        let mut end = header + names;
+        for ((_, t), bytes) in columns.iter().zip(bytes) {
+            let offset = align(end);
+            validity.push(offset);
+            data.push(offset + align(num_rows));
+            end = offset
+                + align(num_rows)
+                + match is_string(*t) {
+                    true => 8 * (num_rows + 1) + bytes,
+                    false => 8 * num_rows,
+                };
+        }
+        Layout {
+            validity,
+            data,
+            len: end,
+        }
+    }
+
+    fn write_header(
+        out: &File,
+        columns: &[(&str, Type)],
+        num_rows: u64,
+        layout: &Layout,
+    ) -> eyre::Result<()> {
+        let mut header = MAGIC.to_vec();
+        header.extend(num_rows.to_le_bytes());
+        header.extend((columns.len() as u64).to_le_bytes());
+        let mut name_offset = 24 + 32 * columns.len() as u64;
+        for ((c, t), data) in columns.iter().zip(&layout.validity) {
+            let code: u64 = match t {
+                Int => 0,
+                Float => 1,
+                Str | Date => 2,
+            };
+            for v in [name_offset, c.len() as u64, code, *data] {
+                header.extend(v.to_le_bytes());
+            }
+            name_offset += c.len() as u64;
+        }
+        for (c, _) in columns {
+            header.extend(c.as_bytes());
+        }
+        out.write_all_at(&header, 0)?;
+        Ok(())
+    }
+
+    // columns of a chunk, written at the position of its first row
+    fn write_chunk(
+        out: &File,
+        buf: &[u8],
+        columns: &[(&str, Type)],
+        layout: &Layout,
+        num_rows: u64,
+        first_row: u64,
+        first_bytes: &[u64],
+    ) -> eyre::Result<()> {
+        let mut validity = vec![Vec::new(); columns.len()];
+        let mut values = vec![Vec::new(); columns.len()];
+        let mut strings = vec![Vec::new(); columns.len()];
+        let mut ends = first_bytes.to_vec();
+        for row in rows(buf) {
+            for (i, (field, (_, t))) in row.zip(columns).enumerate() {
+                // empty numbers are null, as when pyarrow reads the csv, strings are never null
+                let value = match t {
+                    Int => parse::<i64>(field).map(i64::to_le_bytes),
+                    Float => parse::<f64>(field).map(f64::to_le_bytes),
+                    Str | Date => {
+                        strings[i].extend(field.iter().map(|&b| if b == b',' { b';' } else { b }));
+                        ends[i] += field.len() as u64;
+                        Some(ends[i].to_le_bytes())
+                    }
+                };
+                values[i].extend(value.unwrap_or([0; 8]));
+                validity[i].push(value.is_some() as u8);
+            }
+        }
+        for (i, (_, t)) in columns.iter().enumerate() {
+            out.write_all_at(&validity[i], layout.validity[i] + first_row)?;
+            match is_string(*t) {
+                // offsets of the ends of the values, the first offset is the zero the file was created with
+                true => {
+                    out.write_all_at(&values[i], layout.data[i] + 8 * (first_row + 1))?;
+                    let bytes = layout.data[i] + 8 * (num_rows + 1) + first_bytes[i];
+                    out.write_all_at(&strings[i], bytes)?;
+                }
+                false => out.write_all_at(&values[i], layout.data[i] + 8 * first_row)?,
+            }
+        }
+        Ok(())
+    }
+
+    // a first pass counts the rows and string bytes of each chunk, then the chunks are converted in parallel
+    // and written directly at their position, holding no more than a chunk per worker in memory
+    pub fn write(tables: &[&Table], threads: usize) -> eyre::Result<()> {
+        let tables = tables
+            .iter()
+            .copied()
+            .filter(|t| match t.columns {
+                Some(_) => true,
+                None => {
+                    println!("Skipping {}: unknown column types", t.stem);
+                    false
+                }
+            })
+            .collect::<Vec<_>>();
+        let chunk_sizes = tables
+            .iter()
+            .map(|t| Mutex::new(vec![Sizes::default(); t.chunks.len()]))
+            .collect::<Vec<_>>();
+        for_each_chunk(&tables, threads, |t, c, buf| {
+            tables[t].read_chunk(c, buf)?;
+            let s = sizes(buf, tables[t].columns.unwrap());
+            chunk_sizes[t].lock().unwrap()[c] = s;
+            Ok(())
+        })?;
+
+        // start of each chunk in rows and string bytes
+        let mut starts = vec![];
+        let mut layouts = vec![];
+        let mut outputs = vec![];
+        for (table, sizes) in tables.iter().zip(chunk_sizes) {
+            let columns = table.columns.unwrap();
+            let sizes = sizes.into_inner().unwrap();
+            let mut start = Sizes {
+                rows: 0,
+                bytes: vec![0; columns.len()],
+            };
+            let mut table_starts = vec![];
+            for s in sizes {
+                table_starts.push(start.clone());
+                start.rows += s.rows;
+                start
+                    .bytes
+                    .iter_mut()
+                    .zip(&s.bytes)
+                    .for_each(|(a, b)| *a += b);
+            }
+            let layout = layout(columns, start.rows, &start.bytes);
+            println!("Transforming file: {}.rbin", table.stem);
+            // write to a temporary file and rename, so readers never map a partially written table
+            let out = File::create(format!("{}.rbin.tmp", table.stem))?;
+            out.set_len(layout.len)?;
+            write_header(&out, columns, start.rows, &layout)?;
+            starts.push((start.rows, table_starts));
+            layouts.push(layout);
+            outputs.push(out);
+        }
+        for_each_chunk(&tables, threads, |t, c, buf| {
+            tables[t].read_chunk(c, buf)?;
+            let (num_rows, starts) = &starts[t];
+            let start = &starts[c];
+            let columns = tables[t].columns.unwrap();
+            write_chunk(
+                &outputs[t],
+                buf,
+                columns,
+                &layouts[t],
+                *num_rows,
+                start.rows,
+                &start.bytes,
+            )
+        })?;
+        for table in tables {
+            std::fs::rename(
+                format!("{}.rbin.tmp", table.stem),
+                format!("{}.rbin", table.stem),
+            )?;
+        }
+        Ok(())
+    }
+}
+
+// parquet file with the schema pyarrow infers from the csv, dates included, written in row groups of
+// 128K rows as by the test conversion: chunks are parsed to record batches in parallel and written in order
+#[cfg(feature = "parquet")]
+mod parquet_table {
+    use super::*;
+    use arrow::array::{ArrayRef, Date32Builder, Float64Builder, Int64Builder, StringBuilder};
+    use arrow::datatypes::{DataType, Field, Schema};
+    use arrow::record_batch::RecordBatch;
+    use parquet::arrow::ArrowWriter;
+    use parquet::file::properties::WriterProperties;
+    use std::sync::Arc;
+
+    enum Builder {
+        Int(Int64Builder),
+        Float(Float64Builder),
+        Str(StringBuilder),
+        Date(Date32Builder),
+    }
+
+    // days since 1970-01-01 of a yyyy-mm-dd date
+    fn days(date: &[u8]) -> Option<i32> {
+        let (y, m, d) = (
+            parse::<i64>(date.get(0..4)?)?,
+            parse::<i64>(date.get(5..7)?)?,
+            parse::<i64>(date.get(8..10)?)?,
+        );
+        let y = if m <= 2 { y - 1 } else { y };
+        let era = y.div_euclid(400);
+        let yoe = y - era * 400;
+        let doy = (153 * (m + if m > 2 { -3 } else { 9 }) + 2) / 5 + d - 1;
+        let doe = yoe * 365 + yoe / 4 - yoe / 100 + doy;
+        Some((era * 146097 + doe - 719468) as i32)
+    }
+
+    fn schema(columns: &[(&str, Type)]) -> Arc<Schema> {
+        let fields = columns.iter().map(|(c, t)| {
+            let t = match t {
+                Int => DataType::Int64,
+                Float => DataType::Float64,
+                Str => DataType::Utf8,
+                Date => DataType::Date32,
+            };
+            Field::new(*c, t, true)
+        });
+        Arc::new(Schema::new(fields.collect::<Vec<_>>()))
+    }
+
+    fn batch(
+        buf: &[u8],
+        columns: &[(&str, Type)],
+        schema: Arc<Schema>,
+    ) -> eyre::Result<RecordBatch> {
+        let mut builders = columns
+            .iter()
+            .map(|(_, t)| match t {
+                Int => Builder::Int(Int64Builder::new()),
+                Float => Builder::Float(Float64Builder::new()),
+                Str => Builder::Str(StringBuilder::new()),
+                Date => Builder::Date(Date32Builder::new()),
+            })
+            .collect::<Vec<_>>();
+        let mut value = Vec::new();
+        for row in rows(buf) {
+            for (field, builder) in row.zip(builders.iter_mut()) {
+                match builder {
+                    Builder::Int(b) => b.append_option(parse(field)),
+                    Builder::Float(b) => b.append_option(parse(field)),
+                    Builder::Date(b) => b.append_option(days(field)),
+                    Builder::Str(b) => {
+                        value.clear();
+                        value.extend(field.iter().map(|&b| if b == b',' { b';' } else { b }));
+                        b.append_value(std::str::from_utf8(&value)?);
+                    }
+                }
+            }
+        }
+        let arrays = builders
+            .into_iter()
+            .map(|b| -> ArrayRef {
+                match b {
+                    Builder::Int(mut b) => Arc::new(b.finish()),
+                    Builder::Float(mut b) => Arc::new(b.finish()),
+                    Builder::Str(mut b) => Arc::new(b.finish()),
+                    Builder::Date(mut b) => Arc::new(b.finish()),
+                }
+            })
+            .collect();
+        Ok(RecordBatch::try_new(schema, arrays)?)
+    }
+
+    pub fn write(tables: &[&Table], threads: usize) -> eyre::Result<()> {
+        let props = WriterProperties::builder()
+            .set_max_row_group_size(128 * 1024)
+            .build();
+        let writers = tables
+            .iter()
+            .map(|t| match t.columns {
+                Some(columns) => {
+                    println!("Transforming file: {}.parquet", t.stem);
+                    let out = File::create(format!("{}.parquet.tmp", t.stem))?;
+                    let writer = ArrowWriter::try_new(out, schema(columns), Some(props.clone()))?;
+                    Ok(Some(Ordered::new(writer)))
+                }
+                None => {
+                    println!("Skipping {}: unknown column types", t.stem);
+                    Ok(None)
+                }
+            })
+            .collect::<eyre::Result<Vec<_>>>()?;
+        for_each_chunk(tables, threads, |t, c, buf| {
+            let (Some(writer), Some(columns)) = (&writers[t], tables[t].columns) else {
+                return Ok(());
+            };
+            let batch = tables[t]
+                .read_chunk(c, buf)
+                .and_then(|_| batch(buf, columns, schema(columns)));
+            writer.write(c, |w| Ok(w.write(&batch?)?))
+        })?;
+        for (table, writer) in tables.iter().zip(writers) {
+            if let Some(writer) = writer {
+                writer.into_inner().close()?;
+                std::fs::rename(
+                    format!("{}.parquet.tmp", table.stem),
+                    format!("{}.parquet", table.stem),
+                )?;
+            }
+        }
+        Ok(())
+    }
+}
+
+#[cfg(not(feature = "parquet"))]
+mod parquet_table {
+    use super::*;
+
+    pub fn write(_tables: &[&Table], _threads: usize) -> eyre::Result<()> {
+        eyre::bail!(
+            "parquet output needs the `parquet` feature: cargo run --release --features parquet"
+        )
+    }
 }
 
 fn main() -> eyre::Result<()> {
     let args = Args::parse();
     let dir = Path::new(&args.dir);
-    
+    let threads = args
+        .threads
+        .unwrap_or_else(|| thread::available_parallelism().map_or(1, |n| n.get()))
+        .max(1);
+    let chunk_size = (args.chunk_mb.max(1) << 20) as u64;
+
     let file_list: Vec<_> = std::fs::read_dir(dir)?
-        .map(|e| e.unwrap().path().as_os_str().to_os_string().into_string().unwrap())
+        .map(|e| {
+            e.unwrap()
+                .path()
+                .as_os_str()
+                .to_os_string()
+                .into_string()
+                .unwrap()
+        })
         .filter(|n| n.contains(&args.pattern))
         .collect();
+    let tables = file_list
+        .iter()
+        .map(|f| Table::open(f, &args.pattern, &args.suffix, chunk_size))
+        .collect::<eyre::Result<Vec<_>>>()?;
+    let tables = tables.iter().collect::<Vec<_>>();
 
-    for f in &file_list {
-        print!("Transforming file: {}\n", f);
-        let new_file = f.replace(&args.pattern, ".csv");
-        let original_file = File::open(f)?;
-        let reader = BufReader::new(original_file);
-        let mut new_file = File::create(new_file)?;
-
-        for line in reader.lines() {
-            let line = line?;
-            let modified_line = line.replace(",", ";").replace("|", ",");
-            let modified_line = modified_line[..modified_line.len() - 1].to_string();
-            writeln!(new_file, "{}", modified_line)?;
+    // the binary and parquet files are written after the csv, so the tests don't find them older and convert again
+    for format in [Format::Csv, Format::Binary, Format::Parquet] {
+        if !args.format.contains(&format) {
+            continue;
+        }
+        match format {
+            Format::Csv => write_csv(&tables, threads)?,
+            Format::Binary => binary::write(&tables, threads)?,
+            Format::Parquet => parquet_table::write(&tables, threads)?,
         }
     }
 
     println!("Done generating data.");
     Ok(())
-}
\ No newline at end of file
+}
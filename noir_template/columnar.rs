@@ -0,0 +1,140 @@
+// helpers used by generated sources reading parquet and arrow ipc files: copied next to the generated
+// main.rs when needed, and built with the `columnar` feature
+use arrow::array::{Array, AsArray, Date32Array, Float64Array, Int64Array, StringArray};
+use arrow::datatypes::{Date32Type, Float64Type, Int64Type};
+use arrow::ipc::reader::FileReader;
+use arrow::record_batch::RecordBatch;
+use arrow::temporal_conversions::date32_to_datetime;
+use parquet::arrow::arrow_reader::ParquetRecordBatchReaderBuilder;
+use parquet::arrow::ProjectionMask;
+use parquet::file::metadata::RowGroupMetaData;
+use parquet::file::statistics::Statistics;
+use std::fs::File;
+
+const BATCH_SIZE: usize = 16000;
+
+// read only the projected columns of the row groups assigned to this replica that may contain matching rows
+pub fn parquet_batches(
+    path: &str,
+    columns: &[&str],
+    replica: u64,
+    replicas: u64,
+    keep: impl Fn(&RowGroupMetaData) -> bool,
+) -> impl Iterator<Item = RecordBatch> {
+    let builder = ParquetRecordBatchReaderBuilder::try_new(File::open(path).unwrap()).unwrap();
+    let metadata = builder.metadata().clone();
+    let roots: Vec<usize> = builder
+        .parquet_schema()
+        .root_schema()
+        .get_fields()
+        .iter()
+        .enumerate()
+        .filter(|(_, f)| columns.contains(&f.name()))
+        .map(|(i, _)| i)
+        .collect();
+    let mask = ProjectionMask::roots(builder.parquet_schema(), roots);
+    let row_groups: Vec<usize> = (0..metadata.num_row_groups())
+        .filter(|i| *i as u64 % replicas == replica)
+        .filter(|i| keep(metadata.row_group(*i)))
+        .collect();
+    builder
+        .with_projection(mask)
+        .with_row_groups(row_groups)
+        .with_batch_size(BATCH_SIZE)
+        .build()
+        .unwrap()
+        .map(|b| b.unwrap())
+}
+
+// arrow ipc files have no statistics, so replicas just split the record batches
+pub fn ipc_batches(
+    path: &str,
+    columns: &[&str],
+    replica: u64,
+    replicas: u64,
+) -> impl Iterator<Item = RecordBatch> {
+    let schema = FileReader::try_new(File::open(path).unwrap(), None)
+        .unwrap()
+        .schema();
+    let projection: Vec<usize> = columns
+        .iter()
+        .filter_map(|c| schema.index_of(c).ok())
+        .collect();
+    let mut reader = FileReader::try_new(File::open(path).unwrap(), Some(projection)).unwrap();
+    let mut batches = (0..reader.num_batches()).filter(move |i| *i as u64 % replicas == replica);
+    std::iter::from_fn(move || {
+        let i = batches.next()?;
+        reader.set_index(i).unwrap();
+        reader.next().map(|b| b.unwrap())
+    })
+}
+
+fn statistics<'a>(rg: &'a RowGroupMetaData, column: &str) -> Option<&'a Statistics> {
+    rg.columns()
+        .iter()
+        .find(|c| c.column_descr().name() == column)
+        .and_then(|c| c.statistics())
+}
+
+pub fn stats_i64(rg: &RowGroupMetaData, column: &str) -> Option<(i64, i64)> {
+    match statistics(rg, column)? {
+        Statistics::Int64(s) if s.has_min_max_set() => Some((*s.min(), *s.max())),
+        _ => None,
+    }
+}
+
+pub fn stats_f64(rg: &RowGroupMetaData, column: &str) -> Option<(f64, f64)> {
+    match statistics(rg, column)? {
+        Statistics::Double(s) if s.has_min_max_set() => Some((*s.min(), *s.max())),
+        _ => None,
+    }
+}
+
+// columns that were not projected are missing from the batch and produce None values
+pub fn column_i64(batch: &RecordBatch, name: &str) -> Option<Int64Array> {
+    batch
+        .column_by_name(name)
+        .map(|c| c.as_primitive::<Int64Type>().clone())
+}
+
+pub fn column_f64(batch: &RecordBatch, name: &str) -> Option<Float64Array> {
+    batch
+        .column_by_name(name)
+        .map(|c| c.as_primitive::<Float64Type>().clone())
+}
+
+pub fn column_str(batch: &RecordBatch, name: &str) -> Option<StringArray> {
+    batch
+        .column_by_name(name)
+        .map(|c| c.as_string::<i32>().clone())
+}
+
+pub fn column_date(batch: &RecordBatch, name: &str) -> Option<Date32Array> {
+    batch
+        .column_by_name(name)
+        .map(|c| c.as_primitive::<Date32Type>().clone())
+}
+
+pub fn value_i64(column: &Option<Int64Array>, i: usize) -> Option<i64> {
+    column.as_ref().filter(|c| c.is_valid(i)).map(|c| c.value(i))
+}
+
+pub fn value_f64(column: &Option<Float64Array>, i: usize) -> Option<f64> {
+    column.as_ref().filter(|c| c.is_valid(i)).map(|c| c.value(i))
+}
+
+pub fn value_str(column: &Option<StringArray>, i: usize) -> Option<String> {
+    column
+        .as_ref()
+        .filter(|c| c.is_valid(i))
+        .map(|c| c.value(i).to_string())
+}
+
+// dates are yyyy-mm-dd strings in the generated structs
+pub fn value_date(column: &Option<Date32Array>, i: usize) -> Option<String> {
+    column
+        .as_ref()
+        .filter(|c| c.is_valid(i))
+        .and_then(|c| date32_to_datetime(c.value(i)))
+        .map(|d| d.date().to_string())
+}
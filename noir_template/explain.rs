@@ -0,0 +1,78 @@
+// per-operator counters for explain analyze: copied next to the generated main.rs when profiling the query.
+// Each operator is wrapped by probes counting the rows entering and leaving it, and the time spent by a row
+// between the two when they run on the same thread (operators that shuffle rows don't get a time)
+use std::cell::RefCell;
+use std::fs::File;
+use std::io::{BufWriter, Write};
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::OnceLock;
+use std::time::Instant;
+
+#[derive(Default)]
+struct Counters {
+    rows_in: AtomicU64,
+    rows_out: AtomicU64,
+    time_ns: AtomicU64,
+}
+
+static COUNTERS: OnceLock<Vec<Counters>> = OnceLock::new();
+
+thread_local! {
+    // when the last row entered each operator on this thread
+    static ENTERED: RefCell<Vec<Option<Instant>>> = const { RefCell::new(Vec::new()) };
+}
+
+// allocates the counters of the operators of the plan, before building the graph
+pub fn init(operators: usize) {
+    COUNTERS.get_or_init(|| (0..operators).map(|_| Counters::default()).collect());
+}
+
+fn counters(op: usize) -> &'static Counters {
+    &COUNTERS.get().expect("explain::init not called")[op]
+}
+
+pub fn rows_in(op: usize) {
+    counters(op).rows_in.fetch_add(1, Ordering::Relaxed);
+    ENTERED.with(|e| {
+        let mut e = e.borrow_mut();
+        if e.len() <= op {
+            e.resize(op + 1, None);
+        }
+        e[op] = Some(Instant::now());
+    });
+}
+
+pub fn rows_out(op: usize) {
+    let counters = counters(op);
+    counters.rows_out.fetch_add(1, Ordering::Relaxed);
+    ENTERED.with(|e| {
+        if let Some(Some(t)) = e.borrow().get(op) {
+            counters.time_ns.fetch_add(t.elapsed().as_nanos() as u64, Ordering::Relaxed);
+        }
+    });
+}
+
+// operators are tagged with (python operator, ibis node, index of the node in the plan), each process
+// of a cluster writes its own counters, summed when reading them
+pub fn write_json(prefix: &str, operators: &[(&str, &str, usize)]) {
+    let path = match std::env::var("RENOIR_HOST_ID") {
+        Ok(id) => format!("{prefix}-{id}.json"),
+        Err(_) => format!("{prefix}.json"),
+    };
+    let mut writer = BufWriter::new(File::create(path).unwrap());
+    writeln!(writer, "[").unwrap();
+    for (i, (operator, node, plan_index)) in operators.iter().enumerate() {
+        let sep = if i + 1 < operators.len() { "," } else { "" };
+        writeln!(
+            writer,
+            "{{\"operator\": \"{operator}\", \"node\": \"{node}\", \"plan_index\": {plan_index}, \
+             \"rows_in\": {}, \"rows_out\": {}, \"time_ns\": {}}}{sep}",
+            counters(i).rows_in.load(Ordering::Relaxed),
+            counters(i).rows_out.load(Ordering::Relaxed),
+            counters(i).time_ns.load(Ordering::Relaxed)
+        )
+        .unwrap();
+    }
+    writeln!(writer, "]").unwrap();
+    writer.flush().unwrap();
+}
@@ -0,0 +1,102 @@
+// reader for the column-oriented binary tables written by codegen/binary_table.py: the file is memory-mapped,
+// so only the pages of the columns actually read are loaded, and they are shared with other processes
+// reading the same table. Copied next to the generated main.rs when needed, built with the `binary` feature
+use memmap2::Mmap;
+use std::fs::File;
+use std::sync::Arc;
+
+const MAGIC: &[u8; 8] = b"RNRBIN01";
+
+fn read_u64(mmap: &Mmap, pos: usize) -> usize {
+    u64::from_le_bytes(mmap[pos..pos + 8].try_into().unwrap()) as usize
+}
+
+pub struct BinaryTable {
+    mmap: Arc<Mmap>,
+    num_rows: usize,
+    // (name, data offset) of each column
+    columns: Vec<(String, usize)>,
+}
+
+impl BinaryTable {
+    pub fn open(path: &str) -> Self {
+        let file = File::open(path).unwrap();
+        let mmap = unsafe { Mmap::map(&file).unwrap() };
+        assert_eq!(&mmap[0..8], MAGIC, "{path} is not a binary table");
+        let num_rows = read_u64(&mmap, 8);
+        let columns = (0..read_u64(&mmap, 16))
+            .map(|i| {
+                let entry = 24 + 32 * i;
+                let (name_offset, name_len) = (read_u64(&mmap, entry), read_u64(&mmap, entry + 8));
+                let name = std::str::from_utf8(&mmap[name_offset..name_offset + name_len])
+                    .unwrap()
+                    .to_string();
+                (name, read_u64(&mmap, entry + 24))
+            })
+            .collect();
+        Self {
+            mmap: Arc::new(mmap),
+            num_rows,
+            columns,
+        }
+    }
+
+    // contiguous range of rows read by a replica
+    pub fn rows(&self, replica: u64, replicas: u64) -> std::ops::Range<usize> {
+        let chunk = (self.num_rows + replicas as usize - 1) / replicas as usize;
+        let start = (chunk * replica as usize).min(self.num_rows);
+        start..(start + chunk).min(self.num_rows)
+    }
+
+    pub fn column(&self, name: &str) -> Column {
+        let offset = self
+            .columns
+            .iter()
+            .find(|(c, _)| c == name)
+            .unwrap_or_else(|| panic!("column {name} missing from binary table"))
+            .1;
+        Column {
+            mmap: self.mmap.clone(),
+            validity: offset,
+            data: offset + (self.num_rows + 7) / 8 * 8,
+            num_rows: self.num_rows,
+        }
+    }
+}
+
+pub struct Column {
+    mmap: Arc<Mmap>,
+    validity: usize,
+    data: usize,
+    num_rows: usize,
+}
+
+impl Column {
+    fn is_valid(&self, i: usize) -> bool {
+        self.mmap[self.validity + i] != 0
+    }
+
+    pub fn i64(&self, i: usize) -> Option<i64> {
+        let pos = self.data + 8 * i;
+        self.is_valid(i)
+            .then(|| i64::from_le_bytes(self.mmap[pos..pos + 8].try_into().unwrap()))
+    }
+
+    pub fn f64(&self, i: usize) -> Option<f64> {
+        let pos = self.data + 8 * i;
+        self.is_valid(i)
+            .then(|| f64::from_le_bytes(self.mmap[pos..pos + 8].try_into().unwrap()))
+    }
+
+    pub fn str(&self, i: usize) -> Option<String> {
+        if !self.is_valid(i) {
+            return None;
+        }
+        let bytes = self.data + 8 * (self.num_rows + 1);
+        let (start, end) = (
+            read_u64(&self.mmap, self.data + 8 * i),
+            read_u64(&self.mmap, self.data + 8 * (i + 1)),
+        );
+        Some(String::from_utf8_lossy(&self.mmap[bytes + start..bytes + end]).into_owned())
+    }
+}
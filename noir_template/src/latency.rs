@@ -0,0 +1,71 @@
+// end-to-end latency of each output row, from the moment its newest input row was ingested: copied next to
+// the generated main.rs when measuring latency. Latencies are counted in a log-linear histogram, exact up to
+// 128ns and then with 64 buckets per power of two (<1.6% error), so recording is a single atomic increment
+use std::fs::File;
+use std::io::{BufWriter, Write};
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::OnceLock;
+use std::time::{SystemTime, UNIX_EPOCH};
+
+const SUB_BITS: u32 = 7;
+const SUB_BUCKETS: u64 = 1 << (SUB_BITS - 1);
+const NUM_BUCKETS: usize = (64 - SUB_BITS as usize + 2) * SUB_BUCKETS as usize;
+
+static BUCKETS: OnceLock<Vec<AtomicU64>> = OnceLock::new();
+
+fn buckets() -> &'static Vec<AtomicU64> {
+    BUCKETS.get_or_init(|| (0..NUM_BUCKETS).map(|_| AtomicU64::new(0)).collect())
+}
+
+// wall clock, so that latencies are comparable across the processes of a cluster
+pub fn now_ns() -> u64 {
+    SystemTime::now()
+        .duration_since(UNIX_EPOCH)
+        .map(|d| d.as_nanos() as u64)
+        .unwrap_or(0)
+}
+
+fn index(v: u64) -> usize {
+    if v < 2 * SUB_BUCKETS {
+        return v as usize;
+    }
+    let shift = 64 - v.leading_zeros() - SUB_BITS;
+    (shift as u64 * SUB_BUCKETS + (v >> shift)) as usize
+}
+
+// highest latency counted in a bucket
+fn upper_bound(i: usize) -> u64 {
+    let i = i as u64;
+    if i < 2 * SUB_BUCKETS {
+        return i;
+    }
+    let shift = i / SUB_BUCKETS - 1;
+    let base = i % SUB_BUCKETS + SUB_BUCKETS;
+    ((base + 1) << shift).wrapping_sub(1)
+}
+
+// rows whose ingestion time is unknown (0) are not counted
+pub fn record(ingest_ns: u64) {
+    if ingest_ns == 0 {
+        return;
+    }
+    let latency = now_ns().saturating_sub(ingest_ns);
+    buckets()[index(latency)].fetch_add(1, Ordering::Relaxed);
+}
+
+// each process of a cluster writes its own histogram, summed when reading them
+pub fn write_histogram(prefix: &str) {
+    let path = match std::env::var("RENOIR_HOST_ID") {
+        Ok(id) => format!("{prefix}-{id}.csv"),
+        Err(_) => format!("{prefix}.csv"),
+    };
+    let mut writer = BufWriter::new(File::create(path).unwrap());
+    writeln!(writer, "bucket_ns,count").unwrap();
+    for (i, count) in buckets().iter().enumerate() {
+        let count = count.load(Ordering::Relaxed);
+        if count > 0 {
+            writeln!(writer, "{},{}", upper_bound(i), count).unwrap();
+        }
+    }
+    writer.flush().unwrap();
+}
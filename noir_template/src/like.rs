@@ -0,0 +1,39 @@
+// sql LIKE patterns: copied next to the generated main.rs when a filter uses them. `%` matches any
+// sequence of characters and `_` a single one, matched greedily backtracking only to the last `%`
+pub fn like(value: &str, pattern: &str) -> bool {
+    let (v, p) = (value.as_bytes(), pattern.as_bytes());
+    let (mut i, mut j) = (0, 0);
+    // position in the pattern after the last `%` and in the value where it started matching
+    let mut retry: Option<(usize, usize)> = None;
+    while i < v.len() {
+        if j < p.len() && p[j] == b'%' {
+            j += 1;
+            retry = Some((j, i));
+        } else if j < p.len() && p[j] == b'_' {
+            i += char_len(v[i]);
+            j += 1;
+        } else if j < p.len() && p[j] == v[i] {
+            i += 1;
+            j += 1;
+        } else if let Some((rj, ri)) = retry {
+            // the last `%` takes one more character
+            let ri = ri + char_len(v[ri]);
+            retry = Some((rj, ri));
+            i = ri;
+            j = rj;
+        } else {
+            return false;
+        }
+    }
+    p[j..].iter().all(|&c| c == b'%')
+}
+
+// length of the utf-8 character starting with the given byte
+fn char_len(first: u8) -> usize {
+    match first {
+        0x00..=0x7f => 1,
+        0xc0..=0xdf => 2,
+        0xe0..=0xef => 3,
+        _ => 4,
+    }
+}
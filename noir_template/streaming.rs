@@ -0,0 +1,181 @@
+// unbounded sources and continuous sinks: copied next to the generated main.rs when needed,
+// and built with the `streaming` feature
+use nexmark::config::NexmarkConfig;
+use nexmark::event::Event;
+use serde::de::DeserializeOwned;
+use serde::Serialize;
+use std::fs::File;
+use std::io::{BufWriter, Read, Write};
+use std::net::TcpStream;
+use std::os::unix::net::UnixStream;
+use std::sync::mpsc::{sync_channel, RecvTimeoutError, SyncSender};
+use std::thread::JoinHandle;
+use std::time::{Duration, Instant};
+
+const POLL_INTERVAL: Duration = Duration::from_millis(10);
+const FLUSH_INTERVAL: Duration = Duration::from_millis(100);
+
+// returns the data appended to a file, waiting for more when reaching its end: the stream ends
+// when nothing is appended for `idle_timeout`, or never if there's no timeout
+struct TailReader {
+    file: File,
+    idle_timeout: Option<Duration>,
+}
+
+impl Read for TailReader {
+    fn read(&mut self, buf: &mut [u8]) -> std::io::Result<usize> {
+        let start = Instant::now();
+        loop {
+            let n = self.file.read(buf)?;
+            if n > 0 || buf.is_empty() {
+                return Ok(n);
+            }
+            if self.idle_timeout.is_some_and(|t| start.elapsed() >= t) {
+                return Ok(0);
+            }
+            std::thread::sleep(POLL_INTERVAL);
+        }
+    }
+}
+
+fn csv_rows<T: DeserializeOwned>(reader: impl Read) -> impl Iterator<Item = T> {
+    csv::Reader::from_reader(reader)
+        .into_deserialize::<T>()
+        .map(|r| r.unwrap())
+}
+
+pub fn tail_csv<T: DeserializeOwned>(
+    path: &str,
+    idle_timeout_ms: Option<u64>,
+) -> impl Iterator<Item = T> {
+    let reader = TailReader {
+        file: File::open(path).unwrap(),
+        idle_timeout: idle_timeout_ms.map(Duration::from_millis),
+    };
+    csv_rows(reader)
+}
+
+// csv rows (with header) sent by a server until it closes the connection
+pub fn tcp_csv<T: DeserializeOwned>(address: &str) -> impl Iterator<Item = T> {
+    csv_rows(TcpStream::connect(address).unwrap())
+}
+
+pub fn unix_csv<T: DeserializeOwned>(path: &str) -> impl Iterator<Item = T> {
+    csv_rows(UnixStream::connect(path).unwrap())
+}
+
+// same configuration as data/nexmark_data_gen, so the first events are the same as in the generated files
+pub fn nexmark_events(events: Option<usize>) -> impl Iterator<Item = Event> {
+    let conf = NexmarkConfig {
+        num_event_generators: 1,
+        first_rate: 10_000_000,
+        next_rate: 10_000_000,
+        ..Default::default()
+    };
+    nexmark::EventGenerator::new(conf).take(events.unwrap_or(usize::MAX))
+}
+
+// yields the items at most at the given rate, or as fast as possible without a rate
+pub fn throttle<T>(
+    iter: impl Iterator<Item = T>,
+    events_per_sec: Option<u64>,
+) -> impl Iterator<Item = T> {
+    let start = Instant::now();
+    iter.enumerate().map(move |(i, x)| {
+        if let Some(rate) = events_per_sec {
+            let due = start + Duration::from_secs_f64(i as f64 / rate as f64);
+            let now = Instant::now();
+            if due > now {
+                std::thread::sleep(due - now);
+            }
+        }
+        x
+    })
+}
+
+pub struct Sink<T> {
+    sender: SyncSender<T>,
+}
+
+impl<T> Clone for Sink<T> {
+    fn clone(&self) -> Self {
+        Self {
+            sender: self.sender.clone(),
+        }
+    }
+}
+
+impl<T> Sink<T> {
+    pub fn send(&self, x: T) {
+        self.sender.send(x).unwrap();
+    }
+}
+
+pub struct SinkWriter {
+    handle: JoinHandle<()>,
+}
+
+impl SinkWriter {
+    // wait for all rows to be written: all senders must have been dropped, i.e. the execution ended
+    pub fn finish(self) {
+        self.handle.join().unwrap();
+    }
+}
+
+// rows are written by a separate thread as they arrive, through a channel holding at most `capacity` rows:
+// when the writer falls behind the channel fills up and the replicas sending to it block (back-pressure).
+// output is flushed whenever no rows arrive for a while, and every second the number of rows written
+// so far is appended to `throughput_path`
+pub fn continuous_sink<T: Serialize + Send + 'static>(
+    path: &str,
+    throughput_path: &str,
+    header: &[&str],
+    capacity: usize,
+) -> (Sink<T>, SinkWriter) {
+    let (sender, receiver) = sync_channel::<T>(capacity);
+    let mut writer = csv::WriterBuilder::new()
+        .has_headers(false)
+        .from_path(path)
+        .unwrap();
+    writer.write_record(header).unwrap();
+    writer.flush().unwrap();
+    let mut throughput = BufWriter::new(File::create(throughput_path).unwrap());
+    writeln!(throughput, "elapsed_s,rows,rows_per_s").unwrap();
+
+    let handle = std::thread::spawn(move || {
+        let start = Instant::now();
+        let (mut total, mut window, mut window_start) = (0u64, 0u64, start);
+        let mut log = |total: u64, window: u64, window_start: Instant| {
+            let rate = window as f64 / window_start.elapsed().as_secs_f64();
+            writeln!(
+                throughput,
+                "{:.3},{},{:.1}",
+                start.elapsed().as_secs_f64(),
+                total,
+                rate
+            )
+            .unwrap();
+            throughput.flush().unwrap();
+        };
+        loop {
+            match receiver.recv_timeout(FLUSH_INTERVAL) {
+                Ok(x) => {
+                    writer.serialize(x).unwrap();
+                    total += 1;
+                    window += 1;
+                }
+                Err(RecvTimeoutError::Timeout) => writer.flush().unwrap(),
+                Err(RecvTimeoutError::Disconnected) => break,
+            }
+            if window_start.elapsed() >= Duration::from_secs(1) {
+                writer.flush().unwrap();
+                log(total, window, window_start);
+                window = 0;
+                window_start = Instant::now();
+            }
+        }
+        writer.flush().unwrap();
+        log(total, window, window_start);
+    });
+    (Sink { sender }, SinkWriter { handle })
+}
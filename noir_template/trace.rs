@@ -0,0 +1,142 @@
+// timeline of the execution in chrome trace event format, merged by python with the spans of code generation
+// and compilation: copied next to the generated main.rs when tracing the query. Operators are wrapped by probes
+// tracking on each thread (one for each replica of a block) when the first row entered and the last row left
+// them, so that each operator appears as a span for each of its replicas
+use std::cell::RefCell;
+use std::fs::File;
+use std::io::{BufWriter, Write};
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::Mutex;
+use std::time::{SystemTime, UNIX_EPOCH};
+
+struct Span {
+    name: String,
+    op: Option<usize>,
+    ts: u64,
+    dur: u64,
+    tid: u64,
+    rows: u64,
+}
+
+static SPANS: Mutex<Vec<Span>> = Mutex::new(Vec::new());
+static OPEN: Mutex<Vec<(String, u64)>> = Mutex::new(Vec::new());
+static THREADS: Mutex<Vec<(u64, String)>> = Mutex::new(Vec::new());
+static NEXT_TID: AtomicU64 = AtomicU64::new(1);
+
+// wall clock in microseconds, so that spans line up with those recorded by python
+pub fn now_us() -> u64 {
+    SystemTime::now()
+        .duration_since(UNIX_EPOCH)
+        .map(|d| d.as_micros() as u64)
+        .unwrap_or(0)
+}
+
+pub fn begin(name: &str) {
+    OPEN.lock().unwrap().push((name.to_string(), now_us()));
+}
+
+pub fn end() {
+    if let Some((name, ts)) = OPEN.lock().unwrap().pop() {
+        SPANS.lock().unwrap().push(Span {
+            name,
+            op: None,
+            ts,
+            dur: now_us().saturating_sub(ts),
+            tid: 0,
+            rows: 0,
+        });
+    }
+}
+
+// (first row in, last row out, rows out) of each operator on a thread, flushed when the thread exits
+struct Activity {
+    tid: u64,
+    ops: Vec<Option<(u64, u64, u64)>>,
+}
+
+impl Activity {
+    fn get(&mut self, op: usize, now: u64) -> &mut (u64, u64, u64) {
+        if self.ops.len() <= op {
+            self.ops.resize(op + 1, None);
+        }
+        self.ops[op].get_or_insert((now, now, 0))
+    }
+}
+
+impl Drop for Activity {
+    fn drop(&mut self) {
+        let mut spans = SPANS.lock().unwrap();
+        for (op, activity) in self.ops.iter().enumerate() {
+            if let Some((first, last, rows)) = activity {
+                spans.push(Span {
+                    name: String::new(),
+                    op: Some(op),
+                    ts: *first,
+                    dur: last.saturating_sub(*first),
+                    tid: self.tid,
+                    rows: *rows,
+                });
+            }
+        }
+    }
+}
+
+thread_local! {
+    static ACTIVITY: RefCell<Activity> = RefCell::new({
+        let tid = NEXT_TID.fetch_add(1, Ordering::Relaxed);
+        let name = std::thread::current().name().unwrap_or("worker").to_string();
+        THREADS.lock().unwrap().push((tid, name));
+        Activity { tid, ops: Vec::new() }
+    });
+}
+
+pub fn rows_in(op: usize) {
+    let now = now_us();
+    ACTIVITY.with(|a| {
+        a.borrow_mut().get(op, now);
+    });
+}
+
+pub fn rows_out(op: usize) {
+    let now = now_us();
+    ACTIVITY.with(|a| {
+        let mut a = a.borrow_mut();
+        let activity = a.get(op, now);
+        activity.1 = now;
+        activity.2 += 1;
+    });
+}
+
+// operators are tagged with (python operator, ibis node, index of the node in the plan), each process
+// of a cluster writes its own spans
+pub fn write_json(prefix: &str, operators: &[(&str, &str, usize)]) {
+    let path = match std::env::var("RENOIR_HOST_ID") {
+        Ok(id) => format!("{prefix}-{id}.json"),
+        Err(_) => format!("{prefix}.json"),
+    };
+    let pid = std::process::id();
+    let mut events = vec![format!(
+        "{{\"name\": \"thread_name\", \"ph\": \"M\", \"pid\": {pid}, \"tid\": 0, \"args\": {{\"name\": \"main\"}}}}"
+    )];
+    for (tid, name) in THREADS.lock().unwrap().iter() {
+        events.push(format!(
+            "{{\"name\": \"thread_name\", \"ph\": \"M\", \"pid\": {pid}, \"tid\": {tid}, \"args\": {{\"name\": \"{name}\"}}}}"
+        ));
+    }
+    for span in SPANS.lock().unwrap().iter() {
+        let (name, args) = match span.op.and_then(|op| operators.get(op)) {
+            Some((operator, node, plan_index)) => (
+                format!("{operator} ({node})"),
+                format!("{{\"rows\": {}, \"plan_index\": {plan_index}}}", span.rows),
+            ),
+            None => (span.name.clone(), "{}".to_string()),
+        };
+        events.push(format!(
+            "{{\"name\": \"{name}\", \"cat\": \"renoir\", \"ph\": \"X\", \"ts\": {}, \"dur\": {}, \"pid\": {pid}, \"tid\": {}, \"args\": {args}}}",
+            span.ts, span.dur, span.tid
+        ));
+    }
+    let mut writer = BufWriter::new(File::create(path).unwrap());
+    writeln!(writer, "[\n{}\n]", events.join(",\n")).unwrap();
+    writer.flush().unwrap();
+}
@@ -1,3 +1,4 @@
 from .test_base import TestCompiler
 from .test_operators import *
-from .test_nexmark import *
\ No newline at end of file
+from .test_nexmark import *
+from .test_tpch import *
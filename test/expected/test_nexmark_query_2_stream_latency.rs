@@ -0,0 +1,98 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+mod latency;
+mod streaming;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    auction: Option<i64>,
+    bidder: Option<i64>,
+    price: Option<i64>,
+    channel: Option<String>,
+    url: Option<String>,
+    date_time: Option<i64>,
+    extra: Option<String>,
+    #[serde(skip)]
+    ingest_ns: u64,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    auction: Option<i64>,
+    price: Option<i64>,
+    #[serde(skip)]
+    ingest_ns: u64,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_iter(
+            streaming::throttle(streaming::nexmark_events(Some(1000)), None).filter_map(
+                |e| match e {
+                    nexmark::event::Event::Bid(e) => Some(Struct_var_0 {
+                        auction: Some(e.auction as i64),
+                        bidder: Default::default(),
+                        price: Some(e.price as i64),
+                        channel: Default::default(),
+                        url: Default::default(),
+                        date_time: Default::default(),
+                        extra: Default::default(),
+                        ingest_ns: 0,
+                    }),
+                    _ => None,
+                },
+            ),
+        )
+        .batch_mode(BatchMode::adaptive(
+            1024,
+            std::time::Duration::from_millis(10),
+        ))
+        .map(|mut x| {
+            x.ingest_ns = latency::now_ns();
+            x
+        });
+    let var_1 = var_0
+        .filter(|x| {
+            x.auction.clone().is_some_and(|v| v == 1007)
+                | x.auction.clone().is_some_and(|v| v == 1020)
+                | x.auction.clone().is_some_and(|v| v == 2001)
+                | x.auction.clone().is_some_and(|v| v == 2019)
+                | x.auction.clone().is_some_and(|v| v == 2087)
+        })
+        .map(|x| Struct_var_1 {
+            auction: x.auction,
+            price: x.price,
+            ingest_ns: x.ingest_ns,
+        });
+    let (sink, writer) = streaming::continuous_sink(
+        "../out/noir-result.csv",
+        "../out/noir-throughput.csv",
+        &["auction", "price"],
+        1024,
+    );
+    var_1
+        .inspect(|x| latency::record(x.ingest_ns))
+        .for_each(move |x| sink.send(x));
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+    writer.finish();
+    latency::write_histogram("../out/noir-latency");
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
@@ -0,0 +1,67 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+mod arrow_sink;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    int1: Option<i64>,
+    string1: Option<String>,
+    int4: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    string1: Option<String>,
+    int1_agg: Option<i64>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/nullable_op/ints_strings.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_1 = var_0
+        .group_by(|x| (x.string1.clone()))
+        .reduce(|a, b| {
+            a.int1 = a.int1.zip(b.int1).map(|(x, y)| x + y);
+        })
+        .map(|(k, x)| Struct_var_1 {
+            string1: k.clone(),
+            int1_agg: x.int1,
+        });
+    let result = var_1.collect_vec();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+    if let Some(rows) = result.get() {
+        arrow_sink::write_ipc(
+            "../out/noir-result.arrow",
+            vec![
+                (
+                    "string1",
+                    arrow_sink::str_column(rows.iter().map(|x| x.1.string1.clone())),
+                ),
+                (
+                    "int1_agg",
+                    arrow_sink::i64_column(rows.iter().map(|x| x.1.int1_agg.clone())),
+                ),
+            ],
+        );
+    }
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
@@ -0,0 +1,69 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    int1: Option<i64>,
+    string1: Option<String>,
+    int4: Option<i64>,
+    d: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    int1: Option<i64>,
+    d: Option<String>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_par_iter(move |id, instances| {
+            let files = vec![(
+                "../data/nullable_op/ints_strings_date_partitioned/d=2020-01-02/part-0.csv",
+                (Some(String::from("2020-01-02")),),
+            )];
+            files
+                .into_iter()
+                .enumerate()
+                .filter(move |(i, _)| *i as u64 % instances == id)
+                .flat_map(|(_, (path, part))| {
+                    csv::Reader::from_path(path)
+                        .unwrap()
+                        .into_deserialize::<Struct_var_0>()
+                        .map(move |r| {
+                            let mut x = r.unwrap();
+                            x.d = part.0.clone();
+                            x
+                        })
+                })
+        })
+        .batch_mode(BatchMode::fixed(16000));
+    let var_1 = var_0
+        .filter(|x| x.d.as_deref().is_some_and(|v| v > "2020-01-01"))
+        .map(|x| Struct_var_1 {
+            int1: x.int1,
+            d: x.d,
+        });
+    var_1.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
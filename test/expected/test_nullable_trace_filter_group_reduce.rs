@@ -0,0 +1,78 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+mod trace;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    int1: Option<i64>,
+    string1: Option<String>,
+    int4: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    string1: Option<String>,
+    int1_agg: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_collect {
+    string1: Option<String>,
+}
+
+fn logic(ctx: StreamContext) {
+    trace::begin("building graph");
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/nullable_op/ints_strings.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_1 = var_0
+        .inspect(|_| trace::rows_out(0))
+        .inspect(|_| trace::rows_in(1))
+        .filter(|x| x.int1.clone().is_some_and(|v| v > 200))
+        .inspect(|_| trace::rows_out(1))
+        .inspect(|_| trace::rows_in(2))
+        .group_by(|x| (x.string1.clone()))
+        .reduce(|a, b| {
+            a.int1 = a.int1.zip(b.int1).map(|(x, y)| x + y);
+        })
+        .map(|(k, x)| Struct_var_1 {
+            string1: k.clone(),
+            int1_agg: x.int1,
+        })
+        .inspect(|_| trace::rows_out(2));
+    var_1
+        .map(|(k, v)| (Struct_collect { string1: k.clone() }, v))
+        .drop_key()
+        .write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    trace::end();
+    trace::begin("execution");
+    ctx.execute_blocking();
+    trace::end();
+    trace::write_json(
+        "../out/noir-trace",
+        &[
+            ("DatabaseOperator", "DatabaseTable", 1),
+            ("FilterOperator", "Aggregation", 7),
+            ("GroupReduceOperator", "Aggregation", 7),
+        ],
+    );
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
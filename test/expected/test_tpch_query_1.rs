@@ -0,0 +1,265 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    disc_price: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    disc_price: Option<f64>,
+    charge: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    sum_qty: Option<i64>,
+    sum_base_price: Option<f64>,
+    sum_disc_price: Option<f64>,
+    sum_charge: Option<f64>,
+    avg_qty: Option<f64>,
+    avg_price: Option<f64>,
+    avg_disc: Option<f64>,
+    count_order: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    sum_qty: Option<i64>,
+    sum_base_price: Option<f64>,
+    sum_disc_price: Option<f64>,
+    sum_charge: Option<f64>,
+    avg_qty: Option<f64>,
+    avg_price: Option<f64>,
+    avg_disc: Option<f64>,
+    count_order: Option<i64>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/lineitem.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_4 = var_0
+        .filter(|x| x.l_shipdate.as_deref().is_some_and(|v| v <= "1998-09-02"))
+        .map(|x| Struct_var_1 {
+            l_orderkey: x.l_orderkey,
+            l_partkey: x.l_partkey,
+            l_suppkey: x.l_suppkey,
+            l_linenumber: x.l_linenumber,
+            l_quantity: x.l_quantity,
+            l_extendedprice: x.l_extendedprice,
+            l_discount: x.l_discount,
+            l_tax: x.l_tax,
+            l_returnflag: x.l_returnflag,
+            l_linestatus: x.l_linestatus,
+            l_shipdate: x.l_shipdate,
+            l_commitdate: x.l_commitdate,
+            l_receiptdate: x.l_receiptdate,
+            l_shipinstruct: x.l_shipinstruct,
+            l_shipmode: x.l_shipmode,
+            l_comment: x.l_comment,
+            disc_price: x
+                .l_extendedprice
+                .zip(x.l_discount.map(|v| 1 as f64 - v as f64))
+                .map(|(a, b)| a as f64 * b as f64),
+        })
+        .map(|x| Struct_var_2 {
+            l_orderkey: x.l_orderkey,
+            l_partkey: x.l_partkey,
+            l_suppkey: x.l_suppkey,
+            l_linenumber: x.l_linenumber,
+            l_quantity: x.l_quantity,
+            l_extendedprice: x.l_extendedprice,
+            l_discount: x.l_discount,
+            l_tax: x.l_tax,
+            l_returnflag: x.l_returnflag,
+            l_linestatus: x.l_linestatus,
+            l_shipdate: x.l_shipdate,
+            l_commitdate: x.l_commitdate,
+            l_receiptdate: x.l_receiptdate,
+            l_shipinstruct: x.l_shipinstruct,
+            l_shipmode: x.l_shipmode,
+            l_comment: x.l_comment,
+            disc_price: x.disc_price,
+            charge: x
+                .disc_price
+                .zip(x.l_tax.map(|v| v as f64 + 1 as f64))
+                .map(|(a, b)| a as f64 * b as f64),
+        })
+        .group_by_fold(
+            |x| (x.l_returnflag.clone(), x.l_linestatus.clone()),
+            (
+                None::<i64>,
+                None::<f64>,
+                None::<f64>,
+                None::<f64>,
+                (0f64, 0i64),
+                (0f64, 0i64),
+                (0f64, 0i64),
+                0i64,
+            ),
+            |acc, x| {
+                if let Some(v) = x.l_quantity.clone() {
+                    *acc.0.get_or_insert_with(Default::default) += v;
+                }
+                if let Some(v) = x.l_extendedprice.clone() {
+                    *acc.1.get_or_insert_with(Default::default) += v;
+                }
+                if let Some(v) = x.disc_price.clone() {
+                    *acc.2.get_or_insert_with(Default::default) += v;
+                }
+                if let Some(v) = x.charge.clone() {
+                    *acc.3.get_or_insert_with(Default::default) += v;
+                }
+                if let Some(v) = x.l_quantity.clone() {
+                    acc.4 .0 += v as f64;
+                    acc.4 .1 += 1;
+                }
+                if let Some(v) = x.l_extendedprice.clone() {
+                    acc.5 .0 += v as f64;
+                    acc.5 .1 += 1;
+                }
+                if let Some(v) = x.l_discount.clone() {
+                    acc.6 .0 += v as f64;
+                    acc.6 .1 += 1;
+                }
+                acc.7 += 1;
+            },
+            |acc, y| {
+                if let Some(v) = y.0 {
+                    *acc.0.get_or_insert_with(Default::default) += v;
+                }
+                if let Some(v) = y.1 {
+                    *acc.1.get_or_insert_with(Default::default) += v;
+                }
+                if let Some(v) = y.2 {
+                    *acc.2.get_or_insert_with(Default::default) += v;
+                }
+                if let Some(v) = y.3 {
+                    *acc.3.get_or_insert_with(Default::default) += v;
+                }
+                acc.4 .0 += y.4 .0;
+                acc.4 .1 += y.4 .1;
+                acc.5 .0 += y.5 .0;
+                acc.5 .1 += y.5 .1;
+                acc.6 .0 += y.6 .0;
+                acc.6 .1 += y.6 .1;
+                acc.7 += y.7;
+            },
+        )
+        .map(|(k, acc)| Struct_var_3 {
+            l_returnflag: k.0.clone(),
+            l_linestatus: k.1.clone(),
+            sum_qty: acc.0,
+            sum_base_price: acc.1,
+            sum_disc_price: acc.2,
+            sum_charge: acc.3,
+            avg_qty: (acc.4 .1 > 0).then(|| acc.4 .0 / acc.4 .1 as f64),
+            avg_price: (acc.5 .1 > 0).then(|| acc.5 .0 / acc.5 .1 as f64),
+            avg_disc: (acc.6 .1 > 0).then(|| acc.6 .0 / acc.6 .1 as f64),
+            count_order: Some(acc.7),
+        })
+        .drop_key()
+        .fold(Vec::new(), |v, x| v.push(x))
+        .flat_map(|mut v| {
+            v.sort_by(|a, b| {
+                a.l_returnflag
+                    .partial_cmp(&b.l_returnflag)
+                    .unwrap_or(std::cmp::Ordering::Equal)
+                    .then_with(|| {
+                        a.l_linestatus
+                            .partial_cmp(&b.l_linestatus)
+                            .unwrap_or(std::cmp::Ordering::Equal)
+                    })
+            });
+            v
+        })
+        .map(|x| Struct_var_4 {
+            l_returnflag: x.l_returnflag,
+            l_linestatus: x.l_linestatus,
+            sum_qty: x.sum_qty,
+            sum_base_price: x.sum_base_price,
+            sum_disc_price: x.sum_disc_price,
+            sum_charge: x.sum_charge,
+            avg_qty: x.avg_qty,
+            avg_price: x.avg_price,
+            avg_disc: x.avg_disc,
+            count_order: x.count_order,
+        });
+    var_4.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
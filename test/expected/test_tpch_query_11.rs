@@ -0,0 +1,398 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_5 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+    value: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_6 {
+    total: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_7 {
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_8 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_9 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_10 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_11 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_12 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+    value: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_13 {
+    ps_partkey: Option<i64>,
+    value: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_14 {
+    ps_partkey: Option<i64>,
+    value: Option<f64>,
+    total: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_15 {
+    ps_partkey: Option<i64>,
+    value: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_16 {
+    ps_partkey: Option<i64>,
+    value: Option<f64>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/nation.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_0 = var_0;
+    let var_1 = ctx
+        .stream_csv::<Struct_var_1>("../data/tpch/supplier.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_1 = var_1;
+    let var_2 = ctx
+        .stream_csv::<Struct_var_2>("../data/tpch/partsupp.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_6 = var_2
+        .join(var_1, |x| x.ps_suppkey.clone(), |y| y.s_suppkey.clone())
+        .map(|(_, x)| Struct_var_3 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            s_suppkey: x.1.s_suppkey,
+            s_name: x.1.s_name,
+            s_address: x.1.s_address,
+            s_nationkey: x.1.s_nationkey,
+            s_phone: x.1.s_phone,
+            s_acctbal: x.1.s_acctbal,
+            s_comment: x.1.s_comment,
+        })
+        .drop_key()
+        .join(var_0, |x| x.s_nationkey.clone(), |y| y.n_nationkey.clone())
+        .map(|(_, x)| Struct_var_4 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            n_nationkey: x.1.n_nationkey,
+            n_name: x.1.n_name,
+            n_regionkey: x.1.n_regionkey,
+            n_comment: x.1.n_comment,
+        })
+        .filter(|(_, x)| x.n_name.clone().is_some_and(|v| v == "GERMANY"))
+        .map(|(_, x)| Struct_var_5 {
+            ps_partkey: x.ps_partkey,
+            ps_suppkey: x.ps_suppkey,
+            ps_availqty: x.ps_availqty,
+            ps_supplycost: x.ps_supplycost,
+            ps_comment: x.ps_comment,
+            s_suppkey: x.s_suppkey,
+            s_name: x.s_name,
+            s_address: x.s_address,
+            s_nationkey: x.s_nationkey,
+            s_phone: x.s_phone,
+            s_acctbal: x.s_acctbal,
+            s_comment: x.s_comment,
+            n_nationkey: x.n_nationkey,
+            n_name: x.n_name,
+            n_regionkey: x.n_regionkey,
+            n_comment: x.n_comment,
+            value: x
+                .ps_supplycost
+                .zip(x.ps_availqty)
+                .map(|(a, b)| a as f64 * b as f64),
+        })
+        .drop_key()
+        .reduce(|a, b| Struct_var_5 {
+            value: a.value.zip(b.value).map(|(x, y)| x + y),
+            ..a
+        })
+        .map(|x| Struct_var_6 { total: x.value });
+    let var_7 = ctx
+        .stream_csv::<Struct_var_7>("../data/tpch/nation.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_7 = var_7;
+    let var_8 = ctx
+        .stream_csv::<Struct_var_8>("../data/tpch/supplier.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_8 = var_8;
+    let var_9 = ctx
+        .stream_csv::<Struct_var_9>("../data/tpch/partsupp.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_16 = var_9
+        .join(var_8, |x| x.ps_suppkey.clone(), |y| y.s_suppkey.clone())
+        .map(|(_, x)| Struct_var_10 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            s_suppkey: x.1.s_suppkey,
+            s_name: x.1.s_name,
+            s_address: x.1.s_address,
+            s_nationkey: x.1.s_nationkey,
+            s_phone: x.1.s_phone,
+            s_acctbal: x.1.s_acctbal,
+            s_comment: x.1.s_comment,
+        })
+        .drop_key()
+        .join(var_7, |x| x.s_nationkey.clone(), |y| y.n_nationkey.clone())
+        .map(|(_, x)| Struct_var_11 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            n_nationkey: x.1.n_nationkey,
+            n_name: x.1.n_name,
+            n_regionkey: x.1.n_regionkey,
+            n_comment: x.1.n_comment,
+        })
+        .filter(|(_, x)| x.n_name.clone().is_some_and(|v| v == "GERMANY"))
+        .map(|(_, x)| Struct_var_12 {
+            ps_partkey: x.ps_partkey,
+            ps_suppkey: x.ps_suppkey,
+            ps_availqty: x.ps_availqty,
+            ps_supplycost: x.ps_supplycost,
+            ps_comment: x.ps_comment,
+            s_suppkey: x.s_suppkey,
+            s_name: x.s_name,
+            s_address: x.s_address,
+            s_nationkey: x.s_nationkey,
+            s_phone: x.s_phone,
+            s_acctbal: x.s_acctbal,
+            s_comment: x.s_comment,
+            n_nationkey: x.n_nationkey,
+            n_name: x.n_name,
+            n_regionkey: x.n_regionkey,
+            n_comment: x.n_comment,
+            value: x
+                .ps_supplycost
+                .zip(x.ps_availqty)
+                .map(|(a, b)| a as f64 * b as f64),
+        })
+        .drop_key()
+        .group_by(|x| (x.ps_partkey.clone()))
+        .reduce(|a, b| {
+            a.value = a.value.zip(b.value).map(|(x, y)| x + y);
+        })
+        .map(|(k, x)| Struct_var_13 {
+            ps_partkey: k.clone(),
+            value: x.value,
+        })
+        .drop_key()
+        .join(var_6, |_| (), |_| ())
+        .map(|(_, x)| Struct_var_14 {
+            ps_partkey: x.0.ps_partkey,
+            value: x.0.value,
+            total: x.1.total,
+        })
+        .drop_key()
+        .filter(|x| {
+            x.value
+                .clone()
+                .zip(x.total.map(|v| v as f64 * 0.0001 as f64).clone())
+                .map_or(false, |(a, b)| a > b)
+        })
+        .map(|x| Struct_var_15 {
+            ps_partkey: x.ps_partkey,
+            value: x.value,
+        })
+        .fold(Vec::new(), |v, x| v.push(x))
+        .flat_map(|mut v| {
+            v.sort_by(|a, b| {
+                b.value
+                    .partial_cmp(&a.value)
+                    .unwrap_or(std::cmp::Ordering::Equal)
+            });
+            v
+        })
+        .map(|x| Struct_var_16 {
+            ps_partkey: x.ps_partkey,
+            value: x.value,
+        });
+    var_16.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
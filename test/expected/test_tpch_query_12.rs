@@ -0,0 +1,332 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    low_line: Option<i8>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    low_line: Option<i8>,
+    high_line: Option<i8>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_5 {
+    l_shipmode: Option<String>,
+    high_line_count: Option<i64>,
+    low_line_count: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_6 {
+    l_shipmode: Option<String>,
+    high_line_count: Option<i64>,
+    low_line_count: Option<i64>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/lineitem.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_0 = var_0;
+    let var_1 = ctx
+        .stream_csv::<Struct_var_1>("../data/tpch/orders.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_6 = var_1
+        .join(var_0, |x| x.o_orderkey.clone(), |y| y.l_orderkey.clone())
+        .map(|(_, x)| Struct_var_2 {
+            o_orderkey: x.0.o_orderkey,
+            o_custkey: x.0.o_custkey,
+            o_orderstatus: x.0.o_orderstatus,
+            o_totalprice: x.0.o_totalprice,
+            o_orderdate: x.0.o_orderdate,
+            o_orderpriority: x.0.o_orderpriority,
+            o_clerk: x.0.o_clerk,
+            o_shippriority: x.0.o_shippriority,
+            o_comment: x.0.o_comment,
+            l_orderkey: x.1.l_orderkey,
+            l_partkey: x.1.l_partkey,
+            l_suppkey: x.1.l_suppkey,
+            l_linenumber: x.1.l_linenumber,
+            l_quantity: x.1.l_quantity,
+            l_extendedprice: x.1.l_extendedprice,
+            l_discount: x.1.l_discount,
+            l_tax: x.1.l_tax,
+            l_returnflag: x.1.l_returnflag,
+            l_linestatus: x.1.l_linestatus,
+            l_shipdate: x.1.l_shipdate,
+            l_commitdate: x.1.l_commitdate,
+            l_receiptdate: x.1.l_receiptdate,
+            l_shipinstruct: x.1.l_shipinstruct,
+            l_shipmode: x.1.l_shipmode,
+            l_comment: x.1.l_comment,
+        })
+        .filter(|(_, x)| {
+            x.l_commitdate
+                .clone()
+                .zip(x.l_receiptdate.clone())
+                .map_or(false, |(a, b)| a < b)
+        })
+        .filter(|(_, x)| {
+            x.l_shipdate
+                .clone()
+                .zip(x.l_commitdate.clone())
+                .map_or(false, |(a, b)| a < b)
+        })
+        .filter(|(_, x)| {
+            x.l_receiptdate
+                .as_deref()
+                .is_some_and(|v| v >= "1994-01-01")
+        })
+        .filter(|(_, x)| x.l_receiptdate.as_deref().is_some_and(|v| v < "1995-01-01"))
+        .filter(|(_, x)| {
+            x.l_shipmode
+                .as_deref()
+                .is_some_and(|v| ["MAIL", "SHIP"].contains(&v))
+        })
+        .map(|(_, x)| Struct_var_3 {
+            low_line: if !(x
+                .o_orderpriority
+                .as_deref()
+                .is_some_and(|v| ["1-URGENT", "2-HIGH"].contains(&v)))
+            {
+                Some(1)
+            } else {
+                Some(0)
+            },
+            o_orderkey: x.o_orderkey,
+            o_custkey: x.o_custkey,
+            o_orderstatus: x.o_orderstatus,
+            o_totalprice: x.o_totalprice,
+            o_orderdate: x.o_orderdate,
+            o_orderpriority: x.o_orderpriority,
+            o_clerk: x.o_clerk,
+            o_shippriority: x.o_shippriority,
+            o_comment: x.o_comment,
+            l_orderkey: x.l_orderkey,
+            l_partkey: x.l_partkey,
+            l_suppkey: x.l_suppkey,
+            l_linenumber: x.l_linenumber,
+            l_quantity: x.l_quantity,
+            l_extendedprice: x.l_extendedprice,
+            l_discount: x.l_discount,
+            l_tax: x.l_tax,
+            l_returnflag: x.l_returnflag,
+            l_linestatus: x.l_linestatus,
+            l_shipdate: x.l_shipdate,
+            l_commitdate: x.l_commitdate,
+            l_receiptdate: x.l_receiptdate,
+            l_shipinstruct: x.l_shipinstruct,
+            l_shipmode: x.l_shipmode,
+            l_comment: x.l_comment,
+        })
+        .map(|(_, x)| Struct_var_4 {
+            high_line: if x
+                .o_orderpriority
+                .as_deref()
+                .is_some_and(|v| ["1-URGENT", "2-HIGH"].contains(&v))
+            {
+                Some(1)
+            } else {
+                Some(0)
+            },
+            o_orderkey: x.o_orderkey,
+            o_custkey: x.o_custkey,
+            o_orderstatus: x.o_orderstatus,
+            o_totalprice: x.o_totalprice,
+            o_orderdate: x.o_orderdate,
+            o_orderpriority: x.o_orderpriority,
+            o_clerk: x.o_clerk,
+            o_shippriority: x.o_shippriority,
+            o_comment: x.o_comment,
+            l_orderkey: x.l_orderkey,
+            l_partkey: x.l_partkey,
+            l_suppkey: x.l_suppkey,
+            l_linenumber: x.l_linenumber,
+            l_quantity: x.l_quantity,
+            l_extendedprice: x.l_extendedprice,
+            l_discount: x.l_discount,
+            l_tax: x.l_tax,
+            l_returnflag: x.l_returnflag,
+            l_linestatus: x.l_linestatus,
+            l_shipdate: x.l_shipdate,
+            l_commitdate: x.l_commitdate,
+            l_receiptdate: x.l_receiptdate,
+            l_shipinstruct: x.l_shipinstruct,
+            l_shipmode: x.l_shipmode,
+            l_comment: x.l_comment,
+            low_line: x.low_line,
+        })
+        .drop_key()
+        .group_by_fold(
+            |x| x.l_shipmode.clone(),
+            (None::<i64>, None::<i64>),
+            |acc, x| {
+                if let Some(v) = x.high_line.clone() {
+                    *acc.0.get_or_insert_with(Default::default) += v as i64;
+                }
+                if let Some(v) = x.low_line.clone() {
+                    *acc.1.get_or_insert_with(Default::default) += v as i64;
+                }
+            },
+            |acc, y| {
+                if let Some(v) = y.0 {
+                    *acc.0.get_or_insert_with(Default::default) += v;
+                }
+                if let Some(v) = y.1 {
+                    *acc.1.get_or_insert_with(Default::default) += v;
+                }
+            },
+        )
+        .map(|(k, acc)| Struct_var_5 {
+            l_shipmode: k.clone(),
+            high_line_count: acc.0,
+            low_line_count: acc.1,
+        })
+        .drop_key()
+        .fold(Vec::new(), |v, x| v.push(x))
+        .flat_map(|mut v| {
+            v.sort_by(|a, b| {
+                a.l_shipmode
+                    .partial_cmp(&b.l_shipmode)
+                    .unwrap_or(std::cmp::Ordering::Equal)
+            });
+            v
+        })
+        .map(|x| Struct_var_6 {
+            l_shipmode: x.l_shipmode,
+            high_line_count: x.high_line_count,
+            low_line_count: x.low_line_count,
+        });
+    var_6.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
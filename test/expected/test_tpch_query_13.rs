@@ -0,0 +1,185 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+mod like;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    c_custkey: Option<i64>,
+    c_name: Option<String>,
+    c_address: Option<String>,
+    c_nationkey: Option<i64>,
+    c_phone: Option<String>,
+    c_acctbal: Option<f64>,
+    c_mktsegment: Option<String>,
+    c_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    c_custkey: Option<i64>,
+    c_name: Option<String>,
+    c_address: Option<String>,
+    c_nationkey: Option<i64>,
+    c_phone: Option<String>,
+    c_acctbal: Option<f64>,
+    c_mktsegment: Option<String>,
+    c_comment: Option<String>,
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    c_custkey: Option<i64>,
+    c_count: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    c_count: Option<i64>,
+    custdist: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_5 {
+    c_count: Option<i64>,
+    custdist: Option<i64>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/orders.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_0 = var_0.filter(|x| {
+        !(x.o_comment
+            .as_deref()
+            .is_some_and(|v| like::like(v, "%special%requests%")))
+    });
+    let var_1 = ctx
+        .stream_csv::<Struct_var_1>("../data/tpch/customer.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_5 = var_1
+        .left_join(var_0, |x| x.c_custkey.clone(), |y| y.o_custkey.clone())
+        .map(|(_, x)| {
+            let mut v = Struct_var_2 {
+                c_custkey: x.0.c_custkey,
+                c_name: x.0.c_name,
+                c_address: x.0.c_address,
+                c_nationkey: x.0.c_nationkey,
+                c_phone: x.0.c_phone,
+                c_acctbal: x.0.c_acctbal,
+                c_mktsegment: x.0.c_mktsegment,
+                c_comment: x.0.c_comment,
+                o_orderkey: None,
+                o_custkey: None,
+                o_orderstatus: None,
+                o_totalprice: None,
+                o_orderdate: None,
+                o_orderpriority: None,
+                o_clerk: None,
+                o_shippriority: None,
+                o_comment: None,
+            };
+            if let Some(i) = x.1 {
+                v.o_orderkey = i.o_orderkey;
+                v.o_custkey = i.o_custkey;
+                v.o_orderstatus = i.o_orderstatus;
+                v.o_totalprice = i.o_totalprice;
+                v.o_orderdate = i.o_orderdate;
+                v.o_orderpriority = i.o_orderpriority;
+                v.o_clerk = i.o_clerk;
+                v.o_shippriority = i.o_shippriority;
+                v.o_comment = i.o_comment;
+            };
+            v
+        })
+        .drop_key()
+        .group_by_fold(
+            |x| x.c_custkey.clone(),
+            (0i64,),
+            |acc, x| {
+                if x.o_orderkey.is_some() {
+                    acc.0 += 1;
+                }
+            },
+            |acc, y| {
+                acc.0 += y.0;
+            },
+        )
+        .map(|(k, acc)| Struct_var_3 {
+            c_custkey: k.clone(),
+            c_count: Some(acc.0),
+        })
+        .drop_key()
+        .group_by_fold(
+            |x| x.c_count.clone(),
+            (0i64,),
+            |acc, x| {
+                acc.0 += 1;
+            },
+            |acc, y| {
+                acc.0 += y.0;
+            },
+        )
+        .map(|(k, acc)| Struct_var_4 {
+            c_count: k.clone(),
+            custdist: Some(acc.0),
+        })
+        .drop_key()
+        .fold(Vec::new(), |v, x| v.push(x))
+        .flat_map(|mut v| {
+            v.sort_by(|a, b| {
+                b.custdist
+                    .partial_cmp(&a.custdist)
+                    .unwrap_or(std::cmp::Ordering::Equal)
+                    .then_with(|| {
+                        b.c_count
+                            .partial_cmp(&a.c_count)
+                            .unwrap_or(std::cmp::Ordering::Equal)
+                    })
+            });
+            v
+        })
+        .map(|x| Struct_var_5 {
+            c_count: x.c_count,
+            custdist: x.custdist,
+        });
+    var_5.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
@@ -0,0 +1,300 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+    volume: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+    volume: Option<f64>,
+    promo_volume: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_5 {
+    promo: Option<f64>,
+    total: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_6 {
+    promo: Option<f64>,
+    total: Option<f64>,
+    promo_revenue: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_7 {
+    promo_revenue: Option<f64>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/part.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_0 = var_0;
+    let var_1 = ctx
+        .stream_csv::<Struct_var_1>("../data/tpch/lineitem.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_7 = var_1
+        .join(var_0, |x| x.l_partkey.clone(), |y| y.p_partkey.clone())
+        .map(|(_, x)| Struct_var_2 {
+            l_orderkey: x.0.l_orderkey,
+            l_partkey: x.0.l_partkey,
+            l_suppkey: x.0.l_suppkey,
+            l_linenumber: x.0.l_linenumber,
+            l_quantity: x.0.l_quantity,
+            l_extendedprice: x.0.l_extendedprice,
+            l_discount: x.0.l_discount,
+            l_tax: x.0.l_tax,
+            l_returnflag: x.0.l_returnflag,
+            l_linestatus: x.0.l_linestatus,
+            l_shipdate: x.0.l_shipdate,
+            l_commitdate: x.0.l_commitdate,
+            l_receiptdate: x.0.l_receiptdate,
+            l_shipinstruct: x.0.l_shipinstruct,
+            l_shipmode: x.0.l_shipmode,
+            l_comment: x.0.l_comment,
+            p_partkey: x.1.p_partkey,
+            p_name: x.1.p_name,
+            p_mfgr: x.1.p_mfgr,
+            p_brand: x.1.p_brand,
+            p_type: x.1.p_type,
+            p_size: x.1.p_size,
+            p_container: x.1.p_container,
+            p_retailprice: x.1.p_retailprice,
+            p_comment: x.1.p_comment,
+        })
+        .filter(|(_, x)| x.l_shipdate.as_deref().is_some_and(|v| v >= "1995-09-01"))
+        .filter(|(_, x)| x.l_shipdate.as_deref().is_some_and(|v| v < "1995-10-01"))
+        .map(|(_, x)| Struct_var_3 {
+            l_orderkey: x.l_orderkey,
+            l_partkey: x.l_partkey,
+            l_suppkey: x.l_suppkey,
+            l_linenumber: x.l_linenumber,
+            l_quantity: x.l_quantity,
+            l_extendedprice: x.l_extendedprice,
+            l_discount: x.l_discount,
+            l_tax: x.l_tax,
+            l_returnflag: x.l_returnflag,
+            l_linestatus: x.l_linestatus,
+            l_shipdate: x.l_shipdate,
+            l_commitdate: x.l_commitdate,
+            l_receiptdate: x.l_receiptdate,
+            l_shipinstruct: x.l_shipinstruct,
+            l_shipmode: x.l_shipmode,
+            l_comment: x.l_comment,
+            p_partkey: x.p_partkey,
+            p_name: x.p_name,
+            p_mfgr: x.p_mfgr,
+            p_brand: x.p_brand,
+            p_type: x.p_type,
+            p_size: x.p_size,
+            p_container: x.p_container,
+            p_retailprice: x.p_retailprice,
+            p_comment: x.p_comment,
+            volume: x
+                .l_extendedprice
+                .zip(x.l_discount.map(|v| 1 as f64 - v as f64))
+                .map(|(a, b)| a as f64 * b as f64),
+        })
+        .map(|(_, x)| Struct_var_4 {
+            promo_volume: if x.p_type.as_deref().is_some_and(|v| v.starts_with("PROMO")) {
+                x.volume.clone()
+            } else {
+                Some(0.0f64)
+            },
+            l_orderkey: x.l_orderkey,
+            l_partkey: x.l_partkey,
+            l_suppkey: x.l_suppkey,
+            l_linenumber: x.l_linenumber,
+            l_quantity: x.l_quantity,
+            l_extendedprice: x.l_extendedprice,
+            l_discount: x.l_discount,
+            l_tax: x.l_tax,
+            l_returnflag: x.l_returnflag,
+            l_linestatus: x.l_linestatus,
+            l_shipdate: x.l_shipdate,
+            l_commitdate: x.l_commitdate,
+            l_receiptdate: x.l_receiptdate,
+            l_shipinstruct: x.l_shipinstruct,
+            l_shipmode: x.l_shipmode,
+            l_comment: x.l_comment,
+            p_partkey: x.p_partkey,
+            p_name: x.p_name,
+            p_mfgr: x.p_mfgr,
+            p_brand: x.p_brand,
+            p_type: x.p_type,
+            p_size: x.p_size,
+            p_container: x.p_container,
+            p_retailprice: x.p_retailprice,
+            p_comment: x.p_comment,
+            volume: x.volume,
+        })
+        .drop_key()
+        .fold_assoc(
+            (None::<f64>, None::<f64>),
+            |acc, x| {
+                if let Some(v) = x.promo_volume.clone() {
+                    *acc.0.get_or_insert_with(Default::default) += v;
+                }
+                if let Some(v) = x.volume.clone() {
+                    *acc.1.get_or_insert_with(Default::default) += v;
+                }
+            },
+            |acc, y| {
+                if let Some(v) = y.0 {
+                    *acc.0.get_or_insert_with(Default::default) += v;
+                }
+                if let Some(v) = y.1 {
+                    *acc.1.get_or_insert_with(Default::default) += v;
+                }
+            },
+        )
+        .map(|acc| Struct_var_5 {
+            promo: acc.0,
+            total: acc.1,
+        })
+        .map(|x| Struct_var_6 {
+            promo: x.promo,
+            total: x.total,
+            promo_revenue: x
+                .promo
+                .map(|v| v as f64 * 100 as f64)
+                .zip(x.total)
+                .map(|(a, b)| a as f64 / b as f64),
+        })
+        .map(|x| Struct_var_7 {
+            promo_revenue: x.promo_revenue,
+        });
+    var_7.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
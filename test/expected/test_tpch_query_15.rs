@@ -0,0 +1,326 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    volume: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    l_suppkey: Option<i64>,
+    total_revenue: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    max_revenue: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_5 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    volume: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_6 {
+    l_suppkey: Option<i64>,
+    total_revenue: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_7 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_8 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    l_suppkey: Option<i64>,
+    total_revenue: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_9 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    l_suppkey: Option<i64>,
+    total_revenue: Option<f64>,
+    max_revenue: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_10 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_phone: Option<String>,
+    total_revenue: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_11 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_phone: Option<String>,
+    total_revenue: Option<f64>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/lineitem.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_3 = var_0
+        .filter(|x| x.l_shipdate.as_deref().is_some_and(|v| v >= "1996-01-01"))
+        .filter(|x| x.l_shipdate.as_deref().is_some_and(|v| v < "1996-04-01"))
+        .map(|x| Struct_var_1 {
+            l_orderkey: x.l_orderkey,
+            l_partkey: x.l_partkey,
+            l_suppkey: x.l_suppkey,
+            l_linenumber: x.l_linenumber,
+            l_quantity: x.l_quantity,
+            l_extendedprice: x.l_extendedprice,
+            l_discount: x.l_discount,
+            l_tax: x.l_tax,
+            l_returnflag: x.l_returnflag,
+            l_linestatus: x.l_linestatus,
+            l_shipdate: x.l_shipdate,
+            l_commitdate: x.l_commitdate,
+            l_receiptdate: x.l_receiptdate,
+            l_shipinstruct: x.l_shipinstruct,
+            l_shipmode: x.l_shipmode,
+            l_comment: x.l_comment,
+            volume: x
+                .l_extendedprice
+                .zip(x.l_discount.map(|v| 1 as f64 - v as f64))
+                .map(|(a, b)| a as f64 * b as f64),
+        })
+        .group_by(|x| (x.l_suppkey.clone()))
+        .reduce(|a, b| {
+            a.volume = a.volume.zip(b.volume).map(|(x, y)| x + y);
+        })
+        .map(|(k, x)| Struct_var_2 {
+            l_suppkey: k.clone(),
+            total_revenue: x.volume,
+        })
+        .drop_key()
+        .fold_assoc(
+            (None::<f64>,),
+            |acc, x| {
+                if let Some(v) = x.total_revenue.clone() {
+                    acc.0 = Some(match acc.0.take() {
+                        Some(a) => a.max(v),
+                        None => v,
+                    });
+                }
+            },
+            |acc, y| {
+                if let Some(v) = y.0 {
+                    acc.0 = Some(match acc.0.take() {
+                        Some(a) => a.max(v),
+                        None => v,
+                    });
+                }
+            },
+        )
+        .map(|acc| Struct_var_3 { max_revenue: acc.0 });
+    let var_4 = ctx
+        .stream_csv::<Struct_var_4>("../data/tpch/lineitem.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_6 = var_4
+        .filter(|x| x.l_shipdate.as_deref().is_some_and(|v| v >= "1996-01-01"))
+        .filter(|x| x.l_shipdate.as_deref().is_some_and(|v| v < "1996-04-01"))
+        .map(|x| Struct_var_5 {
+            l_orderkey: x.l_orderkey,
+            l_partkey: x.l_partkey,
+            l_suppkey: x.l_suppkey,
+            l_linenumber: x.l_linenumber,
+            l_quantity: x.l_quantity,
+            l_extendedprice: x.l_extendedprice,
+            l_discount: x.l_discount,
+            l_tax: x.l_tax,
+            l_returnflag: x.l_returnflag,
+            l_linestatus: x.l_linestatus,
+            l_shipdate: x.l_shipdate,
+            l_commitdate: x.l_commitdate,
+            l_receiptdate: x.l_receiptdate,
+            l_shipinstruct: x.l_shipinstruct,
+            l_shipmode: x.l_shipmode,
+            l_comment: x.l_comment,
+            volume: x
+                .l_extendedprice
+                .zip(x.l_discount.map(|v| 1 as f64 - v as f64))
+                .map(|(a, b)| a as f64 * b as f64),
+        })
+        .group_by(|x| (x.l_suppkey.clone()))
+        .reduce(|a, b| {
+            a.volume = a.volume.zip(b.volume).map(|(x, y)| x + y);
+        })
+        .map(|(k, x)| Struct_var_6 {
+            l_suppkey: k.clone(),
+            total_revenue: x.volume,
+        });
+    let var_7 = ctx
+        .stream_csv::<Struct_var_7>("../data/tpch/supplier.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_11 = var_7
+        .group_by(|x| x.s_suppkey.clone())
+        .join(var_6)
+        .map(|(_, x)| Struct_var_8 {
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            l_suppkey: x.1.l_suppkey,
+            total_revenue: x.1.total_revenue,
+        })
+        .drop_key()
+        .join(var_3, |_| (), |_| ())
+        .map(|(_, x)| Struct_var_9 {
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            l_suppkey: x.0.l_suppkey,
+            total_revenue: x.0.total_revenue,
+            max_revenue: x.1.max_revenue,
+        })
+        .drop_key()
+        .filter(|x| {
+            x.total_revenue
+                .clone()
+                .zip(x.max_revenue.clone())
+                .map_or(false, |(a, b)| a == b)
+        })
+        .map(|x| Struct_var_10 {
+            s_suppkey: x.s_suppkey,
+            s_name: x.s_name,
+            s_address: x.s_address,
+            s_phone: x.s_phone,
+            total_revenue: x.total_revenue,
+        })
+        .fold(Vec::new(), |v, x| v.push(x))
+        .flat_map(|mut v| {
+            v.sort_by(|a, b| {
+                a.s_suppkey
+                    .partial_cmp(&b.s_suppkey)
+                    .unwrap_or(std::cmp::Ordering::Equal)
+            });
+            v
+        })
+        .map(|x| Struct_var_11 {
+            s_suppkey: x.s_suppkey,
+            s_name: x.s_name,
+            s_address: x.s_address,
+            s_phone: x.s_phone,
+            total_revenue: x.total_revenue,
+        });
+    var_11.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
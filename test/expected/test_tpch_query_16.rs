@@ -0,0 +1,221 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+mod like;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_5 {
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    supplier_cnt: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_6 {
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    supplier_cnt: Option<i64>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/supplier.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_0 = var_0.filter(|x| {
+        x.s_comment
+            .as_deref()
+            .is_some_and(|v| like::like(v, "%Customer%Complaints%"))
+    });
+    let var_1 = ctx
+        .stream_csv::<Struct_var_1>("../data/tpch/part.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_1 = var_1;
+    let var_2 = ctx
+        .stream_csv::<Struct_var_2>("../data/tpch/partsupp.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_6 = var_2
+        .join(var_1, |x| x.ps_partkey.clone(), |y| y.p_partkey.clone())
+        .map(|(_, x)| Struct_var_3 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            p_partkey: x.1.p_partkey,
+            p_name: x.1.p_name,
+            p_mfgr: x.1.p_mfgr,
+            p_brand: x.1.p_brand,
+            p_type: x.1.p_type,
+            p_size: x.1.p_size,
+            p_container: x.1.p_container,
+            p_retailprice: x.1.p_retailprice,
+            p_comment: x.1.p_comment,
+        })
+        .filter(|(_, x)| x.p_brand.clone().is_some_and(|v| v != "Brand#45"))
+        .filter(|(_, x)| {
+            !(x.p_type
+                .as_deref()
+                .is_some_and(|v| v.starts_with("MEDIUM POLISHED")))
+        })
+        .filter(|(_, x)| {
+            x.p_size
+                .is_some_and(|v| [49, 14, 23, 45, 19, 3, 36, 9].contains(&v))
+        })
+        .drop_key()
+        .group_by(|x| x.ps_suppkey.clone())
+        .left_join(var_0.group_by_fold(|y| y.s_suppkey.clone(), (), |_, _| {}, |_, _| {}))
+        .filter(|(_, x)| x.1.is_none())
+        .drop_key()
+        .map(|x| Struct_var_4 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            p_partkey: x.0.p_partkey,
+            p_name: x.0.p_name,
+            p_mfgr: x.0.p_mfgr,
+            p_brand: x.0.p_brand,
+            p_type: x.0.p_type,
+            p_size: x.0.p_size,
+            p_container: x.0.p_container,
+            p_retailprice: x.0.p_retailprice,
+            p_comment: x.0.p_comment,
+        })
+        .group_by_fold(
+            |x| (x.p_brand.clone(), x.p_type.clone(), x.p_size.clone()),
+            (std::collections::HashSet::<i64>::new(),),
+            |acc, x| {
+                if let Some(v) = x.ps_suppkey.clone() {
+                    acc.0.insert(v);
+                }
+            },
+            |acc, y| {
+                acc.0.extend(y.0);
+            },
+        )
+        .map(|(k, acc)| Struct_var_5 {
+            p_brand: k.0.clone(),
+            p_type: k.1.clone(),
+            p_size: k.2.clone(),
+            supplier_cnt: Some(acc.0.len() as i64),
+        })
+        .drop_key()
+        .fold(Vec::new(), |v, x| v.push(x))
+        .flat_map(|mut v| {
+            v.sort_by(|a, b| {
+                b.supplier_cnt
+                    .partial_cmp(&a.supplier_cnt)
+                    .unwrap_or(std::cmp::Ordering::Equal)
+                    .then_with(|| {
+                        a.p_brand
+                            .partial_cmp(&b.p_brand)
+                            .unwrap_or(std::cmp::Ordering::Equal)
+                    })
+                    .then_with(|| {
+                        a.p_type
+                            .partial_cmp(&b.p_type)
+                            .unwrap_or(std::cmp::Ordering::Equal)
+                    })
+                    .then_with(|| {
+                        a.p_size
+                            .partial_cmp(&b.p_size)
+                            .unwrap_or(std::cmp::Ordering::Equal)
+                    })
+            });
+            v
+        })
+        .map(|x| Struct_var_6 {
+            p_brand: x.p_brand,
+            p_type: x.p_type,
+            p_size: x.p_size,
+            supplier_cnt: x.supplier_cnt,
+        });
+    var_6.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
@@ -0,0 +1,256 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    l_partkey: Option<i64>,
+    avg_quantity: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_5 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+    l_partkey_right: Option<i64>,
+    avg_quantity: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_6 {
+    sum_price: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_7 {
+    sum_price: Option<f64>,
+    avg_yearly: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_8 {
+    avg_yearly: Option<f64>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/lineitem.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_1 = var_0
+        .group_by_avg(
+            |x| (x.l_partkey.clone()),
+            |x| x.l_quantity.unwrap_or(0) as f64,
+        )
+        .map(|(k, x)| Struct_var_1 {
+            l_partkey: k.clone(),
+            avg_quantity: Some(x),
+        });
+    let var_2 = ctx
+        .stream_csv::<Struct_var_2>("../data/tpch/part.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_2 = var_2;
+    let var_3 = ctx
+        .stream_csv::<Struct_var_3>("../data/tpch/lineitem.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_8 = var_3
+        .join(var_2, |x| x.l_partkey.clone(), |y| y.p_partkey.clone())
+        .map(|(_, x)| Struct_var_4 {
+            l_orderkey: x.0.l_orderkey,
+            l_partkey: x.0.l_partkey,
+            l_suppkey: x.0.l_suppkey,
+            l_linenumber: x.0.l_linenumber,
+            l_quantity: x.0.l_quantity,
+            l_extendedprice: x.0.l_extendedprice,
+            l_discount: x.0.l_discount,
+            l_tax: x.0.l_tax,
+            l_returnflag: x.0.l_returnflag,
+            l_linestatus: x.0.l_linestatus,
+            l_shipdate: x.0.l_shipdate,
+            l_commitdate: x.0.l_commitdate,
+            l_receiptdate: x.0.l_receiptdate,
+            l_shipinstruct: x.0.l_shipinstruct,
+            l_shipmode: x.0.l_shipmode,
+            l_comment: x.0.l_comment,
+            p_partkey: x.1.p_partkey,
+            p_name: x.1.p_name,
+            p_mfgr: x.1.p_mfgr,
+            p_brand: x.1.p_brand,
+            p_type: x.1.p_type,
+            p_size: x.1.p_size,
+            p_container: x.1.p_container,
+            p_retailprice: x.1.p_retailprice,
+            p_comment: x.1.p_comment,
+        })
+        .filter(|(_, x)| x.p_brand.clone().is_some_and(|v| v == "Brand#23"))
+        .filter(|(_, x)| x.p_container.clone().is_some_and(|v| v == "MED BOX"))
+        .join(var_1)
+        .map(|(_, x)| Struct_var_5 {
+            l_orderkey: x.0.l_orderkey,
+            l_partkey: x.0.l_partkey,
+            l_suppkey: x.0.l_suppkey,
+            l_linenumber: x.0.l_linenumber,
+            l_quantity: x.0.l_quantity,
+            l_extendedprice: x.0.l_extendedprice,
+            l_discount: x.0.l_discount,
+            l_tax: x.0.l_tax,
+            l_returnflag: x.0.l_returnflag,
+            l_linestatus: x.0.l_linestatus,
+            l_shipdate: x.0.l_shipdate,
+            l_commitdate: x.0.l_commitdate,
+            l_receiptdate: x.0.l_receiptdate,
+            l_shipinstruct: x.0.l_shipinstruct,
+            l_shipmode: x.0.l_shipmode,
+            l_comment: x.0.l_comment,
+            p_partkey: x.0.p_partkey,
+            p_name: x.0.p_name,
+            p_mfgr: x.0.p_mfgr,
+            p_brand: x.0.p_brand,
+            p_type: x.0.p_type,
+            p_size: x.0.p_size,
+            p_container: x.0.p_container,
+            p_retailprice: x.0.p_retailprice,
+            p_comment: x.0.p_comment,
+            l_partkey_right: x.1.l_partkey,
+            avg_quantity: x.1.avg_quantity,
+        })
+        .filter(|(_, x)| {
+            x.l_quantity
+                .clone()
+                .zip(x.avg_quantity.map(|v| v as f64 * 0.2 as f64).clone())
+                .map_or(false, |(a, b)| (a as f64) < (b as f64))
+        })
+        .drop_key()
+        .reduce(|a, b| Struct_var_5 {
+            l_extendedprice: a.l_extendedprice.zip(b.l_extendedprice).map(|(x, y)| x + y),
+            ..a
+        })
+        .map(|x| Struct_var_6 {
+            sum_price: x.l_extendedprice,
+        })
+        .map(|x| Struct_var_7 {
+            sum_price: x.sum_price,
+            avg_yearly: x.sum_price.map(|v| v as f64 / 7.0 as f64),
+        })
+        .map(|x| Struct_var_8 {
+            avg_yearly: x.avg_yearly,
+        });
+    var_8.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
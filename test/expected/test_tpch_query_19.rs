@@ -0,0 +1,230 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+    volume: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    revenue: Option<f64>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/part.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_0 = var_0;
+    let var_1 = ctx
+        .stream_csv::<Struct_var_1>("../data/tpch/lineitem.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_4 = var_1
+        .join(var_0, |x| x.l_partkey.clone(), |y| y.p_partkey.clone())
+        .map(|(_, x)| Struct_var_2 {
+            l_orderkey: x.0.l_orderkey,
+            l_partkey: x.0.l_partkey,
+            l_suppkey: x.0.l_suppkey,
+            l_linenumber: x.0.l_linenumber,
+            l_quantity: x.0.l_quantity,
+            l_extendedprice: x.0.l_extendedprice,
+            l_discount: x.0.l_discount,
+            l_tax: x.0.l_tax,
+            l_returnflag: x.0.l_returnflag,
+            l_linestatus: x.0.l_linestatus,
+            l_shipdate: x.0.l_shipdate,
+            l_commitdate: x.0.l_commitdate,
+            l_receiptdate: x.0.l_receiptdate,
+            l_shipinstruct: x.0.l_shipinstruct,
+            l_shipmode: x.0.l_shipmode,
+            l_comment: x.0.l_comment,
+            p_partkey: x.1.p_partkey,
+            p_name: x.1.p_name,
+            p_mfgr: x.1.p_mfgr,
+            p_brand: x.1.p_brand,
+            p_type: x.1.p_type,
+            p_size: x.1.p_size,
+            p_container: x.1.p_container,
+            p_retailprice: x.1.p_retailprice,
+            p_comment: x.1.p_comment,
+        })
+        .filter(|(_, x)| {
+            x.l_shipinstruct
+                .clone()
+                .is_some_and(|v| v == "DELIVER IN PERSON")
+        })
+        .filter(|(_, x)| {
+            x.l_shipmode
+                .as_deref()
+                .is_some_and(|v| ["AIR", "REG AIR"].contains(&v))
+        })
+        .filter(|(_, x)| {
+            (x.p_brand.clone().is_some_and(|v| v == "Brand#12")
+                & x.p_container
+                    .as_deref()
+                    .is_some_and(|v| ["SM CASE", "SM BOX", "SM PACK", "SM PKG"].contains(&v))
+                & (x.l_quantity.clone().is_some_and(|v| v >= 1))
+                & (x.l_quantity.clone().is_some_and(|v| v <= 11))
+                & (x.p_size.clone().is_some_and(|v| v >= 1))
+                & (x.p_size.clone().is_some_and(|v| v <= 5)))
+                | (x.p_brand.clone().is_some_and(|v| v == "Brand#23")
+                    & x.p_container.as_deref().is_some_and(|v| {
+                        ["MED BAG", "MED BOX", "MED PKG", "MED PACK"].contains(&v)
+                    })
+                    & (x.l_quantity.clone().is_some_and(|v| v >= 10))
+                    & (x.l_quantity.clone().is_some_and(|v| v <= 20))
+                    & (x.p_size.clone().is_some_and(|v| v >= 1))
+                    & (x.p_size.clone().is_some_and(|v| v <= 10)))
+                | (x.p_brand.clone().is_some_and(|v| v == "Brand#34")
+                    & x.p_container
+                        .as_deref()
+                        .is_some_and(|v| ["LG CASE", "LG BOX", "LG PACK", "LG PKG"].contains(&v))
+                    & (x.l_quantity.clone().is_some_and(|v| v >= 20))
+                    & (x.l_quantity.clone().is_some_and(|v| v <= 30))
+                    & (x.p_size.clone().is_some_and(|v| v >= 1))
+                    & (x.p_size.clone().is_some_and(|v| v <= 15)))
+        })
+        .map(|(_, x)| Struct_var_3 {
+            l_orderkey: x.l_orderkey,
+            l_partkey: x.l_partkey,
+            l_suppkey: x.l_suppkey,
+            l_linenumber: x.l_linenumber,
+            l_quantity: x.l_quantity,
+            l_extendedprice: x.l_extendedprice,
+            l_discount: x.l_discount,
+            l_tax: x.l_tax,
+            l_returnflag: x.l_returnflag,
+            l_linestatus: x.l_linestatus,
+            l_shipdate: x.l_shipdate,
+            l_commitdate: x.l_commitdate,
+            l_receiptdate: x.l_receiptdate,
+            l_shipinstruct: x.l_shipinstruct,
+            l_shipmode: x.l_shipmode,
+            l_comment: x.l_comment,
+            p_partkey: x.p_partkey,
+            p_name: x.p_name,
+            p_mfgr: x.p_mfgr,
+            p_brand: x.p_brand,
+            p_type: x.p_type,
+            p_size: x.p_size,
+            p_container: x.p_container,
+            p_retailprice: x.p_retailprice,
+            p_comment: x.p_comment,
+            volume: x
+                .l_extendedprice
+                .zip(x.l_discount.map(|v| 1 as f64 - v as f64))
+                .map(|(a, b)| a as f64 * b as f64),
+        })
+        .drop_key()
+        .reduce(|a, b| Struct_var_3 {
+            volume: a.volume.zip(b.volume).map(|(x, y)| x + y),
+            ..a
+        })
+        .map(|x| Struct_var_4 { revenue: x.volume });
+    var_4.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
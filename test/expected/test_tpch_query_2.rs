@@ -0,0 +1,606 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    r_regionkey: Option<i64>,
+    r_name: Option<String>,
+    r_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_5 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_6 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+    r_regionkey: Option<i64>,
+    r_name: Option<String>,
+    r_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_7 {
+    min_partkey: Option<i64>,
+    min_supplycost: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_8 {
+    r_regionkey: Option<i64>,
+    r_name: Option<String>,
+    r_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_9 {
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_10 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_11 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_12 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_13 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_14 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+    r_regionkey: Option<i64>,
+    r_name: Option<String>,
+    r_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_15 {
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_16 {
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+    r_regionkey: Option<i64>,
+    r_name: Option<String>,
+    r_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_17 {
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+    r_regionkey: Option<i64>,
+    r_name: Option<String>,
+    r_comment: Option<String>,
+    min_partkey: Option<i64>,
+    min_supplycost: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_18 {
+    s_acctbal: Option<f64>,
+    s_name: Option<String>,
+    n_name: Option<String>,
+    p_partkey: Option<i64>,
+    p_mfgr: Option<String>,
+    s_address: Option<String>,
+    s_phone: Option<String>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_19 {
+    s_acctbal: Option<f64>,
+    s_name: Option<String>,
+    n_name: Option<String>,
+    p_partkey: Option<i64>,
+    p_mfgr: Option<String>,
+    s_address: Option<String>,
+    s_phone: Option<String>,
+    s_comment: Option<String>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/region.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_0 = var_0;
+    let var_1 = ctx
+        .stream_csv::<Struct_var_1>("../data/tpch/nation.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_1 = var_1;
+    let var_2 = ctx
+        .stream_csv::<Struct_var_2>("../data/tpch/supplier.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_2 = var_2;
+    let var_3 = ctx
+        .stream_csv::<Struct_var_3>("../data/tpch/partsupp.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_7 = var_3
+        .join(var_2, |x| x.ps_suppkey.clone(), |y| y.s_suppkey.clone())
+        .map(|(_, x)| Struct_var_4 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            s_suppkey: x.1.s_suppkey,
+            s_name: x.1.s_name,
+            s_address: x.1.s_address,
+            s_nationkey: x.1.s_nationkey,
+            s_phone: x.1.s_phone,
+            s_acctbal: x.1.s_acctbal,
+            s_comment: x.1.s_comment,
+        })
+        .drop_key()
+        .join(var_1, |x| x.s_nationkey.clone(), |y| y.n_nationkey.clone())
+        .map(|(_, x)| Struct_var_5 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            n_nationkey: x.1.n_nationkey,
+            n_name: x.1.n_name,
+            n_regionkey: x.1.n_regionkey,
+            n_comment: x.1.n_comment,
+        })
+        .drop_key()
+        .join(var_0, |x| x.n_regionkey.clone(), |y| y.r_regionkey.clone())
+        .map(|(_, x)| Struct_var_6 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            n_nationkey: x.0.n_nationkey,
+            n_name: x.0.n_name,
+            n_regionkey: x.0.n_regionkey,
+            n_comment: x.0.n_comment,
+            r_regionkey: x.1.r_regionkey,
+            r_name: x.1.r_name,
+            r_comment: x.1.r_comment,
+        })
+        .filter(|(_, x)| x.r_name.clone().is_some_and(|v| v == "EUROPE"))
+        .drop_key()
+        .group_by_fold(
+            |x| x.ps_partkey.clone(),
+            (None::<f64>,),
+            |acc, x| {
+                if let Some(v) = x.ps_supplycost.clone() {
+                    acc.0 = Some(match acc.0.take() {
+                        Some(a) => a.min(v),
+                        None => v,
+                    });
+                }
+            },
+            |acc, y| {
+                if let Some(v) = y.0 {
+                    acc.0 = Some(match acc.0.take() {
+                        Some(a) => a.min(v),
+                        None => v,
+                    });
+                }
+            },
+        )
+        .map(|(k, acc)| Struct_var_7 {
+            min_partkey: k.clone(),
+            min_supplycost: acc.0,
+        });
+    let var_8 = ctx
+        .stream_csv::<Struct_var_8>("../data/tpch/region.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_8 = var_8;
+    let var_9 = ctx
+        .stream_csv::<Struct_var_9>("../data/tpch/nation.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_9 = var_9;
+    let var_10 = ctx
+        .stream_csv::<Struct_var_10>("../data/tpch/supplier.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_10 = var_10;
+    let var_11 = ctx
+        .stream_csv::<Struct_var_11>("../data/tpch/partsupp.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_14 = var_11
+        .join(var_10, |x| x.ps_suppkey.clone(), |y| y.s_suppkey.clone())
+        .map(|(_, x)| Struct_var_12 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            s_suppkey: x.1.s_suppkey,
+            s_name: x.1.s_name,
+            s_address: x.1.s_address,
+            s_nationkey: x.1.s_nationkey,
+            s_phone: x.1.s_phone,
+            s_acctbal: x.1.s_acctbal,
+            s_comment: x.1.s_comment,
+        })
+        .drop_key()
+        .join(var_9, |x| x.s_nationkey.clone(), |y| y.n_nationkey.clone())
+        .map(|(_, x)| Struct_var_13 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            n_nationkey: x.1.n_nationkey,
+            n_name: x.1.n_name,
+            n_regionkey: x.1.n_regionkey,
+            n_comment: x.1.n_comment,
+        })
+        .drop_key()
+        .join(var_8, |x| x.n_regionkey.clone(), |y| y.r_regionkey.clone())
+        .map(|(_, x)| Struct_var_14 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            n_nationkey: x.0.n_nationkey,
+            n_name: x.0.n_name,
+            n_regionkey: x.0.n_regionkey,
+            n_comment: x.0.n_comment,
+            r_regionkey: x.1.r_regionkey,
+            r_name: x.1.r_name,
+            r_comment: x.1.r_comment,
+        })
+        .filter(|(_, x)| x.r_name.clone().is_some_and(|v| v == "EUROPE"));
+    let var_15 = ctx
+        .stream_csv::<Struct_var_15>("../data/tpch/part.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_19 = var_15
+        .filter(|x| x.p_size.clone().is_some_and(|v| v == 15))
+        .filter(|x| x.p_type.as_deref().is_some_and(|v| v.ends_with("BRASS")))
+        .join(
+            var_14.drop_key(),
+            |x| x.p_partkey.clone(),
+            |y| y.ps_partkey.clone(),
+        )
+        .map(|(_, x)| Struct_var_16 {
+            p_partkey: x.0.p_partkey,
+            p_name: x.0.p_name,
+            p_mfgr: x.0.p_mfgr,
+            p_brand: x.0.p_brand,
+            p_type: x.0.p_type,
+            p_size: x.0.p_size,
+            p_container: x.0.p_container,
+            p_retailprice: x.0.p_retailprice,
+            p_comment: x.0.p_comment,
+            ps_partkey: x.1.ps_partkey,
+            ps_suppkey: x.1.ps_suppkey,
+            ps_availqty: x.1.ps_availqty,
+            ps_supplycost: x.1.ps_supplycost,
+            ps_comment: x.1.ps_comment,
+            s_suppkey: x.1.s_suppkey,
+            s_name: x.1.s_name,
+            s_address: x.1.s_address,
+            s_nationkey: x.1.s_nationkey,
+            s_phone: x.1.s_phone,
+            s_acctbal: x.1.s_acctbal,
+            s_comment: x.1.s_comment,
+            n_nationkey: x.1.n_nationkey,
+            n_name: x.1.n_name,
+            n_regionkey: x.1.n_regionkey,
+            n_comment: x.1.n_comment,
+            r_regionkey: x.1.r_regionkey,
+            r_name: x.1.r_name,
+            r_comment: x.1.r_comment,
+        })
+        .drop_key()
+        .join(
+            var_7.drop_key(),
+            |x| (x.ps_partkey.clone(), x.ps_supplycost.map(f64::to_bits)),
+            |y| (y.min_partkey.clone(), y.min_supplycost.map(f64::to_bits)),
+        )
+        .map(|(_, x)| Struct_var_17 {
+            p_partkey: x.0.p_partkey,
+            p_name: x.0.p_name,
+            p_mfgr: x.0.p_mfgr,
+            p_brand: x.0.p_brand,
+            p_type: x.0.p_type,
+            p_size: x.0.p_size,
+            p_container: x.0.p_container,
+            p_retailprice: x.0.p_retailprice,
+            p_comment: x.0.p_comment,
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            n_nationkey: x.0.n_nationkey,
+            n_name: x.0.n_name,
+            n_regionkey: x.0.n_regionkey,
+            n_comment: x.0.n_comment,
+            r_regionkey: x.0.r_regionkey,
+            r_name: x.0.r_name,
+            r_comment: x.0.r_comment,
+            min_partkey: x.1.min_partkey,
+            min_supplycost: x.1.min_supplycost,
+        })
+        .map(|(_, x)| Struct_var_18 {
+            s_acctbal: x.s_acctbal,
+            s_name: x.s_name,
+            n_name: x.n_name,
+            p_partkey: x.p_partkey,
+            p_mfgr: x.p_mfgr,
+            s_address: x.s_address,
+            s_phone: x.s_phone,
+            s_comment: x.s_comment,
+        })
+        .drop_key()
+        .fold(Vec::new(), |v, x| v.push(x))
+        .flat_map(|mut v| {
+            v.sort_by(|a, b| {
+                b.s_acctbal
+                    .partial_cmp(&a.s_acctbal)
+                    .unwrap_or(std::cmp::Ordering::Equal)
+                    .then_with(|| {
+                        a.n_name
+                            .partial_cmp(&b.n_name)
+                            .unwrap_or(std::cmp::Ordering::Equal)
+                    })
+                    .then_with(|| {
+                        a.s_name
+                            .partial_cmp(&b.s_name)
+                            .unwrap_or(std::cmp::Ordering::Equal)
+                    })
+                    .then_with(|| {
+                        a.p_partkey
+                            .partial_cmp(&b.p_partkey)
+                            .unwrap_or(std::cmp::Ordering::Equal)
+                    })
+            });
+            v.truncate(100);
+            v
+        })
+        .map(|x| Struct_var_19 {
+            s_acctbal: x.s_acctbal,
+            s_name: x.s_name,
+            n_name: x.n_name,
+            p_partkey: x.p_partkey,
+            p_mfgr: x.p_mfgr,
+            s_address: x.s_address,
+            s_phone: x.s_phone,
+            s_comment: x.s_comment,
+        });
+    var_19.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
@@ -0,0 +1,263 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    p_partkey: Option<i64>,
+    p_name: Option<String>,
+    p_mfgr: Option<String>,
+    p_brand: Option<String>,
+    p_type: Option<String>,
+    p_size: Option<i64>,
+    p_container: Option<String>,
+    p_retailprice: Option<f64>,
+    p_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    shipped_qty: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    shipped_qty: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_5 {
+    ps_partkey: Option<i64>,
+    ps_suppkey: Option<i64>,
+    ps_availqty: Option<i64>,
+    ps_supplycost: Option<f64>,
+    ps_comment: Option<String>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    shipped_qty: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_6 {
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_7 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_8 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_9 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_10 {
+    s_name: Option<String>,
+    s_address: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_11 {
+    s_name: Option<String>,
+    s_address: Option<String>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/part.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_0 = var_0.filter(|x| x.p_name.as_deref().is_some_and(|v| v.starts_with("forest")));
+    let var_1 = ctx
+        .stream_csv::<Struct_var_1>("../data/tpch/lineitem.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_2 = var_1
+        .filter(|x| x.l_shipdate.as_deref().is_some_and(|v| v >= "1994-01-01"))
+        .filter(|x| x.l_shipdate.as_deref().is_some_and(|v| v < "1995-01-01"))
+        .group_by(|x| (x.l_partkey.clone(), x.l_suppkey.clone()))
+        .reduce(|a, b| {
+            a.l_quantity = a.l_quantity.zip(b.l_quantity).map(|(x, y)| x + y);
+        })
+        .map(|(k, x)| Struct_var_2 {
+            l_partkey: k.0,
+            l_suppkey: k.1,
+            shipped_qty: x.l_quantity,
+        });
+    let var_3 = ctx
+        .stream_csv::<Struct_var_3>("../data/tpch/partsupp.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_5 = var_3
+        .group_by(|x| (x.ps_partkey.clone(), x.ps_suppkey.clone()))
+        .join(var_2)
+        .map(|(_, x)| Struct_var_4 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            l_partkey: x.1.l_partkey,
+            l_suppkey: x.1.l_suppkey,
+            shipped_qty: x.1.shipped_qty,
+        })
+        .filter(|(_, x)| {
+            x.ps_availqty
+                .clone()
+                .zip(x.shipped_qty.map(|v| v as f64 * 0.5 as f64).clone())
+                .map_or(false, |(a, b)| (a as f64) > (b as f64))
+        })
+        .drop_key()
+        .group_by(|x| x.ps_partkey.clone())
+        .join(var_0.group_by_fold(|y| y.p_partkey.clone(), (), |_, _| {}, |_, _| {}))
+        .drop_key()
+        .map(|x| Struct_var_5 {
+            ps_partkey: x.0.ps_partkey,
+            ps_suppkey: x.0.ps_suppkey,
+            ps_availqty: x.0.ps_availqty,
+            ps_supplycost: x.0.ps_supplycost,
+            ps_comment: x.0.ps_comment,
+            l_partkey: x.0.l_partkey,
+            l_suppkey: x.0.l_suppkey,
+            shipped_qty: x.0.shipped_qty,
+        });
+    let var_6 = ctx
+        .stream_csv::<Struct_var_6>("../data/tpch/nation.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_6 = var_6;
+    let var_7 = ctx
+        .stream_csv::<Struct_var_7>("../data/tpch/supplier.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_11 = var_7
+        .join(var_6, |x| x.s_nationkey.clone(), |y| y.n_nationkey.clone())
+        .map(|(_, x)| Struct_var_8 {
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            n_nationkey: x.1.n_nationkey,
+            n_name: x.1.n_name,
+            n_regionkey: x.1.n_regionkey,
+            n_comment: x.1.n_comment,
+        })
+        .filter(|(_, x)| x.n_name.clone().is_some_and(|v| v == "CANADA"))
+        .drop_key()
+        .group_by(|x| x.s_suppkey.clone())
+        .join(var_5.group_by_fold(|y| y.ps_suppkey.clone(), (), |_, _| {}, |_, _| {}))
+        .drop_key()
+        .map(|x| Struct_var_9 {
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            n_nationkey: x.0.n_nationkey,
+            n_name: x.0.n_name,
+            n_regionkey: x.0.n_regionkey,
+            n_comment: x.0.n_comment,
+        })
+        .map(|x| Struct_var_10 {
+            s_name: x.s_name,
+            s_address: x.s_address,
+        })
+        .fold(Vec::new(), |v, x| v.push(x))
+        .flat_map(|mut v| {
+            v.sort_by(|a, b| {
+                a.s_name
+                    .partial_cmp(&b.s_name)
+                    .unwrap_or(std::cmp::Ordering::Equal)
+            });
+            v
+        })
+        .map(|x| Struct_var_11 {
+            s_name: x.s_name,
+            s_address: x.s_address,
+        });
+    var_11.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
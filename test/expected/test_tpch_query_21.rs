@@ -0,0 +1,612 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    l_orderkey: Option<i64>,
+    n_late_supp: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    l_orderkey: Option<i64>,
+    n_supp: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_5 {
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_6 {
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_7 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_8 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_9 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_10 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_11 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+    l_orderkey_right: Option<i64>,
+    n_supp: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_12 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    s_suppkey: Option<i64>,
+    s_name: Option<String>,
+    s_address: Option<String>,
+    s_nationkey: Option<i64>,
+    s_phone: Option<String>,
+    s_acctbal: Option<f64>,
+    s_comment: Option<String>,
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+    n_nationkey: Option<i64>,
+    n_name: Option<String>,
+    n_regionkey: Option<i64>,
+    n_comment: Option<String>,
+    l_orderkey_right: Option<i64>,
+    n_supp: Option<i64>,
+    n_late_supp: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_13 {
+    s_name: Option<String>,
+    numwait: Option<i64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_14 {
+    s_name: Option<String>,
+    numwait: Option<i64>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/lineitem.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_1 = var_0
+        .filter(|x| {
+            x.l_receiptdate
+                .clone()
+                .zip(x.l_commitdate.clone())
+                .map_or(false, |(a, b)| a > b)
+        })
+        .group_by_fold(
+            |x| x.l_orderkey.clone(),
+            (std::collections::HashSet::<i64>::new(),),
+            |acc, x| {
+                if let Some(v) = x.l_suppkey.clone() {
+                    acc.0.insert(v);
+                }
+            },
+            |acc, y| {
+                acc.0.extend(y.0);
+            },
+        )
+        .map(|(k, acc)| Struct_var_1 {
+            l_orderkey: k.clone(),
+            n_late_supp: Some(acc.0.len() as i64),
+        });
+    let var_2 = ctx
+        .stream_csv::<Struct_var_2>("../data/tpch/lineitem.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_3 = var_2
+        .group_by_fold(
+            |x| x.l_orderkey.clone(),
+            (std::collections::HashSet::<i64>::new(),),
+            |acc, x| {
+                if let Some(v) = x.l_suppkey.clone() {
+                    acc.0.insert(v);
+                }
+            },
+            |acc, y| {
+                acc.0.extend(y.0);
+            },
+        )
+        .map(|(k, acc)| Struct_var_3 {
+            l_orderkey: k.clone(),
+            n_supp: Some(acc.0.len() as i64),
+        });
+    let var_4 = ctx
+        .stream_csv::<Struct_var_4>("../data/tpch/nation.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_4 = var_4;
+    let var_5 = ctx
+        .stream_csv::<Struct_var_5>("../data/tpch/orders.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_5 = var_5;
+    let var_6 = ctx
+        .stream_csv::<Struct_var_6>("../data/tpch/supplier.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_6 = var_6;
+    let var_7 = ctx
+        .stream_csv::<Struct_var_7>("../data/tpch/lineitem.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_14 = var_7
+        .filter(|x| {
+            x.l_receiptdate
+                .clone()
+                .zip(x.l_commitdate.clone())
+                .map_or(false, |(a, b)| a > b)
+        })
+        .join(var_6, |x| x.l_suppkey.clone(), |y| y.s_suppkey.clone())
+        .map(|(_, x)| Struct_var_8 {
+            l_orderkey: x.0.l_orderkey,
+            l_partkey: x.0.l_partkey,
+            l_suppkey: x.0.l_suppkey,
+            l_linenumber: x.0.l_linenumber,
+            l_quantity: x.0.l_quantity,
+            l_extendedprice: x.0.l_extendedprice,
+            l_discount: x.0.l_discount,
+            l_tax: x.0.l_tax,
+            l_returnflag: x.0.l_returnflag,
+            l_linestatus: x.0.l_linestatus,
+            l_shipdate: x.0.l_shipdate,
+            l_commitdate: x.0.l_commitdate,
+            l_receiptdate: x.0.l_receiptdate,
+            l_shipinstruct: x.0.l_shipinstruct,
+            l_shipmode: x.0.l_shipmode,
+            l_comment: x.0.l_comment,
+            s_suppkey: x.1.s_suppkey,
+            s_name: x.1.s_name,
+            s_address: x.1.s_address,
+            s_nationkey: x.1.s_nationkey,
+            s_phone: x.1.s_phone,
+            s_acctbal: x.1.s_acctbal,
+            s_comment: x.1.s_comment,
+        })
+        .drop_key()
+        .join(var_5, |x| x.l_orderkey.clone(), |y| y.o_orderkey.clone())
+        .map(|(_, x)| Struct_var_9 {
+            l_orderkey: x.0.l_orderkey,
+            l_partkey: x.0.l_partkey,
+            l_suppkey: x.0.l_suppkey,
+            l_linenumber: x.0.l_linenumber,
+            l_quantity: x.0.l_quantity,
+            l_extendedprice: x.0.l_extendedprice,
+            l_discount: x.0.l_discount,
+            l_tax: x.0.l_tax,
+            l_returnflag: x.0.l_returnflag,
+            l_linestatus: x.0.l_linestatus,
+            l_shipdate: x.0.l_shipdate,
+            l_commitdate: x.0.l_commitdate,
+            l_receiptdate: x.0.l_receiptdate,
+            l_shipinstruct: x.0.l_shipinstruct,
+            l_shipmode: x.0.l_shipmode,
+            l_comment: x.0.l_comment,
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            o_orderkey: x.1.o_orderkey,
+            o_custkey: x.1.o_custkey,
+            o_orderstatus: x.1.o_orderstatus,
+            o_totalprice: x.1.o_totalprice,
+            o_orderdate: x.1.o_orderdate,
+            o_orderpriority: x.1.o_orderpriority,
+            o_clerk: x.1.o_clerk,
+            o_shippriority: x.1.o_shippriority,
+            o_comment: x.1.o_comment,
+        })
+        .drop_key()
+        .join(var_4, |x| x.s_nationkey.clone(), |y| y.n_nationkey.clone())
+        .map(|(_, x)| Struct_var_10 {
+            l_orderkey: x.0.l_orderkey,
+            l_partkey: x.0.l_partkey,
+            l_suppkey: x.0.l_suppkey,
+            l_linenumber: x.0.l_linenumber,
+            l_quantity: x.0.l_quantity,
+            l_extendedprice: x.0.l_extendedprice,
+            l_discount: x.0.l_discount,
+            l_tax: x.0.l_tax,
+            l_returnflag: x.0.l_returnflag,
+            l_linestatus: x.0.l_linestatus,
+            l_shipdate: x.0.l_shipdate,
+            l_commitdate: x.0.l_commitdate,
+            l_receiptdate: x.0.l_receiptdate,
+            l_shipinstruct: x.0.l_shipinstruct,
+            l_shipmode: x.0.l_shipmode,
+            l_comment: x.0.l_comment,
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            o_orderkey: x.0.o_orderkey,
+            o_custkey: x.0.o_custkey,
+            o_orderstatus: x.0.o_orderstatus,
+            o_totalprice: x.0.o_totalprice,
+            o_orderdate: x.0.o_orderdate,
+            o_orderpriority: x.0.o_orderpriority,
+            o_clerk: x.0.o_clerk,
+            o_shippriority: x.0.o_shippriority,
+            o_comment: x.0.o_comment,
+            n_nationkey: x.1.n_nationkey,
+            n_name: x.1.n_name,
+            n_regionkey: x.1.n_regionkey,
+            n_comment: x.1.n_comment,
+        })
+        .drop_key()
+        .group_by(|x| x.l_orderkey.clone())
+        .join(var_3)
+        .map(|(_, x)| Struct_var_11 {
+            l_orderkey: x.0.l_orderkey,
+            l_partkey: x.0.l_partkey,
+            l_suppkey: x.0.l_suppkey,
+            l_linenumber: x.0.l_linenumber,
+            l_quantity: x.0.l_quantity,
+            l_extendedprice: x.0.l_extendedprice,
+            l_discount: x.0.l_discount,
+            l_tax: x.0.l_tax,
+            l_returnflag: x.0.l_returnflag,
+            l_linestatus: x.0.l_linestatus,
+            l_shipdate: x.0.l_shipdate,
+            l_commitdate: x.0.l_commitdate,
+            l_receiptdate: x.0.l_receiptdate,
+            l_shipinstruct: x.0.l_shipinstruct,
+            l_shipmode: x.0.l_shipmode,
+            l_comment: x.0.l_comment,
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            o_orderkey: x.0.o_orderkey,
+            o_custkey: x.0.o_custkey,
+            o_orderstatus: x.0.o_orderstatus,
+            o_totalprice: x.0.o_totalprice,
+            o_orderdate: x.0.o_orderdate,
+            o_orderpriority: x.0.o_orderpriority,
+            o_clerk: x.0.o_clerk,
+            o_shippriority: x.0.o_shippriority,
+            o_comment: x.0.o_comment,
+            n_nationkey: x.0.n_nationkey,
+            n_name: x.0.n_name,
+            n_regionkey: x.0.n_regionkey,
+            n_comment: x.0.n_comment,
+            l_orderkey_right: x.1.l_orderkey,
+            n_supp: x.1.n_supp,
+        })
+        .join(var_1)
+        .map(|(_, x)| Struct_var_12 {
+            l_orderkey: x.0.l_orderkey,
+            l_partkey: x.0.l_partkey,
+            l_suppkey: x.0.l_suppkey,
+            l_linenumber: x.0.l_linenumber,
+            l_quantity: x.0.l_quantity,
+            l_extendedprice: x.0.l_extendedprice,
+            l_discount: x.0.l_discount,
+            l_tax: x.0.l_tax,
+            l_returnflag: x.0.l_returnflag,
+            l_linestatus: x.0.l_linestatus,
+            l_shipdate: x.0.l_shipdate,
+            l_commitdate: x.0.l_commitdate,
+            l_receiptdate: x.0.l_receiptdate,
+            l_shipinstruct: x.0.l_shipinstruct,
+            l_shipmode: x.0.l_shipmode,
+            l_comment: x.0.l_comment,
+            s_suppkey: x.0.s_suppkey,
+            s_name: x.0.s_name,
+            s_address: x.0.s_address,
+            s_nationkey: x.0.s_nationkey,
+            s_phone: x.0.s_phone,
+            s_acctbal: x.0.s_acctbal,
+            s_comment: x.0.s_comment,
+            o_orderkey: x.0.o_orderkey,
+            o_custkey: x.0.o_custkey,
+            o_orderstatus: x.0.o_orderstatus,
+            o_totalprice: x.0.o_totalprice,
+            o_orderdate: x.0.o_orderdate,
+            o_orderpriority: x.0.o_orderpriority,
+            o_clerk: x.0.o_clerk,
+            o_shippriority: x.0.o_shippriority,
+            o_comment: x.0.o_comment,
+            n_nationkey: x.0.n_nationkey,
+            n_name: x.0.n_name,
+            n_regionkey: x.0.n_regionkey,
+            n_comment: x.0.n_comment,
+            l_orderkey_right: x.0.l_orderkey_right,
+            n_supp: x.0.n_supp,
+            n_late_supp: x.1.l_orderkey,
+        })
+        .filter(|(_, x)| x.o_orderstatus.clone().is_some_and(|v| v == "F"))
+        .filter(|(_, x)| x.n_name.clone().is_some_and(|v| v == "SAUDI ARABIA"))
+        .filter(|(_, x)| x.n_supp.clone().is_some_and(|v| v > 1))
+        .filter(|(_, x)| x.n_late_supp.clone().is_some_and(|v| v == 1))
+        .drop_key()
+        .group_by_fold(
+            |x| x.s_name.clone(),
+            (0i64,),
+            |acc, x| {
+                acc.0 += 1;
+            },
+            |acc, y| {
+                acc.0 += y.0;
+            },
+        )
+        .map(|(k, acc)| Struct_var_13 {
+            s_name: k.clone(),
+            numwait: Some(acc.0),
+        })
+        .drop_key()
+        .fold(Vec::new(), |v, x| v.push(x))
+        .flat_map(|mut v| {
+            v.sort_by(|a, b| {
+                b.numwait
+                    .partial_cmp(&a.numwait)
+                    .unwrap_or(std::cmp::Ordering::Equal)
+                    .then_with(|| {
+                        a.s_name
+                            .partial_cmp(&b.s_name)
+                            .unwrap_or(std::cmp::Ordering::Equal)
+                    })
+            });
+            v.truncate(100);
+            v
+        })
+        .map(|x| Struct_var_14 {
+            s_name: x.s_name,
+            numwait: x.numwait,
+        });
+    var_14.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
@@ -0,0 +1,266 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    c_custkey: Option<i64>,
+    c_name: Option<String>,
+    c_address: Option<String>,
+    c_nationkey: Option<i64>,
+    c_phone: Option<String>,
+    c_acctbal: Option<f64>,
+    c_mktsegment: Option<String>,
+    c_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    c_custkey: Option<i64>,
+    c_name: Option<String>,
+    c_address: Option<String>,
+    c_nationkey: Option<i64>,
+    c_phone: Option<String>,
+    c_acctbal: Option<f64>,
+    c_mktsegment: Option<String>,
+    c_comment: Option<String>,
+    cntrycode: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    avg_acctbal: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    c_custkey: Option<i64>,
+    c_name: Option<String>,
+    c_address: Option<String>,
+    c_nationkey: Option<i64>,
+    c_phone: Option<String>,
+    c_acctbal: Option<f64>,
+    c_mktsegment: Option<String>,
+    c_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_5 {
+    c_custkey: Option<i64>,
+    c_name: Option<String>,
+    c_address: Option<String>,
+    c_nationkey: Option<i64>,
+    c_phone: Option<String>,
+    c_acctbal: Option<f64>,
+    c_mktsegment: Option<String>,
+    c_comment: Option<String>,
+    cntrycode: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_6 {
+    c_custkey: Option<i64>,
+    c_name: Option<String>,
+    c_address: Option<String>,
+    c_nationkey: Option<i64>,
+    c_phone: Option<String>,
+    c_acctbal: Option<f64>,
+    c_mktsegment: Option<String>,
+    c_comment: Option<String>,
+    cntrycode: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_7 {
+    c_custkey: Option<i64>,
+    c_name: Option<String>,
+    c_address: Option<String>,
+    c_nationkey: Option<i64>,
+    c_phone: Option<String>,
+    c_acctbal: Option<f64>,
+    c_mktsegment: Option<String>,
+    c_comment: Option<String>,
+    cntrycode: Option<String>,
+    avg_acctbal: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_8 {
+    cntrycode: Option<String>,
+    numcust: Option<i64>,
+    totacctbal: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_9 {
+    cntrycode: Option<String>,
+    numcust: Option<i64>,
+    totacctbal: Option<f64>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/customer.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_2 = var_0
+        .map(|x| Struct_var_1 {
+            cntrycode: x
+                .c_phone
+                .as_ref()
+                .map(|v| v.chars().skip(0).take(2).collect::<String>()),
+            c_custkey: x.c_custkey,
+            c_name: x.c_name,
+            c_address: x.c_address,
+            c_nationkey: x.c_nationkey,
+            c_phone: x.c_phone,
+            c_acctbal: x.c_acctbal,
+            c_mktsegment: x.c_mktsegment,
+            c_comment: x.c_comment,
+        })
+        .filter(|x| x.c_acctbal.clone().is_some_and(|v| v > 0.0))
+        .filter(|x| {
+            x.cntrycode
+                .as_deref()
+                .is_some_and(|v| ["13", "31", "23", "29", "30", "18", "17"].contains(&v))
+        })
+        .fold_assoc(
+            ((0f64, 0i64),),
+            |acc, x| {
+                if let Some(v) = x.c_acctbal.clone() {
+                    acc.0 .0 += v as f64;
+                    acc.0 .1 += 1;
+                }
+            },
+            |acc, y| {
+                acc.0 .0 += y.0 .0;
+                acc.0 .1 += y.0 .1;
+            },
+        )
+        .map(|acc| Struct_var_2 {
+            avg_acctbal: (acc.0 .1 > 0).then(|| acc.0 .0 / acc.0 .1 as f64),
+        });
+    let var_3 = ctx
+        .stream_csv::<Struct_var_3>("../data/tpch/orders.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_3 = var_3;
+    let var_4 = ctx
+        .stream_csv::<Struct_var_4>("../data/tpch/customer.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_9 = var_4
+        .map(|x| Struct_var_5 {
+            cntrycode: x
+                .c_phone
+                .as_ref()
+                .map(|v| v.chars().skip(0).take(2).collect::<String>()),
+            c_custkey: x.c_custkey,
+            c_name: x.c_name,
+            c_address: x.c_address,
+            c_nationkey: x.c_nationkey,
+            c_phone: x.c_phone,
+            c_acctbal: x.c_acctbal,
+            c_mktsegment: x.c_mktsegment,
+            c_comment: x.c_comment,
+        })
+        .filter(|x| {
+            x.cntrycode
+                .as_deref()
+                .is_some_and(|v| ["13", "31", "23", "29", "30", "18", "17"].contains(&v))
+        })
+        .group_by(|x| x.c_custkey.clone())
+        .left_join(var_3.group_by_fold(|y| y.o_custkey.clone(), (), |_, _| {}, |_, _| {}))
+        .filter(|(_, x)| x.1.is_none())
+        .drop_key()
+        .map(|x| Struct_var_6 {
+            c_custkey: x.0.c_custkey,
+            c_name: x.0.c_name,
+            c_address: x.0.c_address,
+            c_nationkey: x.0.c_nationkey,
+            c_phone: x.0.c_phone,
+            c_acctbal: x.0.c_acctbal,
+            c_mktsegment: x.0.c_mktsegment,
+            c_comment: x.0.c_comment,
+            cntrycode: x.0.cntrycode,
+        })
+        .join(var_2, |_| (), |_| ())
+        .map(|(_, x)| Struct_var_7 {
+            c_custkey: x.0.c_custkey,
+            c_name: x.0.c_name,
+            c_address: x.0.c_address,
+            c_nationkey: x.0.c_nationkey,
+            c_phone: x.0.c_phone,
+            c_acctbal: x.0.c_acctbal,
+            c_mktsegment: x.0.c_mktsegment,
+            c_comment: x.0.c_comment,
+            cntrycode: x.0.cntrycode,
+            avg_acctbal: x.1.avg_acctbal,
+        })
+        .drop_key()
+        .filter(|x| {
+            x.c_acctbal
+                .clone()
+                .zip(x.avg_acctbal.clone())
+                .map_or(false, |(a, b)| a > b)
+        })
+        .group_by_fold(
+            |x| x.cntrycode.clone(),
+            (0i64, None::<f64>),
+            |acc, x| {
+                acc.0 += 1;
+                if let Some(v) = x.c_acctbal.clone() {
+                    *acc.1.get_or_insert_with(Default::default) += v;
+                }
+            },
+            |acc, y| {
+                acc.0 += y.0;
+                if let Some(v) = y.1 {
+                    *acc.1.get_or_insert_with(Default::default) += v;
+                }
+            },
+        )
+        .map(|(k, acc)| Struct_var_8 {
+            cntrycode: k.clone(),
+            numcust: Some(acc.0),
+            totacctbal: acc.1,
+        })
+        .drop_key()
+        .fold(Vec::new(), |v, x| v.push(x))
+        .flat_map(|mut v| {
+            v.sort_by(|a, b| {
+                a.cntrycode
+                    .partial_cmp(&b.cntrycode)
+                    .unwrap_or(std::cmp::Ordering::Equal)
+            });
+            v
+        })
+        .map(|x| Struct_var_9 {
+            cntrycode: x.cntrycode,
+            numcust: x.numcust,
+            totacctbal: x.totacctbal,
+        });
+    var_9.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
@@ -0,0 +1,401 @@
+use mimalloc::MiMalloc;
+use renoir::prelude::*;
+use serde::{Deserialize, Serialize};
+use std::cmp::max;
+use std::fs::File;
+
+#[global_allocator]
+static GLOBAL: MiMalloc = MiMalloc;
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_0 {
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_1 {
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_2 {
+    c_custkey: Option<i64>,
+    c_name: Option<String>,
+    c_address: Option<String>,
+    c_nationkey: Option<i64>,
+    c_phone: Option<String>,
+    c_acctbal: Option<f64>,
+    c_mktsegment: Option<String>,
+    c_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_3 {
+    c_custkey: Option<i64>,
+    c_name: Option<String>,
+    c_address: Option<String>,
+    c_nationkey: Option<i64>,
+    c_phone: Option<String>,
+    c_acctbal: Option<f64>,
+    c_mktsegment: Option<String>,
+    c_comment: Option<String>,
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_4 {
+    c_custkey: Option<i64>,
+    c_name: Option<String>,
+    c_address: Option<String>,
+    c_nationkey: Option<i64>,
+    c_phone: Option<String>,
+    c_acctbal: Option<f64>,
+    c_mktsegment: Option<String>,
+    c_comment: Option<String>,
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_5 {
+    c_custkey: Option<i64>,
+    c_name: Option<String>,
+    c_address: Option<String>,
+    c_nationkey: Option<i64>,
+    c_phone: Option<String>,
+    c_acctbal: Option<f64>,
+    c_mktsegment: Option<String>,
+    c_comment: Option<String>,
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    orderdate: Option<String>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_6 {
+    c_custkey: Option<i64>,
+    c_name: Option<String>,
+    c_address: Option<String>,
+    c_nationkey: Option<i64>,
+    c_phone: Option<String>,
+    c_acctbal: Option<f64>,
+    c_mktsegment: Option<String>,
+    c_comment: Option<String>,
+    o_orderkey: Option<i64>,
+    o_custkey: Option<i64>,
+    o_orderstatus: Option<String>,
+    o_totalprice: Option<f64>,
+    o_orderdate: Option<String>,
+    o_orderpriority: Option<String>,
+    o_clerk: Option<String>,
+    o_shippriority: Option<i64>,
+    o_comment: Option<String>,
+    l_orderkey: Option<i64>,
+    l_partkey: Option<i64>,
+    l_suppkey: Option<i64>,
+    l_linenumber: Option<i64>,
+    l_quantity: Option<i64>,
+    l_extendedprice: Option<f64>,
+    l_discount: Option<f64>,
+    l_tax: Option<f64>,
+    l_returnflag: Option<String>,
+    l_linestatus: Option<String>,
+    l_shipdate: Option<String>,
+    l_commitdate: Option<String>,
+    l_receiptdate: Option<String>,
+    l_shipinstruct: Option<String>,
+    l_shipmode: Option<String>,
+    l_comment: Option<String>,
+    orderdate: Option<String>,
+    volume: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_7 {
+    l_orderkey: Option<i64>,
+    orderdate: Option<String>,
+    o_shippriority: Option<i64>,
+    revenue: Option<f64>,
+}
+#[derive(Clone, Debug, Serialize, Deserialize, PartialOrd, PartialEq, Default)]
+struct Struct_var_8 {
+    l_orderkey: Option<i64>,
+    orderdate: Option<String>,
+    o_shippriority: Option<i64>,
+    revenue: Option<f64>,
+}
+
+fn logic(ctx: StreamContext) {
+    let var_0 = ctx
+        .stream_csv::<Struct_var_0>("../data/tpch/lineitem.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_0 = var_0.filter(|x| x.l_shipdate.as_deref().is_some_and(|v| v > "1995-03-15"));
+    let var_1 = ctx
+        .stream_csv::<Struct_var_1>("../data/tpch/orders.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_1 = var_1.filter(|x| x.o_orderdate.as_deref().is_some_and(|v| v < "1995-03-15"));
+    let var_2 = ctx
+        .stream_csv::<Struct_var_2>("../data/tpch/customer.csv")
+        .batch_mode(BatchMode::fixed(16000));
+    let var_8 = var_2
+        .filter(|x| x.c_mktsegment.clone().is_some_and(|v| v == "BUILDING"))
+        .join(var_1, |x| x.c_custkey.clone(), |y| y.o_custkey.clone())
+        .map(|(_, x)| Struct_var_3 {
+            c_custkey: x.0.c_custkey,
+            c_name: x.0.c_name,
+            c_address: x.0.c_address,
+            c_nationkey: x.0.c_nationkey,
+            c_phone: x.0.c_phone,
+            c_acctbal: x.0.c_acctbal,
+            c_mktsegment: x.0.c_mktsegment,
+            c_comment: x.0.c_comment,
+            o_orderkey: x.1.o_orderkey,
+            o_custkey: x.1.o_custkey,
+            o_orderstatus: x.1.o_orderstatus,
+            o_totalprice: x.1.o_totalprice,
+            o_orderdate: x.1.o_orderdate,
+            o_orderpriority: x.1.o_orderpriority,
+            o_clerk: x.1.o_clerk,
+            o_shippriority: x.1.o_shippriority,
+            o_comment: x.1.o_comment,
+        })
+        .drop_key()
+        .join(var_0, |x| x.o_orderkey.clone(), |y| y.l_orderkey.clone())
+        .map(|(_, x)| Struct_var_4 {
+            c_custkey: x.0.c_custkey,
+            c_name: x.0.c_name,
+            c_address: x.0.c_address,
+            c_nationkey: x.0.c_nationkey,
+            c_phone: x.0.c_phone,
+            c_acctbal: x.0.c_acctbal,
+            c_mktsegment: x.0.c_mktsegment,
+            c_comment: x.0.c_comment,
+            o_orderkey: x.0.o_orderkey,
+            o_custkey: x.0.o_custkey,
+            o_orderstatus: x.0.o_orderstatus,
+            o_totalprice: x.0.o_totalprice,
+            o_orderdate: x.0.o_orderdate,
+            o_orderpriority: x.0.o_orderpriority,
+            o_clerk: x.0.o_clerk,
+            o_shippriority: x.0.o_shippriority,
+            o_comment: x.0.o_comment,
+            l_orderkey: x.1.l_orderkey,
+            l_partkey: x.1.l_partkey,
+            l_suppkey: x.1.l_suppkey,
+            l_linenumber: x.1.l_linenumber,
+            l_quantity: x.1.l_quantity,
+            l_extendedprice: x.1.l_extendedprice,
+            l_discount: x.1.l_discount,
+            l_tax: x.1.l_tax,
+            l_returnflag: x.1.l_returnflag,
+            l_linestatus: x.1.l_linestatus,
+            l_shipdate: x.1.l_shipdate,
+            l_commitdate: x.1.l_commitdate,
+            l_receiptdate: x.1.l_receiptdate,
+            l_shipinstruct: x.1.l_shipinstruct,
+            l_shipmode: x.1.l_shipmode,
+            l_comment: x.1.l_comment,
+        })
+        .map(|(_, x)| Struct_var_5 {
+            orderdate: x.o_orderdate.clone(),
+            c_custkey: x.c_custkey,
+            c_name: x.c_name,
+            c_address: x.c_address,
+            c_nationkey: x.c_nationkey,
+            c_phone: x.c_phone,
+            c_acctbal: x.c_acctbal,
+            c_mktsegment: x.c_mktsegment,
+            c_comment: x.c_comment,
+            o_orderkey: x.o_orderkey,
+            o_custkey: x.o_custkey,
+            o_orderstatus: x.o_orderstatus,
+            o_totalprice: x.o_totalprice,
+            o_orderdate: x.o_orderdate,
+            o_orderpriority: x.o_orderpriority,
+            o_clerk: x.o_clerk,
+            o_shippriority: x.o_shippriority,
+            o_comment: x.o_comment,
+            l_orderkey: x.l_orderkey,
+            l_partkey: x.l_partkey,
+            l_suppkey: x.l_suppkey,
+            l_linenumber: x.l_linenumber,
+            l_quantity: x.l_quantity,
+            l_extendedprice: x.l_extendedprice,
+            l_discount: x.l_discount,
+            l_tax: x.l_tax,
+            l_returnflag: x.l_returnflag,
+            l_linestatus: x.l_linestatus,
+            l_shipdate: x.l_shipdate,
+            l_commitdate: x.l_commitdate,
+            l_receiptdate: x.l_receiptdate,
+            l_shipinstruct: x.l_shipinstruct,
+            l_shipmode: x.l_shipmode,
+            l_comment: x.l_comment,
+        })
+        .map(|(_, x)| Struct_var_6 {
+            c_custkey: x.c_custkey,
+            c_name: x.c_name,
+            c_address: x.c_address,
+            c_nationkey: x.c_nationkey,
+            c_phone: x.c_phone,
+            c_acctbal: x.c_acctbal,
+            c_mktsegment: x.c_mktsegment,
+            c_comment: x.c_comment,
+            o_orderkey: x.o_orderkey,
+            o_custkey: x.o_custkey,
+            o_orderstatus: x.o_orderstatus,
+            o_totalprice: x.o_totalprice,
+            o_orderdate: x.o_orderdate,
+            o_orderpriority: x.o_orderpriority,
+            o_clerk: x.o_clerk,
+            o_shippriority: x.o_shippriority,
+            o_comment: x.o_comment,
+            l_orderkey: x.l_orderkey,
+            l_partkey: x.l_partkey,
+            l_suppkey: x.l_suppkey,
+            l_linenumber: x.l_linenumber,
+            l_quantity: x.l_quantity,
+            l_extendedprice: x.l_extendedprice,
+            l_discount: x.l_discount,
+            l_tax: x.l_tax,
+            l_returnflag: x.l_returnflag,
+            l_linestatus: x.l_linestatus,
+            l_shipdate: x.l_shipdate,
+            l_commitdate: x.l_commitdate,
+            l_receiptdate: x.l_receiptdate,
+            l_shipinstruct: x.l_shipinstruct,
+            l_shipmode: x.l_shipmode,
+            l_comment: x.l_comment,
+            orderdate: x.orderdate,
+            volume: x
+                .l_extendedprice
+                .zip(x.l_discount.map(|v| 1 as f64 - v as f64))
+                .map(|(a, b)| a as f64 * b as f64),
+        })
+        .drop_key()
+        .group_by(|x| {
+            (
+                x.l_orderkey.clone(),
+                x.orderdate.clone(),
+                x.o_shippriority.clone(),
+            )
+        })
+        .reduce(|a, b| {
+            a.volume = a.volume.zip(b.volume).map(|(x, y)| x + y);
+        })
+        .map(|(k, x)| Struct_var_7 {
+            l_orderkey: k.0,
+            orderdate: k.1.clone(),
+            o_shippriority: k.2,
+            revenue: x.volume,
+        })
+        .drop_key()
+        .fold(Vec::new(), |v, x| v.push(x))
+        .flat_map(|mut v| {
+            v.sort_by(|a, b| {
+                b.revenue
+                    .partial_cmp(&a.revenue)
+                    .unwrap_or(std::cmp::Ordering::Equal)
+                    .then_with(|| {
+                        a.orderdate
+                            .partial_cmp(&b.orderdate)
+                            .unwrap_or(std::cmp::Ordering::Equal)
+                    })
+            });
+            v.truncate(10);
+            v
+        })
+        .map(|x| Struct_var_8 {
+            l_orderkey: x.l_orderkey,
+            orderdate: x.orderdate,
+            o_shippriority: x.o_shippriority,
+            revenue: x.revenue,
+        });
+    var_8.write_csv_one("../out/noir-result.csv", true);
+    File::create("../out/noir-result.csv").unwrap();
+    tracing::info!("starting execution");
+    ctx.execute_blocking();
+}
+
+fn main() -> eyre::Result<()> {
+    color_eyre::install().ok();
+    tracing_subscriber::fmt::init();
+
+    let ctx = StreamContext::new_local();
+
+    tracing::info!("building graph");
+    logic(ctx);
+
+    tracing::info!("finished execution");
+
+    Ok(())
+}
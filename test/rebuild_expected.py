@@ -3,6 +3,7 @@ import shutil
 from unittest import TestLoader
 
 from codegen import ROOT_DIR
+import codegen.utils as utl
 from test.test_operators import TestNullableOperators, TestNonNullableOperators
 from test.test_nexmark import TestNexmark
 
@@ -30,7 +31,7 @@ def update_all_expected_sources():
             os.remove(file)
         except FileNotFoundError:
             pass  # ignore: create new file
-        shutil.copyfile(ROOT_DIR + "/noir_template/src/main.rs", file)
+        shutil.copyfile(utl.CRATE_DIR + "/src/main.rs", file)
 
 
 if __name__ == "__main__":
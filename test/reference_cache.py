@@ -0,0 +1,77 @@
+"""
+Cache of the results of the ibis queries that renoir outputs are compared against, so that tests don't run them
+again through the reference backend when neither the query nor its inputs changed. Results are stored as zstd
+parquet files named after a fingerprint of the query: its sql, with the random names of the tables read from
+files or memory replaced by their position, the schemas of the tables, the backend and ibis version, and the path,
+size and modification time of each input file. Any change gives a new fingerprint, so stale results are never
+read, only left behind: remove the directory to clear them.
+"""
+
+import hashlib
+import os
+from typing import Iterator
+
+import ibis
+import ibis.expr.operations as ops
+import ibis.expr.types as ir
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet
+
+import codegen.utils as utl
+
+CACHE_DIR = utl.ROOT_DIR + "/noir_template/target/ibis-cache"
+
+
+def query_fingerprint(query: ir.Table, files: list[str]) -> str:
+    sql = ibis.to_sql(query, dialect="duckdb")
+    digest = hashlib.sha256()
+    digest.update(f"{ibis.__version__} {ibis.get_backend().name}\n".encode())
+    # tables are named after their position in the plan, which is the same for the same query
+    for i, table in enumerate(query.op().find(ops.PhysicalTable)):
+        sql = sql.replace(table.name, f"table_{i}")
+        digest.update(f"table_{i} {table.schema}\n".encode())
+    digest.update(sql.encode())
+    for file in sorted(os.path.abspath(f) for f in files):
+        stat = os.stat(file)
+        digest.update(f"\n{file} {stat.st_size} {stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+class ReferenceCache:
+
+    def __init__(self, query: ir.Table, files: list[str], cache_dir: str = CACHE_DIR):
+        self.path = f"{cache_dir}/{query_fingerprint(query, files)}.parquet"
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.path)
+
+    def read(self) -> pd.DataFrame:
+        return pyarrow.parquet.read_table(self.path).to_pandas()
+
+    def read_chunks(self, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        for batch in pyarrow.parquet.ParquetFile(self.path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+
+    def write(self, df: pd.DataFrame):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        for _ in self.write_chunks(table.schema, [table]):
+            pass
+
+    def write_chunks(self, schema: pa.Schema, chunks) -> Iterator:
+        """
+        write the record batches or tables of a result while they are consumed, yielding each of them: the result
+        is stored once they are all written, so a test failing halfway leaves nothing behind
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # write to a temporary file and rename, as tests can run in parallel processes
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with pyarrow.parquet.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+                for chunk in chunks:
+                    writer.write(chunk)
+                    yield chunk
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
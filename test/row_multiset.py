@@ -0,0 +1,104 @@
+"""
+Order-insensitive comparison of query outputs as multisets of rows. Each row is normalized (integers compared
+exactly, floats rounded and equal to the integers of the same value, nulls equal to each other, dates as
+yyyy-mm-dd strings) and hashed to a 64-bit fingerprint, all rows of a frame at once: two outputs are the same when they have the same count of each
+fingerprint. Counts are accumulated chunk by chunk, so outputs larger than memory can be compared while reading
+them, holding only one count for each distinct row.
+"""
+
+import numpy as np
+import pandas as pd
+
+# columns hashed exactly as int64, and by their rounded value as float64
+INTEGER_KINDS = {"integer", "boolean"}
+FLOAT_KINDS = {"floating", "mixed-integer-float", "decimal"}
+DATE_KINDS = {"date", "datetime", "datetime64"}
+NULL_HASH = np.uint64(0x9e3779b97f4a7c15)
+COMBINE_FACTOR = np.uint64(0x100000001b3)
+
+
+class RowMultiset:
+
+    def __init__(self, columns: list[str], decimals: int = 3):
+        self.columns = list(columns)
+        self.decimals = decimals
+        self.rows = 0
+        # count of each fingerprint, and counts of the chunks added since they were last merged in
+        self.counts = pd.Series(dtype="int64")
+        self.pending: list[pd.Series] = []
+        self.pending_len = 0
+
+    def add(self, df: pd.DataFrame):
+        if len(df.index) == 0:
+            return
+        chunk = pd.Series(fingerprints(df[self.columns], self.decimals)).value_counts()
+        self.rows += len(df.index)
+        self.pending.append(chunk)
+        self.pending_len += len(chunk)
+        # merged when pending counts outgrow the merged ones, so each count is merged a logarithmic number of times
+        if self.pending_len > len(self.counts):
+            self.merge()
+
+    def merge(self):
+        if self.pending:
+            merged = [self.counts] + self.pending if len(self.counts) else self.pending
+            self.counts = pd.concat(merged).groupby(level=0).sum()
+            self.pending = []
+            self.pending_len = 0
+
+    def get_counts(self) -> pd.Series:
+        self.merge()
+        return self.counts
+
+    def difference(self, other: "RowMultiset", subset=False) -> pd.DataFrame:
+        """
+        fingerprints counted differently by this and the other multiset, with their counts: with subset, only
+        those where the other has more occurrences than this, so that the other is contained in this
+        """
+        counts = pd.concat([self.get_counts(), other.get_counts()], axis=1, keys=["expected", "actual"])
+        counts = counts.fillna(0).astype("int64")
+        mismatch = counts["actual"] > counts["expected"] if subset else counts["actual"] != counts["expected"]
+        return counts[mismatch].rename_axis("fingerprint").reset_index()
+
+
+def fingerprints(df: pd.DataFrame, decimals: int = 3) -> np.ndarray:
+    # columns are hashed one by one, nulls to the same value whatever the type inferred for the column, as a
+    # column of a chunk can be all nulls, and combined with the hashes of the previous columns
+    result = np.zeros(len(df.index), dtype="uint64")
+    for c in df.columns:
+        result = result * COMBINE_FACTOR ^ column_hashes(df[c], decimals)
+    return result
+
+
+def column_hashes(col: pd.Series, decimals: int) -> np.ndarray:
+    kind = pd.api.types.infer_dtype(col, skipna=True)
+    if kind in INTEGER_KINDS:
+        # not through float64, which can't tell apart integers above 2^53
+        values = col.astype("Int64")
+        return np.where(values.isna().to_numpy(), NULL_HASH,
+                        pd.util.hash_array(values.to_numpy(dtype="int64", na_value=0)))
+    if kind in FLOAT_KINDS:
+        return float_hashes(col.astype("Float64").to_numpy(dtype="float64", na_value=np.nan), decimals)
+    values = normalize_column(col, decimals)
+    return np.where(values.isna().to_numpy(), NULL_HASH, pd.util.hash_array(values.to_numpy()))
+
+
+def float_hashes(values: np.ndarray, decimals: int) -> np.ndarray:
+    # adding 0 turns -0.0 into 0.0, which would otherwise hash differently
+    values = np.round(values, decimals) + 0.0
+    # integral values hash as the integers they equal, as one output can have floats where the other has integers
+    integral = np.isfinite(values) & (values == np.trunc(values)) & (np.abs(values) < 2.0 ** 63)
+    as_int = np.where(integral, values, 0).astype("int64")
+    hashes = np.where(integral, pd.util.hash_array(as_int), pd.util.hash_array(values))
+    return np.where(np.isnan(values), NULL_HASH, hashes)
+
+
+def normalize_column(col: pd.Series, decimals: int) -> pd.Series:
+    kind = pd.api.types.infer_dtype(col, skipna=True)
+    if kind in DATE_KINDS:
+        dates = pd.to_datetime(col)
+        midnight = (dates.dropna() == dates.dropna().dt.normalize()).all()
+        return dates.dt.strftime("%Y-%m-%d" if midnight else "%Y-%m-%d %H:%M:%S.%f").astype(object)
+    if kind == "string":
+        return col.astype(object)
+    return col.astype(object).map(lambda v: v if pd.isna(v) else str(v))
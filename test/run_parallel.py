@@ -0,0 +1,71 @@
+"""
+Run the compiler tests on a pool of processes, each generating, building and running its queries in its own
+sandbox (see codegen/workspace.py), kept across runs so that later runs only rebuild the generated crate:
+
+    python -m test.run_parallel -j 8 [test name patterns]
+
+same as `pytest -n 8 test` with pytest-xdist, whose workers also get a sandbox each
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+import unittest
+
+import test
+
+
+def main():
+    parser = argparse.ArgumentParser("ibis-renoir-tests")
+    parser.add_argument("patterns", type=str, nargs="*", default=[""],
+                        help="Substrings of the ids of the tests to run, all by default")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="Number of test processes, all cores by default")
+    args = parser.parse_args()
+
+    loader = unittest.TestLoader()
+    tests = [t.id() for c in test.TestCompiler.__subclasses__() for t in loader.loadTestsFromTestCase(c)
+             if any(p in t.id() for p in args.patterns)]
+
+    start_time = time.perf_counter()
+    worker_ids = multiprocessing.Queue()
+    for i in range(args.jobs):
+        worker_ids.put(i)
+    failures = []
+    with multiprocessing.Pool(args.jobs, initializer=init_worker, initargs=(worker_ids,)) as pool:
+        for test_id, outcome, details in pool.imap_unordered(run_test, tests):
+            print(f"{outcome}: {test_id}")
+            if outcome != "ok":
+                failures.append((test_id, outcome, details))
+
+    for test_id, outcome, details in failures:
+        print(f"\n{'=' * 70}\n{outcome.upper()}: {test_id}\n{details}")
+    print(f"\nran {len(tests)} tests in {time.perf_counter() - start_time:.1f}s on {args.jobs} processes: "
+          f"{len(failures)} failed")
+    sys.exit(1 if failures else 0)
+
+
+def init_worker(worker_ids: multiprocessing.Queue):
+    # read by TestCompiler.setUp to use the sandbox of this worker
+    os.environ["TEST_WORKER"] = f"test-worker-{worker_ids.get()}"
+
+
+def run_test(test_id: str) -> tuple[str, str, str]:
+    try:
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromName(test_id).run(result)
+    except Exception as e:
+        return test_id, "error", "".join(traceback.format_exception(e))
+    for outcome, problems in (("error", result.errors), ("fail", result.failures)):
+        if problems:
+            return test_id, outcome, problems[0][1]
+    if result.skipped:
+        return test_id, "skipped", result.skipped[0][1]
+    return test_id, "ok", ""
+
+
+if __name__ == "__main__":
+    main()
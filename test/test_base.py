@@ -2,17 +2,23 @@ import os
 import sys
 import time
 import unittest
-import ibis.backends
-import ibis.backends.duckdb
 import pandas as pd
 import ibis
 from difflib import unified_diff
-from codegen import ROOT_DIR, Benchmark
+from codegen import ROOT_DIR, Benchmark, compile_ibis_to_noir, read_result
+from codegen.results import RESULT_FILES, read_result_chunks
+from codegen.cluster import Cluster
+from codegen.workspace import use_sandbox
+import codegen.utils as utl
 from ibis import _
-from pyflink.table import EnvironmentSettings, TableEnvironment
 import os
 from shutil import move
 from tempfile import NamedTemporaryFile
+from test.reference_cache import ReferenceCache
+from test.row_multiset import RowMultiset, fingerprints
+
+# rows read at a time from each output when comparing them in chunks
+COMPARISON_CHUNK_ROWS = 1_000_000
 
 
 class TestCompiler(unittest.TestCase):
@@ -35,14 +41,38 @@ class TestCompiler(unittest.TestCase):
             "PERFORM_BENCHMARK", "true") == "true" else None
         self.perform_compilation = True
         self.print_output_to_file = True
+        # by default renoir runs in a single local process using all cores
+        self.cluster: Cluster = None
+        # renoir reads csv tables through their memory-mapped binary copy
+        self.binary_cache = os.getenv("BINARY_CACHE", "false") == "true"
+        # renoir writes its output as csv or arrow ipc
+        self.output_format = os.getenv("OUTPUT_FORMAT", "csv")
+        # renoir records the end-to-end latency of each output row
+        self.measure_latency = os.getenv("MEASURE_LATENCY", "false") == "true"
+        # outputs are compared reading them in chunks, for those larger than memory
+        self.compare_in_chunks = os.getenv("COMPARE_IN_CHUNKS", "false") == "true"
+        # renoir counts the rows and time of each operator
+        self.explain = os.getenv("EXPLAIN", "false") == "true"
+        # codegen, cargo and renoir spans are exported as a chrome trace
+        self.trace = os.getenv("TRACE", "false") == "true"
+        # ibis results compared against are reused from previous runs of the same query on the same inputs
+        self.reference_cache = os.getenv("REFERENCE_CACHE", "true") == "true"
+        # renoir backend reuses the binary built for a query when running it again
+        self.reuse_binaries = False
 
         super().__init__(methodName=methodName)
 
     def setUp(self):
-        try:
-            os.remove(ROOT_DIR + "/out/noir-result.csv")
-        except FileNotFoundError:
-            pass
+        # tests run by parallel processes, as pytest-xdist workers or by test/run_parallel.py, each generate, build
+        # and run their queries in a sandbox of their own, while the compiler state is already separate per process
+        worker = os.getenv("PYTEST_XDIST_WORKER") or os.getenv("TEST_WORKER")
+        if worker:
+            use_sandbox(worker)
+        for result_file in RESULT_FILES.values():
+            try:
+                os.remove(utl.OUT_DIR + "/" + result_file)
+            except FileNotFoundError:
+                pass
 
     def init_benchmark_settings(self, perform_compilation: bool):
         self.run_after_gen = True
@@ -52,14 +82,20 @@ class TestCompiler(unittest.TestCase):
         self.print_output_to_file = False
 
     def set_backend(self, backend: str, cached: bool):
-        if backend == "renoir" or (backend == "duckdb" and not cached):
-            # in-memory duckdb, for renoir it's used just to create the AST
-            # while for duckdb it's used to store the tables
+        if backend == "renoir":
+            # reads the tables with in-memory duckdb to create the AST, and compiles the query when executed:
+            # unless binaries are reused across runs, each run measures the compilation too
+            ibis.set_backend(ibis.renoir.connect(cluster=self.cluster, binary_cache=self.binary_cache,
+                                                 cache_binaries=self.reuse_binaries, benchmark=self.benchmark))
+        elif backend == "duckdb" and not cached:
+            # in-memory duckdb used to store the tables
             ibis.set_backend("duckdb")
         elif backend == "duckdb" and cached:
             # in-storage duckdb instance
             ibis.set_backend(ibis.connect("duckdb://duckdb.db"))
         elif backend == "flink":
+            # imported only when used, as it takes a good part of the startup of a benchmark process
+            from pyflink.table import EnvironmentSettings, TableEnvironment
             table_env = TableEnvironment.create(
                 EnvironmentSettings.in_streaming_mode())
             con = ibis.flink.connect(table_env)
@@ -88,17 +124,64 @@ class TestCompiler(unittest.TestCase):
             if os.path.isfile(no_header_path):
                 no_header_files[name] = no_header_path
                 continue
+            # write to a temporary file and rename, as tests can be prepared by parallel processes
+            tmp_path = f"{no_header_path}.{os.getpid()}.tmp"
             with open(file_path, 'r') as f_in:
-                with open(no_header_path, 'w') as f_out:
+                with open(tmp_path, 'w') as f_out:
                     next(f_in)  # skip first line
                     for line in f_in:
                         f_out.write(line)
+            os.replace(tmp_path, no_header_path)
             no_header_files[name] = no_header_path
         return no_header_files
 
+    def convert_files(self, file_format: str) -> dict[str, str]:
+        """
+        convert each csv file to the given columnar format, stored next to the csv and rebuilt if the csv changed
+        """
+        import pyarrow.csv
+        import pyarrow.ipc
+        import pyarrow.parquet
+        extensions = {"parquet": ".parquet", "arrow": ".arrow"}
+        converted_files = {}
+        for name, file_path in self.files.items():
+            converted_path = file_path.replace(".csv", extensions[file_format])
+            converted_files[name] = converted_path
+            if os.path.isfile(converted_path) and os.path.getmtime(converted_path) >= os.path.getmtime(file_path):
+                continue
+            table = pyarrow.csv.read_csv(file_path)
+            # write to a temporary file and rename, as tests can be prepared by parallel processes
+            tmp_path = f"{converted_path}.{os.getpid()}.tmp"
+            if file_format == "parquet":
+                # small row groups so that filters can skip some of them using min/max statistics
+                pyarrow.parquet.write_table(table, tmp_path, row_group_size=128 * 1024)
+            else:
+                with pyarrow.ipc.new_file(tmp_path, table.schema) as writer:
+                    writer.write_table(table, max_chunksize=128 * 1024)
+            os.replace(tmp_path, converted_path)
+        return converted_files
+
+    @staticmethod
+    def read_table(file_path: str):
+        if file_path.endswith(".parquet"):
+            return ibis.read_parquet(file_path)
+        if file_path.endswith(".arrow"):
+            # no ibis backend reads arrow ipc files directly, renoir needs to know the file behind the table
+            if ibis.get_backend().name == "renoir":
+                return ibis.get_backend().read_arrow(file_path)
+            import pyarrow.ipc
+            return ibis.memtable(pyarrow.ipc.open_file(file_path).read_all())
+        return ibis.read_csv(file_path)
+
     def init_files(self, file_suffix=""):
         raise NotImplementedError
 
+    def compile_ibis_to_noir(self, files_tables: list[tuple]):
+        compile_ibis_to_noir(files_tables, self.query, self.run_after_gen, self.print_output_to_file,
+                             self.render_query_graph, self.benchmark, cluster=self.cluster,
+                             binary_cache=self.binary_cache, output_format=self.output_format,
+                             measure_latency=self.measure_latency, explain=self.explain, trace=self.trace)
+
     def init_tables(self):
         raise NotImplementedError
 
@@ -110,11 +193,11 @@ class TestCompiler(unittest.TestCase):
             self.run_ibis_query()
         self.benchmark.log()
 
-    def run_ibis_query(self):
-
-        # benchmark ibis total run time + write to csv (as noir also performs write to csv)
-        start_time = time.perf_counter()
-
+    def run_ibis_query(self, use_cache: bool = False):
+        """
+        with use_cache, the result of the same query on the same inputs is read from the reference cache when
+        stored by a previous run, and ibis time isn't measured
+        """
         # for non-nullable tests rebuild query over new memtable as self.tables is non-materialized
         # to be able to define its schema as non-nullable (ibis doesn't allow defining schema when reading from csv)
         if hasattr(self, "query_func"):
@@ -124,21 +207,43 @@ class TestCompiler(unittest.TestCase):
                       "fruit_right": ibis.memtable(df_right, schema=self.schema)}
             self.query = self.query_func(tables)
 
+        cache = ReferenceCache(self.query, list(self.files.values())) if use_cache else None
+        if cache and cache.exists():
+            self.df_ibis = cache.read()
+            return
+
+        # benchmark ibis total run time + write to csv (as noir also performs write to csv)
+        start_time = time.perf_counter()
         self.df_ibis = self.query.to_pandas()
-        directory = ROOT_DIR + "/out"
+        directory = utl.OUT_DIR
         if not os.path.exists(directory):
             os.makedirs(directory)
         self.df_ibis.to_csv(directory + "/ibis-benchmark.csv")
         end_time = time.perf_counter()
         self.benchmark.ibis_time_s = end_time - start_time
+        if cache:
+            cache.write(self.df_ibis)
+
+    def ibis_result_chunks(self, chunk_rows: int):
+        # batches of the ibis result, stored in the reference cache while they are read
+        cache = ReferenceCache(self.query, list(self.files.values())) if self.reference_cache else None
+        if cache and cache.exists():
+            yield from cache.read_chunks(chunk_rows)
+            return
+        batches = self.query.to_pyarrow_batches(chunk_size=chunk_rows)
+        if cache:
+            batches = cache.write_chunks(batches.schema, batches)
+        for batch in batches:
+            yield batch.to_pandas()
 
-    def assert_equality_noir_source(self):
-        test_expected_file = "/test/expected/" + \
-            sys._getframe().f_back.f_code.co_name + ".rs"
+    def assert_equality_noir_source(self, test_name: str = None):
+        # by default, the expected source is named after the calling test method
+        test_name = test_name or sys._getframe().f_back.f_code.co_name
+        test_expected_file = "/test/expected/" + test_name + ".rs"
 
         with open(ROOT_DIR + test_expected_file, "r") as f:
             expected_lines = f.readlines()
-        with open(ROOT_DIR + "/noir_template/src/main.rs", "r") as f:
+        with open(utl.CRATE_DIR + "/src/main.rs", "r") as f:
             actual_lines = f.readlines()
 
         diff = list(unified_diff(expected_lines, actual_lines))
@@ -146,83 +251,74 @@ class TestCompiler(unittest.TestCase):
         print("\033[92m Source equality: OK\033[00m")
 
     def assert_similarity_noir_output(self, noir_subset_ibis=False):
-        self.run_ibis_query()
-
-        self.round_float_cols(self.df_ibis)
-        df_ibis = self.df_ibis
-        df_ibis.to_csv(ROOT_DIR + "/out/ibis-result.csv")
-
-        noir_path = ROOT_DIR + "/out/noir-result.csv"
-        # if noir file has size 0 it means no output rows were generated by the query and read_csv will fail
-        # this happens because noir doesn't output the header row when output has 0 rows (while ibis does), so we need to
-        # consider df_noir as an empty dataframe, and just check that df_ibis is empty
-        if os.path.getsize(noir_path) == 0:
-            self.assertEqual(len(df_ibis.index), 0,
+        # outputs are compared as multisets of rows, by the count of each row's fingerprint: in chunks,
+        # neither output is ever fully in memory
+        frames = []
+        if self.compare_in_chunks:
+            expected = RowMultiset(self.query.schema().names)
+            for chunk in self.ibis_result_chunks(COMPARISON_CHUNK_ROWS):
+                expected.add(chunk)
+            actual = RowMultiset(expected.columns)
+            for chunk in read_result_chunks(self.output_format, COMPARISON_CHUNK_ROWS):
+                actual.add(self.select_noir_columns(chunk, expected.columns))
+        else:
+            self.run_ibis_query(use_cache=self.reference_cache)
+            self.round_float_cols(self.df_ibis)
+            df_ibis = self.df_ibis
+            df_ibis.to_csv(utl.OUT_DIR + "/ibis-result.csv")
+            expected = RowMultiset(df_ibis.columns)
+            expected.add(df_ibis)
+            actual = RowMultiset(expected.columns)
+            # renoir doesn't write the header of empty outputs, so there's no dataframe to read
+            df_noir = read_result(self.output_format)
+            if df_noir is not None:
+                df_noir = self.select_noir_columns(df_noir, expected.columns)
+                actual.add(df_noir)
+            frames = [df_ibis, df_noir]
+
+        # if noir output is empty, no output rows were generated by the query: just check that ibis is empty
+        if actual.rows == 0:
+            self.assertEqual(expected.rows, 0,
                              "Noir output is 0 rows, while ibis is not!")
             return
 
-        df_noir = pd.read_csv(noir_path)
-        self.round_float_cols(df_noir)
+        # with noir_subset_ibis we allow for noir to output fewer rows than ibis
+        # used for windowing, where ibis semantics don't include windows with size
+        # smaller than specified, while noir does
+        difference = expected.difference(actual, subset=noir_subset_ibis)
+        difference = self.with_example_rows(difference, frames, expected.columns, expected.decimals)
+        difference.to_csv(utl.OUT_DIR + "/ibis-noir-comparison.csv", index=False)
+        message = "Noir output must be a subset of ibis output!" if noir_subset_ibis else \
+            "Row occurrence counts must be the same!"
+        self.assertEqual(len(difference.index), 0,
+                         f"{message} Got these counts of rows in ibis (expected) and noir (actual) instead:\n"
+                         f"{difference}")
 
+        print(f"\033[92m Output similarity: OK\033[00m")
+
+    @staticmethod
+    def select_noir_columns(df_noir: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
         # with keyed streams, noir preserves the key column with its original name
         # with joins, both the key column and the corresponding cols in joined tables are preserved
         # with outer joins, the left preserved col could have NaNs that the key doesn't have, so drop the key col and
         # preserve left joined col instead
         noir_cols = list(df_noir.columns)
         if len(noir_cols) > 1 and noir_cols[1] == noir_cols[0] + ".1":
-            df_noir.drop(noir_cols[0], axis=1, inplace=True)
-            df_noir.rename(columns={noir_cols[1]: noir_cols[0]}, inplace=True)
+            df_noir = df_noir.drop(noir_cols[0], axis=1).rename(columns={noir_cols[1]: noir_cols[0]})
 
         # noir can output duplicate columns and additional columns, so remove duplicates and select those in ibis output
-        df_noir = df_noir.loc[:, ~df_noir.columns.duplicated(
-        )][df_ibis.columns.tolist()]
-
-        # dataframes now should be exactly the same aside from row ordering:
-        # group by all columns and count occurrences of each row
-        df_ibis = df_ibis.groupby(df_ibis.columns.tolist(
-        ), dropna=False).size().reset_index(name="count")
-        df_noir = df_noir.groupby(df_noir.columns.tolist(
-        ), dropna=False).size().reset_index(name="count")
-
-        # fast fail if occurrence counts have different lengths
-        if not noir_subset_ibis:
-            self.assertEqual(len(df_ibis.index), len(df_noir.index),
-                             f"Row occurrence count tables must have same length! Got this instead:\n{df_ibis}\n{df_noir}")
-
-        # occurrence count rows could still be in different order so use a join on all columns
-        join = pd.merge(df_ibis, df_noir, how="outer",
-                        on=df_ibis.columns.tolist(), indicator=True)
-        both_count = join["_merge"].value_counts()["both"]
-        join.to_csv(ROOT_DIR + "/out/ibis-noir-comparison.csv")
-
-        if not noir_subset_ibis:
-            self.assertEqual(both_count, len(join.index),
-                             f"Row occurrence count tables must have same values! Got this instead:\n{join}")
-        else:
-            # here we allow for noir to output fewer rows than ibis
-            # used for windowing, where ibis semantics don't include windows with size
-            # smaller than specified, while noir does
-            left_count = join["_merge"].value_counts()["left_only"]
-            right_count = join["_merge"].value_counts()["right_only"]
-            message = f"Noir output must be a subset of ibis output! Got this instead:\n{join}"
-            self.assertGreaterEqual(left_count, 0, message)
-            # only reason why a right_only row should exist is if an identical left_only row with a higher count exists
-            if right_count > 0:
-                cols = join.columns.tolist()
-                cols.remove("count")
-                cols.remove("_merge")
-                for _, r_row in join[join["_merge"] == "right_only"].iterrows():
-                    found = False
-                    for _, l_row in join[join["_merge"] == "left_only"].iterrows():
-                        if all(r_row[col] == l_row[col] for col in cols) and r_row["count"] < l_row["count"]:
-                            found = True
-                            break
-                    self.assertTrue(found, message)
-            else:
-                self.assertEqual(right_count, 0, message)
-            self.assertGreaterEqual(both_count, 0, message)
+        return df_noir.loc[:, ~df_noir.columns.duplicated()][list(columns)]
 
-        print(f"\033[92m Output similarity: OK\033[00m")
+    @staticmethod
+    def with_example_rows(difference: pd.DataFrame, frames: list[pd.DataFrame], columns: list[str],
+                          decimals: int) -> pd.DataFrame:
+        # values of the differing rows, found in the outputs when they are in memory
+        if len(difference.index) == 0 or not frames:
+            return difference
+        found = [f[list(columns)].assign(fingerprint=fingerprints(f[list(columns)], decimals))
+                 for f in frames if f is not None]
+        rows = pd.concat(found).drop_duplicates("fingerprint")
+        return difference.merge(rows, on="fingerprint", how="left").drop(columns="fingerprint")
 
     @staticmethod
     def round_float_cols(df: pd.DataFrame, decimals=3):
@@ -0,0 +1,126 @@
+import unittest
+
+import ibis
+from ibis import _
+
+from codegen import ROOT_DIR
+from codegen.generator import logical_plan, post_order_dfs
+from codegen.logical import LogicalPlan, build
+from codegen.operators import Operator
+
+
+class TestLogicalPlan(unittest.TestCase):
+
+    def setUp(self):
+        ibis.set_backend("duckdb")
+        self.files = {n: ROOT_DIR + f"/data/nullable_op/{n}.csv" for n in ("ints_strings", "many_ints")}
+        self.read_tables()
+
+    def read_tables(self):
+        # ibis gives each table read a new random name
+        self.tables = {n: ibis.read_csv(f) for n, f in self.files.items()}
+
+    def plan(self, query) -> LogicalPlan:
+        return logical_plan([(self.files[n], t) for n, t in self.tables.items()], query)
+
+    def filter_group_query(self, threshold=200):
+        t = self.tables["ints_strings"]
+        return t.filter(t.int1 > threshold).group_by("string1").aggregate(int1_agg=_.int1.sum())
+
+    def join_query(self):
+        return (self.tables["many_ints"]
+                .filter(_.int2 > 10)
+                .inner_join(self.tables["ints_strings"], "int1")
+                .filter(_.int4 > 100)
+                .mutate(mut4=_.int4 + 100))
+
+    def test_build_filter_group_reduce(self):
+        plan = self.plan(self.filter_group_query())
+        self.assertEqual([n.kind for n in plan.nodes], ["Source", "Filter", "GroupReduce"])
+        source, filter_node, group = plan.nodes
+        self.assertIs(plan.root, group)
+        self.assertEqual(filter_node.inputs, [source])
+        self.assertEqual(source.params["file"], "../data/nullable_op/ints_strings.csv")
+        self.assertEqual(filter_node.params["predicate"], "Greater(int1, 200)")
+        self.assertEqual(filter_node.schema, source.schema)
+        self.assertEqual(group.names, ["string1", "int1_agg"])
+        self.assertEqual((group.keys, group.partitioning), (["string1"], "hash(string1)"))
+        self.assertEqual((source.keys, source.partitioning), ([], "any"))
+
+    def test_build_join(self):
+        plan = self.plan(self.join_query())
+        self.assertEqual([n.kind for n in plan.nodes], ["Source", "Source", "Filter", "Join", "Filter", "Map"])
+        join = plan.nodes[3]
+        # the stream completed first is the right side of the join
+        self.assertEqual(join.inputs, [plan.nodes[2], plan.nodes[0]])
+        self.assertEqual(join.names, ["int1", "int2", "int3", "int1_right", "string1", "int4"])
+        self.assertTrue(all(c.nullable for c in join.schema))
+        self.assertEqual((join.keys, join.partitioning), (["int1"], "hash(int1)"))
+        # operations after the join keep its keys
+        self.assertEqual(plan.root.keys, ["int1"])
+        self.assertEqual(plan.root.names[-1], "mut4")
+
+    def test_push_down_filters(self):
+        plan = self.plan(self.join_query())
+        ints_strings, many_ints = plan.nodes[0], plan.nodes[1]
+        self.assertEqual(many_ints.params["pushed_filters"], ["Greater(int2, 10)"])
+        self.assertEqual(len(many_ints.pushed_filters), 1)
+        # the filter after the join is not pushed to either table
+        self.assertEqual(ints_strings.params["pushed_filters"], [])
+        self.assertEqual(ints_strings.pushed_filters, [])
+
+    def test_push_down_filters_renaming_select(self):
+        t = self.tables["ints_strings"]
+        plan = self.plan(t.select(int1=t.int4, int4=t.int1).filter(_.int1 > 5))
+        # int1 of the filter is int4 of the table
+        self.assertEqual(plan.nodes[0].params["pushed_filters"], [])
+        plan = self.plan(t.select("int1", "int4").filter(_.int1 > 5).mutate(a=_.int1).filter(_.a > 3))
+        self.assertEqual(plan.nodes[0].params["pushed_filters"], ["Greater(int1, 5)"])
+
+    def test_prune_columns(self):
+        plan = self.plan(self.filter_group_query())
+        self.assertEqual(plan.nodes[0].params["columns"], ["int1", "string1"])
+        plan = self.plan(self.join_query())
+        self.assertEqual(plan.nodes[0].params["columns"], ["int1", "string1", "int4"])
+        self.assertEqual(plan.nodes[1].params["columns"], ["int1", "int2", "int3"])
+
+    def test_build_before_optimize(self):
+        query = self.filter_group_query()
+        Operator.cleanup()
+        post_order_dfs(query.op())
+        plan = build(query.op(), Operator.operators)
+        Operator.cleanup()
+        self.assertNotIn("pushed_filters", plan.nodes[0].params)
+        self.assertNotEqual(plan.fingerprint(), self.plan(query).fingerprint())
+
+    def test_json_round_trip(self):
+        for query in (self.filter_group_query(), self.join_query()):
+            plan = self.plan(query)
+            read = LogicalPlan.from_json(plan.to_json())
+            self.assertEqual(read.to_json(), plan.to_json())
+            self.assertEqual(read.fingerprint(), plan.fingerprint())
+            self.assertEqual(read.explain(), plan.explain())
+            self.assertEqual([c.dtype for c in read.root.schema], [c.dtype for c in plan.root.schema])
+
+    def test_fingerprint_stable(self):
+        fingerprint = self.plan(self.join_query()).fingerprint()
+        self.assertEqual(self.plan(self.join_query()).fingerprint(), fingerprint)
+        # the same files read again give tables with other names, but the same plan
+        self.read_tables()
+        self.assertEqual(self.plan(self.join_query()).fingerprint(), fingerprint)
+
+    def test_fingerprint_sensitive(self):
+        fingerprint = self.plan(self.filter_group_query()).fingerprint()
+        self.assertNotEqual(self.plan(self.filter_group_query(threshold=300)).fingerprint(), fingerprint)
+        t = self.tables["ints_strings"]
+        other_metric = t.filter(t.int1 > 200).group_by("string1").aggregate(int1_agg=_.int4.sum())
+        self.assertNotEqual(self.plan(other_metric).fingerprint(), fingerprint)
+        casts = [t.mutate(c=t.int1.cast(to)) for to in ("int32", "float64")]
+        self.assertNotEqual(self.plan(casts[0]).fingerprint(), self.plan(casts[1]).fingerprint())
+        # same query over another file
+        self.files["ints_strings"] = ROOT_DIR + "/data/nullable_op/ints_strings_copy.csv"
+        self.assertNotEqual(self.plan(self.filter_group_query()).fingerprint(), fingerprint)
+
+
+if __name__ == "__main__":
+    unittest.main()
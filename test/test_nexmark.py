@@ -1,5 +1,4 @@
 import ibis
-from codegen.generator import compile_ibis_to_noir
 from test.test_base import TestCompiler
 from codegen import ROOT_DIR
 from ibis import _
@@ -50,7 +49,7 @@ class TestNexmark(TestCompiler):
             self.tables = {n: ibis.read_csv(
                 f, schema=schemas[n]) for n, f in no_header_files.items()}
         else:
-            self.tables = {n: ibis.read_csv(f) for n, f in self.files.items()}
+            self.tables = {n: self.read_table(f) for n, f in self.files.items()}
 
     def test_nexmark_query_1(self):
         """
@@ -64,8 +63,7 @@ class TestNexmark(TestCompiler):
                       .select(["auction", "price", "dol_price", "bidder", "date_time"]))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["bid"], bid)],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["bid"], bid)])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -84,8 +82,45 @@ class TestNexmark(TestCompiler):
                       .select(["auction", "price"]))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["bid"], bid)],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["bid"], bid)])
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source()
+
+    def test_nexmark_query_2_stream(self):
+        """
+        Query 2 over bids produced by the nexmark generator inside renoir, emitting results continuously:
+        the first 1000 events are the same as in the generated files, so the result is the same
+        """
+
+        bid = self.tables["bid"]
+        self.output_format = "stream"
+        self.query = (bid
+                      .filter((bid["auction"] == 1007) | (bid["auction"] == 1020) | (bid["auction"] == 2001) | (bid["auction"] == 2019) | (bid["auction"] == 2087))
+                      .select(["auction", "price"]))
+
+        if self.perform_compilation:
+            self.compile_ibis_to_noir([("nexmark://bid?events=1000", bid)])
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source()
+
+    def test_nexmark_query_2_stream_latency(self):
+        """
+        Query 2 emitting results continuously, recording the latency from the generation of each bid to its output
+        """
+
+        bid = self.tables["bid"]
+        self.output_format = "stream"
+        self.measure_latency = True
+        self.query = (bid
+                      .filter((bid["auction"] == 1007) | (bid["auction"] == 1020) | (bid["auction"] == 2001) | (bid["auction"] == 2019) | (bid["auction"] == 2087))
+                      .select(["auction", "price"]))
+
+        if self.perform_compilation:
+            self.compile_ibis_to_noir([("nexmark://bid?events=1000", bid)])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -107,8 +142,7 @@ class TestNexmark(TestCompiler):
                       .select(["name", "city", "state", "id"]))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["auction"], auction), (self.files["person"], person)],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["auction"], auction), (self.files["person"], person)])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -152,8 +186,7 @@ class TestNexmark(TestCompiler):
         # print(ibis.to_sql(query))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["auction"], auction), (self.files["bid"], bid)],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["auction"], auction), (self.files["bid"], bid)])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -180,8 +213,7 @@ class TestNexmark(TestCompiler):
                       .mutate(avg_final_p=_.final_p.mean().over(w)))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["auction"], auction), (self.files["bid"], bid)],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["auction"], auction), (self.files["bid"], bid)])
 
         # subset option is not enough in this case: testing excluding the last .mutate confirms that outputs
         # are the same up to there, but the last .mutate uses a window over 10 close rows within the same seller group:
@@ -1,10 +1,15 @@
+import datetime
 import ibis
+import json
+import tomllib
 import unittest
 import pandas as pd
 from ibis import _
 
-from codegen import ROOT_DIR
-from codegen import compile_ibis_to_noir
+from codegen import ROOT_DIR, explain_analyze
+import codegen.utils as utl
+from codegen.cluster import Cluster
+from codegen.results import read_explain
 from test.test_base import TestCompiler
 
 
@@ -36,7 +41,7 @@ class TestNullableOperators(TestCompiler):
             self.tables = {n: ibis.read_csv(
                 f, schema=schemas[n]) for n, f in no_header_files.items()}
         else:
-            self.tables = {n: ibis.read_csv(f) for n, f in self.files.items()}
+            self.tables = {n: self.read_table(f) for n, f in self.files.items()}
 
     def test_nullable_filter_select(self):
         self.query = (self.tables["ints_strings"]
@@ -44,8 +49,7 @@ class TestNullableOperators(TestCompiler):
                       .select("int1"))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -59,8 +63,7 @@ class TestNullableOperators(TestCompiler):
                       .select("string1"))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -74,8 +77,7 @@ class TestNullableOperators(TestCompiler):
                       .select(["int1_agg"]))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -89,8 +91,7 @@ class TestNullableOperators(TestCompiler):
                       .mutate(mul=_.int1_agg * 20))  # mutate always results in alias preceded by Multiply (or other bin op)
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -103,8 +104,7 @@ class TestNullableOperators(TestCompiler):
         # here example of reduce without group_by
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -137,8 +137,7 @@ class TestNullableOperators(TestCompiler):
         # .mutate(center=_.int1 - _.int1.mean()))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -153,8 +152,7 @@ class TestNullableOperators(TestCompiler):
                       .select(["string1", "int1", "int3"]))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -165,8 +163,7 @@ class TestNullableOperators(TestCompiler):
                       .outer_join(self.tables["many_ints"], "int1"))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -177,8 +174,7 @@ class TestNullableOperators(TestCompiler):
                       .left_join(self.tables["many_ints"], "int1"))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -197,8 +193,7 @@ class TestNullableOperators(TestCompiler):
                       .mutate(mut4=_.int4 + 100))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -215,8 +210,7 @@ class TestNullableOperators(TestCompiler):
                                   .group_by("int1").aggregate(agg4=_.int4.sum()), "int1"))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -232,8 +226,7 @@ class TestNullableOperators(TestCompiler):
                                   .aggregate(agg4=_.int4.sum()), "int1"))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -247,8 +240,7 @@ class TestNullableOperators(TestCompiler):
                       .mutate(int4_demean=_.int4 - _.int4.mean(), int4_mean=_.int4.mean()))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output(noir_subset_ibis=True)
@@ -262,8 +254,7 @@ class TestNullableOperators(TestCompiler):
                       .mutate(int4_sum=_.int4.sum()))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output(noir_subset_ibis=True)
@@ -278,8 +269,7 @@ class TestNullableOperators(TestCompiler):
                       .mutate(int4_demean=_.int4 - _.int4.mean(), group_mean=_.int4.mean()))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output(noir_subset_ibis=True)
@@ -299,8 +289,7 @@ class TestNullableOperators(TestCompiler):
                       .mutate(group_percent=_.int4 * 100 / _.int4.sum().over(w), group_sum=_.int4.sum().over(w)))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output(noir_subset_ibis=True)
@@ -314,8 +303,7 @@ class TestNullableOperators(TestCompiler):
                       .mutate(group_mean=_.int4.mean().over(w)))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output(noir_subset_ibis=True)
@@ -330,13 +318,191 @@ class TestNullableOperators(TestCompiler):
                       .mutate(group_perc=_.int4 * 100 / _.int4.mean().over(w)))
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output(noir_subset_ibis=True)
             self.assert_equality_noir_source()
 
+    def test_nullable_partitioned_filter_select(self):
+        # hive-style layout: the `day` column only exists in the directory names, and files of
+        # the days excluded by the filter are pruned from the generated source
+        path = ROOT_DIR + "/data/nullable_op/ints_strings_partitioned/*/*.csv"
+        table = ibis.read_csv(path, hive_partitioning=True)
+        self.query = (table
+                      .filter(_.day == 2)
+                      .filter(_.string1 == "unduetre")
+                      .select("int1", "day"))
+
+        if self.perform_compilation:
+            self.compile_ibis_to_noir([(path, table)])
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source()
+
+    def test_nullable_date_partitioned_filter_select(self):
+        # dates in the directory names are compared with the date of the filter, pruning the first day,
+        # and filled in as the strings of the struct
+        path = ROOT_DIR + "/data/nullable_op/ints_strings_date_partitioned/*/*.csv"
+        table = ibis.read_csv(path, hive_partitioning=True)
+        self.query = (table
+                      .filter(_.d > datetime.date(2020, 1, 1))
+                      .select("int1", "d"))
+
+        if self.perform_compilation:
+            self.compile_ibis_to_noir([(path, table)])
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source()
+
+    def test_nullable_parquet_filter_select(self):
+        # columns not referenced by the query (int4) are not read from the file, and the filter
+        # is also checked against the min/max statistics of each row group
+        files = self.convert_files("parquet")
+        table = self.read_table(files["ints_strings"])
+        self.query = (table
+                      .filter(_.int1 > 200)
+                      .select("int1", "string1"))
+
+        if self.perform_compilation:
+            self.compile_ibis_to_noir([(files["ints_strings"], table)])
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source()
+
+    def test_nullable_binary_cache_filter_select(self):
+        # the csv is converted to the binary table cache next to it and memory-mapped by renoir
+        self.binary_cache = True
+        self.query = (self.tables["ints_strings"]
+                      .filter(_.int1 > 200)
+                      .select("int1", "string1"))
+
+        if self.perform_compilation:
+            self.compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])])
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source()
+
+    def test_nullable_arrow_output_filter_select(self):
+        # output is written as arrow ipc and memory-mapped when comparing it with ibis
+        self.output_format = "arrow"
+        self.query = (self.tables["ints_strings"]
+                      .filter(_.int1 > 200)
+                      .select("int1", "string1"))
+
+        if self.perform_compilation:
+            self.compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])])
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source()
+
+    def test_nullable_arrow_output_group_reduce(self):
+        self.output_format = "arrow"
+        self.query = (self.tables["ints_strings"]
+                      .group_by("string1")
+                      .aggregate(int1_agg=_["int1"].sum()))
+
+        if self.perform_compilation:
+            self.compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])])
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source()
+
+    def test_nullable_arrow_output_cast_mutate(self):
+        # narrow integers are written widened to int64
+        self.output_format = "arrow"
+        self.query = (self.tables["ints_strings"]
+                      .filter(_.int1 > 200)
+                      .mutate(int1_32=_.int1.cast("int32"))
+                      .select("string1", "int1_32"))
+
+        if self.perform_compilation:
+            self.compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])])
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source()
+
+    def test_nullable_cluster_filter_select(self):
+        # two processes on localhost join renoir's remote runtime through the config written with the code
+        self.cluster = Cluster.local(processes=2, cores_per_process=1)
+        self.query = (self.tables["ints_strings"]
+                      .filter(_.int1 > 200)
+                      .select("int1", "string1"))
+
+        if self.perform_compilation:
+            self.compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])])
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source()
+            with open(self.cluster.config_path, "rb") as f:
+                config = tomllib.load(f)
+            self.assertEqual(config, {"host": [{"address": "127.0.0.1", "base_port": 9500, "num_cores": 1},
+                                               {"address": "127.0.0.1", "base_port": 10000, "num_cores": 1}]})
+
+    def test_nullable_backend_filter_select(self):
+        # the renoir ibis backend generates, builds and runs the code when the query is executed
+        self.output_format = "arrow"
+        con = ibis.renoir.connect(cluster=self.cluster, binary_cache=self.binary_cache)
+        query = (con.read_csv(self.files["ints_strings"])
+                 .filter(_.int1 > 200)
+                 .select("int1", "string1"))
+        # same query over the duckdb table, to compare renoir output with
+        self.query = (self.tables["ints_strings"]
+                      .filter(_.int1 > 200)
+                      .select("int1", "string1"))
+
+        if self.perform_compilation:
+            query.execute()
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source()
+
+    def test_nullable_explain_group_reduce_join_mutate(self):
+        # each operator is wrapped by probes, whose counters are laid onto the plan after running
+        self.explain = True
+        self.query = (self.tables["many_ints"]
+                      .group_by("int1")
+                      .aggregate(agg2=_.int2.sum())
+                      .inner_join(self.tables["ints_strings"], "int1")
+                      .mutate(mut4=_.int4 + 100))
+
+        if self.perform_compilation:
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source()
+            counters = read_explain()
+            self.assertEqual(counters["rows_out"].iloc[-1], len(self.query.to_pandas()))
+            explain_analyze(self.query, render=False)
+
+    def test_nullable_trace_filter_group_reduce(self):
+        # timeline of codegen, cargo build and of each operator replica is written to out/trace.json
+        self.trace = True
+        self.query = (self.tables["ints_strings"]
+                      .filter(_.int1 > 200)
+                      .group_by("string1")
+                      .aggregate(int1_agg=_["int1"].sum()))
+
+        if self.perform_compilation:
+            self.compile_ibis_to_noir([(self.files["ints_strings"], self.tables["ints_strings"])])
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source()
+            with open(utl.OUT_DIR + "/trace.json") as f:
+                names = {e["name"] for e in json.load(f)["traceEvents"]}
+            self.assertTrue({"generate", "cargo build", "run", "execution", "process startup"} <= names)
+
 
 class TestNonNullableOperators(TestCompiler):
 
@@ -365,8 +531,7 @@ class TestNonNullableOperators(TestCompiler):
         self.query = self.query_func(self.tables)
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["fruit_left"], self.tables["fruit_left"])],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["fruit_left"], self.tables["fruit_left"])])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -382,8 +547,7 @@ class TestNonNullableOperators(TestCompiler):
         self.query = self.query_func(self.tables)
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["fruit_left"], self.tables["fruit_left"])],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["fruit_left"], self.tables["fruit_left"])])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -399,8 +563,7 @@ class TestNonNullableOperators(TestCompiler):
         self.query = self.query_func(self.tables)
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["fruit_left"], self.tables["fruit_left"])],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["fruit_left"], self.tables["fruit_left"])])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -416,8 +579,7 @@ class TestNonNullableOperators(TestCompiler):
         self.query = self.query_func(self.tables)
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["fruit_left"], self.tables["fruit_left"])],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["fruit_left"], self.tables["fruit_left"])])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -431,8 +593,7 @@ class TestNonNullableOperators(TestCompiler):
         self.query = self.query_func(self.tables)
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["fruit_left"], self.tables["fruit_left"])],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["fruit_left"], self.tables["fruit_left"])])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -448,8 +609,7 @@ class TestNonNullableOperators(TestCompiler):
         self.query = self.query_func(self.tables)
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files["fruit_left"], self.tables["fruit_left"])],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files["fruit_left"], self.tables["fruit_left"])])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -466,8 +626,7 @@ class TestNonNullableOperators(TestCompiler):
         self.query = self.query_func(self.tables)
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -480,8 +639,7 @@ class TestNonNullableOperators(TestCompiler):
         self.query = self.query_func(self.tables)
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -494,8 +652,7 @@ class TestNonNullableOperators(TestCompiler):
         self.query = self.query_func(self.tables)
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -511,8 +668,7 @@ class TestNonNullableOperators(TestCompiler):
         self.query = self.query_func(self.tables)
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -528,8 +684,7 @@ class TestNonNullableOperators(TestCompiler):
         self.query = self.query_func(self.tables)
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
@@ -544,8 +699,7 @@ class TestNonNullableOperators(TestCompiler):
         self.query = self.query_func(self.tables)
 
         if self.perform_compilation:
-            compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()],
-                                 self.query, self.run_after_gen, self.print_output_to_file, self.render_query_graph, self.benchmark)
+            self.compile_ibis_to_noir([(self.files[k], self.tables[k]) for k in self.files.keys()])
 
         if self.perform_assertions:
             self.assert_similarity_noir_output()
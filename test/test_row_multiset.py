@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from test.row_multiset import RowMultiset
+
+
+class TestRowMultiset(unittest.TestCase):
+
+    def multiset(self, df: pd.DataFrame, chunk_rows: int = None, columns: list[str] = None) -> RowMultiset:
+        rows = RowMultiset(columns or list(df.columns))
+        chunk_rows = chunk_rows or len(df.index)
+        for start in range(0, len(df.index), chunk_rows):
+            rows.add(df.iloc[start:start + chunk_rows])
+        return rows
+
+    def test_chunked_same_as_whole(self):
+        df = pd.DataFrame({"int1": [1, 2, 2, 3, None, 2] * 50, "string1": ["a", "b", "b", None, "c", "b"] * 50})
+        whole = self.multiset(df)
+        for chunk_rows in (1, 7, 64):
+            chunked = self.multiset(df.sample(frac=1, random_state=chunk_rows), chunk_rows)
+            self.assertEqual(chunked.rows, whole.rows)
+            self.assertTrue(whole.difference(chunked).empty)
+
+    def test_chunked_counts_duplicates(self):
+        expected = self.multiset(pd.DataFrame({"int1": [1, 1, 2]}))
+        actual = self.multiset(pd.DataFrame({"int1": [1, 2, 2]}), chunk_rows=1)
+        difference = expected.difference(actual)
+        self.assertEqual(len(difference.index), 2)
+        self.assertEqual(sorted(difference["expected"] - difference["actual"]), [-1, 1])
+
+    def test_column_subset(self):
+        # only the given columns are compared, in their order, whatever the others contain
+        expected = self.multiset(pd.DataFrame({"a": [1, 2], "b": ["x", "y"], "c": [0.5, 1.5]}), columns=["b", "a"])
+        actual = self.multiset(pd.DataFrame({"b": ["y", "x"], "a": [2, 1], "d": [7, 8]}), columns=expected.columns)
+        self.assertTrue(expected.difference(actual).empty)
+
+    def test_subset_of_rows(self):
+        expected = self.multiset(pd.DataFrame({"a": [1, 2, 3, 3]}))
+        self.assertTrue(expected.difference(self.multiset(pd.DataFrame({"a": [3, 1]})), subset=True).empty)
+        self.assertFalse(expected.difference(self.multiset(pd.DataFrame({"a": [3, 3, 3]})), subset=True).empty)
+
+    def test_large_integers_exact(self):
+        big = 2 ** 60
+        expected = self.multiset(pd.DataFrame({"a": pd.array([big, big + 1], dtype="Int64")}))
+        actual = self.multiset(pd.DataFrame({"a": pd.array([big, big], dtype="Int64")}))
+        self.assertFalse(expected.difference(actual).empty)
+
+    def test_integers_equal_integral_floats(self):
+        expected = self.multiset(pd.DataFrame({"a": pd.array([1, None, 3], dtype="Int64"), "b": [True, False, True]}))
+        actual = self.multiset(pd.DataFrame({"a": [3.0, 1.0004, np.nan], "b": [1.0, 1.0, 0.0]}), chunk_rows=2)
+        self.assertTrue(expected.difference(actual).empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
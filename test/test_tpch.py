@@ -0,0 +1,544 @@
+from datetime import date, timedelta
+
+import ibis
+from ibis import _
+
+from codegen import ROOT_DIR
+from test.test_base import TestCompiler
+
+
+def add_date(day: str, dy=0, dm=0, dd=0) -> date:
+    # interval arithmetic over literals is done in python, so that queries only compare dates
+    d = date.fromisoformat(day)
+    month = d.month - 1 + dm
+    d = d.replace(year=d.year + dy + month // 12, month=month % 12 + 1)
+    return d + timedelta(days=dd)
+
+
+class TestTPCH(TestCompiler):
+    """
+    the 22 TPC-H queries with the substitution parameters of the specification's validation run.
+    data/tpch holds a small dataset with the value domains of dbgen, larger scale factors are read
+    through the path suffix after converting dbgen output with data/tpc_data_gen, e.g. lineitem_sf1.csv
+    """
+
+    def setUp(self):
+        self.init_files()
+        self.init_tables()
+        super().setUp()
+
+    def init_files(self, file_suffix=""):
+        names = ["customer", "lineitem", "nation", "orders", "part", "partsupp", "region", "supplier"]
+        file_prefix = ROOT_DIR + "/data/tpch/"
+        file_suffix = file_suffix + ".csv"
+        self.files = {n: f"{file_prefix}{n}{file_suffix}" for n in names}
+
+    def init_tables(self):
+        if ibis.get_backend().name == "polars":
+            # dates are only detected by duckdb
+            self.tables = {n: ibis.read_csv(f, try_parse_dates=True) for n, f in self.files.items()}
+        else:
+            self.tables = {n: self.read_table(f) for n, f in self.files.items()}
+        # tables read by the query, with their file
+        self.files_tables = []
+
+    def table(self, name: str):
+        # renoir compiles each table read to its own stream, so a table or subquery used twice by a query
+        # reads the table again, keeping the plan a tree: other backends reuse the tables already read
+        if not (self.perform_compilation or ibis.get_backend().name == "renoir"):
+            return self.tables[name]
+        if ibis.get_backend().name == "polars":
+            table = ibis.read_csv(self.files[name], try_parse_dates=True)
+        else:
+            table = self.read_table(self.files[name])
+        self.files_tables.append((self.files[name], table))
+        return table
+
+    def run_query(self):
+        if self.perform_compilation:
+            self.compile_ibis_to_noir(self.files_tables)
+
+        if self.perform_assertions:
+            self.assert_similarity_noir_output()
+            self.assert_equality_noir_source(self._testMethodName)
+
+    def test_tpch_query_1(self):
+        """
+        pricing summary report
+        """
+        lineitem = self.table("lineitem")
+        self.query = (lineitem
+                      .filter(_.l_shipdate <= add_date("1998-12-01", dd=-90))
+                      .mutate(disc_price=_.l_extendedprice * (1 - _.l_discount))
+                      .mutate(charge=_.disc_price * (1 + _.l_tax))
+                      .group_by([_.l_returnflag, _.l_linestatus])
+                      .aggregate(sum_qty=_.l_quantity.sum(),
+                                 sum_base_price=_.l_extendedprice.sum(),
+                                 sum_disc_price=_.disc_price.sum(),
+                                 sum_charge=_.charge.sum(),
+                                 avg_qty=_.l_quantity.mean(),
+                                 avg_price=_.l_extendedprice.mean(),
+                                 avg_disc=_.l_discount.mean(),
+                                 count_order=_.count())
+                      .order_by([_.l_returnflag, _.l_linestatus]))
+
+        self.run_query()
+
+    def test_tpch_query_2(self):
+        """
+        minimum cost supplier
+        """
+        def europe():
+            partsupp, supplier = self.table("partsupp"), self.table("supplier")
+            nation, region = self.table("nation"), self.table("region")
+            return (partsupp
+                    .join(supplier, partsupp["ps_suppkey"] == supplier["s_suppkey"])
+                    .join(nation, _.s_nationkey == nation["n_nationkey"])
+                    .join(region, _.n_regionkey == region["r_regionkey"])
+                    .filter(_.r_name == "EUROPE"))
+
+        min_cost = (europe()
+                    .group_by(min_partkey=_.ps_partkey)
+                    .aggregate(min_supplycost=_.ps_supplycost.min()))
+        part, europe = self.table("part"), europe()
+        self.query = (part
+                      .filter((_.p_size == 15) & _.p_type.endswith("BRASS"))
+                      .join(europe, _.p_partkey == europe["ps_partkey"])
+                      .join(min_cost, [_.ps_partkey == min_cost["min_partkey"],
+                                       _.ps_supplycost == min_cost["min_supplycost"]])
+                      .select(["s_acctbal", "s_name", "n_name", "p_partkey", "p_mfgr", "s_address", "s_phone",
+                               "s_comment"])
+                      .order_by([ibis.desc("s_acctbal"), "n_name", "s_name", "p_partkey"])
+                      .limit(100))
+
+        self.run_query()
+
+    def test_tpch_query_3(self):
+        """
+        shipping priority
+        """
+        customer, orders, lineitem = self.table("customer"), self.table("orders"), self.table("lineitem")
+        day = add_date("1995-03-15")
+        orders = orders.filter(_.o_orderdate < day)
+        lineitem = lineitem.filter(_.l_shipdate > day)
+        self.query = (customer
+                      .filter(_.c_mktsegment == "BUILDING")
+                      .join(orders, _.c_custkey == orders["o_custkey"])
+                      .join(lineitem, _.o_orderkey == lineitem["l_orderkey"])
+                      .mutate(volume=_.l_extendedprice * (1 - _.l_discount), orderdate=_.o_orderdate.cast("string"))
+                      .group_by([_.l_orderkey, _.orderdate, _.o_shippriority])
+                      .aggregate(revenue=_.volume.sum())
+                      .order_by([ibis.desc("revenue"), "orderdate"])
+                      .limit(10))
+
+        self.run_query()
+
+    def test_tpch_query_4(self):
+        """
+        order priority checking
+        """
+        orders, lineitem = self.table("orders"), self.table("lineitem")
+        late = lineitem.filter(_.l_commitdate < _.l_receiptdate)
+        self.query = (orders
+                      .filter((_.o_orderdate >= add_date("1993-07-01")) &
+                              (_.o_orderdate < add_date("1993-07-01", dm=3)))
+                      .semi_join(late, orders["o_orderkey"] == late["l_orderkey"])
+                      .group_by(_.o_orderpriority)
+                      .aggregate(order_count=_.count())
+                      .order_by(_.o_orderpriority))
+
+        self.run_query()
+
+    def test_tpch_query_5(self):
+        """
+        local supplier volume
+        """
+        customer, orders, lineitem = self.table("customer"), self.table("orders"), self.table("lineitem")
+        supplier, nation, region = self.table("supplier"), self.table("nation"), self.table("region")
+        self.query = (customer
+                      .join(orders, customer["c_custkey"] == orders["o_custkey"])
+                      .join(lineitem, _.o_orderkey == lineitem["l_orderkey"])
+                      .join(supplier, [_.l_suppkey == supplier["s_suppkey"],
+                                       _.c_nationkey == supplier["s_nationkey"]])
+                      .join(nation, _.s_nationkey == nation["n_nationkey"])
+                      .join(region, _.n_regionkey == region["r_regionkey"])
+                      .filter((_.r_name == "ASIA") &
+                              (_.o_orderdate >= add_date("1994-01-01")) &
+                              (_.o_orderdate < add_date("1994-01-01", dy=1)))
+                      .mutate(volume=_.l_extendedprice * (1 - _.l_discount))
+                      .group_by(_.n_name)
+                      .aggregate(revenue=_.volume.sum())
+                      .order_by(ibis.desc("revenue")))
+
+        self.run_query()
+
+    def test_tpch_query_6(self):
+        """
+        forecasting revenue change
+        """
+        lineitem = self.table("lineitem")
+        self.query = (lineitem
+                      .filter((_.l_shipdate >= add_date("1994-01-01")) &
+                              (_.l_shipdate < add_date("1994-01-01", dy=1)) &
+                              _.l_discount.between(0.05, 0.07) &
+                              (_.l_quantity < 24))
+                      .mutate(volume=_.l_extendedprice * _.l_discount)
+                      .aggregate(revenue=_.volume.sum()))
+
+        self.run_query()
+
+    def test_tpch_query_7(self):
+        """
+        volume shipping
+        """
+        supplier, lineitem, orders = self.table("supplier"), self.table("lineitem"), self.table("orders")
+        customer = self.table("customer")
+        n1 = self.table("nation").select(supp_nation=_.n_name, n1_nationkey=_.n_nationkey)
+        n2 = self.table("nation").select(cust_nation=_.n_name, n2_nationkey=_.n_nationkey)
+        self.query = (supplier
+                      .join(lineitem, supplier["s_suppkey"] == lineitem["l_suppkey"])
+                      .join(orders, _.l_orderkey == orders["o_orderkey"])
+                      .join(customer, _.o_custkey == customer["c_custkey"])
+                      .join(n1, _.s_nationkey == n1["n1_nationkey"])
+                      .join(n2, _.c_nationkey == n2["n2_nationkey"])
+                      .filter((((_.supp_nation == "FRANCE") & (_.cust_nation == "GERMANY")) |
+                               ((_.supp_nation == "GERMANY") & (_.cust_nation == "FRANCE"))) &
+                              _.l_shipdate.between(add_date("1995-01-01"), add_date("1996-12-31")))
+                      .mutate(l_year=_.l_shipdate.year(), volume=_.l_extendedprice * (1 - _.l_discount))
+                      .group_by([_.supp_nation, _.cust_nation, _.l_year])
+                      .aggregate(revenue=_.volume.sum())
+                      .order_by([_.supp_nation, _.cust_nation, _.l_year]))
+
+        self.run_query()
+
+    def test_tpch_query_8(self):
+        """
+        national market share
+        """
+        part, supplier, lineitem = self.table("part"), self.table("supplier"), self.table("lineitem")
+        orders, customer = self.table("orders"), self.table("customer")
+        region = self.table("region")
+        n1 = self.table("nation").select(n1_nationkey=_.n_nationkey, n1_regionkey=_.n_regionkey)
+        n2 = self.table("nation").select(n2_nationkey=_.n_nationkey, nation=_.n_name)
+        self.query = (part
+                      .join(lineitem, part["p_partkey"] == lineitem["l_partkey"])
+                      .join(supplier, _.l_suppkey == supplier["s_suppkey"])
+                      .join(orders, _.l_orderkey == orders["o_orderkey"])
+                      .join(customer, _.o_custkey == customer["c_custkey"])
+                      .join(n1, _.c_nationkey == n1["n1_nationkey"])
+                      .join(region, _.n1_regionkey == region["r_regionkey"])
+                      .join(n2, _.s_nationkey == n2["n2_nationkey"])
+                      .filter((_.r_name == "AMERICA") &
+                              _.o_orderdate.between(add_date("1995-01-01"), add_date("1996-12-31")) &
+                              (_.p_type == "ECONOMY ANODIZED STEEL"))
+                      .mutate(o_year=_.o_orderdate.year(), volume=_.l_extendedprice * (1 - _.l_discount))
+                      .mutate(brazil_volume=ibis.ifelse(_.nation == "BRAZIL", _.volume, 0))
+                      .group_by(_.o_year)
+                      .aggregate(brazil=_.brazil_volume.sum(), total=_.volume.sum())
+                      .mutate(mkt_share=_.brazil / _.total)
+                      .select(["o_year", "mkt_share"])
+                      .order_by(_.o_year))
+
+        self.run_query()
+
+    def test_tpch_query_9(self):
+        """
+        product type profit measure
+        """
+        part, supplier, lineitem = self.table("part"), self.table("supplier"), self.table("lineitem")
+        partsupp, orders, nation = self.table("partsupp"), self.table("orders"), self.table("nation")
+        self.query = (lineitem
+                      .join(supplier, lineitem["l_suppkey"] == supplier["s_suppkey"])
+                      .join(partsupp, [_.l_suppkey == partsupp["ps_suppkey"], _.l_partkey == partsupp["ps_partkey"]])
+                      .join(part, _.l_partkey == part["p_partkey"])
+                      .join(orders, _.l_orderkey == orders["o_orderkey"])
+                      .join(nation, _.s_nationkey == nation["n_nationkey"])
+                      .filter(_.p_name.contains("green"))
+                      .mutate(o_year=_.o_orderdate.year(),
+                              amount=_.l_extendedprice * (1 - _.l_discount) - _.ps_supplycost * _.l_quantity)
+                      .group_by([_.n_name, _.o_year])
+                      .aggregate(sum_profit=_.amount.sum())
+                      .order_by([_.n_name, ibis.desc("o_year")]))
+
+        self.run_query()
+
+    def test_tpch_query_10(self):
+        """
+        returned item reporting
+        """
+        customer, orders, lineitem = self.table("customer"), self.table("orders"), self.table("lineitem")
+        nation = self.table("nation")
+        self.query = (customer
+                      .join(orders, customer["c_custkey"] == orders["o_custkey"])
+                      .join(lineitem, _.o_orderkey == lineitem["l_orderkey"])
+                      .join(nation, _.c_nationkey == nation["n_nationkey"])
+                      .filter((_.o_orderdate >= add_date("1993-10-01")) &
+                              (_.o_orderdate < add_date("1993-10-01", dm=3)) &
+                              (_.l_returnflag == "R"))
+                      .mutate(volume=_.l_extendedprice * (1 - _.l_discount))
+                      .group_by([_.c_custkey, _.c_name, _.c_acctbal, _.c_phone, _.n_name, _.c_address, _.c_comment])
+                      .aggregate(revenue=_.volume.sum())
+                      .order_by(ibis.desc("revenue"))
+                      .limit(20))
+
+        self.run_query()
+
+    def test_tpch_query_11(self):
+        """
+        important stock identification
+        """
+        def germany():
+            partsupp, supplier, nation = self.table("partsupp"), self.table("supplier"), self.table("nation")
+            return (partsupp
+                    .join(supplier, partsupp["ps_suppkey"] == supplier["s_suppkey"])
+                    .join(nation, _.s_nationkey == nation["n_nationkey"])
+                    .filter(_.n_name == "GERMANY")
+                    .mutate(value=_.ps_supplycost * _.ps_availqty))
+
+        total = germany().aggregate(total=_.value.sum())
+        self.query = (germany()
+                      .group_by(_.ps_partkey)
+                      .aggregate(value=_.value.sum())
+                      .cross_join(total)
+                      .filter(_.value > _.total * 0.0001)
+                      .select(["ps_partkey", "value"])
+                      .order_by(ibis.desc("value")))
+
+        self.run_query()
+
+    def test_tpch_query_12(self):
+        """
+        shipping modes and order priority
+        """
+        orders, lineitem = self.table("orders"), self.table("lineitem")
+        urgent = _.o_orderpriority.isin(["1-URGENT", "2-HIGH"])
+        self.query = (orders
+                      .join(lineitem, orders["o_orderkey"] == lineitem["l_orderkey"])
+                      .filter(_.l_shipmode.isin(["MAIL", "SHIP"]) &
+                              (_.l_commitdate < _.l_receiptdate) &
+                              (_.l_shipdate < _.l_commitdate) &
+                              (_.l_receiptdate >= add_date("1994-01-01")) &
+                              (_.l_receiptdate < add_date("1994-01-01", dy=1)))
+                      .mutate(high_line=ibis.case().when(urgent, 1).else_(0).end(),
+                              low_line=ibis.case().when(~urgent, 1).else_(0).end())
+                      .group_by(_.l_shipmode)
+                      .aggregate(high_line_count=_.high_line.sum(), low_line_count=_.low_line.sum())
+                      .order_by(_.l_shipmode))
+
+        self.run_query()
+
+    def test_tpch_query_13(self):
+        """
+        customer distribution
+        """
+        customer, orders = self.table("customer"), self.table("orders")
+        orders = orders.filter(~_.o_comment.like("%special%requests%"))
+        self.query = (customer
+                      .left_join(orders, customer["c_custkey"] == orders["o_custkey"])
+                      .group_by(_.c_custkey)
+                      .aggregate(c_count=_.o_orderkey.count())
+                      .group_by(_.c_count)
+                      .aggregate(custdist=_.count())
+                      .order_by([ibis.desc("custdist"), ibis.desc("c_count")]))
+
+        self.run_query()
+
+    def test_tpch_query_14(self):
+        """
+        promotion effect
+        """
+        lineitem, part = self.table("lineitem"), self.table("part")
+        self.query = (lineitem
+                      .join(part, lineitem["l_partkey"] == part["p_partkey"])
+                      .filter((_.l_shipdate >= add_date("1995-09-01")) &
+                              (_.l_shipdate < add_date("1995-09-01", dm=1)))
+                      .mutate(volume=_.l_extendedprice * (1 - _.l_discount))
+                      .mutate(promo_volume=ibis.ifelse(_.p_type.startswith("PROMO"), _.volume, 0))
+                      .aggregate(promo=_.promo_volume.sum(), total=_.volume.sum())
+                      .mutate(promo_revenue=_.promo * 100 / _.total)
+                      .select("promo_revenue"))
+
+        self.run_query()
+
+    def test_tpch_query_15(self):
+        """
+        top supplier
+        """
+        def revenue():
+            return (self.table("lineitem")
+                    .filter((_.l_shipdate >= add_date("1996-01-01")) &
+                            (_.l_shipdate < add_date("1996-01-01", dm=3)))
+                    .mutate(volume=_.l_extendedprice * (1 - _.l_discount))
+                    .group_by(_.l_suppkey)
+                    .aggregate(total_revenue=_.volume.sum()))
+
+        top = revenue().aggregate(max_revenue=_.total_revenue.max())
+        supplier, revenue = self.table("supplier"), revenue()
+        self.query = (supplier
+                      .join(revenue, supplier["s_suppkey"] == revenue["l_suppkey"])
+                      .cross_join(top)
+                      .filter(_.total_revenue == _.max_revenue)
+                      .select(["s_suppkey", "s_name", "s_address", "s_phone", "total_revenue"])
+                      .order_by("s_suppkey"))
+
+        self.run_query()
+
+    def test_tpch_query_16(self):
+        """
+        parts/supplier relationship
+        """
+        partsupp, part, supplier = self.table("partsupp"), self.table("part"), self.table("supplier")
+        complaints = supplier.filter(_.s_comment.like("%Customer%Complaints%"))
+        self.query = (partsupp
+                      .join(part, partsupp["ps_partkey"] == part["p_partkey"])
+                      .filter((_.p_brand != "Brand#45") &
+                              ~_.p_type.startswith("MEDIUM POLISHED") &
+                              _.p_size.isin([49, 14, 23, 45, 19, 3, 36, 9]))
+                      .anti_join(complaints, _.ps_suppkey == complaints["s_suppkey"])
+                      .group_by([_.p_brand, _.p_type, _.p_size])
+                      .aggregate(supplier_cnt=_.ps_suppkey.nunique())
+                      .order_by([ibis.desc("supplier_cnt"), "p_brand", "p_type", "p_size"]))
+
+        self.run_query()
+
+    def test_tpch_query_17(self):
+        """
+        small-quantity-order revenue
+        """
+        avg_quantity = (self.table("lineitem")
+                        .group_by(_.l_partkey)
+                        .aggregate(avg_quantity=_.l_quantity.mean()))
+        lineitem, part = self.table("lineitem"), self.table("part")
+        self.query = (lineitem
+                      .join(part, lineitem["l_partkey"] == part["p_partkey"])
+                      .filter((_.p_brand == "Brand#23") & (_.p_container == "MED BOX"))
+                      .join(avg_quantity, _.p_partkey == avg_quantity["l_partkey"])
+                      .filter(_.l_quantity < _.avg_quantity * 0.2)
+                      .aggregate(sum_price=_.l_extendedprice.sum())
+                      .mutate(avg_yearly=_.sum_price / 7.0)
+                      .select("avg_yearly"))
+
+        self.run_query()
+
+    def test_tpch_query_18(self):
+        """
+        large volume customer
+        """
+        large = (self.table("lineitem")
+                 .group_by(_.l_orderkey)
+                 .aggregate(qty=_.l_quantity.sum())
+                 .filter(_.qty > 300))
+        customer, orders, lineitem = self.table("customer"), self.table("orders"), self.table("lineitem")
+        self.query = (customer
+                      .join(orders, customer["c_custkey"] == orders["o_custkey"])
+                      .join(lineitem, _.o_orderkey == lineitem["l_orderkey"])
+                      .semi_join(large, _.o_orderkey == large["l_orderkey"])
+                      .mutate(orderdate=_.o_orderdate.cast("string"))
+                      .group_by([_.c_name, _.c_custkey, _.o_orderkey, _.orderdate, _.o_totalprice])
+                      .aggregate(sum_qty=_.l_quantity.sum())
+                      .order_by([ibis.desc("o_totalprice"), "orderdate"])
+                      .limit(100))
+
+        self.run_query()
+
+    def test_tpch_query_19(self):
+        """
+        discounted revenue
+        """
+        lineitem, part = self.table("lineitem"), self.table("part")
+
+        def brand(name: str, containers: list[str], quantity: int, size: int):
+            return ((_.p_brand == name) & _.p_container.isin(containers) &
+                    _.l_quantity.between(quantity, quantity + 10) & _.p_size.between(1, size))
+
+        self.query = (lineitem
+                      .join(part, lineitem["l_partkey"] == part["p_partkey"])
+                      .filter(_.l_shipmode.isin(["AIR", "REG AIR"]) & (_.l_shipinstruct == "DELIVER IN PERSON"))
+                      .filter(brand("Brand#12", ["SM CASE", "SM BOX", "SM PACK", "SM PKG"], 1, 5) |
+                              brand("Brand#23", ["MED BAG", "MED BOX", "MED PKG", "MED PACK"], 10, 10) |
+                              brand("Brand#34", ["LG CASE", "LG BOX", "LG PACK", "LG PKG"], 20, 15))
+                      .mutate(volume=_.l_extendedprice * (1 - _.l_discount))
+                      .aggregate(revenue=_.volume.sum()))
+
+        self.run_query()
+
+    def test_tpch_query_20(self):
+        """
+        potential part promotion
+        """
+        supplier, nation, partsupp = self.table("supplier"), self.table("nation"), self.table("partsupp")
+        part, lineitem = self.table("part"), self.table("lineitem")
+        shipped = (lineitem
+                   .filter((_.l_shipdate >= add_date("1994-01-01")) &
+                           (_.l_shipdate < add_date("1994-01-01", dy=1)))
+                   .group_by([_.l_partkey, _.l_suppkey])
+                   .aggregate(shipped_qty=_.l_quantity.sum()))
+        forest = part.filter(_.p_name.startswith("forest"))
+        excess = (partsupp
+                  .join(shipped, [partsupp["ps_partkey"] == shipped["l_partkey"],
+                                  partsupp["ps_suppkey"] == shipped["l_suppkey"]])
+                  .filter(_.ps_availqty > _.shipped_qty * 0.5))
+        excess = excess.semi_join(forest, excess["ps_partkey"] == forest["p_partkey"])
+        canada = (supplier
+                  .join(nation, supplier["s_nationkey"] == nation["n_nationkey"])
+                  .filter(_.n_name == "CANADA"))
+        self.query = (canada
+                      .semi_join(excess, canada["s_suppkey"] == excess["ps_suppkey"])
+                      .select(["s_name", "s_address"])
+                      .order_by("s_name"))
+
+        self.run_query()
+
+    def test_tpch_query_21(self):
+        """
+        suppliers who kept orders waiting
+        """
+        # orders with lines of more than one supplier, and with late lines of only one supplier
+        suppliers = (self.table("lineitem")
+                     .group_by(_.l_orderkey)
+                     .aggregate(n_supp=_.l_suppkey.nunique()))
+        late_suppliers = (self.table("lineitem")
+                          .filter(_.l_receiptdate > _.l_commitdate)
+                          .group_by(_.l_orderkey)
+                          .aggregate(n_late_supp=_.l_suppkey.nunique()))
+        supplier, orders, nation = self.table("supplier"), self.table("orders"), self.table("nation")
+        late = self.table("lineitem").filter(_.l_receiptdate > _.l_commitdate)
+        self.query = (late
+                      .join(supplier, late["l_suppkey"] == supplier["s_suppkey"])
+                      .join(orders, _.l_orderkey == orders["o_orderkey"])
+                      .join(nation, _.s_nationkey == nation["n_nationkey"])
+                      .join(suppliers, _.l_orderkey == suppliers["l_orderkey"])
+                      .join(late_suppliers, _.l_orderkey == late_suppliers["l_orderkey"])
+                      .filter((_.o_orderstatus == "F") & (_.n_name == "SAUDI ARABIA") &
+                              (_.n_supp > 1) & (_.n_late_supp == 1))
+                      .group_by(_.s_name)
+                      .aggregate(numwait=_.count())
+                      .order_by([ibis.desc("numwait"), "s_name"])
+                      .limit(100))
+
+        self.run_query()
+
+    def test_tpch_query_22(self):
+        """
+        global sales opportunity
+        """
+        codes = ["13", "31", "23", "29", "30", "18", "17"]
+
+        def candidates():
+            return (self.table("customer")
+                    .mutate(cntrycode=_.c_phone.substr(0, 2))
+                    .filter(_.cntrycode.isin(codes)))
+
+        avg_balance = (candidates()
+                       .filter(_.c_acctbal > 0.0)
+                       .aggregate(avg_acctbal=_.c_acctbal.mean()))
+        candidates, orders = candidates(), self.table("orders")
+        self.query = (candidates
+                      .anti_join(orders, candidates["c_custkey"] == orders["o_custkey"])
+                      .cross_join(avg_balance)
+                      .filter(_.c_acctbal > _.avg_acctbal)
+                      .group_by(_.cntrycode)
+                      .aggregate(numcust=_.count(), totacctbal=_.c_acctbal.sum())
+                      .order_by(_.cntrycode))
+
+        self.run_query()